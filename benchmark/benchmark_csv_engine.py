@@ -0,0 +1,98 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License").
+# You may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Compares the pandas ("c") and Arrow ("pyarrow") CSV engines: time to load a CSV dataset, time to run the email
+metric on its string column, memory used by the resulting DataFrame and peak resident memory of the process.
+Every engine is measured in its own process so that peak memory figures do not leak between runs.
+
+Usage, from the repository root:
+
+    python -m benchmark.benchmark_csv_engine --rows 2000000
+"""
+
+import argparse
+import os
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from unittest import mock
+
+from src.model.csv_engine import CsvEngine
+
+
+def generate_dataset(folder_path: str, rows: int) -> None:
+    random_generator = random.Random(0)
+    with open(os.path.join(folder_path, "data.csv"), "w") as file:
+        file.write("id,age,score,name,contact\n")
+        for index in range(rows):
+            name = f"user{random_generator.randrange(rows)}"
+            contact = f"{name}@example.com" if index % 1000 == 0 else f"555-{index % 10000:04d}"
+            file.write(
+                f"{index},{random_generator.randrange(18, 90)},{random_generator.random():.6f},"
+            )
+            file.write(f"{name},{contact}\n")
+
+
+def measure(folder_path: str, engine: str) -> None:
+    from src.monitoring_custom_metrics.data_quality.string.email import instance as email
+    from src.monitoring_custom_metrics.util import get_dataframe_from_csv
+
+    with mock.patch.dict(os.environ, {"dataset_source": folder_path, "csv_engine": engine}):
+        start = time.perf_counter()
+        df = get_dataframe_from_csv()
+        read_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for column in ["name", "contact"]:
+        email.calculate_statistics(df[column])
+    email_seconds = time.perf_counter() - start
+
+    frame_mb = df.memory_usage(deep=True).sum() / 2**20
+    # ru_maxrss is reported in kilobytes on Linux.
+    peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 2**10
+    print(
+        f"{engine:>8} {read_seconds:>9.2f} {email_seconds:>10.2f} {frame_mb:>10.1f} {peak_mb:>10.1f}"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=1000000)
+    parser.add_argument("--engine", choices=[engine.value for engine in CsvEngine])
+    parser.add_argument("--path")
+    args = parser.parse_args()
+
+    if args.engine is not None:
+        measure(args.path, args.engine)
+        return
+
+    with tempfile.TemporaryDirectory() as folder_path:
+        generate_dataset(folder_path, args.rows)
+        print(
+            f"{args.rows} rows, {os.path.getsize(os.path.join(folder_path, 'data.csv')) / 2**20:.1f} MiB"
+        )
+        print(f"{'engine':>8} {'read (s)':>9} {'email (s)':>10} {'frame MiB':>10} {'peak MiB':>10}")
+        for engine in CsvEngine:
+            command = [sys.executable, "-m", "benchmark.benchmark_csv_engine"]
+            command += ["--engine", engine.value, "--path", folder_path]
+            output = subprocess.run(command, check=True, capture_output=True, text=True).stdout
+            print(output.splitlines()[-1])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License").
+# You may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Compares the time taken by the gini metric: the previous pandas groupby implementation of the binned gini, its
+vectorized replacement and the exact rank-based gini. Every implementation runs on the same random dataset and
+reports its best time over a few repetitions.
+
+Usage, from the repository root:
+
+    python -m benchmark.benchmark_gini --rows 10000000
+"""
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from src.model.model_quality_attributes import ModelQualityAttributes
+from src.monitoring_custom_metrics.model_quality.binary_classification.gini import instance as gini
+
+MODEL_QUALITY_ATTRIBUTES = ModelQualityAttributes("label", "score", None, None)
+
+
+def generate_dataset(rows: int) -> pd.DataFrame:
+    random_generator = np.random.default_rng(0)
+    scores = random_generator.random(rows)
+    return pd.DataFrame(
+        {"label": (random_generator.random(rows) < scores).astype(int), "score": scores}
+    )
+
+
+def groupby_gini(df: pd.DataFrame) -> float:
+    n_bins = 5 if len(df) < 100 else 10
+    binned = pd.DataFrame(
+        {
+            "label": df["label"],
+            "bins": pd.qcut(df["score"], n_bins, labels=False, duplicates="drop"),
+        }
+    )
+
+    def agg_func(x):
+        agg_metrics = dict()
+        agg_metrics["total_cnt"] = x["label"].count()
+        agg_metrics["pos_cnt"] = x["label"].sum()
+        agg_metrics["neg_cnt"] = agg_metrics["total_cnt"] - agg_metrics["pos_cnt"]
+        return pd.Series(agg_metrics, index=["total_cnt", "pos_cnt", "neg_cnt"])
+
+    df_grouped = binned.groupby("bins")[["label"]].apply(agg_func).reset_index()
+    df_grouped.sort_values("bins", ascending=False, inplace=True)
+    cum_pos_pct = df_grouped["pos_cnt"].cumsum() / df_grouped["pos_cnt"].sum()
+    cum_neg_pct = df_grouped["neg_cnt"].cumsum() / df_grouped["neg_cnt"].sum()
+    incr_pos_pct = cum_pos_pct - cum_pos_pct.shift(1, fill_value=0)
+    sum_neg_pct = cum_neg_pct + cum_neg_pct.shift(1, fill_value=0)
+    return (1 - np.dot(sum_neg_pct, incr_pos_pct)).round(4)
+
+
+def measure(function, repeat: int):
+    best_seconds = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        value = function()
+        seconds = time.perf_counter() - start
+        best_seconds = seconds if best_seconds is None else min(best_seconds, seconds)
+    return value, best_seconds
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=1000000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    df = generate_dataset(args.rows)
+    implementations = {
+        "groupby": lambda: groupby_gini(df),
+        "binned": lambda: gini.calculate_statistics(
+            df, {"method": "binned"}, MODEL_QUALITY_ATTRIBUTES
+        )["value"],
+        "exact": lambda: gini.calculate_statistics(
+            df, {"method": "exact"}, MODEL_QUALITY_ATTRIBUTES
+        )["value"],
+    }
+
+    print(f"{args.rows} rows")
+    print(f"{'method':>8} {'gini':>8} {'time (s)':>9} {'speed-up':>9}")
+    groupby_seconds = None
+    for name, function in implementations.items():
+        value, seconds = measure(function, args.repeat)
+        groupby_seconds = seconds if groupby_seconds is None else groupby_seconds
+        print(f"{name:>8} {value:>8.4f} {seconds:>9.3f} {groupby_seconds / seconds:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
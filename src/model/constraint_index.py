@@ -0,0 +1,56 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License").
+# You may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from typing import Any, Dict, Optional, Tuple
+
+from src.model.data_type import DataType
+from src.model.problem_type import ProblemType
+
+
+class DataQualityConstraintIndex:
+    constraints = None
+    data_types = None
+
+    def __init__(
+        self,
+        constraints: Dict[Tuple[str, str], Any],
+        data_types: Dict[str, DataType],
+    ):
+        self.constraints = constraints
+        self.data_types = data_types
+
+    def get(self, feature_name: str, metric_name: str) -> Optional[Any]:
+        return self.constraints.get((feature_name, metric_name))
+
+
+class ModelQualityConstraintIndex:
+    problem_type = None
+    constraints = None
+    segments = None
+
+    def __init__(
+        self,
+        problem_type: ProblemType,
+        constraints: Dict[Tuple[ProblemType, str], Any],
+        segments: Optional[Dict[str, "ModelQualityConstraintIndex"]] = None,
+    ):
+        self.problem_type = problem_type
+        self.constraints = constraints
+        self.segments = segments if segments is not None else {}
+
+    def get(self, metric_name: str) -> Any:
+        return self.constraints.get((self.problem_type, metric_name), {})
+
+    def get_segment(self, segment_key: str) -> Optional["ModelQualityConstraintIndex"]:
+        return self.segments.get(segment_key)
@@ -0,0 +1,34 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License").
+# You may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from typing import Optional
+
+from src.model.execution_mode import ExecutionMode
+from src.model.sampling_mode import SamplingMode
+
+
+class ExecutionPlan:
+    execution_mode = None
+    sampling_mode = None
+    reason = None
+
+    def __init__(
+        self,
+        execution_mode: ExecutionMode,
+        sampling_mode: Optional[SamplingMode],
+        reason: str,
+    ):
+        self.execution_mode = execution_mode
+        self.sampling_mode = sampling_mode
+        self.reason = reason
@@ -12,9 +12,45 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from typing import TypedDict
+from typing import List, TypedDict
 
 
-class ModelQualityStatistic(TypedDict):
+class ConfidenceInterval(TypedDict):
+    confidence_level: float
+    lower: float
+    upper: float
+
+
+class ThresholdValue(TypedDict):
+    threshold: float
+    value: float
+
+
+class LiftTableRow(TypedDict):
+    depth: float
+    count: int
+    positives: int
+    gain: float
+    lift: float
+
+
+class Approximation(TypedDict):
+    method: str
+    histogram_bins: int
+    error_bound: float
+
+
+class _RequiredModelQualityStatistic(TypedDict):
     value: float
     standard_deviation: float
+
+
+class ModelQualityStatistic(_RequiredModelQualityStatistic, total=False):
+    # Only set when the metric is configured to bootstrap its statistics.
+    confidence_interval: ConfidenceInterval
+    # Only set when a threshold metric is configured with a "threshold_sweep" parameter.
+    threshold_sweep: List[ThresholdValue]
+    # Only set when the lift metric is configured with a "table_bins" parameter.
+    lift_table: List[LiftTableRow]
+    # Only set when the value is approximated, by the ranking metrics in "streaming" execution mode.
+    approximation: Approximation
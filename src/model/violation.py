@@ -12,10 +12,17 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from typing import TypedDict
+from typing import Any, Dict, TypedDict
 
 
-class Violation(TypedDict):
+class _RequiredViolation(TypedDict):
     constraint_check_type: str
     description: str
     metric_name: str
+
+
+class Violation(_RequiredViolation, total=False):
+    # Only set for the violations of a segment, when the metrics are calculated by segment.
+    segment: Dict[str, Any]
+    # Only set for the violations of a time bucket, when the metrics are calculated by time bucket.
+    time_bucket: str
@@ -0,0 +1,112 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License").
+# You may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from typing import Any, Dict, Union
+
+import numpy as np
+import pandas
+from pandas.api.types import is_float_dtype, is_integer_dtype
+
+PROFILE_ATTRIBUTE = "profile"
+# Number of smallest hashes kept to estimate the number of distinct values, for a relative error of about 3%.
+DISTINCT_COUNT_SKETCH_SIZE = 1024
+
+
+def calculate_profiles(df: pandas.DataFrame) -> Dict[str, Dict[str, Any]]:
+    """
+    Profiles every column of df with one reduction per statistic over the whole frame instead of one per column:
+    num_present and num_missing for every column, plus min, max and mean for numerical columns. Numerical columns
+    are reduced one dtype at a time, so that every value keeps the type of the column.
+    """
+    item_count = len(df.index)
+    num_present = df.count()
+    profiles: Dict[str, Dict[str, Any]] = {}
+
+    for position, column_name in enumerate(df.columns):
+        present = num_present.iloc[position]
+        profiles[column_name] = {"num_present": present, "num_missing": item_count - present}
+
+    numerical_dtypes = [
+        dtype for dtype in df.dtypes.unique() if is_integer_dtype(dtype) or is_float_dtype(dtype)
+    ]
+    for dtype in numerical_dtypes:
+        frame = df.loc[:, (df.dtypes == dtype).to_numpy()]
+        for statistic, values in [
+            ("min", frame.min()),
+            ("max", frame.max()),
+            ("mean", frame.mean()),
+        ]:
+            for position, column_name in enumerate(values.index):
+                profiles[column_name][statistic] = values.iloc[position]
+
+    return profiles
+
+
+def with_profile(column: pandas.Series, profile: Dict[str, Any]) -> pandas.Series:
+    """
+    Returns a view of column that carries its profile, so that the metrics evaluated on it reuse the profile
+    instead of calculating it again.
+    """
+    column = column.copy(deep=False)
+    column.attrs[PROFILE_ATTRIBUTE] = profile
+    return column
+
+
+def get_column_profile(column: pandas.Series) -> Dict[str, Any]:
+    profile = column.attrs.get(PROFILE_ATTRIBUTE)
+    if profile is None:
+        profile = calculate_profiles(column.to_frame())[column.name]
+        column.attrs[PROFILE_ATTRIBUTE] = profile
+    return profile
+
+
+def get_common_statistics(column: pandas.Series) -> Dict[str, Any]:
+    profile = get_column_profile(column)
+    return {"num_present": profile["num_present"], "num_missing": profile["num_missing"]}
+
+
+def estimate_distinct_count(column: pandas.Series) -> Union[int, float]:
+    """
+    Estimated number of distinct non-missing values, calculated on first use and cached in the profile of the
+    column. Columns with fewer distinct values than the sketch size are counted exactly.
+    """
+    profile = get_column_profile(column)
+    if "distinct_count_estimate" not in profile:
+        hashes = pandas.util.hash_pandas_object(column.dropna(), index=False).to_numpy()
+        profile["distinct_count_estimate"] = estimate_distinct_count_from_hashes(hashes)
+    return profile["distinct_count_estimate"]
+
+
+def estimate_distinct_count_from_hashes(
+    hashes: np.ndarray, sketch_size: int = DISTINCT_COUNT_SKETCH_SIZE
+) -> Union[int, float]:
+    """
+    K minimum values estimator: with the k smallest distinct hashes, uniformly spread over [0, 2^64), the number of
+    distinct values is about (k - 1) / (k-th smallest hash / 2^64). The smallest hashes are found with partial
+    sorts of a growing prefix, so that the full column is never sorted.
+    """
+    candidates = sketch_size
+    while True:
+        if candidates >= hashes.size:
+            smallest = np.unique(hashes)
+            if smallest.size <= sketch_size:
+                return smallest.size
+            break
+        smallest = np.unique(np.partition(hashes, candidates - 1)[:candidates])
+        if smallest.size >= sketch_size:
+            break
+        candidates *= 2
+
+    kth_smallest = float(smallest[sketch_size - 1]) + 1
+    return round((sketch_size - 1) * 2.0**64 / kth_smallest)
@@ -27,3 +27,31 @@ GROUND_TRUTH_ATTRIBUTE_ENV_VAR = "ground_truth_attribute"
 PROBABILITY_ATTRIBUTE_ENV_VAR = "probability_attribute"
 PROBABILITY_THRESHOLD_ATTRIBUTE_ENV_VAR = "probability_threshold_attribute"
 OUTPUT_MESSAGE_FILE_NAME = "message"
+EXECUTION_MODE_ENV_VAR = "execution_mode"
+CHUNK_SIZE_ENV_VAR = "chunk_size"
+DEFAULT_CHUNK_SIZE = 100000
+READER_WORKERS_ENV_VAR = "reader_workers"
+CSV_ENGINE_ENV_VAR = "csv_engine"
+SAMPLING_MODE_ENV_VAR = "sampling_mode"
+SAMPLE_SIZE_ENV_VAR = "sample_size"
+SAMPLING_SEED_ENV_VAR = "sampling_seed"
+DEFAULT_SAMPLE_SIZE = 100000
+DEFAULT_SAMPLING_SEED = 0
+INCREMENTAL_MANIFEST_FILE_NAME = "incremental_manifest.json"
+INCREMENTAL_STATE_FILE_NAME = "incremental_state.pickle"
+PLANNER_SAMPLE_ROWS = 10000
+PLANNER_SAMPLE_BYTES = 1024 * 1024
+LAZY_METRIC_IMPORT_ENV_VAR = "lazy_metric_import"
+METRIC_ENTRY_POINT_GROUP = "monitoring_custom_metrics"
+COLUMN_EXECUTOR_ENV_VAR = "column_executor"
+COLUMN_WORKERS_ENV_VAR = "column_workers"
+BOOTSTRAP_WORKERS_ENV_VAR = "bootstrap_workers"
+DEFAULT_BOOTSTRAP_CONFIDENCE_LEVEL = 0.95
+DEFAULT_BOOTSTRAP_SEED = 0
+# Number of weights (replicates x rows) generated at once by every bootstrap worker.
+BOOTSTRAP_CHUNK_CELLS = 2**21
+SEGMENT_BY_PARAMETER = "segment_by"
+DEFAULT_MIN_SEGMENT_SIZE = 100
+TIME_COLUMN_ENV_VAR = "time_column"
+TIME_BUCKET_ENV_VAR = "time_bucket"
+DEFAULT_TIME_BUCKET = "1h"
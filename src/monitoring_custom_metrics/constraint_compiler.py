@@ -0,0 +1,151 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License").
+# You may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from typing import Any, Dict, List, Set, Tuple
+
+from src.model.constraint_index import DataQualityConstraintIndex, ModelQualityConstraintIndex
+from src.model.data_type import DataType
+from src.model.problem_type import ProblemType
+from src.monitoring_custom_metrics.metric_registry import (
+    get_data_quality_metrics,
+    get_model_quality_metrics,
+)
+from src.monitoring_custom_metrics.segmentation import get_segment_key
+
+CONSTRAINT_TYPE_BY_DATA_TYPE = {
+    DataType.Integral: "num_constraints",
+    DataType.Fractional: "num_constraints",
+    DataType.String: "string_constraints",
+}
+
+
+def compile_data_quality_constraints(constraint_file: Any) -> DataQualityConstraintIndex:
+    """
+    Validates the baseline constraints of a data quality monitor and indexes them by feature and metric name.
+    Every problem found is reported at once, before any data is read.
+    """
+    errors: List[str] = []
+    constraints: Dict[Tuple[str, str], Any] = {}
+    data_types: Dict[str, DataType] = {}
+
+    features = constraint_file.get("features") if isinstance(constraint_file, dict) else None
+    if not isinstance(features, list):
+        raise ValueError("Invalid baseline constraints: 'features' must be a list")
+
+    for position, feature in enumerate(features):
+        if not isinstance(feature, dict) or not isinstance(feature.get("name"), str):
+            errors.append(f"feature {position} has no name")
+            continue
+        name = feature["name"]
+        if name in data_types:
+            errors.append(f"feature {name} is defined more than once")
+            continue
+        if feature.get("inferred_type") not in {data_type.value for data_type in DataType}:
+            errors.append(
+                f"feature {name} has an unknown inferred_type {feature.get('inferred_type')}"
+            )
+            continue
+
+        data_type = DataType(feature["inferred_type"])
+        constraint_type = CONSTRAINT_TYPE_BY_DATA_TYPE[data_type]
+        metric_constraints = feature.get(constraint_type)
+        if not isinstance(metric_constraints, dict):
+            errors.append(f"feature {name} has no {constraint_type}")
+            continue
+
+        data_types[name] = data_type
+        metric_names = {metric.__name__ for metric in get_data_quality_metrics(data_type)}
+        for metric_name, constraint in metric_constraints.items():
+            if metric_name not in metric_names:
+                errors.append(f"feature {name} has constraints for unknown metric {metric_name}")
+            elif not isinstance(constraint, dict):
+                errors.append(f"feature {name} has invalid constraints for metric {metric_name}")
+            else:
+                constraints[(name, metric_name)] = constraint
+
+    raise_for_errors(errors)
+    return DataQualityConstraintIndex(constraints, data_types)
+
+
+def compile_model_quality_constraints(
+    constraint_file: Any, problem_type: ProblemType
+) -> ModelQualityConstraintIndex:
+    """
+    Validates the baseline constraints of a model quality monitor and indexes them by problem type and metric
+    name, and the constraints of every segment by segment. The constraints of other problem types are ignored.
+    """
+    errors: List[str] = []
+    constraints_label = problem_type.name + "_constraints"
+
+    if not isinstance(constraint_file, dict):
+        raise ValueError("Invalid baseline constraints: the file must contain an object")
+
+    metric_constraints = constraint_file.get(constraints_label, {})
+    if not isinstance(metric_constraints, dict):
+        raise ValueError(f"Invalid baseline constraints: '{constraints_label}' must be an object")
+
+    metric_names = {metric.__name__ for metric in get_model_quality_metrics(problem_type)}
+    constraints = index_model_quality_constraints(
+        metric_constraints, problem_type, metric_names, constraints_label, errors
+    )
+
+    segments: Dict[str, ModelQualityConstraintIndex] = {}
+    segment_constraints = constraint_file.get("segments", [])
+    if not isinstance(segment_constraints, list):
+        raise ValueError("Invalid baseline constraints: 'segments' must be a list")
+    for position, segment_constraint in enumerate(segment_constraints):
+        if not isinstance(segment_constraint, dict) or not isinstance(
+            segment_constraint.get("segment"), dict
+        ):
+            errors.append(f"segment {position} has no segment values")
+            continue
+        if not isinstance(segment_constraint.get(constraints_label, {}), dict):
+            errors.append(f"segment {position} has invalid {constraints_label}")
+            continue
+        segments[get_segment_key(segment_constraint["segment"])] = ModelQualityConstraintIndex(
+            problem_type,
+            index_model_quality_constraints(
+                segment_constraint.get(constraints_label, {}),
+                problem_type,
+                metric_names,
+                f"segment {position} {constraints_label}",
+                errors,
+            ),
+        )
+
+    raise_for_errors(errors)
+    return ModelQualityConstraintIndex(problem_type, constraints, segments)
+
+
+def index_model_quality_constraints(
+    metric_constraints: Dict,
+    problem_type: ProblemType,
+    metric_names: Set[str],
+    label: str,
+    errors: List[str],
+) -> Dict[Tuple[ProblemType, str], Any]:
+    constraints: Dict[Tuple[ProblemType, str], Any] = {}
+    for metric_name, constraint in metric_constraints.items():
+        if metric_name not in metric_names:
+            errors.append(f"{label} has constraints for unknown metric {metric_name}")
+        elif not isinstance(constraint, dict):
+            errors.append(f"{label} has invalid constraints for metric {metric_name}")
+        else:
+            constraints[(problem_type, metric_name)] = constraint
+    return constraints
+
+
+def raise_for_errors(errors: List[str]):
+    if errors:
+        raise ValueError("Invalid baseline constraints: " + "; ".join(errors))
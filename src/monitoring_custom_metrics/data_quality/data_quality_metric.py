@@ -13,7 +13,7 @@
 # limitations under the License.
 
 from abc import abstractmethod, ABC
-from typing import Union
+from typing import Any, Dict, Union
 
 import pandas
 
@@ -22,12 +22,26 @@ from src.model.violation import Violation
 
 
 class DataQualityMetric(ABC):
+    # Set by metrics whose statistic grows with the number of rows, such as sum: their constraints, suggested for the
+    # whole dataset, are not checked against the statistics of a part of it, such as a time bucket.
+    grows_with_row_count = False
+
     @abstractmethod
     def calculate_statistics(
         self, column: Union[pandas.Series, pandas.DataFrame]
     ) -> Union[int, str, bool, float]:
         pass
 
+    def calculate_statistics_batch(
+        self, frame: pandas.DataFrame
+    ) -> Union[Dict[str, Union[int, str, bool, float]], None]:
+        """
+        Calculates the statistics of every column of frame at once, which holds all the columns of one data type,
+        and returns them by column name. Metrics that can be vectorized across columns override it. The default
+        returns None, in which case calculate_statistics is called for every column instead.
+        """
+        return None
+
     @abstractmethod
     def evaluate_constraints(
         self,
@@ -45,3 +59,28 @@ class DataQualityMetric(ABC):
         baseline_constraints: Union[DataQualityConstraint, None],
     ) -> DataQualityConstraint:
         pass
+
+    def create_accumulator(self) -> Any:
+        """
+        Returns the initial partial state used when the data is processed in chunks. Metrics that can only be
+        calculated over the whole column return None (the default), which makes them unavailable in streaming mode.
+        """
+        return None
+
+    def accumulate(self, accumulator: Any, column: Union[pandas.Series, pandas.DataFrame]) -> Any:
+        """
+        Folds one chunk of the column into the partial state and returns the updated state.
+        """
+        raise NotImplementedError(f"{type(self).__name__} does not support accumulation")
+
+    def merge_accumulators(self, accumulator: Any, other: Any) -> Any:
+        """
+        Combines two partial states calculated over disjoint parts of the same column.
+        """
+        raise NotImplementedError(f"{type(self).__name__} does not support accumulation")
+
+    def finalize(self, accumulator: Any) -> Union[int, str, bool, float]:
+        """
+        Turns the partial state into the same statistics calculate_statistics would return for the whole column.
+        """
+        raise NotImplementedError(f"{type(self).__name__} does not support accumulation")
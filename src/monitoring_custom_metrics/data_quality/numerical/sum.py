@@ -12,22 +12,37 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from typing import Union
+from typing import Any, Dict, Union
 
 import pandas
 
 from src.monitoring_custom_metrics.data_quality.data_quality_metric import DataQualityMetric
+from src.monitoring_custom_metrics.sampling import get_sampling_weight
 from src.model.data_quality_constraint import DataQualityConstraint
 from src.model.violation import Violation
 
 
 class Sum(DataQualityMetric):
     ten_units = 10
+    grows_with_row_count = True
 
     def calculate_statistics(
         self, column: Union[pandas.Series, pandas.DataFrame]
     ) -> Union[int, str, bool, float]:
-        return column.sum()
+        # A column sampled from a larger dataset estimates the sum of the whole dataset.
+        return column.sum() * get_sampling_weight(column)
+
+    def calculate_statistics_batch(
+        self, frame: pandas.DataFrame
+    ) -> Union[Dict[str, Union[int, str, bool, float]], None]:
+        # One reduction per dtype, so that every sum keeps the type calculate_statistics returns for the column.
+        weight = get_sampling_weight(frame)
+        statistics: Dict = {}
+        for dtype in frame.dtypes.unique():
+            sums = frame.loc[:, (frame.dtypes == dtype).to_numpy()].sum()
+            for position, column_name in enumerate(sums.index):
+                statistics[column_name] = sums.iloc[position] * weight
+        return statistics
 
     def evaluate_constraints(
         self,
@@ -73,5 +88,17 @@ class Sum(DataQualityMetric):
         }
         return constraint
 
+    def create_accumulator(self) -> Any:
+        return 0
+
+    def accumulate(self, accumulator: Any, column: Union[pandas.Series, pandas.DataFrame]) -> Any:
+        return accumulator + column.sum()
+
+    def merge_accumulators(self, accumulator: Any, other: Any) -> Any:
+        return accumulator + other
+
+    def finalize(self, accumulator: Any) -> Union[int, str, bool, float]:
+        return accumulator
+
 
 instance = Sum()
@@ -12,7 +12,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from typing import Union
+from typing import Any, Union
 
 import pandas
 
@@ -28,11 +28,8 @@ class Email(DataQualityMetric):
     def calculate_statistics(
         self, column: Union[pandas.Series, pandas.DataFrame]
     ) -> Union[int, str, bool, float]:
-        series = column.str.contains(email_regex)
-        for single_series in series:
-            if single_series:
-                return True
-        return False
+        # Missing values are not emails. For Arrow-backed string columns the regex runs in Arrow.
+        return bool(column.str.contains(email_regex, na=False).any())
 
     def evaluate_constraints(
         self,
@@ -70,5 +67,18 @@ class Email(DataQualityMetric):
 
         return constraint
 
+    def create_accumulator(self) -> Any:
+        return False
+
+    def accumulate(self, accumulator: Any, column: Union[pandas.Series, pandas.DataFrame]) -> Any:
+        # Once an email has been seen, the remaining chunks cannot change the outcome.
+        return accumulator or self.calculate_statistics(column)
+
+    def merge_accumulators(self, accumulator: Any, other: Any) -> Any:
+        return accumulator or other
+
+    def finalize(self, accumulator: Any) -> Union[int, str, bool, float]:
+        return accumulator
+
 
 instance = Email()
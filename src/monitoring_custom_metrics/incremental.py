@@ -0,0 +1,152 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License").
+# You may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import hashlib
+import json
+import os
+import pickle
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+import pandas
+
+from src.monitoring_custom_metrics.constant import (
+    INCREMENTAL_MANIFEST_FILE_NAME,
+    INCREMENTAL_STATE_FILE_NAME,
+)
+from src.monitoring_custom_metrics.output_generator import get_output_folder_path
+
+MANIFEST_VERSION = 1
+HASH_BLOCK_SIZE = 1024 * 1024
+
+
+def accumulate_incrementally(
+    files: Iterable[Tuple[str, Iterable[pandas.DataFrame]]],
+    fingerprint: Dict,
+    create_state: Callable[[], Dict],
+    accumulate_state: Callable[[Dict, pandas.DataFrame], Dict],
+    merge_states: Callable[[Dict, Dict], Dict],
+) -> Dict:
+    """
+    Builds the partial state of every input file, reusing the states saved by a previous run for the files that
+    did not change, and returns them merged. files yields the path of every input file with its chunks; the
+    chunks of unchanged files are never iterated, so those files are not read. The manifest and the state of
+    every file are saved back to the output folder, so the next run only reads new or changed files. Files that
+    no longer exist are dropped. fingerprint describes the configuration the states were built with: states
+    saved with a different one are discarded.
+    """
+    folder_path = get_output_folder_path()
+    manifest, states = load_incremental_state(folder_path, fingerprint)
+    previous_entries = {entry["path"]: entry for entry in manifest["files"]}
+
+    entries = []
+    file_states: Dict[str, Dict] = {}
+    merged = create_state()
+    for full_path, chunks in files:
+        previous_entry = previous_entries.get(full_path)
+        entry = describe_file(full_path, previous_entry)
+
+        if is_unchanged(entry, previous_entry) and full_path in states:
+            print(f"  Reusing the saved state of unchanged file: {full_path}")
+            state = states[full_path]
+        else:
+            state = create_state()
+            for chunk in chunks:
+                state = accumulate_state(state, chunk)
+
+        entries.append(entry)
+        file_states[full_path] = state
+        merged = merge_states(merged, state)
+
+    save_incremental_state(
+        folder_path,
+        {"version": MANIFEST_VERSION, "fingerprint": fingerprint, "files": entries},
+        file_states,
+    )
+    return merged
+
+
+def describe_file(full_path: str, previous_entry: Optional[Dict] = None) -> Dict:
+    """
+    Manifest entry of a file. The content is only hashed when the size or the modification time changed since
+    previous_entry, so unchanged files are not read at all.
+    """
+    stat = os.stat(full_path)
+    entry = {"path": full_path, "size": stat.st_size, "mtime": stat.st_mtime_ns}
+
+    if (
+        previous_entry is not None
+        and previous_entry["size"] == entry["size"]
+        and previous_entry["mtime"] == entry["mtime"]
+    ):
+        entry["sha256"] = previous_entry["sha256"]
+    else:
+        entry["sha256"] = hash_file(full_path)
+    return entry
+
+
+def is_unchanged(entry: Dict, previous_entry: Optional[Dict]) -> bool:
+    return previous_entry is not None and previous_entry["sha256"] == entry["sha256"]
+
+
+def hash_file(full_path: str) -> str:
+    digest = hashlib.sha256()
+    with open(full_path, "rb") as file:
+        for block in iter(lambda: file.read(HASH_BLOCK_SIZE), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def load_incremental_state(folder_path: str, fingerprint: Dict) -> Tuple[Dict, Dict[str, Any]]:
+    empty_manifest: Dict = {"version": MANIFEST_VERSION, "fingerprint": fingerprint, "files": []}
+    manifest_path = os.path.join(folder_path, INCREMENTAL_MANIFEST_FILE_NAME)
+    state_path = os.path.join(folder_path, INCREMENTAL_STATE_FILE_NAME)
+
+    if not os.path.exists(manifest_path) or not os.path.exists(state_path):
+        print("No saved incremental state found, reading every file")
+        return empty_manifest, {}
+
+    with open(manifest_path) as file:
+        manifest = json.load(file)
+    if manifest.get("version") != MANIFEST_VERSION or manifest.get("fingerprint") != fingerprint:
+        print(
+            "The saved incremental state was built with a different configuration, reading every file"
+        )
+        return empty_manifest, {}
+
+    # The state file is only ever written by this package, in the output folder of the monitor.
+    with open(state_path, "rb") as file:
+        states = pickle.load(file)
+    print(f"Loaded the saved state of {len(states)} file(s)")
+    return manifest, states
+
+
+def save_incremental_state(folder_path: str, manifest: Dict, states: Dict[str, Any]):
+    os.makedirs(folder_path, exist_ok=True)
+    # The states are replaced before the manifest, and each file atomically, so an interrupted run never leaves
+    # a manifest that lists files whose state was not saved.
+    write_atomically(
+        os.path.join(folder_path, INCREMENTAL_STATE_FILE_NAME),
+        pickle.dumps(states, protocol=pickle.HIGHEST_PROTOCOL),
+    )
+    write_atomically(
+        os.path.join(folder_path, INCREMENTAL_MANIFEST_FILE_NAME),
+        json.dumps(manifest, indent=4).encode("utf-8"),
+    )
+
+
+def write_atomically(file_path: str, content: bytes):
+    temporary_path = file_path + ".tmp"
+    with open(temporary_path, "wb") as file:
+        file.write(content)
+    os.replace(temporary_path, file_path)
@@ -13,23 +13,38 @@
 # limitations under the License.
 
 import os
-
-import pandas
+from typing import Optional
 
 from src.monitoring_custom_metrics.constant import (
     BASELINE_STATISTICS_ENV_VAR,
     BASELINE_CONSTRAINTS_ENV_VAR,
     ANALYSIS_TYPE_ENV_VAR,
     GROUND_TRUTH_ATTRIBUTE_ENV_VAR,
+    CHUNK_SIZE_ENV_VAR,
+    DEFAULT_CHUNK_SIZE,
+)
+from src.monitoring_custom_metrics.monitor_data_quality import (
+    execute_for_data_quality,
+    get_baseline_dtypes,
+    load_data_quality_constraints,
 )
-from src.monitoring_custom_metrics.monitor_data_quality import execute_for_data_quality
-from src.monitoring_custom_metrics.monitor_model_quality import execute_for_model_quality
-from src.monitoring_custom_metrics.path_helper import import_class_paths
+from src.monitoring_custom_metrics.monitor_model_quality import (
+    execute_for_model_quality,
+    get_model_quality_columns,
+    load_model_quality_constraints,
+)
+from src.monitoring_custom_metrics.planner import determine_execution_plan
+from src.monitoring_custom_metrics.sampling import sample_dataset
 from src.monitoring_custom_metrics.util import (
     get_dataframe_from_csv,
+    get_dataframe_chunks_from_csv,
+    get_file_chunks_from_csv,
 )
+from src.model.execution_mode import ExecutionMode
+from src.model.execution_plan import ExecutionPlan
 from src.model.monitor_type import MonitorType
 from src.model.operation_type import OperationType
+from src.model.sampling_mode import SamplingMode
 
 
 def determine_operation_to_run() -> OperationType:
@@ -69,20 +84,69 @@ def determine_monitor_type() -> MonitorType:
             return MonitorType.DATA_QUALITY
 
 
+def get_chunk_size() -> int:
+    if os.environ.get(CHUNK_SIZE_ENV_VAR) is not None:
+        chunk_size = int(os.environ[CHUNK_SIZE_ENV_VAR])
+        if chunk_size <= 0:
+            raise ValueError(f"'{CHUNK_SIZE_ENV_VAR}' must be a positive number of rows")
+        return chunk_size
+    return DEFAULT_CHUNK_SIZE
+
+
 def monitoring():
     print("Starting Monitoring Custom Metrics")
-    import_class_paths()
-    df: pandas.DataFrame = get_dataframe_from_csv()
     operation_type: OperationType = determine_operation_to_run()
     monitor_type: MonitorType = determine_monitor_type()
 
     print(f"Operation type: {operation_type}")
     print(f"Monitor type: {monitor_type}")
 
+    columns = None
+    dtype = None
+    constraints = None
+    # The baseline constraints are compiled first, so that an invalid file fails before any data is read.
+    if monitor_type == MonitorType.MODEL_QUALITY:
+        columns = get_model_quality_columns(operation_type)
+        print(f"Columns to read: {columns}")
+        constraints = load_model_quality_constraints(operation_type)
+    elif monitor_type == MonitorType.DATA_QUALITY:
+        constraints = load_data_quality_constraints(operation_type)
+        dtype = get_baseline_dtypes(constraints)
+
+    execution_plan: ExecutionPlan = determine_execution_plan(
+        operation_type, monitor_type, columns, dtype
+    )
+    execution_mode: ExecutionMode = execution_plan.execution_mode
+    sampling_mode: Optional[SamplingMode] = execution_plan.sampling_mode
+
+    print(f"Execution mode: {execution_mode}")
+    print(f"Sampling mode: {sampling_mode}")
+    print(f"Reason: {execution_plan.reason}")
+
+    if sampling_mode is not None:
+        # The sample is drawn while streaming the input, then evaluated in memory.
+        chunks = get_dataframe_chunks_from_csv(
+            chunk_size=get_chunk_size(), columns=columns, dtype=dtype
+        )
+        data = sample_dataset(operation_type, sampling_mode, chunks)
+    elif execution_mode == ExecutionMode.incremental:
+        data = get_file_chunks_from_csv(chunk_size=get_chunk_size(), columns=columns, dtype=dtype)
+    elif execution_mode == ExecutionMode.streaming:
+        data = get_dataframe_chunks_from_csv(
+            chunk_size=get_chunk_size(), columns=columns, dtype=dtype
+        )
+    else:
+        data = get_dataframe_from_csv(columns=columns, dtype=dtype)
+
+    incremental = execution_mode == ExecutionMode.incremental and sampling_mode is None
     if monitor_type == MonitorType.MODEL_QUALITY:
-        execute_for_model_quality(operation_type, df)
+        execute_for_model_quality(
+            operation_type, data, incremental=incremental, constraint=constraints
+        )
     elif monitor_type == MonitorType.DATA_QUALITY:
-        execute_for_data_quality(operation_type, df)
+        execute_for_data_quality(
+            operation_type, data, incremental=incremental, constraints=constraints
+        )
     else:
         raise ValueError(f"Monitor type {monitor_type} not valid")
 
@@ -0,0 +1,116 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License").
+# You may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import importlib
+import os
+import pkgutil
+from importlib.metadata import entry_points
+from typing import Any, Callable, Dict, List
+
+from src.model.data_type import DataType
+from src.model.problem_type import ProblemType
+from src.monitoring_custom_metrics.constant import (
+    LAZY_METRIC_IMPORT_ENV_VAR,
+    METRIC_ENTRY_POINT_GROUP,
+)
+
+DATA_QUALITY_CATEGORY_BY_DATA_TYPE = {
+    DataType.Integral: "data_quality.numerical",
+    DataType.Fractional: "data_quality.numerical",
+    DataType.String: "data_quality.string",
+}
+
+metrics_by_category: Dict[str, List["MetricEntry"]] = {}
+
+
+class MetricEntry:
+    """
+    A metric found by the registry. It exposes the same attributes as a metric module, __name__ and instance,
+    and only imports the metric when instance is first used.
+    """
+
+    def __init__(self, name: str, load: Callable[[], Any]):
+        self.__name__ = name
+        self.load = load
+        self.loaded_instance = None
+
+    @property
+    def instance(self) -> Any:
+        if self.loaded_instance is None:
+            loaded = self.load()
+            self.loaded_instance = getattr(loaded, "instance", loaded)
+        return self.loaded_instance
+
+
+def get_data_quality_metrics(data_type: DataType) -> List[MetricEntry]:
+    if data_type not in DATA_QUALITY_CATEGORY_BY_DATA_TYPE:
+        raise NotImplementedError(f"Data type {data_type} not implemented")
+    return get_metrics(DATA_QUALITY_CATEGORY_BY_DATA_TYPE[data_type])
+
+
+def get_model_quality_metrics(problem_type: ProblemType) -> List[MetricEntry]:
+    return get_metrics(f"model_quality.{problem_type.name}")
+
+
+def get_metrics(category: str) -> List[MetricEntry]:
+    """
+    Metrics are discovered once per process and category, so that looking them up for every column or chunk is
+    a dictionary access.
+    """
+    metrics = metrics_by_category.get(category)
+    if metrics is None:
+        metrics = discover_metrics(category, is_lazy_metric_import())
+        metrics_by_category[category] = metrics
+    return metrics
+
+
+def discover_metrics(category: str, lazy: bool = True) -> List[MetricEntry]:
+    """
+    Finds the metric modules of the category package and the metrics registered by other packages under the
+    '<METRIC_ENTRY_POINT_GROUP>.<category>' entry point group. Modules starting with an underscore are helpers
+    and are not metrics.
+    """
+    package_name = f"{__package__}.{category}"
+    package = importlib.import_module(package_name)
+    entries: Dict[str, MetricEntry] = {}
+
+    for module_info in pkgutil.iter_modules(package.__path__):
+        if module_info.name.startswith("_"):
+            continue
+        module_name = f"{package_name}.{module_info.name}"
+        entries[module_info.name] = MetricEntry(
+            module_info.name, lambda module_name=module_name: importlib.import_module(module_name)
+        )
+
+    for entry_point in entry_points(group=f"{METRIC_ENTRY_POINT_GROUP}.{category}"):
+        if entry_point.name in entries:
+            raise ValueError(
+                f"Metric {entry_point.name} from entry point {entry_point.value} "
+                f"is already defined for {category}"
+            )
+        entries[entry_point.name] = MetricEntry(entry_point.name, entry_point.load)
+
+    metrics = [entries[name] for name in sorted(entries)]
+    if not lazy:
+        for metric in metrics:
+            metric.instance  # noqa: B018, imports the metric now so that failures surface at start up
+    return metrics
+
+
+def is_lazy_metric_import() -> bool:
+    return os.environ.get(LAZY_METRIC_IMPORT_ENV_VAR, "true").lower() != "false"
+
+
+def clear_metric_registry():
+    metrics_by_category.clear()
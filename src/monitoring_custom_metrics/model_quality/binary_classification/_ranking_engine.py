@@ -0,0 +1,290 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License").
+# You may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from typing import Dict, List
+
+import numpy as np
+
+from src.model.bootstrap_config import BootstrapConfig
+from src.monitoring_custom_metrics.model_quality.bootstrap import (
+    get_chunk_bounds,
+    get_chunk_random_generator,
+    get_conditional_poisson_weights,
+    map_weighted_chunks,
+)
+from src.monitoring_custom_metrics.model_quality.model_quality_context import ModelQualityContext
+
+"""
+Ranking engine shared by the binary classification metrics that depend on the order of the scores. The scores are
+sorted once per run and the cumulative true and false positive counts at every distinct score are calculated once,
+then ROC AUC, PR AUC, exact gini, KS and the lift/gain table are all derived from those arrays.
+"""
+
+RANKING_ENGINE_CACHE_KEY = "ranking_engine"
+
+
+class RankingCurves:
+    """
+    ROC AUC, gini, KS and average precision from the cumulative true and false positive counts at every threshold, from
+    the highest to the lowest. Label 1 is the positive class, as in sklearn. The curves follow sklearn's conventions, so
+    that roc_auc and average_precision return the same values as roc_auc_score and average_precision_score.
+    """
+
+    def __init__(self, true_positives: np.ndarray, false_positives: np.ndarray):
+        self.true_positives = true_positives
+        self.false_positives = false_positives
+        self.positive_count = int(true_positives[-1]) if len(true_positives) > 0 else 0
+        self.negative_count = int(false_positives[-1]) if len(false_positives) > 0 else 0
+
+    def roc_auc(self) -> float:
+        true_positive_rate, false_positive_rate = self.roc_curve()
+        # Trapezoidal rule, written out as np.trapz was renamed in NumPy 2.
+        heights = (true_positive_rate[1:] + true_positive_rate[:-1]) / 2
+        return float(np.dot(np.diff(false_positive_rate), heights))
+
+    def gini(self) -> float:
+        return 2 * self.roc_auc() - 1
+
+    def ks(self) -> float:
+        """
+        Kolmogorov-Smirnov statistic: the largest distance between the cumulative distributions of the scores of the
+        positive and the negative class, in either direction, so that a model ranking the negative class first (ROC
+        AUC below 0.5) separates the classes as much as its reverse.
+        """
+        true_positive_rate, false_positive_rate = self.roc_curve()
+        return float(np.max(np.abs(true_positive_rate - false_positive_rate)))
+
+    def average_precision(self) -> float:
+        if self.positive_count == 0:
+            # Same as sklearn, which sets the recall to 1 for every threshold when there is no positive class.
+            return 0.0
+        precision = self.true_positives / (self.true_positives + self.false_positives)
+        recall = self.true_positives / self.positive_count
+        return float(np.sum(np.diff(recall, prepend=0) * precision))
+
+    def roc_curve(self):
+        self.check_both_classes()
+        true_positive_rate = np.r_[0, self.true_positives] / self.positive_count
+        false_positive_rate = np.r_[0, self.false_positives] / self.negative_count
+        return true_positive_rate, false_positive_rate
+
+    def check_both_classes(self):
+        if self.positive_count == 0 or self.negative_count == 0:
+            raise ValueError("Both classes must be present to calculate the ranking metrics")
+
+
+class RankingEngine(RankingCurves):
+    """
+    Curves of the exact scores, sorted once, with the lift table and the bootstrap of the curves.
+    """
+
+    def __init__(self, labels: np.ndarray, scores: np.ndarray):
+        self.item_count = len(scores)
+        # Descending scores, sorted the same way as sklearn.
+        self.order = np.argsort(scores, kind="mergesort")[::-1]
+        sorted_scores = scores[self.order]
+        self.sorted_positives = labels[self.order] == 1
+        self.cumulative_positives = np.cumsum(self.sorted_positives)
+
+        # Tied scores form a single point of the curves: keep the last row of every run of equal scores.
+        threshold_indexes = np.r_[np.flatnonzero(np.diff(sorted_scores)), self.item_count - 1]
+        self.group_ends = threshold_indexes + 1
+        # Distinct scores, in descending order.
+        self.distinct_scores = sorted_scores[threshold_indexes]
+        true_positives = self.cumulative_positives[threshold_indexes]
+        super().__init__(true_positives, self.group_ends - true_positives)
+        self.bootstraps: Dict = {}
+
+    def confusion_counts_at(self, thresholds: np.ndarray) -> np.ndarray:
+        """
+        True positive, false positive, false negative and true negative counts when the samples scored at or above
+        every threshold are predicted positive, as a 4 x len(thresholds) array. The number of distinct scores above
+        every threshold is found with one binary search in the sorted scores, instead of comparing every score with
+        every threshold.
+        """
+        predicted_groups = np.searchsorted(-self.distinct_scores, -thresholds, side="right")
+        true_positives = np.r_[0, self.true_positives][predicted_groups]
+        false_positives = np.r_[0, self.false_positives][predicted_groups]
+        return np.stack(
+            [
+                true_positives,
+                false_positives,
+                self.positive_count - true_positives,
+                self.negative_count - false_positives,
+            ]
+        )
+
+    def lift_table(self, n_bins: int = 10) -> List[Dict]:
+        """
+        Gain and lift of the n_bins top fractions of the population, from the highest scores to the lowest.
+        """
+        if self.positive_count == 0:
+            raise ValueError("The positive class must be present to calculate the lift")
+        table = []
+        for bin_index in range(1, n_bins + 1):
+            depth = bin_index / n_bins
+            table.append(self.lift_at(depth))
+        return table
+
+    def lift_at(self, depth: float) -> Dict:
+        if self.positive_count == 0:
+            raise ValueError("The positive class must be present to calculate the lift")
+        if not 0 < depth <= 1:
+            raise ValueError("Depth must be in (0, 1], got {}".format(depth))
+        count = max(int(round(self.item_count * depth)), 1)
+        positives = int(self.cumulative_positives[count - 1])
+        gain = positives / self.positive_count
+        return {
+            "depth": depth,
+            "count": count,
+            "positives": positives,
+            "gain": gain,
+            "lift": gain / (count / self.item_count),
+        }
+
+    def bootstrap(self, bootstrap_config: BootstrapConfig) -> Dict[str, np.ndarray]:
+        """
+        ROC AUC, average precision and KS in every replicate of a Poisson bootstrap, in a single pass over the sorted
+        rows. The total weights of the positive and the negative rows of every chunk are drawn first, as the sum of
+        n Poisson(1) weights is Poisson(n). The weights of the rows of a chunk are then drawn given those totals, so
+        every chunk knows the cumulative counts of the chunks before it and they can all be processed in parallel.
+        """
+        key = (bootstrap_config.replicates, bootstrap_config.seed)
+        if key in self.bootstraps:
+            return self.bootstraps[key]
+        self.check_both_classes()
+
+        replicates = bootstrap_config.replicates
+        # Chunks end on a change of score, so that tied scores are never split.
+        bounds = get_chunk_bounds(self.item_count, replicates, self.group_ends)
+        stops = np.array([stop for _, stop in bounds])
+        chunk_positives = np.diff(self.cumulative_positives[stops - 1], prepend=0)
+        chunk_negatives = np.diff(stops, prepend=0) - chunk_positives
+
+        # The chunks use streams 0 to len(bounds) - 1, the totals the next one.
+        random_generator = get_chunk_random_generator(bootstrap_config, len(bounds))
+        positive_totals = random_generator.poisson(chunk_positives, size=(replicates, len(bounds)))
+        negative_totals = random_generator.poisson(chunk_negatives, size=(replicates, len(bounds)))
+        positive_carries = np.cumsum(positive_totals, axis=1) - positive_totals
+        negative_carries = np.cumsum(negative_totals, axis=1) - negative_totals
+        positive_weight = positive_totals.sum(axis=1).astype(np.float64)
+        negative_weight = negative_totals.sum(axis=1).astype(np.float64)
+
+        def bootstrap_chunk(chunk_index: int, start: int, stop: int):
+            # Everything is calculated on the cumulative weights of the positive and of the negative rows of the
+            # chunk, taken at the end of every group of tied scores: there is no replicates x rows matrix of both.
+            positives = self.sorted_positives[start:stop]
+            chunk_random_generator = get_chunk_random_generator(bootstrap_config, chunk_index)
+            cumulative_positive_weights = get_cumulative_weights(
+                get_conditional_poisson_weights(
+                    chunk_random_generator,
+                    positive_totals[:, chunk_index],
+                    np.count_nonzero(positives),
+                )
+            )
+            cumulative_negative_weights = get_cumulative_weights(
+                get_conditional_poisson_weights(
+                    chunk_random_generator,
+                    negative_totals[:, chunk_index],
+                    np.count_nonzero(~positives),
+                )
+            )
+
+            # Number of positive and negative rows of the chunk up to the start and the end of every group.
+            group_ends = (
+                self.group_ends[(self.group_ends > start) & (self.group_ends <= stop)] - start
+            )
+            positive_ends = np.cumsum(positives)[group_ends - 1]
+            negative_ends = group_ends - positive_ends
+            positive_starts = np.r_[0, positive_ends[:-1]]
+            negative_starts = np.r_[0, negative_ends[:-1]]
+            positive_carry = positive_carries[:, [chunk_index]]
+            negative_carry = negative_carries[:, [chunk_index]]
+
+            # Trapezoidal area under the ROC curve, before normalization: every group with negative rows adds its
+            # negative weight times the mean of the cumulative positive weight before and after the group.
+            with_negatives = negative_ends > negative_starts
+            false_positives = (
+                cumulative_negative_weights[:, negative_ends[with_negatives]]
+                - cumulative_negative_weights[:, negative_starts[with_negatives]]
+            )
+            positive_weight_sums = (
+                cumulative_positive_weights[:, positive_starts[with_negatives]]
+                + cumulative_positive_weights[:, positive_ends[with_negatives]]
+            )
+            area = (
+                negative_totals[:, chunk_index] * positive_carry[:, 0]
+                + np.einsum("ij,ij->i", false_positives, positive_weight_sums) / 2
+            )
+
+            # Average precision only changes at groups with positive rows.
+            with_positives = positive_ends > positive_starts
+            true_positives = (
+                cumulative_positive_weights[:, positive_ends[with_positives]]
+                - cumulative_positive_weights[:, positive_starts[with_positives]]
+            )
+            cumulative_true_positives = (
+                positive_carry + cumulative_positive_weights[:, positive_ends[with_positives]]
+            )
+            cumulative_false_positives = (
+                negative_carry + cumulative_negative_weights[:, negative_ends[with_positives]]
+            )
+            # Weights are whole numbers, so a sum below 1 is 0, and so is the precision.
+            predicted_positives = np.maximum(
+                cumulative_true_positives + cumulative_false_positives, 1
+            )
+            precision_sum = np.einsum(
+                "ij,ij->i", true_positives, cumulative_true_positives / predicted_positives
+            )
+
+            # KS can reach its maximum at the end of any group, whether its distance is positive or negative.
+            with np.errstate(divide="ignore", invalid="ignore"):
+                true_positive_rates = (
+                    positive_carry + cumulative_positive_weights[:, positive_ends]
+                ) / positive_weight[:, None]
+                false_positive_rates = (
+                    negative_carry + cumulative_negative_weights[:, negative_ends]
+                ) / negative_weight[:, None]
+                distance = np.max(
+                    np.abs(true_positive_rates - false_positive_rates), axis=1, initial=0
+                )
+            return area, precision_sum, distance
+
+        areas, precision_sums, distances = zip(*map_weighted_chunks(bootstrap_chunk, bounds))
+        # A replicate without positive or negative weight has no ROC curve: its values are NaN.
+        with np.errstate(divide="ignore", invalid="ignore"):
+            self.bootstraps[key] = {
+                "roc_auc": np.sum(areas, axis=0) / (positive_weight * negative_weight),
+                "average_precision": np.sum(precision_sums, axis=0) / positive_weight,
+                "ks": np.max(distances, axis=0),
+            }
+        return self.bootstraps[key]
+
+
+def get_cumulative_weights(weights: np.ndarray) -> np.ndarray:
+    """
+    Cumulative sums of the weights of every replicate, starting from 0: column i is the sum of the first i weights.
+    """
+    cumulative_weights = np.zeros((weights.shape[0], weights.shape[1] + 1))
+    np.cumsum(weights, axis=1, out=cumulative_weights[:, 1:])
+    return cumulative_weights
+
+
+def get_ranking_engine(context: ModelQualityContext) -> RankingEngine:
+    """
+    Returns the ranking engine of the context, built on first use and then shared by every metric of the run.
+    """
+    if RANKING_ENGINE_CACHE_KEY not in context.cache:
+        context.cache[RANKING_ENGINE_CACHE_KEY] = RankingEngine(context.labels, context.scores)
+    return context.cache[RANKING_ENGINE_CACHE_KEY]
@@ -0,0 +1,208 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License").
+# You may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import math
+from abc import abstractmethod
+from typing import Any, Dict, Union
+
+import numpy as np
+import pandas as pd
+
+from src.monitoring_custom_metrics.model_quality.binary_classification._ranking_engine import (
+    RankingCurves,
+)
+from src.monitoring_custom_metrics.model_quality.model_quality_context import (
+    ModelQualityContext,
+    get_model_quality_context,
+)
+from src.monitoring_custom_metrics.model_quality.model_quality_metric import ModelQualityMetric
+from src.model.model_quality_attributes import ModelQualityAttributes
+from src.model.model_quality_statistic import ModelQualityStatistic
+
+"""
+Mergeable approximation of the ranking metrics, used in "streaming" execution mode where the scores of the whole
+dataset are never in memory together. Every chunk counts its positive and negative samples in the same fixed-width
+bins of the scores over [0, 1], the counts of all the chunks are summed, and ROC AUC, PR AUC, gini and KS are
+calculated from the summed counts as if every bin were a single score.
+
+Only the order of the samples within a bin is lost, so the error is bounded by the samples that share a bin. The
+bounds are calculated from the counts by the *_error_bound methods of ScoreHistogram.
+"""
+
+HISTOGRAM_BINS_PARAMETER = "histogram_bins"
+DEFAULT_HISTOGRAM_BINS = 4096
+SCORE_HISTOGRAM_CACHE_KEY = "score_histogram"
+
+
+def get_histogram_bins(config: Dict) -> int:
+    histogram_bins = config.get(HISTOGRAM_BINS_PARAMETER, DEFAULT_HISTOGRAM_BINS)
+    if not isinstance(histogram_bins, int) or histogram_bins < 2:
+        raise ValueError(
+            "{} must be an integer of at least 2, got {}".format(
+                HISTOGRAM_BINS_PARAMETER, histogram_bins
+            )
+        )
+    return histogram_bins
+
+
+def create_score_histogram(histogram_bins: int) -> np.ndarray:
+    """
+    Empty score histogram: the number of positive (row 0) and negative (row 1) samples in every bin of the scores.
+    """
+    return np.zeros((2, histogram_bins), dtype=np.int64)
+
+
+def calculate_score_histogram(
+    labels: np.ndarray, scores: np.ndarray, histogram_bins: int
+) -> np.ndarray:
+    """
+    Counts the samples in histogram_bins bins of width 1 / histogram_bins. Scores outside [0, 1] are counted in the
+    first or the last bin.
+    """
+    bins = np.clip(
+        np.floor(scores * histogram_bins), 0, histogram_bins - 1, out=np.empty(len(scores))
+    ).astype(np.int64)
+    negatives = (labels != 1).astype(np.int64)
+    return np.bincount(negatives * histogram_bins + bins, minlength=2 * histogram_bins).reshape(
+        2, histogram_bins
+    )
+
+
+def get_score_histogram(context: ModelQualityContext, histogram_bins: int) -> np.ndarray:
+    """
+    Returns the score histogram of the data of the context, calculated on first use and then shared by every metric.
+    """
+    cache_key = (SCORE_HISTOGRAM_CACHE_KEY, histogram_bins)
+    if cache_key not in context.cache:
+        context.cache[cache_key] = calculate_score_histogram(
+            context.labels, context.scores, histogram_bins
+        )
+    return context.cache[cache_key]
+
+
+class ScoreHistogram(RankingCurves):
+    """
+    Ranking curves of a score histogram, with one threshold at the lower edge of every non-empty bin.
+    """
+
+    def __init__(self, histogram: np.ndarray):
+        # From the highest scores to the lowest. Empty bins are not thresholds of the curves.
+        histogram = histogram[:, ::-1]
+        histogram = histogram[:, histogram.sum(axis=0) > 0]
+        self.bin_positives, self.bin_negatives = histogram
+        super().__init__(np.cumsum(self.bin_positives), np.cumsum(self.bin_negatives))
+
+    def roc_auc_error_bound(self) -> float:
+        """
+        A positive and a negative sample in the same bin count as half a correctly ranked pair, where the exact ROC
+        AUC counts them as 0 or 1: the error is at most half the share of the pairs that share a bin.
+        """
+        self.check_both_classes()
+        shared_pairs = np.dot(self.bin_positives.astype(np.float64), self.bin_negatives)
+        return float(shared_pairs / (2 * self.positive_count * self.negative_count))
+
+    def gini_error_bound(self) -> float:
+        return 2 * self.roc_auc_error_bound()
+
+    def ks_error_bound(self) -> float:
+        """
+        Thresholds within a bin move the true positive rate by at most its share of the positives from one edge of the
+        bin, and the false positive rate by at most its share of the negatives from the other edge. The KS of the
+        histogram is never above the exact KS.
+        """
+        self.check_both_classes()
+        return float(
+            np.max(
+                np.minimum(
+                    self.bin_positives / self.positive_count,
+                    self.bin_negatives / self.negative_count,
+                )
+            )
+        )
+
+    def average_precision_error_bound(self) -> float:
+        """
+        Every positive sample of a bin adds its share of the positives times a precision between the lowest and the
+        highest precision possible within the bin, where the histogram uses the precision at the lower edge.
+        """
+        if self.positive_count == 0:
+            return 0.0
+        previous_true_positives = self.true_positives - self.bin_positives
+        previous_false_positives = self.false_positives - self.bin_negatives
+        with_positives = self.bin_positives > 0
+        highest_precision = self.true_positives[with_positives] / (
+            self.true_positives[with_positives] + previous_false_positives[with_positives]
+        )
+        lowest_precision = (previous_true_positives[with_positives] + 1) / (
+            previous_true_positives[with_positives] + 1 + self.false_positives[with_positives]
+        )
+        return float(
+            np.dot(
+                self.bin_positives[with_positives] / self.positive_count,
+                highest_precision - lowest_precision,
+            )
+        )
+
+
+class ScoreHistogramMetric(ModelQualityMetric):
+    """
+    Base class of the ranking metrics that are approximated from a score histogram in "streaming" execution mode.
+    calculate_statistics stays exact; the accumulators are score histograms, summed across chunks and shards. The
+    approximated statistics say so in their "approximation", with the bound of their error.
+    """
+
+    accepts_context = True
+
+    @abstractmethod
+    def calculate_histogram_value(self, histogram: ScoreHistogram, config: Dict) -> float:
+        pass
+
+    @abstractmethod
+    def calculate_histogram_error_bound(self, histogram: ScoreHistogram, config: Dict) -> float:
+        pass
+
+    def create_accumulator(
+        self, config: Dict, model_quality_attributes: ModelQualityAttributes
+    ) -> Any:
+        return create_score_histogram(get_histogram_bins(config))
+
+    def accumulate(
+        self,
+        accumulator: Any,
+        df: Union[pd.DataFrame, ModelQualityContext],
+        config: Dict,
+        model_quality_attributes: ModelQualityAttributes,
+    ) -> Any:
+        context = get_model_quality_context(df, model_quality_attributes)
+        return accumulator + get_score_histogram(context, get_histogram_bins(config))
+
+    def merge_accumulators(self, accumulator: Any, other: Any) -> Any:
+        return accumulator + other
+
+    def finalize(
+        self, accumulator: Any, config: Dict, model_quality_attributes: ModelQualityAttributes
+    ) -> ModelQualityStatistic:
+        histogram = ScoreHistogram(accumulator)
+        value = self.calculate_histogram_value(histogram, config)
+        error_bound = self.calculate_histogram_error_bound(histogram, config)
+        return {
+            "value": round(value, 4),
+            "standard_deviation": 0,
+            "approximation": {
+                "method": "score_histogram",
+                "histogram_bins": accumulator.shape[1],
+                # Rounded up, so that it stays a bound.
+                "error_bound": math.ceil(error_bound * 1e6) / 1e6,
+            },
+        }
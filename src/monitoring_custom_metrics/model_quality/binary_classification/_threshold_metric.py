@@ -0,0 +1,292 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License").
+# You may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from abc import abstractmethod
+from typing import Any, Dict, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from src.monitoring_custom_metrics.model_quality.binary_classification._ranking_engine import (
+    get_ranking_engine,
+)
+from src.monitoring_custom_metrics.model_quality.bootstrap import (
+    get_bootstrap_config,
+    sum_weighted_chunks,
+    with_bootstrap,
+)
+from src.monitoring_custom_metrics.model_quality.model_quality_context import (
+    ModelQualityContext,
+    get_model_quality_context,
+)
+from src.monitoring_custom_metrics.model_quality.model_quality_metric import ModelQualityMetric
+from src.model.model_quality_attributes import ModelQualityAttributes
+from src.model.model_quality_constraint import ModelQualityConstraint
+from src.model.model_quality_statistic import ModelQualityStatistic
+from src.model.violation import Violation
+
+"""
+Shared confusion counts of the threshold-based binary classification metrics. Samples scored at or above the
+probability threshold are predicted positive, and label 1 is the positive class, as in sklearn. The true positive,
+false positive, false negative and true negative counts at the threshold are calculated in one vectorized pass and
+shared by every metric. The optional threshold sweep reads the counts at many thresholds from the ranking engine,
+which sorts the scores once, instead of comparing the scores with every threshold.
+"""
+
+CONFUSION_COUNTS_CACHE_KEY = "confusion_counts"
+DEFAULT_THRESHOLD_SWEEP_COUNT = 101
+
+
+def get_probability_threshold(model_quality_attributes: ModelQualityAttributes) -> float:
+    probability_threshold = model_quality_attributes.probability_threshold_attribute
+    try:
+        return float(probability_threshold)
+    except (TypeError, ValueError):
+        raise ValueError(
+            "probability_threshold_attribute must be a number, got {}".format(probability_threshold)
+        )
+
+
+def get_sweep_thresholds(config: Dict) -> Optional[np.ndarray]:
+    """
+    Reads the optional "threshold_sweep" parameter: either {"thresholds": [...]} or {"count": n} for n thresholds
+    evenly spaced between 0 and 1. Returns None when the metric is only calculated at the probability threshold.
+    """
+    if config is None or config.get("threshold_sweep") is None:
+        return None
+    threshold_sweep = config["threshold_sweep"]
+    if "thresholds" in threshold_sweep:
+        thresholds = np.asarray(threshold_sweep["thresholds"], dtype=np.float64)
+        if thresholds.ndim != 1 or len(thresholds) == 0:
+            raise ValueError("threshold_sweep thresholds must be a non-empty list of numbers")
+        return thresholds
+    count = threshold_sweep.get("count", DEFAULT_THRESHOLD_SWEEP_COUNT)
+    if not isinstance(count, int) or count < 2:
+        raise ValueError("threshold_sweep count must be an integer of at least 2")
+    # Rounded, so that a threshold such as 0.35 is the same number as a score of 0.35.
+    return np.linspace(0, 1, count).round(10)
+
+
+def get_cells(labels: np.ndarray, scores: np.ndarray, threshold: float) -> np.ndarray:
+    """
+    Cell of every sample in the confusion counts: 0 for a true positive, 1 for a false positive, 2 for a false
+    negative and 3 for a true negative.
+    """
+    predicted_negatives = scores < threshold
+    negatives = labels != 1
+    return negatives.astype(np.int64) + 2 * predicted_negatives
+
+
+def calculate_confusion_counts(
+    labels: np.ndarray, scores: np.ndarray, threshold: float
+) -> np.ndarray:
+    return np.bincount(get_cells(labels, scores, threshold), minlength=4)
+
+
+def get_confusion_counts(context: ModelQualityContext, threshold: float) -> np.ndarray:
+    """
+    Returns the confusion counts of the data of the context at the threshold, calculated on first use and then
+    shared by every threshold metric.
+    """
+    cache_key = (CONFUSION_COUNTS_CACHE_KEY, threshold)
+    if cache_key not in context.cache:
+        context.cache[cache_key] = calculate_confusion_counts(
+            context.labels, context.scores, threshold
+        )
+    return context.cache[cache_key]
+
+
+def divide(numerators: np.ndarray, denominators: np.ndarray) -> np.ndarray:
+    """
+    Element-wise division where a zero denominator gives 0, like sklearn's default zero_division.
+    """
+    numerators, denominators = np.broadcast_arrays(
+        np.asarray(numerators, dtype=np.float64), np.asarray(denominators, dtype=np.float64)
+    )
+    result = np.zeros(numerators.shape, dtype=np.float64)
+    np.divide(numerators, denominators, out=result, where=denominators != 0)
+    return result
+
+
+class ThresholdMetric(ModelQualityMetric):
+    """
+    Base class of the threshold-based binary classification metrics. Every metric is a vectorized function of the
+    confusion counts, so that the same function calculates its value at the probability threshold, in every
+    bootstrap replicate and at every threshold of the sweep.
+    """
+
+    accepts_context = True
+    metric_name = None
+    # Precision, recall and the other rates of correct predictions are in violation when they fall below the baseline.
+    comparison_operator = "LessThanThreshold"
+
+    @abstractmethod
+    def calculate_value(
+        self,
+        true_positives: np.ndarray,
+        false_positives: np.ndarray,
+        false_negatives: np.ndarray,
+        true_negatives: np.ndarray,
+    ) -> np.ndarray:
+        pass
+
+    def calculate_counts_value(self, counts: np.ndarray) -> np.ndarray:
+        return self.calculate_value(*counts.astype(np.float64))
+
+    def calculate_statistics(
+        self,
+        df: Union[pd.DataFrame, ModelQualityContext],
+        config: Dict,
+        model_quality_attributes: ModelQualityAttributes,
+    ) -> ModelQualityStatistic:
+        context = get_model_quality_context(df, model_quality_attributes)
+        threshold = get_probability_threshold(model_quality_attributes)
+        counts = get_confusion_counts(context, threshold)
+        self.check_samples(counts)
+        statistics = {
+            "value": round(float(self.calculate_counts_value(counts)), 4),
+            "standard_deviation": 0,
+        }
+
+        thresholds = get_sweep_thresholds(config)
+        if thresholds is not None:
+            statistics["threshold_sweep"] = self.get_threshold_sweep(
+                thresholds, get_ranking_engine(context).confusion_counts_at(thresholds)
+            )
+
+        bootstrap_config = get_bootstrap_config(config)
+        if bootstrap_config is None:
+            return statistics
+        # Weighted confusion counts of every replicate: the weights of the samples of every cell, summed.
+        cells = np.eye(4)[get_cells(context.labels, context.scores, threshold)]
+        counts = sum_weighted_chunks(
+            lambda weights, start, stop: weights @ cells[start:stop],
+            context.item_count,
+            bootstrap_config,
+        )
+        return with_bootstrap(statistics, self.calculate_counts_value(counts.T), bootstrap_config)
+
+    def check_samples(self, counts: np.ndarray):
+        # Without samples every count is 0 and the rates are not defined.
+        if counts.sum() == 0:
+            raise ValueError("Metric {} needs at least one sample".format(self.metric_name))
+
+    def get_threshold_sweep(self, thresholds: np.ndarray, counts: np.ndarray) -> list:
+        values = self.calculate_counts_value(counts)
+        return [
+            {"threshold": round(float(threshold), 4), "value": round(float(value), 4)}
+            for threshold, value in zip(thresholds, values)
+        ]
+
+    def evaluate_constraints(
+        self,
+        statistics: ModelQualityStatistic,
+        df: pd.DataFrame,
+        config: Dict,
+        constraint: ModelQualityConstraint,
+        model_quality_attributes: ModelQualityAttributes,
+    ) -> Union[Violation, None]:
+        custom_metric = statistics["value"]
+        metric_name = self.metric_name
+
+        threshold = 0.0
+        if "threshold" in constraint and constraint["threshold"] is not None:
+            threshold = constraint["threshold"]
+        comparison_operator = constraint["comparison_operator"]
+
+        in_violation = False
+        if comparison_operator == "GreaterThanThreshold":
+            in_violation = custom_metric > threshold
+        elif comparison_operator == "LessThanThreshold":
+            in_violation = custom_metric < threshold
+
+        if in_violation:
+            return Violation(
+                constraint_check_type="{}".format(comparison_operator),
+                description="Metric {} with {} was {} {}".format(
+                    metric_name, custom_metric, comparison_operator, threshold
+                ),
+                metric_name="{}".format(metric_name),
+            )
+        return None
+
+    def suggest_constraints(
+        self,
+        statistics: ModelQualityStatistic,
+        df: pd.DataFrame,
+        config: Dict,
+        model_quality_attributes: ModelQualityAttributes,
+    ) -> ModelQualityConstraint:
+        custom_metric = statistics["value"]
+        # threshold_override < 0 means the threshold is set below the baseline. In this case, we will accept some deterioration in the metrics.
+        threshold_override = config["threshold_override"] if "threshold_override" in config else 0
+        return ModelQualityConstraint(
+            threshold=float(custom_metric + threshold_override),
+            comparison_operator=config.get("comparison_operator", self.comparison_operator),
+            additional_properties=None,
+        )
+
+    def create_accumulator(
+        self, config: Dict, model_quality_attributes: ModelQualityAttributes
+    ) -> Any:
+        thresholds = get_sweep_thresholds(config)
+        return {
+            "counts": np.zeros(4, dtype=np.int64),
+            "sweep_counts": (
+                None if thresholds is None else np.zeros((4, len(thresholds)), dtype=np.int64)
+            ),
+        }
+
+    def accumulate(
+        self,
+        accumulator: Any,
+        df: Union[pd.DataFrame, ModelQualityContext],
+        config: Dict,
+        model_quality_attributes: ModelQualityAttributes,
+    ) -> Any:
+        context = get_model_quality_context(df, model_quality_attributes)
+        threshold = get_probability_threshold(model_quality_attributes)
+        sweep_counts = accumulator["sweep_counts"]
+        if sweep_counts is not None and context.item_count > 0:
+            sweep_counts = sweep_counts + get_ranking_engine(context).confusion_counts_at(
+                get_sweep_thresholds(config)
+            )
+        return {
+            "counts": accumulator["counts"] + get_confusion_counts(context, threshold),
+            "sweep_counts": sweep_counts,
+        }
+
+    def merge_accumulators(self, accumulator: Any, other: Any) -> Any:
+        return {
+            "counts": accumulator["counts"] + other["counts"],
+            "sweep_counts": (
+                None
+                if accumulator["sweep_counts"] is None
+                else accumulator["sweep_counts"] + other["sweep_counts"]
+            ),
+        }
+
+    def finalize(
+        self, accumulator: Any, config: Dict, model_quality_attributes: ModelQualityAttributes
+    ) -> ModelQualityStatistic:
+        self.check_samples(accumulator["counts"])
+        statistics = {
+            "value": round(float(self.calculate_counts_value(accumulator["counts"])), 4),
+            "standard_deviation": 0,
+        }
+        if accumulator["sweep_counts"] is not None:
+            statistics["threshold_sweep"] = self.get_threshold_sweep(
+                get_sweep_thresholds(config), accumulator["sweep_counts"]
+            )
+        return statistics
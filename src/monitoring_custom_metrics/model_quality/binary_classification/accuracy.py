@@ -0,0 +1,42 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License").
+# You may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import numpy as np
+
+from src.monitoring_custom_metrics.model_quality.binary_classification._threshold_metric import (
+    ThresholdMetric,
+)
+
+"""
+Accuracy is the share of the samples whose predicted class, at the probability threshold, is the actual class.
+Reference: https://scikit-learn.org/stable/modules/generated/sklearn.metrics.accuracy_score.html
+"""
+
+
+class Accuracy(ThresholdMetric):
+    metric_name = "accuracy"
+
+    def calculate_value(
+        self,
+        true_positives: np.ndarray,
+        false_positives: np.ndarray,
+        false_negatives: np.ndarray,
+        true_negatives: np.ndarray,
+    ) -> np.ndarray:
+        return (true_positives + true_negatives) / (
+            true_positives + false_positives + false_negatives + true_negatives
+        )
+
+
+instance = Accuracy()
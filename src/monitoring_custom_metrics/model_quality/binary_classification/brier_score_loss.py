@@ -12,11 +12,21 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from typing import Dict, Union
+from typing import Any, Dict, Union
 
+import numpy as np
 import pandas as pd
 from sklearn.metrics import brier_score_loss
 
+from src.monitoring_custom_metrics.model_quality.bootstrap import (
+    get_bootstrap_config,
+    sum_weighted_chunks,
+    with_bootstrap,
+)
+from src.monitoring_custom_metrics.model_quality.model_quality_context import (
+    ModelQualityContext,
+    get_model_quality_context,
+)
 from src.monitoring_custom_metrics.model_quality.model_quality_metric import ModelQualityMetric
 from src.model.model_quality_attributes import ModelQualityAttributes
 from src.model.model_quality_constraint import ModelQualityConstraint
@@ -30,20 +40,37 @@ Reference: https://scikit-learn.org/stable/modules/generated/sklearn.metrics.bri
 
 
 class BrierScoreLoss(ModelQualityMetric):
+    accepts_context = True
+
     def calculate_statistics(
-        self, df: pd.DataFrame, config: Dict, model_quality_attributes: ModelQualityAttributes
+        self,
+        df: Union[pd.DataFrame, ModelQualityContext],
+        config: Dict,
+        model_quality_attributes: ModelQualityAttributes,
     ) -> ModelQualityStatistic:
-        actual = model_quality_attributes.ground_truth_attribute
-        pred = model_quality_attributes.probability_attribute
-        if df[actual].isnull().values.any():
-            raise ValueError("Missing value in {} column".format(actual))
-        if df[pred].isnull().values.any():
-            raise ValueError("Missing value in {} column".format(pred))
-        return {
-            "value": brier_score_loss(df[actual], df[pred]).round(decimals=4),
+        context = get_model_quality_context(df, model_quality_attributes)
+        self._check_samples(context.item_count)
+        statistics = {
+            "value": brier_score_loss(context.labels, context.scores).round(decimals=4),
             "standard_deviation": 0,
         }
 
+        bootstrap_config = get_bootstrap_config(config)
+        if bootstrap_config is None:
+            return statistics
+        # Same convention as sklearn's brier_score_loss: label 1 is the positive class.
+        squared_error = np.square((context.labels == 1) - context.scores.astype(np.float64))
+        sums = sum_weighted_chunks(
+            lambda weights, start, stop: np.stack(
+                [weights @ squared_error[start:stop], weights.sum(axis=1)]
+            ),
+            context.item_count,
+            bootstrap_config,
+        )
+        with np.errstate(divide="ignore", invalid="ignore"):
+            replicate_values = sums[0] / sums[1]
+        return with_bootstrap(statistics, replicate_values, bootstrap_config)
+
     def evaluate_constraints(
         self,
         statistics: ModelQualityStatistic,
@@ -93,5 +120,42 @@ class BrierScoreLoss(ModelQualityMetric):
             additional_properties=None,
         )
 
+    def create_accumulator(
+        self, config: Dict, model_quality_attributes: ModelQualityAttributes
+    ) -> Any:
+        return {"count": 0, "squared_error_sum": 0.0}
+
+    def accumulate(
+        self,
+        accumulator: Any,
+        df: Union[pd.DataFrame, ModelQualityContext],
+        config: Dict,
+        model_quality_attributes: ModelQualityAttributes,
+    ) -> Any:
+        context = get_model_quality_context(df, model_quality_attributes)
+
+        # Same convention as sklearn's brier_score_loss: label 1 is the positive class.
+        outcome = (context.labels == 1).astype(np.float64)
+        squared_error = np.square(outcome - context.scores.astype(np.float64, copy=False))
+        return {
+            "count": accumulator["count"] + context.item_count,
+            "squared_error_sum": accumulator["squared_error_sum"] + squared_error.sum(),
+        }
+
+    def merge_accumulators(self, accumulator: Any, other: Any) -> Any:
+        return {key: accumulator[key] + other[key] for key in accumulator}
+
+    def finalize(
+        self, accumulator: Any, config: Dict, model_quality_attributes: ModelQualityAttributes
+    ) -> ModelQualityStatistic:
+        self._check_samples(accumulator["count"])
+        value = np.float64(accumulator["squared_error_sum"]) / accumulator["count"]
+        return {"value": value.round(decimals=4), "standard_deviation": 0}
+
+    @staticmethod
+    def _check_samples(count: int):
+        if count == 0:
+            raise ValueError("Metric brier_score_loss needs at least one sample")
+
 
 instance = BrierScoreLoss()
@@ -0,0 +1,41 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License").
+# You may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import numpy as np
+
+from src.monitoring_custom_metrics.model_quality.binary_classification._threshold_metric import (
+    ThresholdMetric,
+    divide,
+)
+
+"""
+F1 is the harmonic mean of the precision and the recall at the probability threshold.
+Reference: https://scikit-learn.org/stable/modules/generated/sklearn.metrics.f1_score.html
+"""
+
+
+class F1(ThresholdMetric):
+    metric_name = "f1"
+
+    def calculate_value(
+        self,
+        true_positives: np.ndarray,
+        false_positives: np.ndarray,
+        false_negatives: np.ndarray,
+        true_negatives: np.ndarray,
+    ) -> np.ndarray:
+        return divide(2 * true_positives, 2 * true_positives + false_positives + false_negatives)
+
+
+instance = F1()
@@ -0,0 +1,42 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License").
+# You may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import numpy as np
+
+from src.monitoring_custom_metrics.model_quality.binary_classification._threshold_metric import (
+    ThresholdMetric,
+    divide,
+)
+
+"""
+False positive rate is the share of the negative samples that are predicted positive at the probability threshold.
+"""
+
+
+class FalsePositiveRate(ThresholdMetric):
+    metric_name = "false_positive_rate"
+    # The share of false alarms is in violation when it grows above the baseline.
+    comparison_operator = "GreaterThanThreshold"
+
+    def calculate_value(
+        self,
+        true_positives: np.ndarray,
+        false_positives: np.ndarray,
+        false_negatives: np.ndarray,
+        true_negatives: np.ndarray,
+    ) -> np.ndarray:
+        return divide(false_positives, false_positives + true_negatives)
+
+
+instance = FalsePositiveRate()
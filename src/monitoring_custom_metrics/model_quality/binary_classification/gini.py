@@ -12,12 +12,27 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from typing import Dict, Union
+from typing import Any, Dict, Union
 
 import pandas as pd
 import numpy as np
 
-from src.monitoring_custom_metrics.model_quality.model_quality_metric import ModelQualityMetric
+from src.monitoring_custom_metrics.model_quality.binary_classification._ranking_engine import (
+    get_ranking_engine,
+)
+from src.monitoring_custom_metrics.model_quality.binary_classification._score_histogram import (
+    ScoreHistogram,
+    ScoreHistogramMetric,
+)
+from src.monitoring_custom_metrics.model_quality.bootstrap import (
+    get_bootstrap_config,
+    sum_weighted_chunks,
+    with_bootstrap,
+)
+from src.monitoring_custom_metrics.model_quality.model_quality_context import (
+    ModelQualityContext,
+    get_model_quality_context,
+)
 from src.model.model_quality_attributes import ModelQualityAttributes
 from src.model.model_quality_constraint import ModelQualityConstraint
 from src.model.model_quality_statistic import ModelQualityStatistic
@@ -29,44 +44,105 @@ while 1 means perfect ranking power.
 """
 
 
-class Gini(ModelQualityMetric):
+class Gini(ScoreHistogramMetric):
     def calculate_statistics(
-        self, df: pd.DataFrame, config: Dict, model_quality_attributes: ModelQualityAttributes
+        self,
+        df: Union[pd.DataFrame, ModelQualityContext],
+        config: Dict,
+        model_quality_attributes: ModelQualityAttributes,
     ) -> ModelQualityStatistic:
-        actual = model_quality_attributes.ground_truth_attribute
-        pred = model_quality_attributes.probability_attribute
-        if df[actual].isnull().values.any():
-            raise ValueError("Missing value in {} column".format(actual))
-        if df[pred].isnull().values.any():
-            raise ValueError("Missing value in {} column".format(pred))
-
+        """
+        Gini calculation accepts following parameters:
+        method: String, binned/exact, default = "binned"
+        bootstrap: Dict, optional, see the bootstrap module
+        """
+        context = get_model_quality_context(df, model_quality_attributes)
+        method = self._get_method(config)
+
+        if method == "binned":
+            bins = self._get_bins(context.scores)
+            n_bins = bins.max() + 1
+            total_cnt = np.bincount(bins, minlength=n_bins)
+            pos_cnt = np.bincount(bins, weights=context.labels, minlength=n_bins)
+            gini = self._gini_from_counts(total_cnt, pos_cnt)
+        else:
+            gini = np.float64(get_ranking_engine(context).gini())
+        statistics = {"value": gini.round(4), "standard_deviation": 0}
+
+        bootstrap_config = get_bootstrap_config(config)
+        if bootstrap_config is None:
+            return statistics
+        if method == "binned":
+            # The bins stay those of the whole dataset in every replicate.
+            def weighted_counts(weights: np.ndarray, start: int, stop: int) -> np.ndarray:
+                indicators = np.eye(n_bins)[bins[start:stop]]
+                return np.stack(
+                    [
+                        weights @ indicators,
+                        weights @ (indicators * context.labels[start:stop, None]),
+                    ]
+                )
+
+            counts = sum_weighted_chunks(weighted_counts, context.item_count, bootstrap_config)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                replicate_values = self._gini_from_counts(counts[0], counts[1])
+        else:
+            replicate_values = (
+                2 * get_ranking_engine(context).bootstrap(bootstrap_config)["roc_auc"] - 1
+            )
+        return with_bootstrap(statistics, replicate_values, bootstrap_config)
+
+    def create_accumulator(
+        self, config: Dict, model_quality_attributes: ModelQualityAttributes
+    ) -> Any:
+        # The bins of the binned gini are quantiles of the scores of the whole dataset, which chunks can not merge.
+        if self._get_method(config) == "binned":
+            return None
+        return super().create_accumulator(config, model_quality_attributes)
+
+    def calculate_histogram_value(self, histogram: ScoreHistogram, config: Dict) -> float:
+        return histogram.gini()
+
+    def calculate_histogram_error_bound(self, histogram: ScoreHistogram, config: Dict) -> float:
+        return histogram.gini_error_bound()
+
+    @staticmethod
+    def _get_method(config: Dict) -> str:
+        method = config["method"] if "method" in config else "binned"
+        if method not in ["binned", "exact"]:
+            raise ValueError("Unknown method {} for metric gini".format(method))
+        return method
+
+    @staticmethod
+    def _get_bins(scores: np.ndarray) -> np.ndarray:
         # To ensure enough samples in every bin, use 5 bins with <100 samples and 10 bins with >100 samples
-        if len(df) < 100:
+        if len(scores) < 100:
             n_bins = 5
         else:
             n_bins = 10
 
-        df["bins"] = pd.qcut(df[pred], n_bins, labels=False, duplicates="drop")
-
-        def agg_func(x, actual, pred):
-            agg_metrics = dict()
-            agg_metrics["total_cnt"] = x[actual].count()
-            agg_metrics["pos_cnt"] = x[actual].sum()
-            agg_metrics["neg_cnt"] = agg_metrics["total_cnt"] - agg_metrics["pos_cnt"]
-            return pd.Series(agg_metrics, index=["total_cnt", "pos_cnt", "neg_cnt"])
-
-        df_grouped = df.groupby("bins").apply(agg_func, actual=actual, pred=pred).reset_index()
-        df_grouped.sort_values("bins", ascending=False, inplace=True)
-
-        df_grouped["cum_pos_pct"] = df_grouped["pos_cnt"].cumsum() / df_grouped["pos_cnt"].sum()
-        df_grouped["cum_pos_pct_lag"] = df_grouped["cum_pos_pct"].shift(1, fill_value=0)
-        df_grouped["cum_neg_pct"] = df_grouped["neg_cnt"].cumsum() / df_grouped["neg_cnt"].sum()
-        df_grouped["cum_neg_pct_lag"] = df_grouped["cum_neg_pct"].shift(1, fill_value=0)
-        df_grouped["incr_pos_pct"] = df_grouped["cum_pos_pct"] - df_grouped["cum_pos_pct_lag"]
-        df_grouped["sum_neg_pct"] = df_grouped["cum_neg_pct"] + df_grouped["cum_neg_pct_lag"]
-        gini = 1 - np.dot(df_grouped.sum_neg_pct, df_grouped.incr_pos_pct)
-
-        return {"value": gini.round(4), "standard_deviation": 0}
+        # The quantile edges of np.quantile differ from those of pd.qcut in the last bits, which moves the scores
+        # sitting on an edge to another bin.
+        bins = pd.qcut(scores, n_bins, labels=False, duplicates="drop")
+        # With a single distinct score, qcut keeps a single edge and leaves every score out of the bins: one bin.
+        return np.nan_to_num(bins, nan=0).astype(np.int64)
+
+    @staticmethod
+    def _gini_from_counts(total_cnt: np.ndarray, pos_cnt: np.ndarray) -> np.ndarray:
+        """
+        Gini from the number of samples and positive samples of every bin, along the last axis.
+        """
+        neg_cnt = total_cnt - pos_cnt
+
+        # From the highest scores to the lowest. Empty bins add nothing to the sum.
+        cum_pos_pct = pos_cnt[..., ::-1].cumsum(axis=-1) / pos_cnt.sum(axis=-1, keepdims=True)
+        cum_neg_pct = neg_cnt[..., ::-1].cumsum(axis=-1) / neg_cnt.sum(axis=-1, keepdims=True)
+        incr_pos_pct = np.diff(cum_pos_pct, prepend=0, axis=-1)
+        cum_neg_pct_lag = np.concatenate(
+            [np.zeros_like(cum_neg_pct[..., :1]), cum_neg_pct[..., :-1]], axis=-1
+        )
+        sum_neg_pct = cum_neg_pct + cum_neg_pct_lag
+        return 1 - np.sum(sum_neg_pct * incr_pos_pct, axis=-1)
 
     def evaluate_constraints(
         self,
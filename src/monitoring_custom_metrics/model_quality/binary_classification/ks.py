@@ -0,0 +1,120 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License").
+# You may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from typing import Dict, Union
+
+import pandas as pd
+
+from src.monitoring_custom_metrics.model_quality.binary_classification._ranking_engine import (
+    get_ranking_engine,
+)
+from src.monitoring_custom_metrics.model_quality.binary_classification._score_histogram import (
+    ScoreHistogram,
+    ScoreHistogramMetric,
+)
+from src.monitoring_custom_metrics.model_quality.bootstrap import (
+    get_bootstrap_config,
+    with_bootstrap,
+)
+from src.monitoring_custom_metrics.model_quality.model_quality_context import (
+    ModelQualityContext,
+    get_model_quality_context,
+)
+from src.model.model_quality_attributes import ModelQualityAttributes
+from src.model.model_quality_constraint import ModelQualityConstraint
+from src.model.model_quality_statistic import ModelQualityStatistic
+from src.model.violation import Violation
+
+"""
+KS (Kolmogorov-Smirnov statistic) measures the largest distance, in either direction, between the cumulative
+distributions of the scores of the positive and the negative samples. It ranges from 0 to 1 - 0 means no separation
+between the classes while 1 means perfect separation.
+"""
+
+
+class Ks(ScoreHistogramMetric):
+    def calculate_statistics(
+        self,
+        df: Union[pd.DataFrame, ModelQualityContext],
+        config: Dict,
+        model_quality_attributes: ModelQualityAttributes,
+    ) -> ModelQualityStatistic:
+        context = get_model_quality_context(df, model_quality_attributes)
+        statistics = {
+            "value": round(get_ranking_engine(context).ks(), 4),
+            "standard_deviation": 0,
+        }
+
+        bootstrap_config = get_bootstrap_config(config)
+        if bootstrap_config is None:
+            return statistics
+        replicate_values = get_ranking_engine(context).bootstrap(bootstrap_config)["ks"]
+        return with_bootstrap(statistics, replicate_values, bootstrap_config)
+
+    def calculate_histogram_value(self, histogram: ScoreHistogram, config: Dict) -> float:
+        return histogram.ks()
+
+    def calculate_histogram_error_bound(self, histogram: ScoreHistogram, config: Dict) -> float:
+        return histogram.ks_error_bound()
+
+    def evaluate_constraints(
+        self,
+        statistics: ModelQualityStatistic,
+        df: pd.DataFrame,
+        config: Dict,
+        constraint: ModelQualityConstraint,
+        model_quality_attributes: ModelQualityAttributes,
+    ) -> Union[Violation, None]:
+        custom_metric = statistics["value"]
+        metric_name = "ks"
+
+        threshold = 0.0
+        if "threshold" in constraint and constraint["threshold"] is not None:
+            threshold = constraint["threshold"]
+        comparison_operator = constraint["comparison_operator"]
+
+        in_violation = False
+        if comparison_operator == "GreaterThanThreshold":
+            in_violation = custom_metric > threshold
+        elif comparison_operator == "LessThanThreshold":
+            in_violation = custom_metric < threshold
+
+        if in_violation:
+            return Violation(
+                constraint_check_type="{}".format(comparison_operator),
+                description="Metric {} with {} was {} {}".format(
+                    metric_name, custom_metric, comparison_operator, threshold
+                ),
+                metric_name="{}".format(metric_name),
+            )
+        return None
+
+    def suggest_constraints(
+        self,
+        statistics: ModelQualityStatistic,
+        df: pd.DataFrame,
+        config: Dict,
+        model_quality_attributes: ModelQualityAttributes,
+    ) -> ModelQualityConstraint:
+        custom_metric = statistics["value"]
+        # threshold_override > 0 means the threshold is set above the baseline. In this case, we will accept some deterioration in the metrics.
+        threshold_override = config["threshold_override"] if "threshold_override" in config else 0
+        return ModelQualityConstraint(
+            threshold=custom_metric + threshold_override,
+            comparison_operator="LessThanThreshold",
+            additional_properties=None,
+        )
+
+
+instance = Ks()
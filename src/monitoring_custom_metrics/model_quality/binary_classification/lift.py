@@ -0,0 +1,154 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License").
+# You may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from typing import Dict, Union
+
+import numpy as np
+import pandas as pd
+
+from src.monitoring_custom_metrics.model_quality.binary_classification._ranking_engine import (
+    get_ranking_engine,
+)
+from src.monitoring_custom_metrics.model_quality.bootstrap import (
+    get_bootstrap_config,
+    sum_weighted_chunks,
+    with_bootstrap,
+)
+from src.monitoring_custom_metrics.model_quality.model_quality_context import (
+    ModelQualityContext,
+    get_model_quality_context,
+)
+from src.monitoring_custom_metrics.model_quality.model_quality_metric import ModelQualityMetric
+from src.model.model_quality_attributes import ModelQualityAttributes
+from src.model.model_quality_constraint import ModelQualityConstraint
+from src.model.model_quality_statistic import ModelQualityStatistic
+from src.model.violation import Violation
+
+"""
+Lift measures how many more positive samples are found among the highest scores than in a random sample of the same
+size: the share of the positive samples found in the top "depth" fraction of the scores, divided by that fraction.
+"""
+
+
+class Lift(ModelQualityMetric):
+    accepts_context = True
+
+    def calculate_statistics(
+        self,
+        df: Union[pd.DataFrame, ModelQualityContext],
+        config: Dict,
+        model_quality_attributes: ModelQualityAttributes,
+    ) -> ModelQualityStatistic:
+        """
+        Lift calculation accepts following parameters:
+        depth: Float, fraction of the samples with the highest scores, default = 0.1
+        table_bins: Int, optional, adds the gain and lift of that many top fractions of the samples
+        bootstrap: Dict, optional, see the bootstrap module
+        """
+        context = get_model_quality_context(df, model_quality_attributes)
+        depth = config["depth"] if "depth" in config else 0.1
+        engine = get_ranking_engine(context)
+        lift = engine.lift_at(depth)
+        statistics = {"value": round(lift["lift"], 4), "standard_deviation": 0}
+
+        if config.get("table_bins") is not None:
+            table_bins = config["table_bins"]
+            if not isinstance(table_bins, int) or table_bins < 1:
+                raise ValueError("table_bins must be a positive integer, got {}".format(table_bins))
+            statistics["lift_table"] = [
+                {
+                    "depth": round(row["depth"], 4),
+                    "count": row["count"],
+                    "positives": row["positives"],
+                    "gain": round(row["gain"], 4),
+                    "lift": round(row["lift"], 4),
+                }
+                for row in engine.lift_table(table_bins)
+            ]
+
+        bootstrap_config = get_bootstrap_config(config)
+        if bootstrap_config is None:
+            return statistics
+        # The top samples stay those of the whole dataset in every replicate.
+        top = np.zeros(context.item_count)
+        top[engine.order[: lift["count"]]] = 1
+        positives = (context.labels == 1).astype(np.float64)
+
+        def weighted_sums(weights: np.ndarray, start: int, stop: int) -> np.ndarray:
+            chunk_top = top[start:stop]
+            chunk_positives = positives[start:stop]
+            return np.stack(
+                [
+                    weights @ (chunk_top * chunk_positives),
+                    weights @ chunk_top,
+                    weights @ chunk_positives,
+                    weights.sum(axis=1),
+                ]
+            )
+
+        sums = sum_weighted_chunks(weighted_sums, context.item_count, bootstrap_config)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            replicate_values = (sums[0] / sums[2]) / (sums[1] / sums[3])
+        return with_bootstrap(statistics, replicate_values, bootstrap_config)
+
+    def evaluate_constraints(
+        self,
+        statistics: ModelQualityStatistic,
+        df: pd.DataFrame,
+        config: Dict,
+        constraint: ModelQualityConstraint,
+        model_quality_attributes: ModelQualityAttributes,
+    ) -> Union[Violation, None]:
+        custom_metric = statistics["value"]
+        metric_name = "lift"
+
+        threshold = 0.0
+        if "threshold" in constraint and constraint["threshold"] is not None:
+            threshold = constraint["threshold"]
+        comparison_operator = constraint["comparison_operator"]
+
+        in_violation = False
+        if comparison_operator == "GreaterThanThreshold":
+            in_violation = custom_metric > threshold
+        elif comparison_operator == "LessThanThreshold":
+            in_violation = custom_metric < threshold
+
+        if in_violation:
+            return Violation(
+                constraint_check_type="{}".format(comparison_operator),
+                description="Metric {} with {} was {} {}".format(
+                    metric_name, custom_metric, comparison_operator, threshold
+                ),
+                metric_name="{}".format(metric_name),
+            )
+        return None
+
+    def suggest_constraints(
+        self,
+        statistics: ModelQualityStatistic,
+        df: pd.DataFrame,
+        config: Dict,
+        model_quality_attributes: ModelQualityAttributes,
+    ) -> ModelQualityConstraint:
+        custom_metric = statistics["value"]
+        # threshold_override > 0 means the threshold is set above the baseline. In this case, we will accept some deterioration in the metrics.
+        threshold_override = config["threshold_override"] if "threshold_override" in config else 0
+        return ModelQualityConstraint(
+            threshold=custom_metric + threshold_override,
+            comparison_operator="LessThanThreshold",
+            additional_properties=None,
+        )
+
+
+instance = Lift()
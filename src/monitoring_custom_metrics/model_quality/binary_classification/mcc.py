@@ -0,0 +1,51 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License").
+# You may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import numpy as np
+
+from src.monitoring_custom_metrics.model_quality.binary_classification._threshold_metric import (
+    ThresholdMetric,
+    divide,
+)
+
+"""
+MCC (Matthews correlation coefficient) is the correlation between the actual and the predicted classes at the
+probability threshold. It ranges from -1 to 1: 1 means perfect predictions, 0 means no better than random.
+Reference: https://scikit-learn.org/stable/modules/generated/sklearn.metrics.matthews_corrcoef.html
+"""
+
+
+class Mcc(ThresholdMetric):
+    metric_name = "mcc"
+
+    def calculate_value(
+        self,
+        true_positives: np.ndarray,
+        false_positives: np.ndarray,
+        false_negatives: np.ndarray,
+        true_negatives: np.ndarray,
+    ) -> np.ndarray:
+        # Same as sklearn's matthews_corrcoef, which is 0 when a class is never predicted or never present.
+        denominator = np.sqrt(
+            (true_positives + false_positives)
+            * (true_positives + false_negatives)
+            * (true_negatives + false_positives)
+            * (true_negatives + false_negatives)
+        )
+        return divide(
+            true_positives * true_negatives - false_positives * false_negatives, denominator
+        )
+
+
+instance = Mcc()
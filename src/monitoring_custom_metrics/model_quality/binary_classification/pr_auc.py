@@ -15,34 +15,60 @@
 from typing import Dict, Union
 
 import pandas as pd
-from sklearn.metrics import average_precision_score
 
-from src.monitoring_custom_metrics.model_quality.model_quality_metric import ModelQualityMetric
+from src.monitoring_custom_metrics.model_quality.binary_classification._ranking_engine import (
+    get_ranking_engine,
+)
+from src.monitoring_custom_metrics.model_quality.binary_classification._score_histogram import (
+    ScoreHistogram,
+    ScoreHistogramMetric,
+)
+from src.monitoring_custom_metrics.model_quality.bootstrap import (
+    get_bootstrap_config,
+    with_bootstrap,
+)
+from src.monitoring_custom_metrics.model_quality.model_quality_context import (
+    ModelQualityContext,
+    get_model_quality_context,
+)
 from src.model.model_quality_attributes import ModelQualityAttributes
 from src.model.model_quality_constraint import ModelQualityConstraint
 from src.model.model_quality_statistic import ModelQualityStatistic
 from src.model.violation import Violation
 
 """
-PR AUC measures the area under precision-recall curve.
+PR AUC measures the area under precision-recall curve. It is calculated as the average precision, the same way as
+sklearn's average_precision_score, from the ranking engine shared with the other ranking metrics.
 """
 
 
-class PrAuc(ModelQualityMetric):
+class PrAuc(ScoreHistogramMetric):
     def calculate_statistics(
-        self, df: pd.DataFrame, config: Dict, model_quality_attributes: ModelQualityAttributes
+        self,
+        df: Union[pd.DataFrame, ModelQualityContext],
+        config: Dict,
+        model_quality_attributes: ModelQualityAttributes,
     ) -> ModelQualityStatistic:
-        actual = model_quality_attributes.ground_truth_attribute
-        pred = model_quality_attributes.probability_attribute
-        if df[actual].isnull().values.any():
-            raise ValueError("Missing value in {} column".format(actual))
-        if df[pred].isnull().values.any():
-            raise ValueError("Missing value in {} column".format(pred))
-        return {
-            "value": average_precision_score(df[actual], df[pred]).round(decimals=4),
+        context = get_model_quality_context(df, model_quality_attributes)
+        statistics = {
+            "value": round(get_ranking_engine(context).average_precision(), 4),
             "standard_deviation": 0,
         }
 
+        bootstrap_config = get_bootstrap_config(config)
+        if bootstrap_config is None:
+            return statistics
+        replicate_values = get_ranking_engine(context).bootstrap(bootstrap_config)[
+            "average_precision"
+        ]
+        return with_bootstrap(statistics, replicate_values, bootstrap_config)
+
+    def calculate_histogram_value(self, histogram: ScoreHistogram, config: Dict) -> float:
+        return histogram.average_precision()
+
+    def calculate_histogram_error_bound(self, histogram: ScoreHistogram, config: Dict) -> float:
+        return histogram.average_precision_error_bound()
+
     def evaluate_constraints(
         self,
         statistics: ModelQualityStatistic,
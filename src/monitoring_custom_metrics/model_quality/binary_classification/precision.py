@@ -0,0 +1,41 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License").
+# You may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import numpy as np
+
+from src.monitoring_custom_metrics.model_quality.binary_classification._threshold_metric import (
+    ThresholdMetric,
+    divide,
+)
+
+"""
+Precision is the share of the samples predicted positive, at the probability threshold, that are positive.
+Reference: https://scikit-learn.org/stable/modules/generated/sklearn.metrics.precision_score.html
+"""
+
+
+class Precision(ThresholdMetric):
+    metric_name = "precision"
+
+    def calculate_value(
+        self,
+        true_positives: np.ndarray,
+        false_positives: np.ndarray,
+        false_negatives: np.ndarray,
+        true_negatives: np.ndarray,
+    ) -> np.ndarray:
+        return divide(true_positives, true_positives + false_positives)
+
+
+instance = Precision()
@@ -12,10 +12,20 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from typing import Dict, Union
+from typing import Any, Dict, Union
 
+import numpy as np
 import pandas as pd
 
+from src.monitoring_custom_metrics.model_quality.bootstrap import (
+    get_bootstrap_config,
+    sum_weighted_chunks,
+    with_bootstrap,
+)
+from src.monitoring_custom_metrics.model_quality.model_quality_context import (
+    ModelQualityContext,
+    get_model_quality_context,
+)
 from src.monitoring_custom_metrics.model_quality.model_quality_metric import ModelQualityMetric
 from src.model.model_quality_attributes import ModelQualityAttributes
 from src.model.model_quality_constraint import ModelQualityConstraint
@@ -34,31 +44,43 @@ To detect under-prediction only, set comparison_operator = "LessThanThreshold".
 
 
 class ScoreDiff(ModelQualityMetric):
+    accepts_context = True
+
     def calculate_statistics(
-        self, df: pd.DataFrame, config: Dict, model_quality_attributes: ModelQualityAttributes
+        self,
+        df: Union[pd.DataFrame, ModelQualityContext],
+        config: Dict,
+        model_quality_attributes: ModelQualityAttributes,
     ) -> ModelQualityStatistic:
         """
         Score difference calculation requires following parameters:
         comparison_type: String, absolute/relative, default = "absolute"
+        bootstrap: Dict, optional, see the bootstrap module
         """
-        actual = model_quality_attributes.ground_truth_attribute
-        pred = model_quality_attributes.probability_attribute
-        if df[actual].isnull().values.any():
-            raise ValueError("Missing value in {} column".format(actual))
-        if df[pred].isnull().values.any():
-            raise ValueError("Missing value in {} column".format(pred))
-
-        comparison_type = config.get("comparison_type", "absolute")
-        if comparison_type == "absolute":
-            statistics = df[pred].mean() - df[actual].mean()
-        elif comparison_type == "relative":
-            if df[actual].mean() == 0:
-                raise ZeroDivisionError("Denominator cannot be zero")
-            statistics = (df[pred].mean() - df[actual].mean()) / df[actual].mean()
-        else:
-            raise ValueError("invalid comparison type")
+        context = get_model_quality_context(df, model_quality_attributes)
+        self._check_samples(context.item_count)
+        statistics = self._score_diff(context.scores.mean(), context.labels.mean(), config)
 
-        return {"value": statistics.round(decimals=4), "standard_deviation": 0}
+        bootstrap_config = get_bootstrap_config(config)
+        if bootstrap_config is None:
+            return statistics
+        scores = context.scores.astype(np.float64)
+        labels = context.labels.astype(np.float64)
+        sums = sum_weighted_chunks(
+            lambda weights, start, stop: np.stack(
+                [weights @ scores[start:stop], weights @ labels[start:stop], weights.sum(axis=1)]
+            ),
+            context.item_count,
+            bootstrap_config,
+        )
+        with np.errstate(divide="ignore", invalid="ignore"):
+            pred_mean = sums[0] / sums[2]
+            actual_mean = sums[1] / sums[2]
+            if config.get("comparison_type", "absolute") == "relative":
+                replicate_values = (pred_mean - actual_mean) / actual_mean
+            else:
+                replicate_values = pred_mean - actual_mean
+        return with_bootstrap(statistics, replicate_values, bootstrap_config)
 
     def evaluate_constraints(
         self,
@@ -118,5 +140,56 @@ class ScoreDiff(ModelQualityMetric):
             threshold=threshold, comparison_operator=comparison_operator, additional_properties=None
         )
 
+    def create_accumulator(
+        self, config: Dict, model_quality_attributes: ModelQualityAttributes
+    ) -> Any:
+        return {"count": 0, "actual_sum": 0.0, "pred_sum": 0.0}
+
+    def accumulate(
+        self,
+        accumulator: Any,
+        df: Union[pd.DataFrame, ModelQualityContext],
+        config: Dict,
+        model_quality_attributes: ModelQualityAttributes,
+    ) -> Any:
+        context = get_model_quality_context(df, model_quality_attributes)
+
+        return {
+            "count": accumulator["count"] + context.item_count,
+            "actual_sum": accumulator["actual_sum"] + context.labels.sum(),
+            "pred_sum": accumulator["pred_sum"] + context.scores.sum(),
+        }
+
+    def merge_accumulators(self, accumulator: Any, other: Any) -> Any:
+        return {key: accumulator[key] + other[key] for key in accumulator}
+
+    def finalize(
+        self, accumulator: Any, config: Dict, model_quality_attributes: ModelQualityAttributes
+    ) -> ModelQualityStatistic:
+        count = accumulator["count"]
+        self._check_samples(count)
+        pred_mean = np.float64(accumulator["pred_sum"]) / count
+        actual_mean = np.float64(accumulator["actual_sum"]) / count
+        return self._score_diff(pred_mean, actual_mean, config)
+
+    @staticmethod
+    def _check_samples(count: int):
+        if count == 0:
+            raise ValueError("Metric score_diff needs at least one sample")
+
+    @staticmethod
+    def _score_diff(pred_mean: float, actual_mean: float, config: Dict) -> ModelQualityStatistic:
+        comparison_type = config.get("comparison_type", "absolute")
+        if comparison_type == "absolute":
+            statistics = pred_mean - actual_mean
+        elif comparison_type == "relative":
+            if actual_mean == 0:
+                raise ZeroDivisionError("Denominator cannot be zero")
+            statistics = (pred_mean - actual_mean) / actual_mean
+        else:
+            raise ValueError("invalid comparison type")
+
+        return {"value": statistics.round(decimals=4), "standard_deviation": 0}
+
 
 instance = ScoreDiff()
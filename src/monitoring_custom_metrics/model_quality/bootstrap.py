@@ -0,0 +1,167 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License").
+# You may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from src.model.bootstrap_config import BootstrapConfig
+from src.model.model_quality_statistic import ModelQualityStatistic
+from src.monitoring_custom_metrics.constant import (
+    BOOTSTRAP_CHUNK_CELLS,
+    BOOTSTRAP_WORKERS_ENV_VAR,
+    DEFAULT_BOOTSTRAP_CONFIDENCE_LEVEL,
+    DEFAULT_BOOTSTRAP_SEED,
+)
+from src.monitoring_custom_metrics.util import get_workers, map_in_order
+
+"""
+Poisson bootstrap of the model quality statistics. Instead of resampling the DataFrame and running the metric once per
+replicate, every row gets an independent Poisson(1) weight in each of the B replicates, and the metric calculates the
+weighted sums it needs for all the replicates at once. The weights are generated chunk by chunk, each chunk from its
+own random stream, so memory stays bounded and the chunks can be processed in parallel with the same result whatever
+the number of workers.
+"""
+
+
+def get_bootstrap_config(config: Dict) -> Optional[BootstrapConfig]:
+    """
+    Reads the optional "bootstrap" parameter of a metric, e.g. {"replicates": 1000, "confidence_level": 0.95}.
+    Returns None when the metric is not configured to bootstrap its statistics.
+    """
+    if config is None or config.get("bootstrap") is None:
+        return None
+    bootstrap = config["bootstrap"]
+    replicates = bootstrap.get("replicates")
+    confidence_level = bootstrap.get("confidence_level", DEFAULT_BOOTSTRAP_CONFIDENCE_LEVEL)
+    seed = bootstrap.get("seed", DEFAULT_BOOTSTRAP_SEED)
+    if not isinstance(replicates, int) or replicates < 2:
+        raise ValueError("bootstrap replicates must be an integer of at least 2")
+    if not 0 < confidence_level < 1:
+        raise ValueError("bootstrap confidence_level must be between 0 and 1")
+    return BootstrapConfig(replicates, confidence_level, seed)
+
+
+def get_bootstrap_workers() -> int:
+    return get_workers(BOOTSTRAP_WORKERS_ENV_VAR, "auto")
+
+
+def get_chunk_bounds(
+    item_count: int, replicates: int, boundaries: Optional[np.ndarray] = None
+) -> List[Tuple[int, int]]:
+    """
+    Splits the rows into chunks of about BOOTSTRAP_CHUNK_CELLS weights. When boundaries (sorted positions, ending with
+    item_count) are given, every chunk ends on one of them.
+    """
+    chunk_rows = max(BOOTSTRAP_CHUNK_CELLS // replicates, 1)
+    stops = np.r_[np.arange(chunk_rows, item_count, chunk_rows), item_count]
+    if boundaries is not None:
+        stops = np.unique(boundaries[np.searchsorted(boundaries, stops)])
+    starts = np.r_[0, stops[:-1]]
+    return [(int(start), int(stop)) for start, stop in zip(starts, stops)]
+
+
+def get_chunk_random_generator(
+    bootstrap_config: BootstrapConfig, chunk_index: int
+) -> np.random.Generator:
+    return np.random.default_rng([bootstrap_config.seed, chunk_index])
+
+
+def get_poisson_weights(
+    bootstrap_config: BootstrapConfig, chunk_index: int, row_count: int
+) -> np.ndarray:
+    """
+    Poisson(1) weights of row_count rows in every replicate, as a replicates x row_count matrix.
+    """
+    random_generator = get_chunk_random_generator(bootstrap_config, chunk_index)
+    totals = random_generator.poisson(row_count, size=bootstrap_config.replicates)
+    return get_conditional_poisson_weights(random_generator, totals, row_count)
+
+
+def get_conditional_poisson_weights(
+    random_generator: np.random.Generator, totals: np.ndarray, row_count: int
+) -> np.ndarray:
+    """
+    Poisson(1) weights of row_count rows in every replicate, given the total weight of the rows in each replicate.
+    Conditionally on their sum, independent Poisson weights are distributed multinomially with equal probabilities:
+    they are the number of times every row is picked when drawing that many rows uniformly. Counting uniform draws
+    is several times faster than drawing every weight from a Poisson distribution.
+    """
+    replicates = len(totals)
+    if row_count == 0:
+        return np.zeros((replicates, 0))
+    cells = np.repeat(np.arange(replicates, dtype=np.int64) * row_count, totals)
+    cells += random_generator.integers(0, row_count, size=len(cells))
+    counts = np.bincount(cells, minlength=replicates * row_count)
+    return counts.reshape(replicates, row_count).astype(np.float64)
+
+
+def map_weighted_chunks(
+    function: Callable, bounds: List[Tuple[int, int]], workers: Optional[int] = None
+) -> List:
+    """
+    Calls function(chunk_index, start, stop) for every chunk, in a thread pool: NumPy releases the GIL while it
+    generates the weights and multiplies them.
+    """
+    workers = get_bootstrap_workers() if workers is None else workers
+    return list(
+        map_in_order(
+            lambda item: function(item[0], *item[1]),
+            list(enumerate(bounds)),
+            workers,
+            ThreadPoolExecutor,
+        )
+    )
+
+
+def sum_weighted_chunks(
+    function: Callable, item_count: int, bootstrap_config: BootstrapConfig
+) -> np.ndarray:
+    """
+    Sums function(weights, start, stop) over the chunks of rows, where weights are the Poisson weights of rows start
+    to stop. function returns the weighted sums of its chunk for every replicate, in an array of any shape.
+    """
+    return sum(
+        map_weighted_chunks(
+            lambda chunk_index, start, stop: function(
+                get_poisson_weights(bootstrap_config, chunk_index, stop - start), start, stop
+            ),
+            get_chunk_bounds(item_count, bootstrap_config.replicates),
+        )
+    )
+
+
+def with_bootstrap(
+    statistics: ModelQualityStatistic,
+    replicate_values: np.ndarray,
+    bootstrap_config: BootstrapConfig,
+) -> ModelQualityStatistic:
+    """
+    Sets the standard deviation and the percentile confidence interval of the statistic from its value in every
+    replicate. Replicates where the statistic is undefined (NaN, e.g. no positive sample was drawn) are ignored.
+    """
+    tail = (1 - bootstrap_config.confidence_level) / 2
+    with np.errstate(invalid="ignore"):
+        standard_deviation = np.nanstd(replicate_values, ddof=1)
+        lower, upper = np.nanpercentile(replicate_values, [100 * tail, 100 * (1 - tail)])
+    return {
+        **statistics,
+        "standard_deviation": round(float(standard_deviation), 4),
+        "confidence_interval": {
+            "confidence_level": bootstrap_config.confidence_level,
+            "lower": round(float(lower), 4),
+            "upper": round(float(upper), 4),
+        },
+    }
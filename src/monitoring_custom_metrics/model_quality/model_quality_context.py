@@ -0,0 +1,89 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License").
+# You may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from typing import Any, Dict, Union
+
+import numpy as np
+import pandas
+from pandas.api.types import is_bool_dtype, is_float_dtype, is_integer_dtype
+
+from src.model.model_quality_attributes import ModelQualityAttributes
+
+
+class ModelQualityContext:
+    """
+    Read-only view of the data evaluated by the model quality metrics. The label, score and prediction columns are
+    extracted once as contiguous NumPy arrays and checked for missing values on first use, then shared by every
+    metric instead of being extracted and validated again by each of them.
+    """
+
+    def __init__(self, df: pandas.DataFrame, model_quality_attributes: ModelQualityAttributes):
+        self.source = df
+        self.model_quality_attributes = model_quality_attributes
+        self.item_count = len(df.index)
+        self.arrays: Dict[str, np.ndarray] = {}
+        # Results derived from the arrays and shared between metrics, such as the ranking of the scores.
+        self.cache: Dict[str, Any] = {}
+
+    @property
+    def labels(self) -> np.ndarray:
+        return self.get_array(self.model_quality_attributes.ground_truth_attribute)
+
+    @property
+    def scores(self) -> np.ndarray:
+        return self.get_array(self.model_quality_attributes.probability_attribute)
+
+    @property
+    def predictions(self) -> np.ndarray:
+        return self.get_array(self.model_quality_attributes.inference_attribute)
+
+    @property
+    def df(self) -> pandas.DataFrame:
+        """
+        Compatibility shim for metrics that work on the DataFrame. It is a shallow copy, so columns added by a metric
+        are not seen by the other metrics.
+        """
+        return self.source.copy(deep=False)
+
+    def get_array(self, column_name: str) -> np.ndarray:
+        if column_name not in self.arrays:
+            column = self.source[column_name]
+            if column.isnull().values.any():
+                raise ValueError("Missing value in {} column".format(column_name))
+            array = np.ascontiguousarray(column.to_numpy(dtype=get_array_dtype(column.dtype)))
+            array.flags.writeable = False
+            self.arrays[column_name] = array
+        return self.arrays[column_name]
+
+
+def get_array_dtype(dtype) -> Union[type, None]:
+    if is_bool_dtype(dtype):
+        return np.bool_
+    if is_integer_dtype(dtype):
+        return np.int64
+    if is_float_dtype(dtype):
+        return np.float64
+    return None
+
+
+def get_model_quality_context(
+    data: Union[pandas.DataFrame, ModelQualityContext],
+    model_quality_attributes: ModelQualityAttributes,
+) -> ModelQualityContext:
+    """
+    Metrics receive the context shared by the orchestrator, or a DataFrame when they are called directly.
+    """
+    if isinstance(data, ModelQualityContext):
+        return data
+    return ModelQualityContext(data, model_quality_attributes)
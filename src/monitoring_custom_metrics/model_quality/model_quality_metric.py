@@ -13,7 +13,7 @@
 # limitations under the License.
 
 from abc import abstractmethod, ABC
-from typing import Union, Dict
+from typing import Any, Union, Dict
 
 import pandas
 
@@ -24,6 +24,13 @@ from src.model.violation import Violation
 
 
 class ModelQualityMetric(ABC):
+    # Metrics that set it receive a ModelQualityContext instead of the DataFrame in calculate_statistics and
+    # accumulate. The DataFrame stays available as its df attribute.
+    accepts_context = False
+    # Set by metrics whose statistic grows with the number of rows: their constraints, suggested for the whole
+    # dataset, are not checked against the statistics of a time bucket.
+    grows_with_row_count = False
+
     @abstractmethod
     def calculate_statistics(
         self, df: pandas.DataFrame, config: Dict, model_quality_attributes: ModelQualityAttributes
@@ -50,3 +57,38 @@ class ModelQualityMetric(ABC):
         model_quality_attributes: ModelQualityAttributes,
     ) -> ModelQualityConstraint:
         pass
+
+    def create_accumulator(
+        self, config: Dict, model_quality_attributes: ModelQualityAttributes
+    ) -> Any:
+        """
+        Returns the initial partial state used when the data is processed in chunks. Metrics that can only be
+        calculated over the whole dataset return None (the default), which makes them unavailable in streaming mode.
+        """
+        return None
+
+    def accumulate(
+        self,
+        accumulator: Any,
+        df: pandas.DataFrame,
+        config: Dict,
+        model_quality_attributes: ModelQualityAttributes,
+    ) -> Any:
+        """
+        Folds one chunk of the dataset into the partial state and returns the updated state.
+        """
+        raise NotImplementedError(f"{type(self).__name__} does not support accumulation")
+
+    def merge_accumulators(self, accumulator: Any, other: Any) -> Any:
+        """
+        Combines two partial states calculated over disjoint parts of the same dataset.
+        """
+        raise NotImplementedError(f"{type(self).__name__} does not support accumulation")
+
+    def finalize(
+        self, accumulator: Any, config: Dict, model_quality_attributes: ModelQualityAttributes
+    ) -> ModelQualityStatistic:
+        """
+        Turns the partial state into the same statistics calculate_statistics would return for the whole dataset.
+        """
+        raise NotImplementedError(f"{type(self).__name__} does not support accumulation")
@@ -0,0 +1,255 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License").
+# You may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from abc import abstractmethod
+from typing import Any, Dict, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from src.monitoring_custom_metrics.model_quality.model_quality_context import (
+    ModelQualityContext,
+    get_model_quality_context,
+)
+from src.monitoring_custom_metrics.model_quality.model_quality_metric import ModelQualityMetric
+from src.model.model_quality_attributes import ModelQualityAttributes
+from src.model.model_quality_constraint import ModelQualityConstraint
+from src.model.model_quality_statistic import ModelQualityStatistic
+from src.model.violation import Violation
+
+"""
+Shared confusion matrix of the multiclass classification metrics. The ground truth and the inference are encoded to
+integer codes of the same classes, and the matrix is counted in one pass with np.bincount(true * K + predicted),
+K being the number of classes. Rows are the ground truth classes and columns the predicted classes. Matrices of
+different chunks are merged by aligning their classes, so a chunked or sharded run gives the same result as a run over
+the whole dataset.
+"""
+
+CONFUSION_MATRIX_CACHE_KEY = "confusion_matrix"
+# Integer classes spanning at most this range are used as codes directly, without hashing them.
+MAX_DIRECT_CLASS_RANGE = 1024
+
+
+def create_confusion_matrix() -> Dict:
+    return {"classes": np.empty(0), "matrix": np.zeros((0, 0), dtype=np.int64)}
+
+
+def get_class_codes(
+    labels: np.ndarray, predictions: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Encodes the ground truth and the inference to the codes of their sorted classes. Returns the codes of the ground
+    truth, the codes of the inference and the classes.
+    """
+    if (
+        np.issubdtype(labels.dtype, np.integer)
+        and np.issubdtype(predictions.dtype, np.integer)
+        and len(labels) > 0
+    ):
+        minimum = min(labels.min(), predictions.min())
+        maximum = max(labels.max(), predictions.max())
+        if maximum - minimum < MAX_DIRECT_CLASS_RANGE:
+            classes = np.arange(minimum, maximum + 1, dtype=np.int64)
+            return labels - minimum, predictions - minimum, classes
+
+    codes, classes = pd.factorize(np.concatenate([labels, predictions]), sort=True)
+    return codes[: len(labels)], codes[len(labels) :], np.asarray(classes)
+
+
+def calculate_confusion_matrix(labels: np.ndarray, predictions: np.ndarray) -> Dict:
+    if len(labels) == 0:
+        return create_confusion_matrix()
+
+    label_codes, prediction_codes, classes = get_class_codes(labels, predictions)
+    class_count = len(classes)
+    matrix = np.bincount(
+        label_codes.astype(np.int64, copy=False) * class_count + prediction_codes,
+        minlength=class_count * class_count,
+    ).reshape(class_count, class_count)
+
+    # Direct integer codes cover the whole range between the smallest and the largest class: drop the missing ones.
+    present = (matrix.sum(axis=0) + matrix.sum(axis=1)) > 0
+    if not present.all():
+        classes = classes[present]
+        matrix = matrix[np.ix_(present, present)]
+    return {"classes": classes, "matrix": matrix}
+
+
+def merge_confusion_matrices(confusion_matrix: Dict, other: Dict) -> Dict:
+    if len(other["classes"]) == 0:
+        return confusion_matrix
+    if len(confusion_matrix["classes"]) == 0:
+        return other
+
+    classes = pd.Index(confusion_matrix["classes"]).union(pd.Index(other["classes"]))
+    matrix = np.zeros((len(classes), len(classes)), dtype=np.int64)
+    for part in [confusion_matrix, other]:
+        indexes = classes.get_indexer(part["classes"])
+        matrix[np.ix_(indexes, indexes)] += part["matrix"]
+    return {"classes": np.asarray(classes), "matrix": matrix}
+
+
+def get_class_index(confusion_matrix: Dict, class_value: Any) -> int:
+    """
+    Finds a class in the confusion matrix. Classes are also compared as strings, since the class of a configuration
+    file can be a string when the column is numeric.
+    """
+    for index, value in enumerate(confusion_matrix["classes"].tolist()):
+        if value == class_value or str(value) == str(class_value):
+            return index
+    raise ValueError("Unknown class {}".format(class_value))
+
+
+def divide(numerators: np.ndarray, denominators: np.ndarray) -> np.ndarray:
+    """
+    Element-wise division where a zero denominator gives 0, like sklearn's default zero_division.
+    """
+    result = np.zeros(len(numerators), dtype=np.float64)
+    np.divide(numerators, denominators, out=result, where=denominators > 0)
+    return result
+
+
+def get_per_class_counts(matrix: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Returns the true positives, the predicted count and the support (ground truth count) of every class.
+    """
+    return np.diag(matrix), matrix.sum(axis=0), matrix.sum(axis=1)
+
+
+def average_per_class(values: np.ndarray, support: np.ndarray, average: str) -> float:
+    if average == "macro":
+        return float(values.mean())
+    if average == "weighted":
+        return float(np.average(values, weights=support)) if support.sum() > 0 else 0.0
+    raise ValueError("Unknown average {}".format(average))
+
+
+def get_average(config: Dict) -> str:
+    average = config["average"] if "average" in config else "macro"
+    if average not in ["macro", "micro", "weighted"]:
+        raise ValueError("Unknown average {}".format(average))
+    return average
+
+
+def get_confusion_matrix(context: ModelQualityContext) -> Dict:
+    """
+    Returns the confusion matrix of the data of the context, counted on first use and then shared by every multiclass
+    classification metric.
+    """
+    if CONFUSION_MATRIX_CACHE_KEY not in context.cache:
+        context.cache[CONFUSION_MATRIX_CACHE_KEY] = calculate_confusion_matrix(
+            context.labels, context.predictions
+        )
+    return context.cache[CONFUSION_MATRIX_CACHE_KEY]
+
+
+class ConfusionMatrixMetric(ModelQualityMetric):
+    """
+    Base class of the multiclass classification metrics: every metric is a function of the shared confusion matrix,
+    in memory as well as in streaming mode.
+    """
+
+    accepts_context = True
+    metric_name = None
+    # Accuracy, precision, recall, F1 and kappa are in violation when they fall below the baseline.
+    comparison_operator = "LessThanThreshold"
+
+    @abstractmethod
+    def calculate_value(self, confusion_matrix: Dict, config: Dict) -> float:
+        pass
+
+    def calculate_statistics(
+        self,
+        df: Union[pd.DataFrame, ModelQualityContext],
+        config: Dict,
+        model_quality_attributes: ModelQualityAttributes,
+    ) -> ModelQualityStatistic:
+        context = get_model_quality_context(df, model_quality_attributes)
+        return self.finalize(get_confusion_matrix(context), config, model_quality_attributes)
+
+    def evaluate_constraints(
+        self,
+        statistics: ModelQualityStatistic,
+        df: pd.DataFrame,
+        config: Dict,
+        constraint: ModelQualityConstraint,
+        model_quality_attributes: ModelQualityAttributes,
+    ) -> Union[Violation, None]:
+        custom_metric = statistics["value"]
+        metric_name = self.metric_name
+
+        threshold = 0.0
+        if "threshold" in constraint and constraint["threshold"] is not None:
+            threshold = constraint["threshold"]
+        comparison_operator = constraint["comparison_operator"]
+
+        in_violation = False
+        if comparison_operator == "GreaterThanThreshold":
+            in_violation = custom_metric > threshold
+        elif comparison_operator == "LessThanThreshold":
+            in_violation = custom_metric < threshold
+
+        if in_violation:
+            return Violation(
+                constraint_check_type="{}".format(comparison_operator),
+                description="Metric {} with {} was {} {}".format(
+                    metric_name, custom_metric, comparison_operator, threshold
+                ),
+                metric_name="{}".format(metric_name),
+            )
+        return None
+
+    def suggest_constraints(
+        self,
+        statistics: ModelQualityStatistic,
+        df: pd.DataFrame,
+        config: Dict,
+        model_quality_attributes: ModelQualityAttributes,
+    ) -> ModelQualityConstraint:
+        custom_metric = statistics["value"]
+        # threshold_override < 0 means the threshold is set below the baseline. In this case, we will accept some deterioration in the metrics.
+        threshold_override = config["threshold_override"] if "threshold_override" in config else 0
+        return ModelQualityConstraint(
+            threshold=float(custom_metric + threshold_override),
+            comparison_operator=config.get("comparison_operator", self.comparison_operator),
+            additional_properties=None,
+        )
+
+    def create_accumulator(
+        self, config: Dict, model_quality_attributes: ModelQualityAttributes
+    ) -> Any:
+        return create_confusion_matrix()
+
+    def accumulate(
+        self,
+        accumulator: Any,
+        df: Union[pd.DataFrame, ModelQualityContext],
+        config: Dict,
+        model_quality_attributes: ModelQualityAttributes,
+    ) -> Any:
+        context = get_model_quality_context(df, model_quality_attributes)
+        return merge_confusion_matrices(accumulator, get_confusion_matrix(context))
+
+    def merge_accumulators(self, accumulator: Any, other: Any) -> Any:
+        return merge_confusion_matrices(accumulator, other)
+
+    def finalize(
+        self, accumulator: Any, config: Dict, model_quality_attributes: ModelQualityAttributes
+    ) -> ModelQualityStatistic:
+        if accumulator["matrix"].sum() == 0:
+            raise ValueError("Metric {} needs at least one sample".format(self.metric_name))
+        return {
+            "value": round(float(self.calculate_value(accumulator, config)), 4),
+            "standard_deviation": 0,
+        }
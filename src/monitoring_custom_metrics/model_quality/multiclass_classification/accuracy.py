@@ -0,0 +1,37 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License").
+# You may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from typing import Dict
+
+import numpy as np
+
+from src.monitoring_custom_metrics.model_quality.multiclass_classification._confusion_matrix import (
+    ConfusionMatrixMetric,
+)
+
+"""
+Accuracy is the share of the samples whose inference is the ground truth class.
+Reference: https://scikit-learn.org/stable/modules/generated/sklearn.metrics.accuracy_score.html
+"""
+
+
+class Accuracy(ConfusionMatrixMetric):
+    metric_name = "accuracy"
+
+    def calculate_value(self, confusion_matrix: Dict, config: Dict) -> float:
+        matrix = confusion_matrix["matrix"]
+        return np.trace(matrix) / matrix.sum()
+
+
+instance = Accuracy()
@@ -0,0 +1,45 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License").
+# You may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from typing import Dict
+
+from src.monitoring_custom_metrics.model_quality.multiclass_classification._confusion_matrix import (
+    ConfusionMatrixMetric,
+    divide,
+    get_class_index,
+    get_per_class_counts,
+)
+
+"""
+Class recall is the recall of a single class: the share of its samples that are predicted as this class. Without a
+class, it is the lowest recall of the classes found in the ground truth, to detect a class the model stops recognizing.
+"""
+
+
+class ClassRecall(ConfusionMatrixMetric):
+    metric_name = "class_recall"
+
+    def calculate_value(self, confusion_matrix: Dict, config: Dict) -> float:
+        """
+        Class recall calculation accepts following parameters:
+        class: class of the ground truth, default = the class with the lowest recall
+        """
+        true_positives, predicted, support = get_per_class_counts(confusion_matrix["matrix"])
+        recalls = divide(true_positives, support)
+        if "class" in config:
+            return recalls[get_class_index(confusion_matrix, config["class"])]
+        return recalls[support > 0].min()
+
+
+instance = ClassRecall()
@@ -0,0 +1,48 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License").
+# You may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from typing import Dict
+
+import numpy as np
+
+from src.monitoring_custom_metrics.model_quality.multiclass_classification._confusion_matrix import (
+    ConfusionMatrixMetric,
+    get_per_class_counts,
+)
+
+"""
+Cohen's kappa measures the agreement between the ground truth and the inference, corrected for the agreement expected
+by chance: 1 means perfect agreement, 0 means no better than chance.
+Reference: https://scikit-learn.org/stable/modules/generated/sklearn.metrics.cohen_kappa_score.html
+"""
+
+
+class CohenKappa(ConfusionMatrixMetric):
+    metric_name = "cohen_kappa"
+
+    def calculate_value(self, confusion_matrix: Dict, config: Dict) -> float:
+        matrix = confusion_matrix["matrix"]
+        total = matrix.sum()
+        true_positives, predicted, support = get_per_class_counts(matrix)
+        observed_agreement = true_positives.sum() / total
+        expected_agreement = np.dot(predicted, support) / (total * total)
+        # Undefined when agreement by chance is certain, where sklearn's cohen_kappa_score returns NaN.
+        if expected_agreement == 1:
+            raise ValueError(
+                "Metric cohen_kappa needs more than one class in the ground truth or the inference"
+            )
+        return (observed_agreement - expected_agreement) / (1 - expected_agreement)
+
+
+instance = CohenKappa()
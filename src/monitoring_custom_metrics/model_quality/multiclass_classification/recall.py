@@ -0,0 +1,49 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License").
+# You may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from typing import Dict
+
+import numpy as np
+
+from src.monitoring_custom_metrics.model_quality.multiclass_classification._confusion_matrix import (
+    ConfusionMatrixMetric,
+    average_per_class,
+    divide,
+    get_average,
+    get_per_class_counts,
+)
+
+"""
+Recall is the share of the samples of a class that are predicted as this class, averaged over the classes.
+Reference: https://scikit-learn.org/stable/modules/generated/sklearn.metrics.recall_score.html
+"""
+
+
+class Recall(ConfusionMatrixMetric):
+    metric_name = "recall"
+
+    def calculate_value(self, confusion_matrix: Dict, config: Dict) -> float:
+        """
+        Recall calculation accepts following parameters:
+        average: String, "macro", "micro" or "weighted", default = "macro"
+        """
+        average = get_average(config)
+        matrix = confusion_matrix["matrix"]
+        true_positives, predicted, support = get_per_class_counts(matrix)
+        if average == "micro":
+            return np.trace(matrix) / matrix.sum()
+        return average_per_class(divide(true_positives, support), support, average)
+
+
+instance = Recall()
@@ -0,0 +1,270 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License").
+# You may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import math
+from abc import abstractmethod
+from typing import Any, Dict, Union
+
+import numpy as np
+import pandas as pd
+
+from src.monitoring_custom_metrics.model_quality.model_quality_context import (
+    ModelQualityContext,
+    get_model_quality_context,
+)
+from src.monitoring_custom_metrics.model_quality.model_quality_metric import ModelQualityMetric
+from src.model.model_quality_attributes import ModelQualityAttributes
+from src.model.model_quality_constraint import ModelQualityConstraint
+from src.model.model_quality_statistic import ModelQualityStatistic
+from src.model.violation import Violation
+
+"""
+Shared accumulator of the regression metrics. A single pass over the ground truth and the inference columns keeps the
+count, the mean and the sum of squared deviations (Welford) of the residuals (inference - ground truth) and of the
+ground truth, the sums of the absolute and absolute percentage errors, and a logarithmic histogram of the residuals
+for their quantiles. Accumulators of different chunks are merged with Chan's formulas and by adding up the histogram
+counts, so a chunked or sharded run gives the same result as a run over the whole dataset.
+"""
+
+REGRESSION_ACCUMULATOR_CACHE_KEY = "regression_accumulator"
+# Residual quantiles are estimated within 1% of their value, as the midpoint of a bucket [gamma^(i-1), gamma^i].
+RESIDUAL_QUANTILE_RELATIVE_ACCURACY = 0.01
+RESIDUAL_BUCKET_GAMMA = (1 + RESIDUAL_QUANTILE_RELATIVE_ACCURACY) / (
+    1 - RESIDUAL_QUANTILE_RELATIVE_ACCURACY
+)
+# Residuals smaller than this in absolute value are counted as 0.
+MIN_BUCKETED_RESIDUAL = 1e-9
+
+
+def create_regression_accumulator() -> Dict:
+    return {
+        "count": 0,
+        "residual_mean": 0.0,
+        "residual_m2": 0.0,
+        "actual_mean": 0.0,
+        "actual_m2": 0.0,
+        "absolute_error_sum": 0.0,
+        "absolute_percentage_error_sum": 0.0,
+        "positive_residual_buckets": {},
+        "negative_residual_buckets": {},
+        "zero_residual_count": 0,
+    }
+
+
+def calculate_regression_accumulator(actuals: np.ndarray, predictions: np.ndarray) -> Dict:
+    actuals = actuals.astype(np.float64, copy=False)
+    residuals = predictions.astype(np.float64, copy=False) - actuals
+    accumulator = create_regression_accumulator()
+    if len(residuals) == 0:
+        return accumulator
+
+    absolute_residuals = np.abs(residuals)
+    accumulator["count"] = len(residuals)
+    accumulator["residual_mean"] = float(residuals.mean())
+    accumulator["residual_m2"] = float(np.square(residuals - residuals.mean()).sum())
+    accumulator["actual_mean"] = float(actuals.mean())
+    accumulator["actual_m2"] = float(np.square(actuals - actuals.mean()).sum())
+    accumulator["absolute_error_sum"] = float(absolute_residuals.sum())
+    # Same as sklearn's mean_absolute_percentage_error, which divides by max(|actual|, machine epsilon).
+    accumulator["absolute_percentage_error_sum"] = float(
+        (absolute_residuals / np.maximum(np.abs(actuals), np.finfo(np.float64).eps)).sum()
+    )
+    accumulator["positive_residual_buckets"] = get_residual_buckets(residuals)
+    accumulator["negative_residual_buckets"] = get_residual_buckets(-residuals)
+    accumulator["zero_residual_count"] = int(
+        np.count_nonzero(absolute_residuals < MIN_BUCKETED_RESIDUAL)
+    )
+    return accumulator
+
+
+def get_residual_buckets(residuals: np.ndarray) -> Dict[int, int]:
+    """
+    Counts the residuals above MIN_BUCKETED_RESIDUAL by bucket i = ceil(log_gamma(residual)).
+    """
+    residuals = residuals[residuals >= MIN_BUCKETED_RESIDUAL]
+    indexes = np.ceil(np.log(residuals) / math.log(RESIDUAL_BUCKET_GAMMA)).astype(np.int64)
+    buckets, counts = np.unique(indexes, return_counts=True)
+    return dict(zip(buckets.tolist(), counts.tolist()))
+
+
+def merge_regression_accumulators(accumulator: Dict, other: Dict) -> Dict:
+    count = accumulator["count"] + other["count"]
+    if accumulator["count"] == 0 or other["count"] == 0:
+        return dict(accumulator if other["count"] == 0 else other)
+
+    merged = {"count": count}
+    for name in ["residual", "actual"]:
+        delta = other[f"{name}_mean"] - accumulator[f"{name}_mean"]
+        merged[f"{name}_mean"] = accumulator[f"{name}_mean"] + delta * other["count"] / count
+        merged[f"{name}_m2"] = (
+            accumulator[f"{name}_m2"]
+            + other[f"{name}_m2"]
+            + delta * delta * accumulator["count"] * other["count"] / count
+        )
+    for name in ["absolute_error_sum", "absolute_percentage_error_sum", "zero_residual_count"]:
+        merged[name] = accumulator[name] + other[name]
+    for name in ["positive_residual_buckets", "negative_residual_buckets"]:
+        buckets = dict(accumulator[name])
+        for bucket, bucket_count in other[name].items():
+            buckets[bucket] = buckets.get(bucket, 0) + bucket_count
+        merged[name] = buckets
+    return merged
+
+
+def get_squared_error_sum(accumulator: Dict) -> float:
+    """
+    Sum of the squared residuals, from their mean and their sum of squared deviations.
+    """
+    return accumulator["residual_m2"] + accumulator["count"] * accumulator["residual_mean"] ** 2
+
+
+def get_residual_quantile(accumulator: Dict, quantile: float) -> float:
+    """
+    Estimates a quantile of the residuals, within RESIDUAL_QUANTILE_RELATIVE_ACCURACY of the value of the residual of
+    the same rank (lower interpolation).
+    """
+    if accumulator["count"] == 0:
+        raise ValueError("The quantile of the residuals needs at least one residual")
+    rank = math.floor(quantile * (accumulator["count"] - 1))
+
+    # From the most negative residual to the most positive one.
+    negative_buckets = accumulator["negative_residual_buckets"]
+    positive_buckets = accumulator["positive_residual_buckets"]
+    buckets = [(bucket, -1, negative_buckets[bucket]) for bucket in sorted(negative_buckets)[::-1]]
+    buckets.append((None, 0, accumulator["zero_residual_count"]))
+    buckets += [(bucket, 1, positive_buckets[bucket]) for bucket in sorted(positive_buckets)]
+
+    seen = 0
+    for bucket, sign, bucket_count in buckets:
+        seen += bucket_count
+        if seen > rank:
+            if sign == 0:
+                return 0.0
+            return sign * 2 * RESIDUAL_BUCKET_GAMMA**bucket / (RESIDUAL_BUCKET_GAMMA + 1)
+    raise ValueError(
+        "The residual buckets hold {} residuals, not {}".format(seen, accumulator["count"])
+    )
+
+
+def get_regression_accumulator(context: ModelQualityContext) -> Dict:
+    """
+    Returns the accumulator of the data of the context, calculated on first use and then shared by every regression
+    metric.
+    """
+    if REGRESSION_ACCUMULATOR_CACHE_KEY not in context.cache:
+        context.cache[REGRESSION_ACCUMULATOR_CACHE_KEY] = calculate_regression_accumulator(
+            context.labels, context.predictions
+        )
+    return context.cache[REGRESSION_ACCUMULATOR_CACHE_KEY]
+
+
+class RegressionMetric(ModelQualityMetric):
+    """
+    Base class of the regression metrics: every metric is a function of the shared accumulator, in memory as well as
+    in streaming mode. Metrics set their name and the default comparison operator of their constraint.
+    """
+
+    accepts_context = True
+    metric_name = None
+    # Error metrics are in violation when they grow above the baseline.
+    comparison_operator = "GreaterThanThreshold"
+
+    @abstractmethod
+    def calculate_value(self, accumulator: Dict, config: Dict) -> float:
+        pass
+
+    def calculate_statistics(
+        self,
+        df: Union[pd.DataFrame, ModelQualityContext],
+        config: Dict,
+        model_quality_attributes: ModelQualityAttributes,
+    ) -> ModelQualityStatistic:
+        context = get_model_quality_context(df, model_quality_attributes)
+        return self.finalize(get_regression_accumulator(context), config, model_quality_attributes)
+
+    def evaluate_constraints(
+        self,
+        statistics: ModelQualityStatistic,
+        df: pd.DataFrame,
+        config: Dict,
+        constraint: ModelQualityConstraint,
+        model_quality_attributes: ModelQualityAttributes,
+    ) -> Union[Violation, None]:
+        custom_metric = statistics["value"]
+        metric_name = self.metric_name
+
+        threshold = 0.0
+        if "threshold" in constraint and constraint["threshold"] is not None:
+            threshold = constraint["threshold"]
+        comparison_operator = constraint["comparison_operator"]
+
+        in_violation = False
+        if comparison_operator == "GreaterThanThreshold":
+            in_violation = custom_metric > threshold
+        elif comparison_operator == "LessThanThreshold":
+            in_violation = custom_metric < threshold
+
+        if in_violation:
+            return Violation(
+                constraint_check_type="{}".format(comparison_operator),
+                description="Metric {} with {} was {} {}".format(
+                    metric_name, custom_metric, comparison_operator, threshold
+                ),
+                metric_name="{}".format(metric_name),
+            )
+        return None
+
+    def suggest_constraints(
+        self,
+        statistics: ModelQualityStatistic,
+        df: pd.DataFrame,
+        config: Dict,
+        model_quality_attributes: ModelQualityAttributes,
+    ) -> ModelQualityConstraint:
+        custom_metric = statistics["value"]
+        # threshold_override > 0 means the threshold is set above the baseline. In this case, we will accept some deterioration in the metrics.
+        threshold_override = config["threshold_override"] if "threshold_override" in config else 0
+        return ModelQualityConstraint(
+            threshold=float(custom_metric + threshold_override),
+            comparison_operator=config.get("comparison_operator", self.comparison_operator),
+            additional_properties=None,
+        )
+
+    def create_accumulator(
+        self, config: Dict, model_quality_attributes: ModelQualityAttributes
+    ) -> Any:
+        return create_regression_accumulator()
+
+    def accumulate(
+        self,
+        accumulator: Any,
+        df: Union[pd.DataFrame, ModelQualityContext],
+        config: Dict,
+        model_quality_attributes: ModelQualityAttributes,
+    ) -> Any:
+        context = get_model_quality_context(df, model_quality_attributes)
+        return merge_regression_accumulators(accumulator, get_regression_accumulator(context))
+
+    def merge_accumulators(self, accumulator: Any, other: Any) -> Any:
+        return merge_regression_accumulators(accumulator, other)
+
+    def finalize(
+        self, accumulator: Any, config: Dict, model_quality_attributes: ModelQualityAttributes
+    ) -> ModelQualityStatistic:
+        if accumulator["count"] == 0:
+            raise ValueError("Metric {} needs at least one sample".format(self.metric_name))
+        return {
+            "value": round(float(self.calculate_value(accumulator, config)), 4),
+            "standard_deviation": 0,
+        }
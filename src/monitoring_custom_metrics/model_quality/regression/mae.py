@@ -0,0 +1,33 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License").
+# You may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from typing import Dict
+
+from src.monitoring_custom_metrics.model_quality.regression._regression_metric import (
+    RegressionMetric,
+)
+
+"""
+MAE (mean absolute error) is the mean of the absolute differences between the inference and the ground truth.
+"""
+
+
+class MeanAbsoluteError(RegressionMetric):
+    metric_name = "mae"
+
+    def calculate_value(self, accumulator: Dict, config: Dict) -> float:
+        return accumulator["absolute_error_sum"] / accumulator["count"]
+
+
+instance = MeanAbsoluteError()
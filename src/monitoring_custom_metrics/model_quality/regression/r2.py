@@ -0,0 +1,41 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License").
+# You may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from typing import Dict
+
+from src.monitoring_custom_metrics.model_quality.regression._regression_metric import (
+    RegressionMetric,
+    get_squared_error_sum,
+)
+
+"""
+R2 (coefficient of determination) is the proportion of the variance of the ground truth explained by the inference.
+1 means perfect predictions, 0 means no better than always predicting the mean of the ground truth.
+Reference: https://scikit-learn.org/stable/modules/generated/sklearn.metrics.r2_score.html
+"""
+
+
+class R2(RegressionMetric):
+    metric_name = "r2"
+    comparison_operator = "LessThanThreshold"
+
+    def calculate_value(self, accumulator: Dict, config: Dict) -> float:
+        squared_error_sum = get_squared_error_sum(accumulator)
+        # Same as sklearn's r2_score when the ground truth is constant.
+        if accumulator["actual_m2"] == 0:
+            return 1.0 if squared_error_sum == 0 else 0.0
+        return 1 - squared_error_sum / accumulator["actual_m2"]
+
+
+instance = R2()
@@ -0,0 +1,42 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License").
+# You may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from typing import Dict
+
+from src.monitoring_custom_metrics.model_quality.regression._regression_metric import (
+    RegressionMetric,
+    get_residual_quantile,
+)
+
+"""
+Residual quantile is a quantile of the differences between the inference and the ground truth, estimated within 1%
+of its value from a histogram of the residuals.
+"""
+
+
+class ResidualQuantile(RegressionMetric):
+    metric_name = "residual_quantile"
+
+    def calculate_value(self, accumulator: Dict, config: Dict) -> float:
+        """
+        Residual quantile calculation accepts following parameters:
+        quantile: Float, between 0 and 1, default = 0.5
+        """
+        quantile = config["quantile"] if "quantile" in config else 0.5
+        if not 0 <= quantile <= 1:
+            raise ValueError("Quantile must be between 0 and 1, got {}".format(quantile))
+        return get_residual_quantile(accumulator, quantile)
+
+
+instance = ResidualQuantile()
@@ -0,0 +1,36 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License").
+# You may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import math
+from typing import Dict
+
+from src.monitoring_custom_metrics.model_quality.regression._regression_metric import (
+    RegressionMetric,
+    get_squared_error_sum,
+)
+
+"""
+RMSE (root mean squared error) is the square root of the mean of the squared differences between the inference and
+the ground truth.
+"""
+
+
+class RootMeanSquaredError(RegressionMetric):
+    metric_name = "rmse"
+
+    def calculate_value(self, accumulator: Dict, config: Dict) -> float:
+        return math.sqrt(get_squared_error_sum(accumulator) / accumulator["count"])
+
+
+instance = RootMeanSquaredError()
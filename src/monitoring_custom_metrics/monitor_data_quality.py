@@ -13,37 +13,82 @@
 # limitations under the License.
 
 import os
-from typing import Any, Dict, List, Union
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
 
 import pandas
+from pandas.api.types import (
+    CategoricalDtype,
+    is_bool_dtype,
+    is_float_dtype,
+    is_integer_dtype,
+    is_object_dtype,
+    is_string_dtype,
+)
 
-from src.monitoring_custom_metrics.constant import BASELINE_CONSTRAINTS_ENV_VAR
+from src.monitoring_custom_metrics.constant import (
+    BASELINE_CONSTRAINTS_ENV_VAR,
+    COLUMN_EXECUTOR_ENV_VAR,
+    COLUMN_WORKERS_ENV_VAR,
+)
 from src.monitoring_custom_metrics.output_generator import write_results_to_output_folder
-from src.monitoring_custom_metrics.path_helper import (
-    get_data_quality_class_path,
-    retrieve_modules,
+from src.monitoring_custom_metrics.column_profile import (
+    calculate_profiles,
+    get_common_statistics,
+    with_profile,
+)
+from src.monitoring_custom_metrics.constraint_compiler import compile_data_quality_constraints
+from src.monitoring_custom_metrics.incremental import accumulate_incrementally
+from src.monitoring_custom_metrics.metric_registry import get_data_quality_metrics
+from src.monitoring_custom_metrics.sampling import get_sampling_metadata
+from src.monitoring_custom_metrics.time_series import (
+    split_time_buckets,
+    validate_time_series_execution,
 )
 from src.monitoring_custom_metrics.util import (
+    get_workers,
+    map_in_order,
     retrieve_json_file_in_path,
     validate_environment_variable,
 )
+from src.model.column_executor import ColumnExecutor
+from src.model.constraint_index import DataQualityConstraintIndex
 from src.model.data_type import DataType
+from src.model.execution_mode import ExecutionMode
+from src.model.monitor_type import MonitorType
 from src.model.operation_type import OperationType
+from src.model.time_series_config import TimeSeriesConfig
+
+
+BASELINE_DTYPES = {
+    DataType.Integral.value: "Int64",
+    DataType.Fractional.value: "float64",
+    DataType.String.value: "string",
+}
+EXECUTOR_CLASS_BY_COLUMN_EXECUTOR = {
+    ColumnExecutor.thread: ThreadPoolExecutor,
+    ColumnExecutor.process: ProcessPoolExecutor,
+}
 
 
 def translate_data_type(column_data_type):
-    if column_data_type == "object":
-        return DataType.String
-    elif column_data_type == "bool":
+    if (
+        is_bool_dtype(column_data_type)
+        or is_object_dtype(column_data_type)
+        or is_string_dtype(column_data_type)
+        or isinstance(column_data_type, CategoricalDtype)
+    ):
         return DataType.String
-    elif column_data_type == "int64":
+    elif is_integer_dtype(column_data_type):
         return DataType.Integral
-    elif column_data_type == "float64":
+    elif is_float_dtype(column_data_type):
         return DataType.Fractional
 
 
-def get_data_types_for_columns(df) -> Dict:
-    df.info()
+def get_data_types_for_columns(df, describe: bool = True) -> Dict:
+    if describe:
+        df.info()
     return df.dtypes.to_dict()
 
 
@@ -51,15 +96,142 @@ def execute_operation_for_data_quality(
     operation_type: OperationType,
     data_type: DataType,
     column: Union[pandas.Series, pandas.DataFrame],
-    constraint_from_file: Any = None,
+    constraints: Optional[DataQualityConstraintIndex] = None,
+    batch_statistics: Union[Dict[str, Any], None] = None,
+    whole_dataset: bool = True,
+) -> List:
+    """
+    batch_statistics holds the statistics of the column already calculated by calculate_statistics_batch, by
+    metric name. The other metrics are calculated for the column alone. whole_dataset is False when the column only
+    holds a part of the rows, such as a time bucket.
+    """
+    modules = get_data_quality_metrics(data_type)
+    batch_statistics = batch_statistics or {}
+
+    module_statistics = [
+        (
+            module,
+            (
+                batch_statistics[module.__name__]
+                if module.__name__ in batch_statistics
+                else module.instance.calculate_statistics(column)
+            ),
+        )
+        for module in modules
+    ]
+
+    return build_data_quality_output(
+        operation_type,
+        data_type,
+        column,
+        get_common_statistics(column),
+        module_statistics,
+        constraints,
+        whole_dataset,
+    )
+
+
+def execute_columns_for_data_quality(
+    operation_type: OperationType,
+    df: pandas.DataFrame,
+    constraints: Optional[DataQualityConstraintIndex] = None,
+    whole_dataset: bool = True,
+) -> Iterable[List]:
+    """
+    Yields the output of every column in column order. Columns are independent, so the 'thread' and 'process'
+    column executors evaluate them concurrently and the results are merged in the same order as the serial path.
+    The columns are only described when df is the whole dataset.
+    """
+    dtypes: Dict = get_data_types_for_columns(df, describe=whole_dataset)
+    column_executor = get_column_executor()
+    workers = 1 if column_executor is ColumnExecutor.serial else get_column_workers()
+    data_types = {
+        column_name: translate_data_type(column_data_type)
+        for column_name, column_data_type in dtypes.items()
+    }
+    profiles = calculate_profiles(df)
+    batch_statistics = calculate_batch_statistics(df, data_types)
+    columns = [
+        (
+            data_type,
+            with_profile(df[column_name], profiles[column_name]),
+            batch_statistics[column_name],
+        )
+        for column_name, data_type in data_types.items()
+    ]
+
+    return map_in_order(
+        partial(execute_column_for_data_quality, operation_type, constraints, whole_dataset),
+        columns,
+        workers,
+        EXECUTOR_CLASS_BY_COLUMN_EXECUTOR.get(column_executor, ProcessPoolExecutor),
+    )
+
+
+def execute_column_for_data_quality(
+    operation_type: OperationType,
+    constraints: Optional[DataQualityConstraintIndex],
+    whole_dataset: bool,
+    column: Tuple[DataType, pandas.Series, Dict[str, Any]],
+) -> List:
+    data_type, series, batch_statistics = column
+    return execute_operation_for_data_quality(
+        operation_type, data_type, series, constraints, batch_statistics, whole_dataset
+    )
+
+
+def calculate_batch_statistics(
+    df: pandas.DataFrame, data_types: Dict[str, DataType]
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Calculates once, over all the columns of each data type, the statistics of the metrics that implement
+    calculate_statistics_batch. Returns them by column name and metric name.
+    """
+    statistics_by_column: Dict[str, Dict[str, Any]] = {
+        column_name: {} for column_name in data_types
+    }
+
+    for data_type in dict.fromkeys(data_types.values()):
+        column_names = [
+            column_name
+            for column_name, column_data_type in data_types.items()
+            if column_data_type is data_type
+        ]
+        frame = df[column_names]
+        for module in get_data_quality_metrics(data_type):
+            statistics = module.instance.calculate_statistics_batch(frame)
+            if statistics is None:
+                continue
+            for column_name in column_names:
+                statistics_by_column[column_name][module.__name__] = statistics[column_name]
+
+    return statistics_by_column
+
+
+def get_column_executor() -> ColumnExecutor:
+    if os.environ.get(COLUMN_EXECUTOR_ENV_VAR) is not None:
+        return ColumnExecutor(os.environ[COLUMN_EXECUTOR_ENV_VAR])
+    return ColumnExecutor.serial
+
+
+def get_column_workers() -> int:
+    return get_workers(COLUMN_WORKERS_ENV_VAR, "auto")
+
+
+def build_data_quality_output(
+    operation_type: OperationType,
+    data_type: DataType,
+    column: Union[pandas.Series, pandas.DataFrame],
+    common_statistics: Dict,
+    module_statistics: List[Tuple[Any, Any]],
+    constraints: Optional[DataQualityConstraintIndex] = None,
+    whole_dataset: bool = True,
 ) -> List:
     output_statistics_features: List = []
     output_constraints: List = []
     output_constraint_violations: List = []
     feature = None
     constraint = None
-    violation = None  # noqa
-    class_path = get_data_quality_class_path(data_type)
 
     if data_type is DataType.String:
         feature = {
@@ -84,56 +256,36 @@ def execute_operation_for_data_quality(
             "num_constraints": {},
         }
 
-    feature_dict = {}
-
-    if constraint_from_file is not None:
-        feature_constraints = (
-            constraint_from_file["features"] if constraint_from_file is not None else None
-        )
-        for feature_constraint in feature_constraints:
-            if "num_constraints" in feature_constraint:
-                feature_dict[feature_constraint["name"]] = {
-                    "inferred_type": feature_constraint["inferred_type"],
-                    "num_constraints": feature_constraint["num_constraints"],
-                }
-            else:
-                feature_dict[feature_constraint["name"]] = {
-                    "inferred_type": feature_constraint["inferred_type"],
-                    "string_constraints": feature_constraint["string_constraints"],
-                }
-
-    modules = retrieve_modules(class_path)
     constraint_type = "string_constraints" if DataType.String == data_type else "num_constraints"
 
-    for module in modules:
+    for module, statistics in module_statistics:
         instance = module.instance
-        module_statistics = instance.calculate_statistics(column)
         statistic_type = (
             "string_statistics" if DataType.String == data_type else "numerical_statistics"
         )
 
-        feature[statistic_type]["common"] = calculate_common_statistics(column)
-        feature[statistic_type][module.__name__] = module_statistics
-
-        if operation_type == OperationType.run_monitor:
-            result = instance.evaluate_constraints(
-                module_statistics,
-                column,
-                feature_dict[column.name][constraint_type][module.__name__],
-            )
-            if result is not None:
-                output_constraint_violations.append(result)
+        feature[statistic_type]["common"] = common_statistics
+        feature[statistic_type][module.__name__] = statistics
 
         original_constraints = None
+        if constraints is not None:
+            original_constraints = constraints.get(column.name, module.__name__)
 
-        if (
-            column.name in feature_dict
-            and module.__name__ in feature_dict[column.name][constraint_type]
+        if operation_type == OperationType.run_monitor and (
+            whole_dataset or not instance.grows_with_row_count
         ):
-            original_constraints = feature_dict[column.name][constraint_type][module.__name__]
+            if original_constraints is None:
+                print(
+                    f"No baseline constraints for metric {module.__name__} of column {column.name}. "
+                    "Skipping evaluation."
+                )
+            else:
+                result = instance.evaluate_constraints(statistics, column, original_constraints)
+                if result is not None:
+                    output_constraint_violations.append(result)
 
         constraint[constraint_type][module.__name__] = instance.suggest_constraints(
-            module_statistics, column, original_constraints
+            statistics, column, original_constraints
         )
 
     output_statistics_features.append(feature)
@@ -142,41 +294,297 @@ def execute_operation_for_data_quality(
     return [output_statistics_features, output_constraints, output_constraint_violations]
 
 
-def validate_environment_variables(operation_type):
-    if operation_type == OperationType.run_monitor:
-        validate_environment_variable(BASELINE_CONSTRAINTS_ENV_VAR)
+def execute_time_series_for_data_quality(
+    operation_type: OperationType,
+    df: pandas.DataFrame,
+    time_series_config: TimeSeriesConfig,
+    constraints: Optional[DataQualityConstraintIndex] = None,
+) -> Tuple[List[Dict], List]:
+    """
+    Calculates the statistics of every column for every time bucket, and evaluates them against the baseline
+    constraints of the whole dataset, except for the metrics that grow with the number of rows. Returns the features
+    of every bucket and their violations.
+    """
+    time_series: List[Dict] = []
+    violations: List = []
+    for start, bucket_df in split_time_buckets(df, time_series_config):
+        features: List = []
+        for result in execute_columns_for_data_quality(
+            operation_type, bucket_df, constraints, whole_dataset=False
+        ):
+            features = features + result[0]
+            for violation in result[2]:
+                violation["time_bucket"] = start
+                violations.append(violation)
+        time_series.append(
+            {"start": start, "item_count": len(bucket_df.index), "features": features}
+        )
+    return time_series, violations
+
 
+def create_data_quality_state() -> Dict:
+    """
+    Partial state for streaming execution. It only holds per-column counters and metric accumulators, so its size
+    does not depend on the number of rows processed.
+    """
+    return {"item_count": 0, "columns": {}}
 
-def calculate_common_statistics(column: Union[pandas.Series, pandas.DataFrame]) -> Any:
-    num_present = column.count()
-    num_missing = column.isnull().sum()
-    output = {"num_present": num_present, "num_missing": num_missing}
 
-    return output
+def accumulate_data_quality_state(state: Dict, df: pandas.DataFrame) -> Dict:
+    for column_name, column_state in state["columns"].items():
+        if column_name not in df.columns:
+            mark_rows_missing(column_state, len(df.index))
+
+    for column_name, column_data_type in df.dtypes.to_dict().items():
+        data_type: DataType = translate_data_type(column_data_type)
+        column = df[column_name]
+        modules = get_data_quality_metrics(data_type)
+
+        if column_name not in state["columns"]:
+            column_state = create_column_state(data_type, column.dtype, modules)
+            mark_rows_missing(column_state, state["item_count"])
+            state["columns"][column_name] = column_state
+        else:
+            column_state = state["columns"][column_name]
+            merged_data_type = merge_data_types(column_name, column_state["data_type"], data_type)
+            if merged_data_type is not column_state["data_type"]:
+                column_state["data_type"] = merged_data_type
+                column_state["dtype"] = column.dtype
+
+        column_state["num_present"] += column.count()
+        column_state["num_missing"] += column.isnull().sum()
+        for module in modules:
+            column_state["accumulators"][module.__name__] = module.instance.accumulate(
+                column_state["accumulators"][module.__name__], column
+            )
 
+    state["item_count"] += len(df.index)
+    return state
+
+
+def merge_data_quality_states(state: Dict, other: Dict) -> Dict:
+    merged: Dict = {"item_count": state["item_count"] + other["item_count"], "columns": {}}
+
+    for column_name, column_state in state["columns"].items():
+        merged_column_state = dict(column_state, accumulators=dict(column_state["accumulators"]))
+        other_column_state = other["columns"].get(column_name)
+
+        if other_column_state is None:
+            mark_rows_missing(merged_column_state, other["item_count"])
+        else:
+            merged_data_type = merge_data_types(
+                column_name, column_state["data_type"], other_column_state["data_type"]
+            )
+            if merged_data_type is not column_state["data_type"]:
+                merged_column_state["data_type"] = merged_data_type
+                merged_column_state["dtype"] = other_column_state["dtype"]
+            merged_column_state["num_present"] += other_column_state["num_present"]
+            merged_column_state["num_missing"] += other_column_state["num_missing"]
+            modules = get_data_quality_metrics(merged_column_state["data_type"])
+            for module in modules:
+                merged_column_state["accumulators"][module.__name__] = (
+                    module.instance.merge_accumulators(
+                        column_state["accumulators"][module.__name__],
+                        other_column_state["accumulators"][module.__name__],
+                    )
+                )
+        merged["columns"][column_name] = merged_column_state
+
+    for column_name, other_column_state in other["columns"].items():
+        if column_name not in merged["columns"]:
+            merged_column_state = dict(
+                other_column_state, accumulators=dict(other_column_state["accumulators"])
+            )
+            mark_rows_missing(merged_column_state, state["item_count"])
+            merged["columns"][column_name] = merged_column_state
 
-def execute_for_data_quality(operation_type: OperationType, df: pandas.DataFrame) -> List:
+    return merged
+
+
+def finalize_data_quality_state(
+    operation_type: OperationType,
+    state: Dict,
+    constraints: Optional[DataQualityConstraintIndex] = None,
+) -> List:
+    output_statistics_features: List = []
+    output_constraints: List = []
+    output_constraint_violations: List = []
+
+    for column_name, column_state in state["columns"].items():
+        data_type: DataType = column_state["data_type"]
+        modules = get_data_quality_metrics(data_type)
+        module_statistics = [
+            (module, module.instance.finalize(column_state["accumulators"][module.__name__]))
+            for module in modules
+        ]
+        # Metrics only use the column for its name once the statistics are calculated.
+        empty_column = pandas.Series([], name=column_name, dtype=column_state["dtype"])
+        common_statistics = {
+            "num_present": column_state["num_present"],
+            "num_missing": column_state["num_missing"],
+        }
+
+        result = build_data_quality_output(
+            operation_type,
+            data_type,
+            empty_column,
+            common_statistics,
+            module_statistics,
+            constraints,
+        )
+        output_statistics_features = output_statistics_features + result[0]
+        output_constraints = output_constraints + result[1]
+        output_constraint_violations = output_constraint_violations + result[2]
+
+    return [output_statistics_features, output_constraints, output_constraint_violations]
+
+
+def create_column_state(data_type: DataType, dtype: Any, modules: List) -> Dict:
+    accumulators: Dict = {}
+
+    for module in modules:
+        accumulator = module.instance.create_accumulator()
+        if accumulator is None:
+            raise ValueError(
+                f"Metric {module.__name__} does not support streaming execution. "
+                f"Use the '{ExecutionMode.in_memory.value}' execution mode instead."
+            )
+        accumulators[module.__name__] = accumulator
+
+    return {
+        "data_type": data_type,
+        "dtype": dtype,
+        "num_present": 0,
+        "num_missing": 0,
+        "accumulators": accumulators,
+    }
+
+
+def mark_rows_missing(column_state: Dict, row_count: int):
+    if row_count == 0:
+        return
+    column_state["num_missing"] += row_count
+    # Same as pandas.concat: an integer column with missing values becomes a float column.
+    if column_state["data_type"] is DataType.Integral:
+        column_state["data_type"] = DataType.Fractional
+        column_state["dtype"] = "float64"
+
+
+def merge_data_types(column_name: str, data_type: DataType, other: DataType) -> DataType:
+    if data_type is other:
+        return data_type
+    if {data_type, other} == {DataType.Integral, DataType.Fractional}:
+        return DataType.Fractional
+    raise ValueError(
+        f"Column {column_name} changed from {data_type.name} to {other.name} between chunks"
+    )
+
+
+def supports_streaming_for_data_quality() -> bool:
+    modules = get_data_quality_metrics(DataType.Integral) + get_data_quality_metrics(
+        DataType.String
+    )
+    return all(module.instance.create_accumulator() is not None for module in modules)
+
+
+def get_data_quality_fingerprint() -> Dict:
+    """
+    Configuration partial states depend on: states saved with other metrics cannot be reused.
+    """
+    metrics = {
+        data_type.name: sorted(module.__name__ for module in get_data_quality_metrics(data_type))
+        for data_type in [DataType.Integral, DataType.String]
+    }
+    return {"monitor_type": MonitorType.DATA_QUALITY.value, "metrics": metrics}
+
+
+def load_data_quality_constraints(
+    operation_type: OperationType,
+) -> Optional[DataQualityConstraintIndex]:
+    """
+    Reads and compiles the baseline constraints when evaluating constraints, so that an invalid file is reported
+    before any data is read.
+    """
     validate_environment_variables(operation_type)
-    constraint: Any = None
+    if operation_type != OperationType.run_monitor:
+        return None
+
+    return compile_data_quality_constraints(
+        retrieve_json_file_in_path(os.environ[BASELINE_CONSTRAINTS_ENV_VAR])
+    )
+
+
+def get_baseline_dtypes(
+    constraints: Optional[DataQualityConstraintIndex],
+) -> Union[Dict[str, str], None]:
+    """
+    Builds the parser types for the columns of the baseline constraints, so that CSV files are parsed with the
+    same types the baseline was calculated with instead of inferring them again for every file. Integral columns
+    use the nullable integer type, so that missing values do not turn them into Fractional columns. Columns that
+    are not part of the baseline keep being inferred.
+    """
+    if constraints is None:
+        return None
+
+    return {
+        feature_name: BASELINE_DTYPES[data_type.value]
+        for feature_name, data_type in constraints.data_types.items()
+    }
+
 
+def validate_environment_variables(operation_type):
     if operation_type == OperationType.run_monitor:
-        constraint = retrieve_json_file_in_path(os.environ[BASELINE_CONSTRAINTS_ENV_VAR])
+        validate_environment_variable(BASELINE_CONSTRAINTS_ENV_VAR)
+
+
+def execute_for_data_quality(
+    operation_type: OperationType,
+    data: Union[pandas.DataFrame, Iterable[pandas.DataFrame], Iterable[Tuple[str, Iterable]]],
+    incremental: bool = False,
+    constraints: Optional[DataQualityConstraintIndex] = None,
+) -> List:
+    """
+    data is either a DataFrame, evaluated in memory, or an iterable of chunks, folded into a partial state. When
+    incremental is set, data yields the path of every input file with its chunks instead, and the states saved
+    by the previous run are reused for the files that did not change. constraints are the compiled baseline
+    constraints, loaded from the environment when they are not provided.
+    """
+    validate_environment_variables(operation_type)
+    time_series_config = validate_time_series_execution(data)
+
+    if constraints is None:
+        constraints = load_data_quality_constraints(operation_type)
 
-    dtypes: Dict = get_data_types_for_columns(df)
     output_statistic_features: List[str] = []
     output_constraints: List[str] = []
     output_constraint_violations: List[str] = []
 
-    for column_name, column_data_type in dtypes.items():
-        data_type: DataType = translate_data_type(column_data_type)
-        result = execute_operation_for_data_quality(
-            operation_type, data_type, df[column_name], constraint
-        )
-        output_statistic_features = output_statistic_features + result[0]
-        output_constraints = output_constraints + result[1]
-        output_constraint_violations = output_constraint_violations + result[2]
+    if isinstance(data, pandas.DataFrame):
+        df = data
 
-    item_count = len(df.index)
+        for result in execute_columns_for_data_quality(operation_type, df, constraints):
+            output_statistic_features = output_statistic_features + result[0]
+            output_constraints = output_constraints + result[1]
+            output_constraint_violations = output_constraint_violations + result[2]
+
+        item_count = len(df.index)
+    else:
+        if incremental:
+            state = accumulate_incrementally(
+                data,
+                get_data_quality_fingerprint(),
+                create_data_quality_state,
+                accumulate_data_quality_state,
+                merge_data_quality_states,
+            )
+        else:
+            state = create_data_quality_state()
+            for chunk in data:
+                accumulate_data_quality_state(state, chunk)
+
+        result = finalize_data_quality_state(operation_type, state, constraints)
+        output_statistic_features, output_constraints, output_constraint_violations = result
+        item_count = state["item_count"]
 
     output_statistic: Any = {
         "version": 0.0,
@@ -185,6 +593,8 @@ def execute_for_data_quality(operation_type: OperationType, df: pandas.DataFrame
         },
         "features": output_statistic_features,
     }
+    if isinstance(data, pandas.DataFrame) and get_sampling_metadata(data) is not None:
+        output_statistic["dataset"]["sampling"] = get_sampling_metadata(data)
 
     output_constraint: Any = {"version": 0.0, "features": output_constraints}
 
@@ -193,6 +603,14 @@ def execute_for_data_quality(operation_type: OperationType, df: pandas.DataFrame
     if operation_type == OperationType.run_monitor:
         output_violation = {"violations": output_constraint_violations}
 
+    if time_series_config is not None:
+        time_series, time_series_violations = execute_time_series_for_data_quality(
+            operation_type, data, time_series_config, constraints
+        )
+        output_statistic["time_series"] = time_series
+        if output_violation is not None:
+            output_violation["violations"] = output_violation["violations"] + time_series_violations
+
     result = [output_statistic, output_constraint, output_violation]
     write_results_to_output_folder(result)
     return result
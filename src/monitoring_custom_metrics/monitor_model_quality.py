@@ -13,13 +13,33 @@
 # limitations under the License.
 
 import os
-from typing import Any, Dict, List
+from functools import partial
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
 
 import pandas
 
+from src.monitoring_custom_metrics.constraint_compiler import compile_model_quality_constraints
+from src.monitoring_custom_metrics.incremental import accumulate_incrementally
+from src.monitoring_custom_metrics.model_quality.model_quality_context import ModelQualityContext
 from src.monitoring_custom_metrics.output_generator import write_results_to_output_folder
+from src.monitoring_custom_metrics.sampling import get_sampling_metadata
+from src.monitoring_custom_metrics.segmentation import (
+    get_segment_config,
+    get_segment_key,
+    split_segments,
+)
+from src.monitoring_custom_metrics.time_series import (
+    get_time_series_config,
+    split_time_buckets,
+    validate_time_series_execution,
+)
+from src.model.constraint_index import ModelQualityConstraintIndex
+from src.model.execution_mode import ExecutionMode
 from src.model.model_quality_attributes import ModelQualityAttributes
+from src.model.monitor_type import MonitorType
 from src.model.problem_type import ProblemType
+from src.model.segment_config import SegmentConfig
+from src.model.time_series_config import TimeSeriesConfig
 from src.monitoring_custom_metrics.constant import (
     CONFIG_PATH_ENV_VAR,
     BASELINE_CONSTRAINTS_ENV_VAR,
@@ -29,10 +49,7 @@ from src.monitoring_custom_metrics.constant import (
     PROBABILITY_ATTRIBUTE_ENV_VAR,
     INFERENCE_ATTRIBUTE_ENV_VAR,
 )
-from src.monitoring_custom_metrics.path_helper import (
-    retrieve_modules,
-    get_model_quality_class_path,
-)
+from src.monitoring_custom_metrics.metric_registry import get_model_quality_metrics
 from src.monitoring_custom_metrics.util import (
     retrieve_json_file_in_path,
     validate_environment_variable,
@@ -47,15 +64,17 @@ def execute_operation_for_model_quality(
     df: pandas.DataFrame,
     config: Any,
     constraints_label: str,
-    constraint: Any = None,
+    constraint: Optional[ModelQualityConstraintIndex] = None,
 ) -> List:
-    output_statistics_dict: Dict = {}
-    output_constraints_dict: Dict = {}
-    output_constraint_violations: List = []
-    class_path = os.path.join(get_model_quality_class_path(problem_type))
-
-    print(f"Retrieving modules from {class_path}")
-    modules = retrieve_modules(class_path)
+    """
+    Returns the statistics, the suggested constraints and the violations of the configured metrics. When the
+    "segment_by" parameter is set, the metrics are also calculated for every segment, whose statistics and
+    constraints are returned as a fourth element and whose violations are added to the others.
+    """
+    print(f"Retrieving modules for {problem_type.name}")
+    modules = get_model_quality_metrics(problem_type)
+    module_statistics: List[Tuple[Any, Any]] = []
+    context = ModelQualityContext(df, model_quality_attributes)
 
     print("Traversing modules for MODEL QUALITY:")
     for module in modules:
@@ -63,37 +82,403 @@ def execute_operation_for_model_quality(
         if module.__name__ in config:
             print(f" - {module.__name__} found in the provided config. Executing metric logic.")
             module_config = config[module.__name__]
-            statistics = instance.calculate_statistics(df, module_config, model_quality_attributes)
-            output_statistics_dict[module.__name__] = statistics
-            output_constraints_dict[module.__name__] = instance.suggest_constraints(
-                statistics, df, module_config, model_quality_attributes
+            statistics = instance.calculate_statistics(
+                get_metric_input(instance, context), module_config, model_quality_attributes
             )
-
-            if operation_type == OperationType.run_monitor:
-                constraints: Dict = {}
-
-                if (
-                    constraints_label in constraint
-                    and module.__name__ in constraint[constraints_label]
-                ):
-                    constraints = constraint[constraints_label][module.__name__]
-
-                violations = instance.evaluate_constraints(
-                    statistics,
-                    df,
-                    module_config,
-                    constraints,
-                    model_quality_attributes,
-                )
-                if violations is not None:
-                    output_constraint_violations.append(violations)
+            module_statistics.append((module, statistics))
         else:
             print(f" - {module.__name__} not found in the provided config. Skipping metric logic.")
     print("Finished traversing modules for MODEL QUALITY.")
 
+    result = build_model_quality_output(
+        operation_type,
+        model_quality_attributes,
+        df,
+        config,
+        constraints_label,
+        module_statistics,
+        constraint,
+    )
+
+    segment_config = get_segment_config(config)
+    if segment_config is not None:
+        # Segments below min_segment_size are skipped without calculating their statistics.
+        segment_results = [
+            (
+                segment,
+                len(segment_df.index),
+                (
+                    calculate_configured_statistics(
+                        problem_type, model_quality_attributes, segment_df, config
+                    )
+                    if len(segment_df.index) >= segment_config.min_segment_size
+                    else []
+                ),
+            )
+            for segment, segment_df in split_segments(df, segment_config.columns)
+        ]
+        append_segment_output(
+            result,
+            operation_type,
+            model_quality_attributes,
+            df,
+            config,
+            constraints_label,
+            segment_config,
+            segment_results,
+            constraint,
+        )
+    return result
+
+
+def calculate_configured_statistics(
+    problem_type: ProblemType,
+    model_quality_attributes: ModelQualityAttributes,
+    df: pandas.DataFrame,
+    config: Any,
+) -> List[Tuple[Any, Any]]:
+    context = ModelQualityContext(df, model_quality_attributes)
+    return [
+        (
+            module,
+            module.instance.calculate_statistics(
+                get_metric_input(module.instance, context),
+                config[module.__name__],
+                model_quality_attributes,
+            ),
+        )
+        for module in retrieve_configured_modules(problem_type, config)
+    ]
+
+
+def execute_time_series_for_model_quality(
+    operation_type: OperationType,
+    problem_type: ProblemType,
+    model_quality_attributes: ModelQualityAttributes,
+    df: pandas.DataFrame,
+    config: Any,
+    statistics_label: str,
+    constraints_label: str,
+    time_series_config: TimeSeriesConfig,
+    constraint: Optional[ModelQualityConstraintIndex] = None,
+) -> Tuple[List[Dict], List]:
+    """
+    Calculates the configured metrics for every time bucket, and evaluates them against the baseline constraints of
+    the whole dataset, except for the metrics that grow with the number of rows. Returns the statistics of every
+    bucket and their violations.
+    """
+    time_series: List[Dict] = []
+    violations: List = []
+    for start, bucket_df in split_time_buckets(df, time_series_config):
+        statistics, _, bucket_violations = build_model_quality_output(
+            operation_type,
+            model_quality_attributes,
+            bucket_df,
+            config,
+            constraints_label,
+            calculate_configured_statistics(
+                problem_type, model_quality_attributes, bucket_df, config
+            ),
+            constraint,
+            whole_dataset=False,
+        )
+        time_series.append(
+            {"start": start, "item_count": len(bucket_df.index), statistics_label: statistics}
+        )
+        for violation in bucket_violations:
+            violation["time_bucket"] = start
+            violations.append(violation)
+    return time_series, violations
+
+
+def append_segment_output(
+    result: List,
+    operation_type: OperationType,
+    model_quality_attributes: ModelQualityAttributes,
+    df: pandas.DataFrame,
+    config: Any,
+    constraints_label: str,
+    segment_config: SegmentConfig,
+    segment_results: List[Tuple[Dict, int, List[Tuple[Any, Any]]]],
+    constraint: Optional[ModelQualityConstraintIndex] = None,
+):
+    """
+    Adds the statistics and the suggested constraints of every segment of at least min_segment_size rows to the
+    result, and their violations to the violations of the whole dataset. Segments without baseline constraints are
+    not evaluated.
+    """
+    segment_outputs: List[Dict] = []
+    for segment, item_count, module_statistics in segment_results:
+        if item_count < segment_config.min_segment_size:
+            print(f" - Skipping segment {segment}: {item_count} rows.")
+            continue
+
+        segment_constraint = None
+        if constraint is not None:
+            segment_constraint = constraint.get_segment(get_segment_key(segment))
+        statistics, constraints, violations = build_model_quality_output(
+            operation_type,
+            model_quality_attributes,
+            df,
+            config,
+            constraints_label,
+            module_statistics,
+            segment_constraint,
+        )
+        segment_outputs.append(
+            {
+                "segment": segment,
+                "item_count": item_count,
+                "statistics": statistics,
+                "constraints": constraints,
+            }
+        )
+        for violation in violations:
+            violation["segment"] = segment
+            result[2].append(violation)
+    result.append(segment_outputs)
+
+
+def get_metric_input(
+    instance: Any, context: ModelQualityContext
+) -> Union[ModelQualityContext, pandas.DataFrame]:
+    """
+    Metrics that set accepts_context share the validated arrays of the context; every other metric receives its own
+    shallow copy of the DataFrame, so that columns it adds are not seen by the next metric.
+    """
+    if getattr(instance, "accepts_context", False) is True:
+        return context
+    return context.df
+
+
+def build_model_quality_output(
+    operation_type: OperationType,
+    model_quality_attributes: ModelQualityAttributes,
+    df: pandas.DataFrame,
+    config: Any,
+    constraints_label: str,
+    module_statistics: List[Tuple[Any, Any]],
+    constraint: Optional[ModelQualityConstraintIndex] = None,
+    whole_dataset: bool = True,
+) -> List:
+    output_statistics_dict: Dict = {}
+    output_constraints_dict: Dict = {}
+    output_constraint_violations: List = []
+
+    for module, statistics in module_statistics:
+        instance = module.instance
+        module_config = config[module.__name__]
+        output_statistics_dict[module.__name__] = statistics
+        output_constraints_dict[module.__name__] = instance.suggest_constraints(
+            statistics, df, module_config, model_quality_attributes
+        )
+
+        if (
+            operation_type == OperationType.run_monitor
+            and constraint is not None
+            and (whole_dataset or not instance.grows_with_row_count)
+        ):
+            constraints = constraint.get(module.__name__)
+            violations = instance.evaluate_constraints(
+                statistics,
+                df,
+                module_config,
+                constraints,
+                model_quality_attributes,
+            )
+            if violations is not None:
+                output_constraint_violations.append(violations)
+
     return [output_statistics_dict, output_constraints_dict, output_constraint_violations]
 
 
+def create_model_quality_state(
+    problem_type: ProblemType, config: Any, model_quality_attributes: ModelQualityAttributes
+) -> Dict:
+    """
+    Partial state for streaming execution: the accumulator of every configured metric, plus the row count and the
+    column names seen so far.
+    """
+    accumulators: Dict = {}
+
+    for module in retrieve_configured_modules(problem_type, config):
+        accumulator = module.instance.create_accumulator(
+            config[module.__name__], model_quality_attributes
+        )
+        if accumulator is None:
+            raise ValueError(
+                f"Metric {module.__name__} does not support streaming execution. "
+                f"Use the '{ExecutionMode.in_memory.value}' execution mode instead."
+            )
+        accumulators[module.__name__] = accumulator
+
+    state: Dict = {"item_count": 0, "columns": [], "accumulators": accumulators}
+    if get_segment_config(config) is not None:
+        # Partial state of every segment seen so far, by segment key.
+        state["segments"] = {}
+    return state
+
+
+def accumulate_model_quality_state(
+    state: Dict,
+    problem_type: ProblemType,
+    config: Any,
+    model_quality_attributes: ModelQualityAttributes,
+    df: pandas.DataFrame,
+) -> Dict:
+    context = ModelQualityContext(df, model_quality_attributes)
+    for module in retrieve_configured_modules(problem_type, config):
+        state["accumulators"][module.__name__] = module.instance.accumulate(
+            state["accumulators"][module.__name__],
+            get_metric_input(module.instance, context),
+            config[module.__name__],
+            model_quality_attributes,
+        )
+
+    state["item_count"] += len(df.index)
+    state["columns"] = state["columns"] + [
+        column for column in df.columns if column not in state["columns"]
+    ]
+
+    if "segments" in state:
+        for segment, segment_df in split_segments(df, get_segment_config(config).columns):
+            segment_key = get_segment_key(segment)
+            if segment_key not in state["segments"]:
+                state["segments"][segment_key] = {
+                    "segment": segment,
+                    "state": create_segment_state(problem_type, config, model_quality_attributes),
+                }
+            accumulate_model_quality_state(
+                state["segments"][segment_key]["state"],
+                problem_type,
+                config,
+                model_quality_attributes,
+                segment_df,
+            )
+    return state
+
+
+def create_segment_state(
+    problem_type: ProblemType, config: Any, model_quality_attributes: ModelQualityAttributes
+) -> Dict:
+    state = create_model_quality_state(problem_type, config, model_quality_attributes)
+    del state["segments"]
+    return state
+
+
+def merge_model_quality_states(
+    state: Dict, other: Dict, problem_type: ProblemType, config: Any
+) -> Dict:
+    accumulators: Dict = {}
+
+    for module in retrieve_configured_modules(problem_type, config):
+        accumulators[module.__name__] = module.instance.merge_accumulators(
+            state["accumulators"][module.__name__], other["accumulators"][module.__name__]
+        )
+
+    merged = {
+        "item_count": state["item_count"] + other["item_count"],
+        "columns": state["columns"]
+        + [column for column in other["columns"] if column not in state["columns"]],
+        "accumulators": accumulators,
+    }
+
+    if "segments" in state:
+        segments = dict(state["segments"])
+        for segment_key, segment_state in other["segments"].items():
+            if segment_key in segments:
+                segment_state = {
+                    "segment": segment_state["segment"],
+                    "state": merge_model_quality_states(
+                        segments[segment_key]["state"], segment_state["state"], problem_type, config
+                    ),
+                }
+            segments[segment_key] = segment_state
+        merged["segments"] = segments
+    return merged
+
+
+def finalize_model_quality_state(
+    operation_type: OperationType,
+    state: Dict,
+    problem_type: ProblemType,
+    model_quality_attributes: ModelQualityAttributes,
+    config: Any,
+    constraints_label: str,
+    constraint: Optional[ModelQualityConstraintIndex] = None,
+) -> List:
+    module_statistics: List[Tuple[Any, Any]] = [
+        (
+            module,
+            module.instance.finalize(
+                state["accumulators"][module.__name__],
+                config[module.__name__],
+                model_quality_attributes,
+            ),
+        )
+        for module in retrieve_configured_modules(problem_type, config)
+    ]
+    # Metrics only use the DataFrame for its columns once the statistics are calculated.
+    empty_df = pandas.DataFrame(columns=state["columns"])
+
+    result = build_model_quality_output(
+        operation_type,
+        model_quality_attributes,
+        empty_df,
+        config,
+        constraints_label,
+        module_statistics,
+        constraint,
+    )
+
+    if "segments" in state:
+        segment_results = [
+            (
+                segment_state["segment"],
+                segment_state["state"]["item_count"],
+                [
+                    (
+                        module,
+                        module.instance.finalize(
+                            segment_state["state"]["accumulators"][module.__name__],
+                            config[module.__name__],
+                            model_quality_attributes,
+                        ),
+                    )
+                    for module in retrieve_configured_modules(problem_type, config)
+                ],
+            )
+            for segment_state in sorted(
+                state["segments"].values(),
+                key=lambda segment_state: get_segment_sort_key(segment_state["segment"]),
+            )
+        ]
+        append_segment_output(
+            result,
+            operation_type,
+            model_quality_attributes,
+            empty_df,
+            config,
+            constraints_label,
+            get_segment_config(config),
+            segment_results,
+            constraint,
+        )
+    return result
+
+
+def get_segment_sort_key(segment: Dict) -> Tuple:
+    """
+    Orders the segments of a streaming run like the segments of an in-memory run: by value, missing values last.
+    """
+    return tuple((value is None, 0 if value is None else value) for value in segment.values())
+
+
+def retrieve_configured_modules(problem_type: ProblemType, config: Any) -> List:
+    modules = get_model_quality_metrics(problem_type)
+    return [module for module in modules if module.__name__ in config]
+
+
 def get_model_quality_attributes() -> ModelQualityAttributes:
     ground_truth_attribute = os.environ[GROUND_TRUTH_ATTRIBUTE_ENV_VAR]
     probability_attribute = None
@@ -114,6 +499,61 @@ def get_model_quality_attributes() -> ModelQualityAttributes:
     )
 
 
+def get_model_quality_columns(operation_type: OperationType) -> List[str]:
+    """
+    Returns the only columns a model quality run needs, so that the reader can skip every other column.
+    """
+    validate_environment_variables(operation_type)
+    config: Any = retrieve_json_file_in_path(os.environ[CONFIG_PATH_ENV_VAR])
+    columns = get_columns_referenced(config, get_model_quality_attributes())
+
+    time_series_config = get_time_series_config()
+    if time_series_config is not None and time_series_config.time_column not in columns:
+        columns.append(time_series_config.time_column)
+    return columns
+
+
+def supports_streaming_for_model_quality(operation_type: OperationType) -> bool:
+    validate_environment_variables(operation_type)
+    problem_type: ProblemType = translate_problem_type(os.environ[PROBLEM_TYPE_ENV_VAR])
+    config: Any = retrieve_json_file_in_path(os.environ[CONFIG_PATH_ENV_VAR])
+    model_quality_attributes: ModelQualityAttributes = get_model_quality_attributes()
+
+    return all(
+        module.instance.create_accumulator(config[module.__name__], model_quality_attributes)
+        is not None
+        for module in retrieve_configured_modules(problem_type, config)
+    )
+
+
+def get_columns_referenced(
+    config: Any, model_quality_attributes: ModelQualityAttributes
+) -> List[str]:
+    columns = [
+        model_quality_attributes.ground_truth_attribute,
+        model_quality_attributes.probability_attribute,
+        model_quality_attributes.inference_attribute,
+    ]
+
+    # Metric parameters ending in "_attribute" name a column, like the environment variables do. The probability
+    # threshold is the exception: it holds a value.
+    for module_config in config.values():
+        if isinstance(module_config, dict):
+            for key, value in module_config.items():
+                if (
+                    key.endswith("_attribute")
+                    and key != PROBABILITY_THRESHOLD_ATTRIBUTE_ENV_VAR
+                    and isinstance(value, str)
+                ):
+                    columns.append(value)
+
+    segment_config = get_segment_config(config)
+    if segment_config is not None:
+        columns += segment_config.columns
+
+    return list(dict.fromkeys(column for column in columns if column is not None))
+
+
 def validate_environment_variables(operation_type):
     validate_environment_variable(PROBLEM_TYPE_ENV_VAR)
     validate_environment_variable(CONFIG_PATH_ENV_VAR)
@@ -128,44 +568,121 @@ def validate_environment_variables(operation_type):
         validate_environment_variable(INFERENCE_ATTRIBUTE_ENV_VAR)
 
 
-def execute_for_model_quality(operation_type: OperationType, df: pandas.DataFrame) -> List:
+def execute_for_model_quality(
+    operation_type: OperationType,
+    data: Union[pandas.DataFrame, Iterable[pandas.DataFrame], Iterable[Tuple[str, Iterable]]],
+    incremental: bool = False,
+    constraint: Optional[ModelQualityConstraintIndex] = None,
+) -> List:
+    """
+    data is either a DataFrame, evaluated in memory, or an iterable of chunks, folded into a partial state. When
+    incremental is set, data yields the path of every input file with its chunks instead, and the states saved
+    by the previous run are reused for the files that did not change. constraint holds the compiled baseline
+    constraints, loaded from the environment when it is not provided.
+    """
     validate_environment_variables(operation_type)
     problem_type: ProblemType = translate_problem_type(os.environ[PROBLEM_TYPE_ENV_VAR])
     config: Any = retrieve_json_file_in_path(os.environ[CONFIG_PATH_ENV_VAR])
+    time_series_config = validate_time_series_execution(data)
 
     model_quality_attributes: ModelQualityAttributes = get_model_quality_attributes()
 
-    constraint: Any = None
-
-    if operation_type == OperationType.run_monitor:
-        constraint = retrieve_json_file_in_path(os.environ[BASELINE_CONSTRAINTS_ENV_VAR])
+    if constraint is None:
+        constraint = load_model_quality_constraints(operation_type)
 
     statistics_label: str = problem_type.name + "_metrics"
     constraints_label: str = problem_type.name + "_constraints"
 
-    result = execute_operation_for_model_quality(
-        operation_type,
-        problem_type,
-        model_quality_attributes,
-        df,
-        config,
-        constraints_label,
-        constraint,
-    )
-    item_count = len(df.index)
+    if isinstance(data, pandas.DataFrame):
+        df = data
+        result = execute_operation_for_model_quality(
+            operation_type,
+            problem_type,
+            model_quality_attributes,
+            df,
+            config,
+            constraints_label,
+            constraint,
+        )
+        item_count = len(df.index)
+    else:
+        if incremental:
+            fingerprint = {
+                "monitor_type": MonitorType.MODEL_QUALITY.value,
+                "problem_type": problem_type.name,
+                "config": config,
+                "attributes": vars(model_quality_attributes),
+            }
+            state = accumulate_incrementally(
+                data,
+                fingerprint,
+                partial(create_model_quality_state, problem_type, config, model_quality_attributes),
+                lambda state, chunk: accumulate_model_quality_state(
+                    state, problem_type, config, model_quality_attributes, chunk
+                ),
+                partial(merge_model_quality_states, problem_type=problem_type, config=config),
+            )
+        else:
+            state = create_model_quality_state(problem_type, config, model_quality_attributes)
+            for chunk in data:
+                accumulate_model_quality_state(
+                    state, problem_type, config, model_quality_attributes, chunk
+                )
+
+        result = finalize_model_quality_state(
+            operation_type,
+            state,
+            problem_type,
+            model_quality_attributes,
+            config,
+            constraints_label,
+            constraint,
+        )
+        item_count = state["item_count"]
 
     output_statistic: Dict = {
         "version": 0.0,
         "dataset": {"item_count": item_count},
         statistics_label: result[0],
     }
+    if isinstance(data, pandas.DataFrame) and get_sampling_metadata(data) is not None:
+        output_statistic["dataset"]["sampling"] = get_sampling_metadata(data)
     output_constraint: Dict = {"version": 0.0, constraints_label: result[1]}
+    if len(result) > 3:
+        output_statistic["segments"] = [
+            {
+                "segment": segment_output["segment"],
+                "item_count": segment_output["item_count"],
+                statistics_label: segment_output["statistics"],
+            }
+            for segment_output in result[3]
+        ]
+        output_constraint["segments"] = [
+            {"segment": segment_output["segment"], constraints_label: segment_output["constraints"]}
+            for segment_output in result[3]
+        ]
 
     output_violation = None
 
     if operation_type == OperationType.run_monitor:
         output_violation = {"violations": result[2]}
 
+    if time_series_config is not None:
+        time_series, time_series_violations = execute_time_series_for_model_quality(
+            operation_type,
+            problem_type,
+            model_quality_attributes,
+            data,
+            config,
+            statistics_label,
+            constraints_label,
+            time_series_config,
+            constraint,
+        )
+        output_statistic["time_series"] = time_series
+        if output_violation is not None:
+            output_violation["violations"] = output_violation["violations"] + time_series_violations
+
     output_result: List = [output_statistic, output_constraint, output_violation]
 
     write_results_to_output_folder(output_result)
@@ -173,6 +690,24 @@ def execute_for_model_quality(operation_type: OperationType, df: pandas.DataFram
     return output_result
 
 
+def load_model_quality_constraints(
+    operation_type: OperationType,
+) -> Optional[ModelQualityConstraintIndex]:
+    """
+    Reads and compiles the baseline constraints when evaluating constraints, so that an invalid file is reported
+    before any data is read.
+    """
+    if operation_type != OperationType.run_monitor:
+        return None
+
+    validate_environment_variable(PROBLEM_TYPE_ENV_VAR)
+    validate_environment_variable(BASELINE_CONSTRAINTS_ENV_VAR)
+    return compile_model_quality_constraints(
+        retrieve_json_file_in_path(os.environ[BASELINE_CONSTRAINTS_ENV_VAR]),
+        translate_problem_type(os.environ[PROBLEM_TYPE_ENV_VAR]),
+    )
+
+
 def translate_problem_type(problem_type) -> ProblemType:
     if problem_type == "Regression":
         return ProblemType.regression
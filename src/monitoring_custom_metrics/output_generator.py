@@ -24,11 +24,14 @@ from src.monitoring_custom_metrics.constant import (
 )
 
 
-def write_results_to_output_folder(result):
-    local_output_path = DEFAULT_OUTPUT_PATH
-
+def get_output_folder_path() -> str:
     if os.environ.get(OUTPUT_PATH_ENV_VAR) is not None:
-        local_output_path = str(os.environ.get(OUTPUT_PATH_ENV_VAR))
+        return str(os.environ.get(OUTPUT_PATH_ENV_VAR))
+    return DEFAULT_OUTPUT_PATH
+
+
+def write_results_to_output_folder(result):
+    local_output_path = get_output_folder_path()
 
     if result[0] is not None:
         output_path = os.path.join(local_output_path, "community_statistics.json")
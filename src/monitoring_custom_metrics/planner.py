@@ -0,0 +1,244 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License").
+# You may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import zlib
+from typing import Any, Dict, List, Optional, Tuple
+
+from src.monitoring_custom_metrics.constant import (
+    EXECUTION_MODE_ENV_VAR,
+    SAMPLING_MODE_ENV_VAR,
+    PLANNER_SAMPLE_ROWS,
+    PLANNER_SAMPLE_BYTES,
+)
+from src.monitoring_custom_metrics.monitor_data_quality import supports_streaming_for_data_quality
+from src.monitoring_custom_metrics.monitor_model_quality import (
+    supports_streaming_for_model_quality,
+)
+from src.monitoring_custom_metrics.sampling import determine_sampling_mode
+from src.monitoring_custom_metrics.time_series import get_time_series_config
+from src.monitoring_custom_metrics.util import (
+    detect_compression,
+    detect_file_format,
+    get_csv_engine,
+    get_dataset_folder_path,
+    get_full_paths_in_directory,
+    read_file_in_chunks,
+)
+from src.model.compression import Compression
+from src.model.execution_mode import ExecutionMode
+from src.model.execution_plan import ExecutionPlan
+from src.model.file_format import FileFormat
+from src.model.monitor_type import MonitorType
+from src.model.operation_type import OperationType
+from src.model.sampling_mode import SamplingMode
+
+# Loading in memory needs about three times the size of the data: the DataFrame of every file, the result of
+# concatenating them and the temporary columns the metrics create.
+IN_MEMORY_OVERHEAD = 3
+COMPRESSED_BLOCK_SIZE = 4096
+# Added to the window bits, makes zlib expect a gzip header.
+GZIP_WBITS = 16
+CGROUP_MEMORY_LIMIT_PATHS = [
+    "/sys/fs/cgroup/memory.max",
+    "/sys/fs/cgroup/memory/memory.limit_in_bytes",
+]
+
+
+def determine_execution_plan(
+    operation_type: OperationType,
+    monitor_type: MonitorType,
+    columns: Optional[List[str]] = None,
+    dtype: Optional[Dict[str, str]] = None,
+) -> ExecutionPlan:
+    """
+    Uses the execution and sampling modes set in the environment, if any. Otherwise, plans the execution from
+    the size of the input and the memory available.
+    """
+    if (
+        os.environ.get(EXECUTION_MODE_ENV_VAR) is not None
+        or os.environ.get(SAMPLING_MODE_ENV_VAR) is not None
+    ):
+        return ExecutionPlan(
+            determine_execution_mode(), determine_sampling_mode(), "set by the environment"
+        )
+
+    return plan_execution(operation_type, monitor_type, columns, dtype)
+
+
+def determine_execution_mode() -> ExecutionMode:
+    print("Determining execution mode ...")
+    if os.environ.get(EXECUTION_MODE_ENV_VAR) is not None:
+        return ExecutionMode(os.environ[EXECUTION_MODE_ENV_VAR])
+    return ExecutionMode.in_memory
+
+
+def plan_execution(
+    operation_type: OperationType,
+    monitor_type: MonitorType,
+    columns: Optional[List[str]] = None,
+    dtype: Optional[Dict[str, str]] = None,
+) -> ExecutionPlan:
+    """
+    Loads the data in memory when it fits, streams it when it does not and every metric supports streaming,
+    and otherwise samples it when suggesting a baseline.
+    """
+    memory_limit = get_memory_limit()
+    estimated_size = estimate_in_memory_size(
+        get_full_paths_in_directory(get_dataset_folder_path()), columns, dtype
+    )
+    required_memory = estimated_size * IN_MEMORY_OVERHEAD
+    sizes = (
+        f"{format_size(required_memory)} needed in memory, {format_size(memory_limit)} available"
+    )
+
+    if required_memory <= memory_limit:
+        return ExecutionPlan(ExecutionMode.in_memory, None, f"the input fits in memory ({sizes})")
+
+    if supports_streaming(operation_type, monitor_type):
+        return ExecutionPlan(
+            ExecutionMode.streaming, None, f"the input does not fit in memory ({sizes})"
+        )
+
+    if operation_type == OperationType.suggest_baseline:
+        return ExecutionPlan(
+            ExecutionMode.in_memory,
+            SamplingMode.reservoir,
+            f"the input does not fit in memory ({sizes}) and some metrics do not support streaming",
+        )
+
+    return ExecutionPlan(
+        ExecutionMode.in_memory,
+        None,
+        f"the input may not fit in memory ({sizes}), but some metrics do not support streaming and "
+        "constraints must be evaluated against every row",
+    )
+
+
+def supports_streaming(operation_type: OperationType, monitor_type: MonitorType) -> bool:
+    # Time series are calculated from the whole dataset in memory.
+    if get_time_series_config() is not None:
+        return False
+    if monitor_type == MonitorType.MODEL_QUALITY:
+        return supports_streaming_for_model_quality(operation_type)
+    return supports_streaming_for_data_quality()
+
+
+def estimate_in_memory_size(
+    full_paths: List[str],
+    columns: Optional[List[str]] = None,
+    dtype: Optional[Dict[str, str]] = None,
+) -> float:
+    """
+    Estimates the size of the input once loaded: the number of rows of every file, times the size in memory of
+    a row, measured by parsing the first rows of the first file that has any.
+    """
+    row_count = sum(estimate_row_count(full_path) for full_path in full_paths)
+    if row_count == 0:
+        return 0
+
+    bytes_per_row = 0.0
+    engine = get_csv_engine()
+    for full_path in full_paths:
+        chunks = read_file_in_chunks(full_path, PLANNER_SAMPLE_ROWS, columns, dtype, engine)
+        sample = next(chunks, None)
+        chunks.close()
+        if sample is not None and len(sample.index) > 0:
+            bytes_per_row = sample.memory_usage(deep=True).sum() / len(sample.index)
+            break
+
+    print(f"Estimated {row_count:.0f} rows of {bytes_per_row:.0f} bytes in memory")
+    return row_count * bytes_per_row
+
+
+def estimate_row_count(full_path: str) -> float:
+    """
+    Exact for Parquet and Feather files, which record it. For CSV files, it is extrapolated from the number of
+    lines in the first bytes of the file, after decompression.
+    """
+    file_format = detect_file_format(full_path)
+
+    if file_format == FileFormat.parquet:
+        import pyarrow.parquet
+
+        return pyarrow.parquet.ParquetFile(full_path).metadata.num_rows
+    elif file_format == FileFormat.feather:
+        import pyarrow
+
+        with pyarrow.ipc.open_file(pyarrow.memory_map(full_path)) as reader:
+            return sum(
+                reader.get_batch(index).num_rows for index in range(reader.num_record_batches)
+            )
+
+    # For compressed files, the bytes read from the file give the compression ratio.
+    sample, bytes_read = read_sample(full_path, PLANNER_SAMPLE_BYTES)
+
+    line_count = sample.count(b"\n") + (0 if sample.endswith(b"\n") or not sample else 1)
+    if len(sample) < PLANNER_SAMPLE_BYTES:
+        # The whole file was read, minus the header.
+        return max(line_count - 1, 0)
+    return line_count * os.path.getsize(full_path) / max(bytes_read, 1)
+
+
+def read_sample(full_path: str, size: int) -> Tuple[bytes, int]:
+    """
+    Returns up to size bytes from the start of the file, decompressed, and the number of bytes of the file they
+    were read from.
+    """
+    compression = detect_compression(full_path)
+    with open(full_path, "rb") as file:
+        if compression is None:
+            sample = file.read(size)
+            return sample, len(sample)
+
+        if compression == Compression.gzip:
+            decompressor: Any = zlib.decompressobj(wbits=zlib.MAX_WBITS | GZIP_WBITS)
+        else:
+            import zstandard
+
+            decompressor = zstandard.ZstdDecompressor().decompressobj()
+
+        # Small blocks, so that the compressed size of the sample is known precisely.
+        blocks = []
+        decompressed_size = 0
+        bytes_read = 0
+        while decompressed_size < size:
+            block = file.read(COMPRESSED_BLOCK_SIZE)
+            if not block:
+                break
+            bytes_read += len(block)
+            blocks.append(decompressor.decompress(block))
+            decompressed_size += len(blocks[-1])
+        return b"".join(blocks)[:size], bytes_read
+
+
+def get_memory_limit() -> int:
+    """
+    Memory limit of the container, or the physical memory of the machine when it is not limited.
+    """
+    limits = [os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES")]
+    for path in CGROUP_MEMORY_LIMIT_PATHS:
+        try:
+            with open(path) as file:
+                value = file.read().strip()
+        except OSError:
+            continue
+        # cgroup v2 writes "max" when there is no limit.
+        if value.isdigit():
+            limits.append(int(value))
+    return min(limits)
+
+
+def format_size(size: float) -> str:
+    return f"{size / 2**30:.2f} GiB"
@@ -0,0 +1,247 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License").
+# You may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import heapq
+import math
+import os
+from typing import Any, Dict, Iterable, Optional, Union
+
+import numpy as np
+import pandas
+
+from src.monitoring_custom_metrics.constant import (
+    SAMPLING_MODE_ENV_VAR,
+    SAMPLE_SIZE_ENV_VAR,
+    SAMPLING_SEED_ENV_VAR,
+    DEFAULT_SAMPLE_SIZE,
+    DEFAULT_SAMPLING_SEED,
+    GROUND_TRUTH_ATTRIBUTE_ENV_VAR,
+)
+from src.monitoring_custom_metrics.util import validate_environment_variable
+from src.model.operation_type import OperationType
+from src.model.sampling_mode import SamplingMode
+
+SAMPLING_ATTRIBUTE = "sampling"
+# Two-sided 95% confidence.
+Z_SCORE = 1.96
+
+
+def determine_sampling_mode() -> Optional[SamplingMode]:
+    if os.environ.get(SAMPLING_MODE_ENV_VAR) is not None:
+        return SamplingMode(os.environ[SAMPLING_MODE_ENV_VAR])
+    return None
+
+
+def get_sample_size() -> int:
+    if os.environ.get(SAMPLE_SIZE_ENV_VAR) is not None:
+        sample_size = int(os.environ[SAMPLE_SIZE_ENV_VAR])
+        if sample_size <= 0:
+            raise ValueError(f"'{SAMPLE_SIZE_ENV_VAR}' must be a positive number of rows")
+        return sample_size
+    return DEFAULT_SAMPLE_SIZE
+
+
+def get_sampling_seed() -> int:
+    if os.environ.get(SAMPLING_SEED_ENV_VAR) is not None:
+        return int(os.environ[SAMPLING_SEED_ENV_VAR])
+    return DEFAULT_SAMPLING_SEED
+
+
+def sample_dataset(
+    operation_type: OperationType,
+    sampling_mode: SamplingMode,
+    chunks: Iterable[pandas.DataFrame],
+) -> pandas.DataFrame:
+    if operation_type != OperationType.suggest_baseline:
+        raise ValueError(
+            f"'{SAMPLING_MODE_ENV_VAR}' is only supported when suggesting a baseline: constraints must be "
+            "evaluated against every row."
+        )
+
+    strata_column = None
+    if sampling_mode == SamplingMode.stratified:
+        validate_environment_variable(GROUND_TRUTH_ATTRIBUTE_ENV_VAR)
+        strata_column = os.environ[GROUND_TRUTH_ATTRIBUTE_ENV_VAR]
+
+    return sample_chunks(chunks, get_sample_size(), get_sampling_seed(), strata_column)
+
+
+def sample_chunks(
+    chunks: Iterable[pandas.DataFrame],
+    sample_size: int,
+    seed: int,
+    strata_column: Optional[str] = None,
+) -> pandas.DataFrame:
+    """
+    Draws a uniform sample of sample_size rows without replacement in a single pass over chunks. Every row gets
+    a random key and the rows with the smallest keys are kept (bottom-k sampling, the vectorized equivalent of a
+    reservoir), so at most sample_size rows are held besides the current chunk. When strata_column is provided,
+    a reservoir is kept per value of that column and the sample is allocated proportionally to the value
+    counts, with at least one row per value: the column must be categorical, with at most sample_size values.
+    The rows keep their input order, and the sampling metadata is stored in the "sampling" entry of the attrs
+    of the returned DataFrame.
+    """
+    random_generator = np.random.default_rng(seed)
+    reservoirs: Dict[Any, Dict] = {}
+    population_size = 0
+
+    for chunk in chunks:
+        row_count = len(chunk.index)
+        # The index records the position of the rows in the input, to restore their order at the end.
+        chunk = chunk.set_axis(pandas.RangeIndex(population_size, population_size + row_count))
+        keys = random_generator.random(row_count)
+        population_size += row_count
+
+        if strata_column is None:
+            add_to_reservoir(reservoirs, None, chunk, keys, sample_size)
+        else:
+            strata = chunk[strata_column]
+            for stratum, positions in strata.groupby(
+                strata, sort=False, dropna=False
+            ).indices.items():
+                add_to_reservoir(
+                    reservoirs, stratum, chunk.iloc[positions], keys[positions], sample_size
+                )
+            # Checked on every chunk, before a continuous column fills a reservoir per row.
+            validate_strata_count(len(reservoirs), sample_size, strata_column)
+
+    quotas = allocate_sample(
+        {stratum: reservoir["count"] for stratum, reservoir in reservoirs.items()}, sample_size
+    )
+    selected = [
+        reservoir["rows"].iloc[
+            np.sort(np.argsort(reservoir["keys"], kind="stable")[: quotas[stratum]])
+        ]
+        for stratum, reservoir in reservoirs.items()
+    ]
+    sample = pandas.concat(selected).sort_index() if selected else pandas.DataFrame()
+    sample = sample.reset_index(drop=True)
+
+    sampling: Dict[str, Any] = {
+        "method": (
+            SamplingMode.reservoir if strata_column is None else SamplingMode.stratified
+        ).value,
+        "seed": seed,
+        "sample_size": len(sample.index),
+        "population_size": population_size,
+        "estimated_sampling_error": estimate_sampling_error(len(sample.index), population_size),
+    }
+    if strata_column is not None:
+        sampling["strata_column"] = strata_column
+    sample.attrs[SAMPLING_ATTRIBUTE] = sampling
+
+    print(f"Sampled {len(sample.index)} out of {population_size} rows")
+    return sample
+
+
+def add_to_reservoir(
+    reservoirs: Dict[Any, Dict],
+    stratum: Any,
+    rows: pandas.DataFrame,
+    keys: np.ndarray,
+    sample_size: int,
+) -> None:
+    reservoir = reservoirs.setdefault(stratum, {"count": 0, "rows": None, "keys": None})
+    reservoir["count"] += len(rows.index)
+
+    if reservoir["rows"] is not None:
+        if len(reservoir["keys"]) >= sample_size:
+            # Only rows with a smaller key than the largest kept one can enter a full reservoir.
+            candidates = keys < reservoir["keys"].max()
+            rows, keys = rows[candidates], keys[candidates]
+        rows = pandas.concat([reservoir["rows"], rows])
+        keys = np.concatenate([reservoir["keys"], keys])
+
+    if len(keys) > sample_size:
+        kept = np.sort(np.argpartition(keys, sample_size - 1)[:sample_size])
+        rows, keys = rows.iloc[kept], keys[kept]
+
+    reservoir["rows"] = rows
+    reservoir["keys"] = keys
+
+
+def validate_strata_count(strata_count: int, sample_size: int, strata_column: str) -> None:
+    if strata_count > sample_size:
+        raise ValueError(
+            f"Stratified sampling needs at most {sample_size} distinct values in column '{strata_column}': "
+            "stratify on a categorical column or use reservoir sampling."
+        )
+
+
+def allocate_sample(counts: Dict[Any, int], sample_size: int) -> Dict[Any, int]:
+    """
+    Splits sample_size between strata proportionally to their counts (largest remainder method). Every stratum
+    gets at least one row, so that rare labels are still represented in the sample, which requires at most
+    sample_size strata. The quotas add up to sample_size, or to the population size when it is smaller.
+    """
+    if len(counts) > sample_size:
+        raise ValueError(f"Can not allocate {sample_size} rows to {len(counts)} strata")
+    population_size = sum(counts.values())
+    if population_size <= sample_size:
+        return dict(counts)
+
+    shares = {stratum: sample_size * count / population_size for stratum, count in counts.items()}
+    quotas = {
+        stratum: min(count, max(1, math.floor(shares[stratum])))
+        for stratum, count in counts.items()
+    }
+
+    by_remainder = sorted(
+        counts, key=lambda stratum: shares[stratum] - quotas[stratum], reverse=True
+    )
+    remaining = sample_size - sum(quotas.values())
+    for stratum in by_remainder:
+        if remaining <= 0:
+            break
+        if quotas[stratum] < counts[stratum]:
+            quotas[stratum] += 1
+            remaining -= 1
+    # The rows given to the strata raised to one row are taken back from the largest quotas, one at a time, as
+    # a single stratum may have to give back more than one.
+    largest_quotas = [
+        (-quota, position, stratum) for position, (stratum, quota) in enumerate(quotas.items())
+    ]
+    heapq.heapify(largest_quotas)
+    while remaining < 0:
+        quota, position, stratum = heapq.heappop(largest_quotas)
+        quotas[stratum] -= 1
+        remaining += 1
+        heapq.heappush(largest_quotas, (quota + 1, position, stratum))
+    return quotas
+
+
+def estimate_sampling_error(sample_size: int, population_size: int) -> float:
+    """
+    Worst-case margin of error, at 95% confidence, of any proportion estimated from the sample (for example
+    the share of rows above a threshold), including the finite population correction.
+    """
+    if sample_size == 0 or population_size <= 1:
+        return 0.0
+    correction = (population_size - sample_size) / (population_size - 1)
+    return Z_SCORE * math.sqrt(0.25 / sample_size * correction)
+
+
+def get_sampling_weight(data: Union[pandas.Series, pandas.DataFrame]) -> Union[int, float]:
+    """
+    Number of input rows each row of data stands for: population_size / sample_size for a sample drawn by
+    sample_chunks, 1 otherwise. Metrics that add up rows, such as sum, scale their result by it.
+    """
+    sampling = data.attrs.get(SAMPLING_ATTRIBUTE)
+    if sampling is None or sampling["sample_size"] == 0:
+        return 1
+    return sampling["population_size"] / sampling["sample_size"]
+
+
+def get_sampling_metadata(data: Union[pandas.Series, pandas.DataFrame]) -> Optional[Dict]:
+    return data.attrs.get(SAMPLING_ATTRIBUTE)
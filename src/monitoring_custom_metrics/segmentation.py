@@ -0,0 +1,111 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License").
+# You may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import math
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas
+
+from src.monitoring_custom_metrics.constant import (
+    DEFAULT_MIN_SEGMENT_SIZE,
+    SEGMENT_BY_PARAMETER,
+)
+from src.model.segment_config import SegmentConfig
+
+
+def get_segment_config(config: Any) -> Optional[SegmentConfig]:
+    """
+    Reads the optional "segment_by" parameter of a model quality run, e.g.
+    {"columns": ["marketplace", "device_type"], "min_segment_size": 1000}. Returns None when the metrics are only
+    calculated over the whole dataset.
+    """
+    if not isinstance(config, dict) or config.get(SEGMENT_BY_PARAMETER) is None:
+        return None
+    segment_by = config[SEGMENT_BY_PARAMETER]
+    if not isinstance(segment_by, dict):
+        raise ValueError(f"'{SEGMENT_BY_PARAMETER}' must be an object")
+    columns = segment_by.get("columns")
+    min_segment_size = segment_by.get("min_segment_size", DEFAULT_MIN_SEGMENT_SIZE)
+    if (
+        not isinstance(columns, list)
+        or len(columns) == 0
+        or not all(isinstance(column, str) for column in columns)
+    ):
+        raise ValueError(
+            f"'{SEGMENT_BY_PARAMETER}' columns must be a non-empty list of column names"
+        )
+    if not isinstance(min_segment_size, int) or min_segment_size < 1:
+        raise ValueError(f"'{SEGMENT_BY_PARAMETER}' min_segment_size must be a positive integer")
+    return SegmentConfig(columns, min_segment_size)
+
+
+def split_segments(
+    df: pandas.DataFrame, columns: List[str]
+) -> List[Tuple[Dict[str, Any], pandas.DataFrame]]:
+    """
+    Splits the rows by the values of the segment columns. Segments are ordered by their values, missing values last.
+    """
+    if len(df.index) == 0:
+        return []
+
+    codes = df.groupby(columns, sort=True, dropna=False).ngroup().to_numpy()
+    groups = split_by_codes(df, codes)
+    return [
+        (get_segment(segment_df[columns].iloc[0].to_dict()), segment_df)
+        for code, segment_df in groups
+    ]
+
+
+def split_by_codes(df: pandas.DataFrame, codes: np.ndarray) -> List[Tuple[int, pandas.DataFrame]]:
+    """
+    Splits the rows by a non-negative integer code, in one pass: the rows are sorted by code with a single stable
+    sort, and every group is a contiguous slice of the sorted rows, instead of being selected with a mask over the
+    whole dataset. Returns the code and the rows of every code that has any, by increasing code. The codes must be
+    dense, numbered from 0, as one count is allocated for every code up to the largest.
+    """
+    counts = np.bincount(codes)
+    stops = np.cumsum(counts)
+    starts = stops - counts
+    sorted_df = df.take(np.argsort(codes, kind="stable"))
+    return [
+        (int(code), sorted_df.iloc[starts[code] : stops[code]]) for code in np.flatnonzero(counts)
+    ]
+
+
+def get_segment(values: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Converts the values of a segment to JSON values: NumPy scalars to Python ones and missing values to None.
+    """
+    segment = {}
+    for column, value in values.items():
+        if isinstance(value, np.generic):
+            value = value.item()
+        if value is None or (isinstance(value, float) and math.isnan(value)) or value is pandas.NaT:
+            value = None
+        elif not isinstance(value, (str, int, float, bool)):
+            value = str(value)
+        segment[column] = value
+    return segment
+
+
+def get_segment_key(segment: Dict[str, Any]) -> str:
+    """
+    Identifies a segment in the baseline constraints and in the streaming state. Values are compared as strings, so
+    that a segment read back from a JSON file matches the values of the data.
+    """
+    return json.dumps(
+        [[column, None if value is None else str(value)] for column, value in segment.items()]
+    )
@@ -0,0 +1,105 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License").
+# You may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+from typing import List, Optional, Tuple
+
+import numpy as np
+import pandas
+from pandas.api.types import is_datetime64_any_dtype, is_numeric_dtype
+
+from src.monitoring_custom_metrics.constant import (
+    DEFAULT_TIME_BUCKET,
+    TIME_BUCKET_ENV_VAR,
+    TIME_COLUMN_ENV_VAR,
+)
+from src.monitoring_custom_metrics.segmentation import split_by_codes
+from src.model.time_series_config import TimeSeriesConfig
+
+
+def get_time_series_config() -> Optional[TimeSeriesConfig]:
+    """
+    Reads the event time column and the bucket duration (a pandas duration such as "5min" or "1h") of the time
+    series. Returns None when the metrics are only calculated over the whole dataset.
+    """
+    if os.environ.get(TIME_COLUMN_ENV_VAR) is None:
+        return None
+    try:
+        bucket = pandas.Timedelta(os.environ.get(TIME_BUCKET_ENV_VAR, DEFAULT_TIME_BUCKET))
+    except ValueError:
+        bucket = None
+    if bucket is None or bucket <= pandas.Timedelta(0):
+        raise ValueError(
+            f"'{TIME_BUCKET_ENV_VAR}' must be a positive duration, such as '5min' or '1h'"
+        )
+    return TimeSeriesConfig(os.environ[TIME_COLUMN_ENV_VAR], bucket)
+
+
+def validate_time_series_execution(data) -> Optional[TimeSeriesConfig]:
+    """
+    Returns the time series configuration, after checking that the data is evaluated in memory.
+    """
+    time_series_config = get_time_series_config()
+    if time_series_config is not None and not isinstance(data, pandas.DataFrame):
+        raise ValueError(
+            f"'{TIME_COLUMN_ENV_VAR}' is only supported when the data is evaluated in memory"
+        )
+    return time_series_config
+
+
+def get_event_times(column: pandas.Series) -> np.ndarray:
+    """
+    Parses the event times to nanoseconds since the epoch, in UTC. Numbers are seconds since the epoch. Missing and
+    invalid times are NaT.
+    """
+    if is_datetime64_any_dtype(column.dtype):
+        times = pandas.to_datetime(column, utc=True)
+    elif is_numeric_dtype(column.dtype):
+        times = pandas.to_datetime(column, unit="s", utc=True, errors="coerce")
+    else:
+        times = pandas.to_datetime(column, utc=True, errors="coerce", format="ISO8601")
+    return times.to_numpy(dtype="datetime64[ns]").view(np.int64)
+
+
+def split_time_buckets(
+    df: pandas.DataFrame, time_series_config: TimeSeriesConfig
+) -> List[Tuple[str, pandas.DataFrame]]:
+    """
+    Splits the rows by time bucket, with one sort of the rows by bucket. Buckets are aligned on the epoch, so that
+    the buckets of consecutive jobs line up. Returns the start of every bucket that has rows, in ISO 8601 format, and
+    its rows, by increasing start. Rows without a valid event time are not in any bucket.
+    """
+    if len(df.index) == 0:
+        return []
+
+    times = get_event_times(df[time_series_config.time_column])
+    valid = times != np.iinfo(np.int64).min
+    if not valid.all():
+        print(f"Skipping {np.count_nonzero(~valid)} rows without a valid event time.")
+        df = df[valid]
+        times = times[valid]
+    if len(times) == 0:
+        return []
+
+    # Numbered densely, so that an outlier time far from the others does not allocate the buckets in between.
+    buckets, codes = np.unique(times // time_series_config.bucket.value, return_inverse=True)
+    return [
+        (
+            pandas.Timestamp(
+                int(buckets[code]) * time_series_config.bucket.value, tz="UTC"
+            ).isoformat(),
+            bucket_df,
+        )
+        for code, bucket_df in split_by_codes(df, codes)
+    ]
@@ -14,7 +14,10 @@
 
 import json
 import os
-from typing import Any, List
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor
+from functools import partial
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, Type
 
 import pandas
 import pandas as pd
@@ -22,7 +25,33 @@ import pandas as pd
 from src.monitoring_custom_metrics.constant import (
     DATASET_SOURCE_ENV_VAR,
     DEFAULT_DATA_PATH,
+    DEFAULT_CHUNK_SIZE,
+    READER_WORKERS_ENV_VAR,
+    CSV_ENGINE_ENV_VAR,
 )
+from src.model.compression import Compression
+from src.model.csv_engine import CsvEngine
+from src.model.file_format import FileFormat
+
+FILE_FORMAT_BY_EXTENSION = {
+    ".csv": FileFormat.csv,
+    ".parquet": FileFormat.parquet,
+    ".pq": FileFormat.parquet,
+    ".feather": FileFormat.feather,
+    ".arrow": FileFormat.feather,
+    ".ipc": FileFormat.feather,
+}
+COMPRESSION_BY_EXTENSION = {
+    ".gz": Compression.gzip,
+    ".gzip": Compression.gzip,
+    ".zst": Compression.zstd,
+    ".zstd": Compression.zstd,
+}
+PARQUET_MAGIC_BYTES = b"PAR1"
+ARROW_MAGIC_BYTES = b"ARROW1"
+GZIP_MAGIC_BYTES = b"\x1f\x8b"
+ZSTD_MAGIC_BYTES = b"\x28\xb5\x2f\xfd"
+ARROW_TYPE_NAME_BY_DTYPE = {"Int64": "int64", "float64": "float64", "string": "string"}
 
 
 def retrieve_json_file_in_path(path) -> Any:
@@ -44,35 +73,460 @@ def retrieve_json_file(file_path) -> Any:
     return result
 
 
-def get_dataframe_from_csv(path=None) -> pandas.DataFrame:
-    folder_path: str = ""
+def get_dataset_folder_path(path=None) -> str:
     if os.environ.get(DATASET_SOURCE_ENV_VAR) is not None:
-        folder_path = os.environ[DATASET_SOURCE_ENV_VAR]
+        return os.environ[DATASET_SOURCE_ENV_VAR]
     elif path is not None:
-        folder_path = path
+        return path
     else:
-        folder_path = DEFAULT_DATA_PATH
+        return DEFAULT_DATA_PATH
+
 
-    print(f"Retrieving data from path: {folder_path}")
+def get_dataframe_from_csv(
+    path=None, columns: Optional[List[str]] = None, dtype: Optional[Dict[str, str]] = None
+) -> pandas.DataFrame:
+    """
+    Loads every input file into a single DataFrame. Despite the name, Parquet and Feather (Arrow IPC) files are
+    supported as well. When columns is provided, only those columns are read from the files. When dtype is
+    provided, CSV columns listed in it are parsed with that type instead of having it inferred.
+    """
+    folder_path: str = get_dataset_folder_path(path)
+    workers: int = get_reader_workers()
+    engine: CsvEngine = get_csv_engine()
 
-    filenames: List[str] = get_files_in_directory(folder_path)
-    data_frames = []
+    print(f"Retrieving data from path: {folder_path} using {workers} worker(s)")
 
-    for filename in filenames:
-        full_path = os.path.join(folder_path, filename)
-        print(f"  Reading data from file: {folder_path}")
-        data_frames.append(pd.read_csv(full_path))
+    full_paths = get_full_paths_in_directory(folder_path)
+    data_frames = list(
+        map_in_order(
+            partial(read_file, columns=columns, dtype=dtype, engine=engine), full_paths, workers
+        )
+    )
 
     print(f"Finished retrieving data from path: {folder_path}")
     return pd.concat(data_frames)
 
 
+def get_dataframe_chunks_from_csv(
+    path=None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    columns: Optional[List[str]] = None,
+    dtype: Optional[Dict[str, str]] = None,
+) -> Iterator[pandas.DataFrame]:
+    """
+    Streaming counterpart of get_dataframe_from_csv: yields DataFrames of at most chunk_size rows, one file
+    after another, so that only a single chunk is held in memory at any time. When several reader workers are
+    configured, whole files are parsed in parallel instead, and at most two files per worker are held in memory.
+    """
+    folder_path: str = get_dataset_folder_path(path)
+    workers: int = get_reader_workers()
+    engine: CsvEngine = get_csv_engine()
+
+    print(f"Streaming data from path: {folder_path} in chunks of {chunk_size} rows")
+
+    full_paths = get_full_paths_in_directory(folder_path)
+
+    if workers > 1 and len(full_paths) > 1:
+        read_function = partial(read_file, columns=columns, dtype=dtype, engine=engine)
+        for df in map_in_order(read_function, full_paths, workers):
+            for start in range(0, len(df.index), chunk_size):
+                yield df.iloc[start : start + chunk_size]
+    else:
+        for full_path in full_paths:
+            yield from read_file_in_chunks(full_path, chunk_size, columns, dtype, engine)
+
+    print(f"Finished streaming data from path: {folder_path}")
+
+
+def get_file_chunks_from_csv(
+    path=None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    columns: Optional[List[str]] = None,
+    dtype: Optional[Dict[str, str]] = None,
+) -> Iterator[Tuple[str, Iterator[pandas.DataFrame]]]:
+    """
+    Yields the path of every input file with a lazy iterator over its chunks: a file is only read when its
+    chunks are iterated, so callers can skip files they already processed.
+    """
+    folder_path: str = get_dataset_folder_path(path)
+    engine: CsvEngine = get_csv_engine()
+
+    print(f"Listing files in path: {folder_path}")
+
+    for full_path in get_full_paths_in_directory(folder_path):
+        yield full_path, read_file_in_chunks(full_path, chunk_size, columns, dtype, engine)
+
+
+def detect_file_format(full_path: str) -> FileFormat:
+    root, extension = os.path.splitext(full_path.lower())
+    compression = detect_compression(full_path)
+    if compression is not None:
+        # Parquet and Feather compress their pages internally and need random access, so only CSV files are
+        # read through a decompressing stream.
+        if extension in COMPRESSION_BY_EXTENSION:
+            extension = os.path.splitext(root)[1]
+        if FILE_FORMAT_BY_EXTENSION.get(extension, FileFormat.csv) != FileFormat.csv:
+            raise ValueError(
+                f"File {full_path} is {compression.value} compressed. Only CSV files can be compressed."
+            )
+        return FileFormat.csv
+
+    if extension in FILE_FORMAT_BY_EXTENSION:
+        return FILE_FORMAT_BY_EXTENSION[extension]
+
+    magic_bytes = read_magic_bytes(full_path)
+    if magic_bytes.startswith(PARQUET_MAGIC_BYTES):
+        return FileFormat.parquet
+    if magic_bytes == ARROW_MAGIC_BYTES:
+        return FileFormat.feather
+    return FileFormat.csv
+
+
+def detect_compression(full_path: str) -> Optional[Compression]:
+    extension = os.path.splitext(full_path)[1].lower()
+    if extension in COMPRESSION_BY_EXTENSION:
+        return COMPRESSION_BY_EXTENSION[extension]
+    if extension in FILE_FORMAT_BY_EXTENSION:
+        return None
+
+    magic_bytes = read_magic_bytes(full_path)
+    if magic_bytes.startswith(GZIP_MAGIC_BYTES):
+        return Compression.gzip
+    if magic_bytes.startswith(ZSTD_MAGIC_BYTES):
+        return Compression.zstd
+    return None
+
+
+def read_magic_bytes(full_path: str) -> bytes:
+    with open(full_path, "rb") as file:
+        return file.read(len(ARROW_MAGIC_BYTES))
+
+
+def read_file(
+    full_path: str,
+    columns: Optional[List[str]] = None,
+    dtype: Optional[Dict[str, str]] = None,
+    engine: CsvEngine = CsvEngine.c,
+) -> pandas.DataFrame:
+    print(f"  Reading data from file: {full_path}")
+    file_format = detect_file_format(full_path)
+
+    if file_format == FileFormat.parquet:
+        return pd.read_parquet(full_path, columns=columns)
+    elif file_format == FileFormat.feather:
+        return pd.read_feather(full_path, columns=columns)
+
+    read_csv = read_csv_with_pyarrow if engine == CsvEngine.pyarrow else read_csv_with_pandas
+    if dtype is not None:
+        try:
+            return read_csv(full_path, columns, dtype)
+        except (TypeError, ValueError) as error:
+            print(
+                f"  Could not parse {full_path} with the provided types ({error}), inferring them"
+            )
+
+    return read_csv(full_path, columns)
+
+
+def read_csv_with_pandas(
+    full_path: str, columns: Optional[List[str]] = None, dtype: Optional[Dict[str, str]] = None
+) -> pandas.DataFrame:
+    options = get_csv_options(columns, dtype, detect_compression(full_path))
+    return pd.read_csv(full_path, **options)
+
+
+def read_csv_with_pyarrow(
+    full_path: str, columns: Optional[List[str]] = None, dtype: Optional[Dict[str, str]] = None
+) -> pandas.DataFrame:
+    """
+    Parses a CSV file with the multithreaded Arrow reader. String columns are kept Arrow-backed
+    (string[pyarrow]) rather than being converted to Python objects.
+    """
+    import pyarrow.csv
+
+    convert_options = get_arrow_convert_options(columns, dtype)
+    with open_arrow_input_stream(full_path) as source:
+        table = pyarrow.csv.read_csv(source, convert_options=convert_options)
+
+    overrides = get_arrow_type_overrides(table.schema)
+    if overrides:
+        # Re-read with the original text of the columns Arrow parsed differently than pandas would.
+        convert_options.column_types = {**convert_options.column_types, **overrides}
+        with open_arrow_input_stream(full_path) as source:
+            table = pyarrow.csv.read_csv(source, convert_options=convert_options)
+
+    return arrow_table_to_pandas(table, dtype)
+
+
+def read_file_in_chunks(
+    full_path: str,
+    chunk_size: int,
+    columns: Optional[List[str]] = None,
+    dtype: Optional[Dict[str, str]] = None,
+    engine: CsvEngine = CsvEngine.c,
+) -> Iterator[pandas.DataFrame]:
+    print(f"  Reading data from file: {full_path}")
+    file_format = detect_file_format(full_path)
+
+    if file_format == FileFormat.parquet:
+        import pyarrow.parquet
+
+        parquet_file = pyarrow.parquet.ParquetFile(full_path)
+        for batch in parquet_file.iter_batches(batch_size=chunk_size, columns=columns):
+            yield batch.to_pandas()
+    elif file_format == FileFormat.feather:
+        import pyarrow
+
+        with pyarrow.ipc.open_file(pyarrow.memory_map(full_path)) as reader:
+            for index in range(reader.num_record_batches):
+                batch = reader.get_batch(index)
+                if columns is not None:
+                    batch = batch.select(columns)
+                for start in range(0, batch.num_rows, chunk_size):
+                    yield batch.slice(start, chunk_size).to_pandas()
+    elif engine == CsvEngine.pyarrow:
+        yield from read_csv_in_chunks_with_pyarrow(full_path, chunk_size, columns, dtype)
+    else:
+        # Compressed files are decompressed while parsing, one chunk at a time.
+        compression = detect_compression(full_path)
+        rows_read = 0
+        if dtype is not None:
+            try:
+                options = get_csv_options(columns, dtype, compression)
+                with pd.read_csv(full_path, chunksize=chunk_size, **options) as reader:
+                    for chunk in reader:
+                        rows_read += len(chunk.index)
+                        yield chunk
+                return
+            except (TypeError, ValueError) as error:
+                print(
+                    f"  Could not parse {full_path} with the provided types ({error}), "
+                    f"inferring them after row {rows_read}"
+                )
+
+        options = get_csv_options(columns, compression=compression)
+        if rows_read > 0:
+            # Resume after the rows already returned; the header line is kept.
+            options["skiprows"] = range(1, rows_read + 1)
+        with pd.read_csv(full_path, chunksize=chunk_size, **options) as reader:
+            for chunk in reader:
+                yield chunk
+
+
+def read_csv_in_chunks_with_pyarrow(
+    full_path: str,
+    chunk_size: int,
+    columns: Optional[List[str]] = None,
+    dtype: Optional[Dict[str, str]] = None,
+) -> Iterator[pandas.DataFrame]:
+    """
+    Streams a CSV file with the Arrow reader. Arrow infers the column types from the first block of the file,
+    so when a later block does not match them (or the provided dtype), the rest of the file is read again with
+    the types inferred from that point on, like the pandas reader does.
+    """
+    import pyarrow
+    import pyarrow.csv
+
+    rows_read = 0
+    column_types = dtype
+    while True:
+        first_row = rows_read
+        read_options = pyarrow.csv.ReadOptions(skip_rows_after_names=rows_read)
+        convert_options = get_arrow_convert_options(columns, column_types)
+        source = reader = None
+        batches: List = []
+        pending_rows = 0
+        try:
+            source = open_arrow_input_stream(full_path)
+            reader = pyarrow.csv.open_csv(
+                source, read_options=read_options, convert_options=convert_options
+            )
+            overrides = get_arrow_type_overrides(reader.schema)
+            if overrides:
+                reader.close()
+                source.close()
+                convert_options.column_types = {**convert_options.column_types, **overrides}
+                source = open_arrow_input_stream(full_path)
+                reader = pyarrow.csv.open_csv(
+                    source, read_options=read_options, convert_options=convert_options
+                )
+
+            for batch in reader:
+                batches.append(batch)
+                pending_rows += batch.num_rows
+                if pending_rows >= chunk_size:
+                    table = pyarrow.Table.from_batches(batches, schema=reader.schema)
+                    full_rows = pending_rows - pending_rows % chunk_size
+                    for start in range(0, full_rows, chunk_size):
+                        yield arrow_table_to_pandas(
+                            table.slice(start, chunk_size), dtype, rows_read + start
+                        )
+                    rows_read += full_rows
+                    batches = table.slice(full_rows).to_batches()
+                    pending_rows -= full_rows
+        except (TypeError, ValueError) as error:
+            if rows_read + pending_rows == first_row and column_types is None:
+                # Nothing could be parsed with freshly inferred types: the file itself is malformed.
+                raise
+            print(
+                f"  Could not parse {full_path} with the current types ({error}), "
+                f"inferring them again after row {rows_read + pending_rows}"
+            )
+            column_types = None
+            # The rows that were already parsed are kept and the rest of the file is read again.
+            if pending_rows > 0:
+                table = pyarrow.Table.from_batches(batches, schema=reader.schema)
+                yield arrow_table_to_pandas(table, dtype, rows_read)
+                rows_read += pending_rows
+            continue
+        finally:
+            if reader is not None:
+                reader.close()
+            if source is not None:
+                source.close()
+
+        if pending_rows > 0:
+            table = pyarrow.Table.from_batches(batches, schema=reader.schema)
+            yield arrow_table_to_pandas(table, dtype, rows_read)
+        return
+
+
+def open_arrow_input_stream(full_path: str) -> Any:
+    import pyarrow
+
+    compression = detect_compression(full_path)
+    return pyarrow.input_stream(
+        full_path, compression=compression.value if compression is not None else None
+    )
+
+
+def get_arrow_convert_options(
+    columns: Optional[List[str]] = None, dtype: Optional[Dict[str, str]] = None
+) -> Any:
+    import pyarrow
+    import pyarrow.csv
+
+    # Empty strings are missing values, as they are for the pandas reader.
+    convert_options = pyarrow.csv.ConvertOptions(strings_can_be_null=True)
+    if columns is not None:
+        convert_options.include_columns = columns
+    if dtype is not None:
+        convert_options.column_types = {
+            name: pyarrow.type_for_alias(ARROW_TYPE_NAME_BY_DTYPE.get(column_dtype, column_dtype))
+            for name, column_dtype in dtype.items()
+        }
+    return convert_options
+
+
+def get_arrow_type_overrides(schema: Any) -> Dict[str, Any]:
+    """
+    Arrow parses dates and timestamps, and types all-empty columns as null, while pandas keeps the former as
+    strings and reads the latter as missing numbers. Returns the types that make both readers agree.
+    """
+    import pyarrow
+
+    overrides = {}
+    for field in schema:
+        if pyarrow.types.is_temporal(field.type):
+            overrides[field.name] = pyarrow.string()
+        elif pyarrow.types.is_null(field.type):
+            overrides[field.name] = pyarrow.float64()
+    return overrides
+
+
+def arrow_table_to_pandas(
+    table: Any, dtype: Optional[Dict[str, str]] = None, start: int = 0
+) -> pandas.DataFrame:
+    import pyarrow
+
+    string_dtype = pd.StringDtype("pyarrow")
+    df = table.to_pandas(
+        types_mapper={pyarrow.string(): string_dtype, pyarrow.large_string(): string_dtype}.get
+    )
+    for name, column_dtype in (dtype or {}).items():
+        if column_dtype == "Int64" and name in df.columns:
+            # Converted from Arrow directly: going through float64 would lose large integers.
+            df[name] = table.column(name).to_pandas(
+                types_mapper={pyarrow.int64(): pd.Int64Dtype()}.get
+            )
+    # Continue the index across chunks, as the pandas reader does.
+    df.index = pd.RangeIndex(start, start + len(df.index))
+    return df
+
+
+def get_csv_options(
+    columns: Optional[List[str]] = None,
+    dtype: Optional[Dict[str, str]] = None,
+    compression: Optional[Compression] = None,
+) -> dict:
+    options: dict = {}
+    if columns is not None:
+        options["usecols"] = columns
+    if dtype is not None:
+        options["dtype"] = dtype
+    if compression is not None:
+        options["compression"] = compression.value
+    return options
+
+
+def map_in_order(
+    function: Callable,
+    items: List,
+    workers: int,
+    executor_class: Type[Executor] = ProcessPoolExecutor,
+) -> Iterator:
+    """
+    Applies function to every item and yields the results in the order of items. With more than one worker, the
+    calls run in a pool of executor_class with at most two pending results per worker, so that results are
+    consumed as they are produced instead of piling up in memory.
+    """
+    if workers <= 1 or len(items) <= 1:
+        for item in items:
+            yield function(item)
+        return
+
+    max_pending = workers * 2
+    with executor_class(max_workers=min(workers, len(items))) as executor:
+        pending: deque = deque()
+        for item in items:
+            pending.append(executor.submit(function, item))
+            if len(pending) >= max_pending:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def get_csv_engine() -> CsvEngine:
+    if os.environ.get(CSV_ENGINE_ENV_VAR) is not None:
+        return CsvEngine(os.environ[CSV_ENGINE_ENV_VAR])
+    return CsvEngine.c
+
+
+def get_reader_workers() -> int:
+    return get_workers(READER_WORKERS_ENV_VAR, "1")
+
+
+def get_workers(env_var: str, default: str) -> int:
+    value = os.environ.get(env_var, default)
+    if value == "auto":
+        return os.cpu_count() or 1
+    workers = int(value)
+    if workers <= 0:
+        raise ValueError(f"'{env_var}' must be a positive number or 'auto'")
+    return workers
+
+
+def get_full_paths_in_directory(folder_path: str) -> List[str]:
+    return [os.path.join(folder_path, filename) for filename in get_files_in_directory(folder_path)]
+
+
 def get_first_file_from_directory(path) -> Any:
-    return os.listdir(path)[0]
+    return get_files_in_directory(path)[0]
 
 
 def get_files_in_directory(path) -> List[str]:
-    return os.listdir(path)
+    # Sorted, as the order of os.listdir depends on the filesystem: the files are read and concatenated in this order.
+    return sorted(os.listdir(path))
 
 
 def validate_environment_variable(env_var_name):
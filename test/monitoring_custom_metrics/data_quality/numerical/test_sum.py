@@ -67,3 +67,38 @@ class TestSum(unittest.TestCase):
         statistics = EXPECTED_SUM
         suggested_baseline = instance.suggest_constraints(statistics, DF["Age"], None)
         self.assertEqual(CONSTRAINT_NO_VIOLATION_NO_BASELINE_PROVIDED, suggested_baseline)
+
+    def test_accumulate_matches_calculate_statistics(self):
+        accumulator = instance.create_accumulator()
+        accumulator = instance.accumulate(accumulator, DF["Age"].iloc[:1])
+        accumulator = instance.accumulate(accumulator, DF["Age"].iloc[1:])
+        self.assertEqual(EXPECTED_SUM, instance.finalize(accumulator))
+
+    def test_merge_accumulators(self):
+        first = instance.accumulate(instance.create_accumulator(), DF["Age"].iloc[:2])
+        second = instance.accumulate(instance.create_accumulator(), DF["Age"].iloc[2:])
+        merged = instance.merge_accumulators(first, second)
+        self.assertEqual(EXPECTED_SUM, instance.finalize(merged))
+
+    def test_calculate_statistics_for_sample(self):
+        sample = DF.copy()
+        sample.attrs["sampling"] = {"sample_size": 4, "population_size": 10}
+        self.assertEqual(EXPECTED_SUM * 2.5, instance.calculate_statistics(sample["Age"]))
+
+    def test_calculate_statistics_batch_matches_calculate_statistics(self):
+        frame = pd.DataFrame(
+            {
+                "Age": DF["Age"],
+                "Score": [1.5, None, 2.5, 4.0],
+                "Count": pd.array([1, None, 3, 4], dtype="Int64"),
+            }
+        )
+        frame.attrs["sampling"] = {"sample_size": 4, "population_size": 10}
+
+        statistics = instance.calculate_statistics_batch(frame)
+
+        self.assertEqual(["Age", "Score", "Count"], sorted(statistics, key=list(frame).index))
+        for column_name in frame.columns:
+            expected = instance.calculate_statistics(frame[column_name])
+            self.assertEqual(expected, statistics[column_name])
+            self.assertEqual(type(expected), type(statistics[column_name]))
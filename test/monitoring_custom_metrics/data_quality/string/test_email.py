@@ -60,3 +60,27 @@ class TestEmail(unittest.TestCase):
         statistics = True
         suggested_baseline = instance.suggest_constraints(statistics, DF["Name"], None)
         self.assertEqual(CONSTRAINT_NO_VIOLATION, suggested_baseline)
+
+    def test_accumulate_matches_calculate_statistics(self):
+        accumulator = instance.create_accumulator()
+        accumulator = instance.accumulate(accumulator, DF["Name"].iloc[:2])
+        self.assertFalse(instance.finalize(accumulator))
+        accumulator = instance.accumulate(accumulator, DF["Name"].iloc[2:])
+        self.assertEqual(EXPECTED_STATISTIC, instance.finalize(accumulator))
+
+    def test_merge_accumulators(self):
+        first = instance.accumulate(instance.create_accumulator(), DF["Name"].iloc[:2])
+        second = instance.accumulate(instance.create_accumulator(), DF["Name"].iloc[2:])
+        self.assertTrue(instance.finalize(instance.merge_accumulators(first, second)))
+        self.assertFalse(instance.finalize(instance.merge_accumulators(first, first)))
+
+    def test_calculate_statistics_with_missing_values(self):
+        column = pd.Series(["mike", None, "sarah"], dtype="string")
+        self.assertFalse(instance.calculate_statistics(column))
+        column = pd.Series([None, "sam@gmail.com"], dtype="string")
+        self.assertTrue(instance.calculate_statistics(column))
+
+    def test_calculate_statistics_with_arrow_strings(self):
+        column = DF["Name"].astype("string[pyarrow]")
+        self.assertEqual(EXPECTED_STATISTIC, instance.calculate_statistics(column))
+        self.assertFalse(instance.calculate_statistics(column.iloc[:3]))
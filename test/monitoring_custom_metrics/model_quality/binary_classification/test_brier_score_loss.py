@@ -12,14 +12,19 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import numpy as np
 import pandas as pd
 import pytest  # noqa
 import unittest
+from sklearn.metrics import brier_score_loss
+
+from src.model.bootstrap_config import BootstrapConfig
 
 from src.model.model_quality_attributes import ModelQualityAttributes
 from src.monitoring_custom_metrics.model_quality.binary_classification.brier_score_loss import (
     instance,
 )
+from src.monitoring_custom_metrics.model_quality.bootstrap import get_poisson_weights
 
 predictions = [0.9, 0.3, 0.8, 0.75, 0.65, 0.6, 0.78, 0.7, 0.05, 0.4, 0.4, 0.05, 0.5, 0.1, 0.1]
 actuals = [1, 1, 1, 1, 1, 1, 0, 0, 0, 0, 0, 0, 0, 0, 0]
@@ -66,6 +71,39 @@ class TestCustomMetric(unittest.TestCase):
         statistic = instance.calculate_statistics(DF, CONFIG, MODEL_QUALITY_ATTRIBUTES)
         self.assertEqual(EXPECTED_STATISTIC, statistic)
 
+    def test_calculate_statistics_with_bootstrap(self):
+        config = {**CONFIG, "bootstrap": {"replicates": 200, "seed": 1}}
+
+        statistic = instance.calculate_statistics(DF, config, MODEL_QUALITY_ATTRIBUTES)
+
+        self.assertEqual(EXPECTED_STATISTIC["value"], statistic["value"])
+        self.assertGreater(statistic["standard_deviation"], 0)
+        confidence_interval = statistic["confidence_interval"]
+        self.assertEqual(0.95, confidence_interval["confidence_level"])
+        self.assertLess(confidence_interval["lower"], confidence_interval["upper"])
+        self.assertEqual(
+            statistic, instance.calculate_statistics(DF, config, MODEL_QUALITY_ATTRIBUTES)
+        )
+
+    def test_bootstrap_matches_weighted_brier_score_loss(self):
+        bootstrap_config = BootstrapConfig(50, 0.95, 2)
+        # 15 rows fit in a single chunk.
+        weights = get_poisson_weights(bootstrap_config, 0, len(DF))
+        replicate_values = np.array(
+            [
+                brier_score_loss(actuals, predictions, sample_weight=sample_weight)
+                for sample_weight in weights
+            ]
+        )
+
+        statistic = instance.calculate_statistics(
+            DF, {**CONFIG, "bootstrap": {"replicates": 50, "seed": 2}}, MODEL_QUALITY_ATTRIBUTES
+        )
+
+        self.assertEqual(
+            round(float(np.std(replicate_values, ddof=1)), 4), statistic["standard_deviation"]
+        )
+
     def test_evaluate_constraints(self):
         no_violation = instance.evaluate_constraints(
             EXPECTED_STATISTIC, DF, CONFIG, CONSTRAINT_NO_VIOLATION, MODEL_QUALITY_ATTRIBUTES
@@ -85,3 +123,42 @@ class TestCustomMetric(unittest.TestCase):
         )
         self.assertEqual(CONSTRAINT_NO_VIOLATION, suggested_baseline)
         self.assertEqual(CONSTRAINT_WITH_VIOLATION, suggested_baseline_w_override)
+
+    def test_accumulate_matches_calculate_statistics(self):
+        accumulator = instance.create_accumulator(CONFIG, MODEL_QUALITY_ATTRIBUTES)
+        for start in range(0, len(DF), 4):
+            accumulator = instance.accumulate(
+                accumulator, DF.iloc[start : start + 4], CONFIG, MODEL_QUALITY_ATTRIBUTES
+            )
+        statistic = instance.finalize(accumulator, CONFIG, MODEL_QUALITY_ATTRIBUTES)
+        self.assertEqual(EXPECTED_STATISTIC, statistic)
+
+    def test_merge_accumulators(self):
+        first = instance.accumulate(
+            instance.create_accumulator(CONFIG, MODEL_QUALITY_ATTRIBUTES),
+            DF.iloc[:7],
+            CONFIG,
+            MODEL_QUALITY_ATTRIBUTES,
+        )
+        second = instance.accumulate(
+            instance.create_accumulator(CONFIG, MODEL_QUALITY_ATTRIBUTES),
+            DF.iloc[7:],
+            CONFIG,
+            MODEL_QUALITY_ATTRIBUTES,
+        )
+        merged = instance.merge_accumulators(first, second)
+        statistic = instance.finalize(merged, CONFIG, MODEL_QUALITY_ATTRIBUTES)
+        self.assertEqual(EXPECTED_STATISTIC, statistic)
+
+    def test_without_data(self):
+        with self.assertRaises(ValueError) as context:
+            instance.finalize(
+                instance.create_accumulator(CONFIG, MODEL_QUALITY_ATTRIBUTES),
+                CONFIG,
+                MODEL_QUALITY_ATTRIBUTES,
+            )
+        self.assertEqual(
+            "Metric brier_score_loss needs at least one sample", str(context.exception)
+        )
+        with self.assertRaises(ValueError):
+            instance.calculate_statistics(DF.iloc[:0], CONFIG, MODEL_QUALITY_ATTRIBUTES)
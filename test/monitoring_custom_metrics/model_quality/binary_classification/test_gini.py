@@ -12,14 +12,17 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import numpy as np
 import pandas as pd
 import pytest  # noqa
 import unittest
+from sklearn.metrics import roc_auc_score
 
 from src.model.model_quality_attributes import ModelQualityAttributes
 from src.monitoring_custom_metrics.model_quality.binary_classification.gini import (
     instance,
 )
+from src.monitoring_custom_metrics.model_quality.model_quality_context import ModelQualityContext
 
 predictions = [0.9, 0.3, 0.8, 0.75, 0.65, 0.6, 0.78, 0.7, 0.05, 0.4, 0.4, 0.05, 0.5, 0.1, 0.1]
 actuals = [1, 1, 1, 1, 1, 1, 0, 0, 0, 0, 0, 0, 0, 0, 0]
@@ -61,11 +64,125 @@ MODEL_QUALITY_ATTRIBUTES = ModelQualityAttributes(
 )
 
 
+def groupby_gini(df: pd.DataFrame) -> float:
+    # Previous implementation of the binned gini, kept as a reference for the vectorized one.
+    actual = GROUND_TRUTH_ATTRIBUTE
+    df = df.copy()
+    n_bins = 5 if len(df) < 100 else 10
+    df["bins"] = pd.qcut(df[PROBABILITY_ATTRIBUTE], n_bins, labels=False, duplicates="drop")
+
+    def agg_func(x):
+        agg_metrics = dict()
+        agg_metrics["total_cnt"] = x[actual].count()
+        agg_metrics["pos_cnt"] = x[actual].sum()
+        agg_metrics["neg_cnt"] = agg_metrics["total_cnt"] - agg_metrics["pos_cnt"]
+        return pd.Series(agg_metrics, index=["total_cnt", "pos_cnt", "neg_cnt"])
+
+    df_grouped = df.groupby("bins")[[actual]].apply(agg_func).reset_index()
+    df_grouped.sort_values("bins", ascending=False, inplace=True)
+
+    df_grouped["cum_pos_pct"] = df_grouped["pos_cnt"].cumsum() / df_grouped["pos_cnt"].sum()
+    df_grouped["cum_pos_pct_lag"] = df_grouped["cum_pos_pct"].shift(1, fill_value=0)
+    df_grouped["cum_neg_pct"] = df_grouped["neg_cnt"].cumsum() / df_grouped["neg_cnt"].sum()
+    df_grouped["cum_neg_pct_lag"] = df_grouped["cum_neg_pct"].shift(1, fill_value=0)
+    df_grouped["incr_pos_pct"] = df_grouped["cum_pos_pct"] - df_grouped["cum_pos_pct_lag"]
+    df_grouped["sum_neg_pct"] = df_grouped["cum_neg_pct"] + df_grouped["cum_neg_pct_lag"]
+    return (1 - np.dot(df_grouped.sum_neg_pct, df_grouped.incr_pos_pct)).round(4)
+
+
+def create_random_df(rows: int, seed: int, decimals: int) -> pd.DataFrame:
+    random_generator = np.random.default_rng(seed)
+    scores = random_generator.random(rows).round(decimals)
+    df = pd.DataFrame()
+    df[PROBABILITY_ATTRIBUTE] = scores
+    df[GROUND_TRUTH_ATTRIBUTE] = (random_generator.random(rows) < scores).astype(int)
+    return df
+
+
 class TestCustomMetric(unittest.TestCase):
     def test_calculate_statistics(self):
         statistic = instance.calculate_statistics(DF, CONFIG, MODEL_QUALITY_ATTRIBUTES)
         self.assertEqual(EXPECTED_STATISTIC, statistic)
 
+    def test_calculate_statistics_with_bootstrap(self):
+        config = {**CONFIG, "bootstrap": {"replicates": 200, "seed": 1}}
+
+        statistic = instance.calculate_statistics(DF, config, MODEL_QUALITY_ATTRIBUTES)
+
+        self.assertEqual(EXPECTED_STATISTIC["value"], statistic["value"])
+        self.assertGreater(statistic["standard_deviation"], 0)
+        confidence_interval = statistic["confidence_interval"]
+        self.assertEqual(0.95, confidence_interval["confidence_level"])
+        self.assertLess(confidence_interval["lower"], confidence_interval["upper"])
+        self.assertEqual(
+            statistic, instance.calculate_statistics(DF, config, MODEL_QUALITY_ATTRIBUTES)
+        )
+
+    def test_calculate_statistics_leaves_df_untouched(self):
+        df = DF.copy()
+
+        instance.calculate_statistics(df, CONFIG, MODEL_QUALITY_ATTRIBUTES)
+        statistic = instance.calculate_statistics(
+            ModelQualityContext(df, MODEL_QUALITY_ATTRIBUTES), CONFIG, MODEL_QUALITY_ATTRIBUTES
+        )
+
+        self.assertEqual(EXPECTED_STATISTIC, statistic)
+        self.assertEqual(["probability_attribute", "ground_truth_attribute"], list(df.columns))
+
+    def test_binned_gini_matches_groupby(self):
+        # Rounding the scores to one or two decimals creates ties, and then duplicate quantile edges.
+        for rows, decimals in [(15, 6), (60, 1), (99, 2), (100, 1), (1000, 2), (100000, 6)]:
+            for seed in range(3):
+                df = create_random_df(rows, seed, decimals)
+                statistic = instance.calculate_statistics(df, CONFIG, MODEL_QUALITY_ATTRIBUTES)
+                self.assertEqual(groupby_gini(df), statistic["value"], f"{rows} rows, seed {seed}")
+
+    def test_binned_gini_matches_groupby_with_scores_on_quantile_edges(self):
+        # With 181 rows, the quantiles fall between two tied scores, where rounding decides the bin of the ties.
+        for decimals in [1, 2]:
+            for seed in range(50):
+                df = create_random_df(181, seed, decimals)
+                statistic = instance.calculate_statistics(df, CONFIG, MODEL_QUALITY_ATTRIBUTES)
+                self.assertEqual(
+                    groupby_gini(df), statistic["value"], f"{decimals} decimals, seed {seed}"
+                )
+
+    def test_binned_gini_with_constant_scores(self):
+        df = DF.copy()
+        df[PROBABILITY_ATTRIBUTE] = 0.5
+
+        statistic = instance.calculate_statistics(df, CONFIG, MODEL_QUALITY_ATTRIBUTES)
+
+        # A single bin: no ranking power.
+        self.assertEqual(0, statistic["value"])
+
+    def test_exact_gini(self):
+        config = {"metric_name": "gini", "method": "exact"}
+        for rows, decimals in [(15, 6), (60, 1), (1000, 2), (100000, 6)]:
+            df = create_random_df(rows, 0, decimals)
+            expected = (
+                2 * roc_auc_score(df[GROUND_TRUTH_ATTRIBUTE], df[PROBABILITY_ATTRIBUTE]) - 1
+            ).round(4)
+
+            statistic = instance.calculate_statistics(df, config, MODEL_QUALITY_ATTRIBUTES)
+
+            self.assertEqual({"value": expected, "standard_deviation": 0}, statistic)
+
+    def test_exact_gini_requires_both_classes(self):
+        df = DF.copy()
+        df[GROUND_TRUTH_ATTRIBUTE] = 1
+
+        with self.assertRaisesRegex(ValueError, "Both classes must be present"):
+            instance.calculate_statistics(
+                df, {"metric_name": "gini", "method": "exact"}, MODEL_QUALITY_ATTRIBUTES
+            )
+
+    def test_unknown_method(self):
+        with self.assertRaisesRegex(ValueError, "Unknown method ranked for metric gini"):
+            instance.calculate_statistics(
+                DF, {"metric_name": "gini", "method": "ranked"}, MODEL_QUALITY_ATTRIBUTES
+            )
+
     def test_evaluate_constraints(self):
         no_violation = instance.evaluate_constraints(
             EXPECTED_STATISTIC, DF, CONFIG, CONSTRAINT_NO_VIOLATION, MODEL_QUALITY_ATTRIBUTES
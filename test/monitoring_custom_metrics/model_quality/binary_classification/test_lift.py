@@ -0,0 +1,131 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License").
+# You may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pandas as pd
+import pytest  # noqa
+import unittest
+
+from src.model.model_quality_attributes import ModelQualityAttributes
+from src.monitoring_custom_metrics.model_quality.binary_classification.lift import (
+    instance,
+)
+
+predictions = [0.9, 0.3, 0.8, 0.75, 0.65, 0.6, 0.78, 0.7, 0.05, 0.4, 0.4, 0.05, 0.5, 0.1, 0.1]
+actuals = [1, 1, 1, 1, 1, 1, 0, 0, 0, 0, 0, 0, 0, 0, 0]
+DF = pd.DataFrame()
+DF["probability_attribute"] = predictions
+DF["ground_truth_attribute"] = actuals
+
+CONSTRAINT_NO_VIOLATION = {
+    "threshold": 2.5,
+    "comparison_operator": "LessThanThreshold",
+    "additional_properties": None,
+}
+CONSTRAINT_WITH_VIOLATION = {
+    "threshold": 2.55,
+    "comparison_operator": "LessThanThreshold",
+    "additional_properties": None,
+}
+
+CONFIG = {"metric_name": "lift"}
+
+CONFIG_OVERRIDE = {"metric_name": "lift", "threshold_override": 0.05}
+
+EXPECTED_STATISTIC = {"value": 2.5, "standard_deviation": 0}
+EXPECTED_VIOLATION = {
+    "constraint_check_type": "LessThanThreshold",
+    "description": "Metric lift with 2.5 was LessThanThreshold 2.55",
+    "metric_name": "lift",
+}
+
+GROUND_TRUTH_ATTRIBUTE = "ground_truth_attribute"
+PROBABILITY_ATTRIBUTE = "probability_attribute"
+PROBABILITY_THRESHOLD_ATTRIBUTE = "probability_threshold_attribute"
+INFERENCE_ATTRIBUTE = "inference_attribute"
+MODEL_QUALITY_ATTRIBUTES = ModelQualityAttributes(
+    GROUND_TRUTH_ATTRIBUTE,
+    PROBABILITY_ATTRIBUTE,
+    PROBABILITY_THRESHOLD_ATTRIBUTE,
+    INFERENCE_ATTRIBUTE,
+)
+
+
+class TestCustomMetric(unittest.TestCase):
+    def test_calculate_statistics(self):
+        statistic = instance.calculate_statistics(DF, CONFIG, MODEL_QUALITY_ATTRIBUTES)
+        self.assertEqual(EXPECTED_STATISTIC, statistic)
+
+    def test_calculate_statistics_with_bootstrap(self):
+        config = {**CONFIG, "bootstrap": {"replicates": 200, "seed": 1}}
+
+        statistic = instance.calculate_statistics(DF, config, MODEL_QUALITY_ATTRIBUTES)
+
+        self.assertEqual(EXPECTED_STATISTIC["value"], statistic["value"])
+        self.assertGreater(statistic["standard_deviation"], 0)
+        confidence_interval = statistic["confidence_interval"]
+        self.assertEqual(0.95, confidence_interval["confidence_level"])
+        self.assertLess(confidence_interval["lower"], confidence_interval["upper"])
+        self.assertEqual(
+            statistic, instance.calculate_statistics(DF, config, MODEL_QUALITY_ATTRIBUTES)
+        )
+
+    def test_calculate_statistics_with_depth(self):
+        statistic = instance.calculate_statistics(
+            DF, {"metric_name": "lift", "depth": 0.4}, MODEL_QUALITY_ATTRIBUTES
+        )
+        self.assertEqual({"value": 1.6667, "standard_deviation": 0}, statistic)
+
+    def test_calculate_statistics_with_lift_table(self):
+        config = {**CONFIG, "table_bins": 5}
+
+        statistic = instance.calculate_statistics(DF, config, MODEL_QUALITY_ATTRIBUTES)
+
+        self.assertEqual(EXPECTED_STATISTIC["value"], statistic["value"])
+        self.assertEqual(
+            [
+                {"depth": 0.2, "count": 3, "positives": 2, "gain": 0.3333, "lift": 1.6667},
+                {"depth": 0.4, "count": 6, "positives": 4, "gain": 0.6667, "lift": 1.6667},
+                {"depth": 0.6, "count": 9, "positives": 5, "gain": 0.8333, "lift": 1.3889},
+                {"depth": 0.8, "count": 12, "positives": 6, "gain": 1.0, "lift": 1.25},
+                {"depth": 1.0, "count": 15, "positives": 6, "gain": 1.0, "lift": 1.0},
+            ],
+            statistic["lift_table"],
+        )
+
+    def test_calculate_statistics_with_invalid_table_bins(self):
+        for table_bins in [0, 2.5, "10"]:
+            with self.assertRaises(ValueError):
+                instance.calculate_statistics(
+                    DF, {**CONFIG, "table_bins": table_bins}, MODEL_QUALITY_ATTRIBUTES
+                )
+
+    def test_evaluate_constraints(self):
+        no_violation = instance.evaluate_constraints(
+            EXPECTED_STATISTIC, DF, CONFIG, CONSTRAINT_NO_VIOLATION, MODEL_QUALITY_ATTRIBUTES
+        )
+        violation = instance.evaluate_constraints(
+            EXPECTED_STATISTIC, DF, CONFIG, CONSTRAINT_WITH_VIOLATION, MODEL_QUALITY_ATTRIBUTES
+        )
+        self.assertIsNone(no_violation)
+        self.assertEqual(EXPECTED_VIOLATION, violation)
+
+    def test_suggest_constraints(self):
+        suggested_baseline = instance.suggest_constraints(
+            EXPECTED_STATISTIC, DF, CONFIG, MODEL_QUALITY_ATTRIBUTES
+        )
+        suggested_baseline_w_override = instance.suggest_constraints(
+            EXPECTED_STATISTIC, DF, CONFIG_OVERRIDE, MODEL_QUALITY_ATTRIBUTES
+        )
+        self.assertEqual(CONSTRAINT_NO_VIOLATION, suggested_baseline)
+        self.assertEqual(CONSTRAINT_WITH_VIOLATION, suggested_baseline_w_override)
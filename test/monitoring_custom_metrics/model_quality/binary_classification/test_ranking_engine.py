@@ -0,0 +1,191 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License").
+# You may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+
+import numpy as np
+import pandas as pd
+import pytest  # noqa
+import unittest
+from unittest import mock
+from sklearn.metrics import average_precision_score, roc_auc_score, roc_curve
+
+from src.model.bootstrap_config import BootstrapConfig
+from src.model.model_quality_attributes import ModelQualityAttributes
+from src.monitoring_custom_metrics.model_quality import bootstrap
+from src.monitoring_custom_metrics.model_quality.binary_classification import _ranking_engine
+from src.monitoring_custom_metrics.model_quality.binary_classification._ranking_engine import (
+    RankingEngine,
+    get_ranking_engine,
+)
+from src.monitoring_custom_metrics.model_quality.model_quality_context import ModelQualityContext
+
+PREDICTIONS = [0.9, 0.3, 0.8, 0.75, 0.65, 0.6, 0.78, 0.7, 0.05, 0.4, 0.4, 0.05, 0.5, 0.1, 0.1]
+ACTUALS = [1, 1, 1, 1, 1, 1, 0, 0, 0, 0, 0, 0, 0, 0, 0]
+
+MODEL_QUALITY_ATTRIBUTES = ModelQualityAttributes(
+    "ground_truth_attribute",
+    "probability_attribute",
+    "probability_threshold_attribute",
+    "inference_attribute",
+)
+
+
+def create_random_arrays(rows: int, seed: int, decimals: int):
+    random_generator = np.random.default_rng(seed)
+    scores = random_generator.random(rows).round(decimals)
+    labels = (random_generator.random(rows) < scores).astype(np.int64)
+    return labels, scores
+
+
+class TestRankingEngine(unittest.TestCase):
+    def test_matches_sklearn(self):
+        # Rounding the scores to one or two decimals creates ties.
+        for rows, decimals in [(15, 6), (100, 1), (10000, 2), (10000, 6)]:
+            labels, scores = create_random_arrays(rows, rows, decimals)
+            engine = RankingEngine(labels, scores)
+            false_positive_rate, true_positive_rate, _ = roc_curve(labels, scores)
+
+            self.assertAlmostEqual(roc_auc_score(labels, scores), engine.roc_auc(), places=12)
+            self.assertAlmostEqual(2 * roc_auc_score(labels, scores) - 1, engine.gini(), places=12)
+            self.assertAlmostEqual(
+                average_precision_score(labels, scores), engine.average_precision(), places=12
+            )
+            self.assertAlmostEqual(
+                np.max(np.abs(true_positive_rate - false_positive_rate)), engine.ks(), places=12
+            )
+
+    def test_ks_of_reversed_scores(self):
+        labels, scores = create_random_arrays(1000, 0, 2)
+        engine = RankingEngine(labels, 1 - scores)
+        false_positive_rate, true_positive_rate, _ = roc_curve(labels, 1 - scores)
+
+        self.assertLess(engine.roc_auc(), 0.5)
+        self.assertGreater(engine.ks(), 0.3)
+        self.assertAlmostEqual(
+            np.max(false_positive_rate - true_positive_rate), engine.ks(), places=12
+        )
+        self.assertAlmostEqual(RankingEngine(labels, scores).ks(), engine.ks(), places=12)
+
+    def test_lift_table(self):
+        engine = RankingEngine(np.array(ACTUALS), np.array(PREDICTIONS))
+
+        table = engine.lift_table(5)
+
+        self.assertEqual([3, 6, 9, 12, 15], [row["count"] for row in table])
+        self.assertEqual([2, 4, 5, 6, 6], [row["positives"] for row in table])
+        np.testing.assert_allclose([2 / 6, 4 / 6, 5 / 6, 1, 1], [row["gain"] for row in table])
+        np.testing.assert_allclose([5 / 3, 5 / 3, 25 / 18, 1.25, 1], [row["lift"] for row in table])
+
+    def test_lift_at_invalid_depth(self):
+        engine = RankingEngine(np.array(ACTUALS), np.array(PREDICTIONS))
+
+        with self.assertRaisesRegex(ValueError, "Depth must be in"):
+            engine.lift_at(0)
+        with self.assertRaisesRegex(ValueError, "Depth must be in"):
+            engine.lift_at(1.5)
+
+    def test_single_class(self):
+        engine = RankingEngine(np.zeros(4, dtype=np.int64), np.array([0.1, 0.4, 0.3, 0.2]))
+
+        self.assertEqual(0.0, engine.average_precision())
+        with self.assertRaisesRegex(ValueError, "Both classes must be present"):
+            engine.roc_auc()
+        with self.assertRaisesRegex(ValueError, "Both classes must be present"):
+            engine.ks()
+        with self.assertRaisesRegex(ValueError, "The positive class must be present"):
+            engine.lift_table()
+
+    def test_get_ranking_engine_sorts_once_per_context(self):
+        df = pd.DataFrame({"ground_truth_attribute": ACTUALS, "probability_attribute": PREDICTIONS})
+        context = ModelQualityContext(df, MODEL_QUALITY_ATTRIBUTES)
+
+        engine = get_ranking_engine(context)
+
+        self.assertIs(engine, get_ranking_engine(context))
+        self.assertIsNot(
+            engine, get_ranking_engine(ModelQualityContext(df, MODEL_QUALITY_ATTRIBUTES))
+        )
+
+    def test_bootstrap_matches_weighted_sklearn(self):
+        labels, scores = create_random_arrays(3000, 0, 2)
+        self.check_bootstrap_matches_weighted_sklearn(labels, scores)
+
+    def test_bootstrap_of_reversed_scores_matches_weighted_sklearn(self):
+        labels, scores = create_random_arrays(3000, 0, 2)
+        self.check_bootstrap_matches_weighted_sklearn(labels, 1 - scores)
+
+    def check_bootstrap_matches_weighted_sklearn(self, labels: np.ndarray, scores: np.ndarray):
+        # Small chunks, so that several of them are needed and tied scores sit on their boundaries.
+        engine = RankingEngine(labels, scores)
+        bootstrap_config = BootstrapConfig(20, 0.95, 0)
+        conditional_weights = []
+
+        def record_weights(*args):
+            weights = bootstrap.get_conditional_poisson_weights(*args)
+            conditional_weights.append(weights)
+            return weights
+
+        with mock.patch.object(bootstrap, "BOOTSTRAP_CHUNK_CELLS", 20 * 500), mock.patch.object(
+            _ranking_engine, "get_conditional_poisson_weights", record_weights
+        ), mock.patch.dict(os.environ, {"bootstrap_workers": "1"}):
+            replicates = engine.bootstrap(bootstrap_config)
+            bounds = bootstrap.get_chunk_bounds(3000, 20, engine.group_ends)
+
+        # Weights of the sorted rows, drawn for the positive then the negative rows of every chunk.
+        self.assertGreater(len(bounds), 2)
+        weights = np.zeros((20, 3000))
+        for chunk_index, (start, stop) in enumerate(bounds):
+            positives = engine.sorted_positives[start:stop]
+            chunk_weights = weights[:, start:stop]
+            chunk_weights[:, positives] = conditional_weights[2 * chunk_index]
+            chunk_weights[:, ~positives] = conditional_weights[2 * chunk_index + 1]
+        sorted_labels = labels[engine.order]
+        sorted_scores = scores[engine.order]
+        for replicate in range(20):
+            sample_weight = weights[replicate]
+            false_positive_rate, true_positive_rate, _ = roc_curve(
+                sorted_labels, sorted_scores, sample_weight=sample_weight
+            )
+            self.assertAlmostEqual(
+                roc_auc_score(sorted_labels, sorted_scores, sample_weight=sample_weight),
+                replicates["roc_auc"][replicate],
+                places=12,
+            )
+            self.assertAlmostEqual(
+                average_precision_score(sorted_labels, sorted_scores, sample_weight=sample_weight),
+                replicates["average_precision"][replicate],
+                places=12,
+            )
+            self.assertAlmostEqual(
+                np.max(np.abs(true_positive_rate - false_positive_rate)),
+                replicates["ks"][replicate],
+                places=12,
+            )
+
+    def test_bootstrap_is_cached_and_does_not_depend_on_workers(self):
+        labels, scores = create_random_arrays(2000, 1, 3)
+        bootstrap_config = BootstrapConfig(50, 0.95, 4)
+
+        with mock.patch.object(bootstrap, "BOOTSTRAP_CHUNK_CELLS", 50 * 300):
+            with mock.patch.dict(os.environ, {"bootstrap_workers": "1"}):
+                engine = RankingEngine(labels, scores)
+                replicates = engine.bootstrap(bootstrap_config)
+            with mock.patch.dict(os.environ, {"bootstrap_workers": "4"}):
+                other_replicates = RankingEngine(labels, scores).bootstrap(bootstrap_config)
+
+        self.assertIs(replicates, engine.bootstrap(bootstrap_config))
+        for name in ["roc_auc", "average_precision", "ks"]:
+            np.testing.assert_array_equal(replicates[name], other_replicates[name])
+        self.assertGreater(np.std(replicates["roc_auc"]), 0)
@@ -118,6 +118,20 @@ class TestCustomMetric(unittest.TestCase):
         self.assertEqual(EXPECTED_STATISTIC, statistic)
         self.assertEqual(EXPECTED_STATISTIC_RELATIVE, statistic_relative)
 
+    def test_calculate_statistics_with_bootstrap(self):
+        config = {**CONFIG, "bootstrap": {"replicates": 200, "seed": 1}}
+
+        statistic = instance.calculate_statistics(DF, config, MODEL_QUALITY_ATTRIBUTES)
+
+        self.assertEqual(EXPECTED_STATISTIC["value"], statistic["value"])
+        self.assertGreater(statistic["standard_deviation"], 0)
+        confidence_interval = statistic["confidence_interval"]
+        self.assertEqual(0.95, confidence_interval["confidence_level"])
+        self.assertLess(confidence_interval["lower"], confidence_interval["upper"])
+        self.assertEqual(
+            statistic, instance.calculate_statistics(DF, config, MODEL_QUALITY_ATTRIBUTES)
+        )
+
     def test_evaluate_constraints(self):
         no_violation = instance.evaluate_constraints(
             EXPECTED_STATISTIC, DF, CONFIG, CONSTRAINT_NO_VIOLATION, MODEL_QUALITY_ATTRIBUTES
@@ -161,3 +175,44 @@ class TestCustomMetric(unittest.TestCase):
         self.assertEqual(CONSTRAINT_WITH_VIOLATION, suggested_baseline_w_override)
         self.assertEqual(CONSTRAINT_WITH_VIOLATION_ONE_SIDED, suggested_baseline_one_sided)
         self.assertEqual(CONSTRAINT_WITH_VIOLATION_RELATIVE, suggested_baseline_relative)
+
+    def test_accumulate_matches_calculate_statistics(self):
+        for config, expected in [
+            (CONFIG, EXPECTED_STATISTIC),
+            (CONFIG_RELATIVE, EXPECTED_STATISTIC_RELATIVE),
+        ]:
+            accumulator = instance.create_accumulator(config, MODEL_QUALITY_ATTRIBUTES)
+            for start in range(0, len(DF), 4):
+                accumulator = instance.accumulate(
+                    accumulator, DF.iloc[start : start + 4], config, MODEL_QUALITY_ATTRIBUTES
+                )
+            statistic = instance.finalize(accumulator, config, MODEL_QUALITY_ATTRIBUTES)
+            self.assertEqual(expected, statistic)
+
+    def test_merge_accumulators(self):
+        first = instance.accumulate(
+            instance.create_accumulator(CONFIG, MODEL_QUALITY_ATTRIBUTES),
+            DF.iloc[:5],
+            CONFIG,
+            MODEL_QUALITY_ATTRIBUTES,
+        )
+        second = instance.accumulate(
+            instance.create_accumulator(CONFIG, MODEL_QUALITY_ATTRIBUTES),
+            DF.iloc[5:],
+            CONFIG,
+            MODEL_QUALITY_ATTRIBUTES,
+        )
+        merged = instance.merge_accumulators(first, second)
+        statistic = instance.finalize(merged, CONFIG, MODEL_QUALITY_ATTRIBUTES)
+        self.assertEqual(EXPECTED_STATISTIC, statistic)
+
+    def test_without_data(self):
+        with self.assertRaises(ValueError) as context:
+            instance.finalize(
+                instance.create_accumulator(CONFIG, MODEL_QUALITY_ATTRIBUTES),
+                CONFIG,
+                MODEL_QUALITY_ATTRIBUTES,
+            )
+        self.assertEqual("Metric score_diff needs at least one sample", str(context.exception))
+        with self.assertRaises(ValueError):
+            instance.calculate_statistics(DF.iloc[:0], CONFIG, MODEL_QUALITY_ATTRIBUTES)
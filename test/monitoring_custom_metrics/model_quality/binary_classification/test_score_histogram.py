@@ -0,0 +1,207 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License").
+# You may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import math
+from functools import reduce
+
+import numpy as np
+import pandas as pd
+import pytest  # noqa
+import unittest
+
+from src.model.model_quality_attributes import ModelQualityAttributes
+from src.monitoring_custom_metrics.model_quality.binary_classification import (
+    gini,
+    ks,
+    pr_auc,
+    roc_auc,
+)
+from src.monitoring_custom_metrics.model_quality.binary_classification._ranking_engine import (
+    RankingEngine,
+)
+from src.monitoring_custom_metrics.model_quality.binary_classification._score_histogram import (
+    ScoreHistogram,
+    calculate_score_histogram,
+    get_histogram_bins,
+)
+
+MODEL_QUALITY_ATTRIBUTES = ModelQualityAttributes(
+    "ground_truth_attribute", "probability_attribute", "0.5", "inference_attribute"
+)
+
+
+def create_random_arrays(rows: int, seed: int):
+    random_generator = np.random.default_rng(seed)
+    scores = random_generator.beta(2, 5, rows)
+    labels = (random_generator.random(rows) < scores).astype(np.int64)
+    return labels, scores
+
+
+def create_random_df(rows: int, seed: int) -> pd.DataFrame:
+    labels, scores = create_random_arrays(rows, seed)
+    return pd.DataFrame({"ground_truth_attribute": labels, "probability_attribute": scores})
+
+
+class TestScoreHistogram(unittest.TestCase):
+    def test_calculate_score_histogram(self):
+        labels, scores = create_random_arrays(1000, 0)
+
+        histogram = calculate_score_histogram(labels, scores, 16)
+
+        edges = np.linspace(0, 1, 17)
+        self.assertEqual(
+            np.histogram(scores[labels == 1], edges)[0].tolist(), histogram[0].tolist()
+        )
+        self.assertEqual(
+            np.histogram(scores[labels == 0], edges)[0].tolist(), histogram[1].tolist()
+        )
+
+    def test_scores_outside_the_range_are_in_the_first_and_the_last_bin(self):
+        histogram = calculate_score_histogram(
+            np.array([1, 0, 1, 0]), np.array([-0.5, 0.0, 1.0, 1.5]), 4
+        )
+
+        self.assertEqual([[1, 0, 0, 1], [1, 0, 0, 1]], histogram.tolist())
+
+    def test_error_is_within_the_bound(self):
+        for rows, histogram_bins in [(100, 4096), (10000, 64), (10000, 4096), (200000, 4096)]:
+            labels, scores = create_random_arrays(rows, rows + histogram_bins)
+            engine = RankingEngine(labels, scores)
+            histogram = ScoreHistogram(calculate_score_histogram(labels, scores, histogram_bins))
+
+            self.assertLessEqual(
+                abs(histogram.roc_auc() - engine.roc_auc()), histogram.roc_auc_error_bound() + 1e-12
+            )
+            self.assertLessEqual(
+                abs(histogram.gini() - engine.gini()), histogram.gini_error_bound() + 1e-12
+            )
+            self.assertLessEqual(histogram.ks(), engine.ks() + 1e-12)
+            self.assertLessEqual(engine.ks() - histogram.ks(), histogram.ks_error_bound() + 1e-12)
+            self.assertLessEqual(
+                abs(histogram.average_precision() - engine.average_precision()),
+                histogram.average_precision_error_bound() + 1e-12,
+            )
+
+    def test_bound_with_the_default_bins(self):
+        labels, scores = create_random_arrays(200000, 1)
+
+        histogram = ScoreHistogram(calculate_score_histogram(labels, scores, 4096))
+
+        # The bounds are worst cases: the errors of this data are much smaller.
+        self.assertLess(histogram.roc_auc_error_bound(), 5e-4)
+        self.assertLess(histogram.ks_error_bound(), 1e-3)
+        self.assertLess(histogram.average_precision_error_bound(), 1e-3)
+
+    def test_exact_when_every_bin_holds_a_single_score(self):
+        labels, scores = create_random_arrays(10000, 2)
+        scores = scores.round(2)
+        engine = RankingEngine(labels, scores)
+
+        histogram = ScoreHistogram(calculate_score_histogram(labels, scores, 4096))
+
+        self.assertAlmostEqual(engine.roc_auc(), histogram.roc_auc(), places=12)
+        self.assertAlmostEqual(engine.ks(), histogram.ks(), places=12)
+        self.assertAlmostEqual(engine.average_precision(), histogram.average_precision(), places=12)
+
+    def test_single_class(self):
+        histogram = ScoreHistogram(
+            calculate_score_histogram(
+                np.zeros(4, dtype=np.int64), np.array([0.1, 0.4, 0.3, 0.2]), 8
+            )
+        )
+
+        with self.assertRaises(ValueError):
+            histogram.roc_auc()
+        self.assertEqual(0.0, histogram.average_precision())
+
+    def test_chunked_and_sharded_runs_match_the_histogram_of_the_whole_dataset(self):
+        df = create_random_df(10000, 3)
+        labels = df["ground_truth_attribute"].to_numpy()
+        scores = df["probability_attribute"].to_numpy()
+        histogram = ScoreHistogram(calculate_score_histogram(labels, scores, 4096))
+        config = {"method": "exact"}
+
+        for metric, expected, error_bound in [
+            (roc_auc, histogram.roc_auc(), histogram.roc_auc_error_bound()),
+            (pr_auc, histogram.average_precision(), histogram.average_precision_error_bound()),
+            (ks, histogram.ks(), histogram.ks_error_bound()),
+            (gini, histogram.gini(), histogram.gini_error_bound()),
+        ]:
+            instance = metric.instance
+            expected_statistic = {
+                "value": round(expected, 4),
+                "standard_deviation": 0,
+                "approximation": {
+                    "method": "score_histogram",
+                    "histogram_bins": 4096,
+                    "error_bound": math.ceil(error_bound * 1e6) / 1e6,
+                },
+            }
+
+            # Chunks folded one after another.
+            accumulator = instance.create_accumulator(config, MODEL_QUALITY_ATTRIBUTES)
+            for start in range(0, 10000, 777):
+                accumulator = instance.accumulate(
+                    accumulator, df.iloc[start : start + 777], config, MODEL_QUALITY_ATTRIBUTES
+                )
+            self.assertEqual(
+                expected_statistic,
+                instance.finalize(accumulator, config, MODEL_QUALITY_ATTRIBUTES),
+            )
+
+            # Shards accumulated separately, merged in another order.
+            shards = [
+                instance.accumulate(
+                    instance.create_accumulator(config, MODEL_QUALITY_ATTRIBUTES),
+                    df.iloc[start : start + 2000],
+                    config,
+                    MODEL_QUALITY_ATTRIBUTES,
+                )
+                for start in range(0, 10000, 2000)
+            ]
+            merged = reduce(instance.merge_accumulators, shards[::-1])
+            self.assertEqual(
+                expected_statistic, instance.finalize(merged, config, MODEL_QUALITY_ATTRIBUTES)
+            )
+
+            # Within the reported bound of the exact value, both rounded to 4 decimals.
+            exact = instance.calculate_statistics(df, config, MODEL_QUALITY_ATTRIBUTES)
+            self.assertNotIn("approximation", exact)
+            self.assertLessEqual(
+                abs(exact["value"] - expected_statistic["value"]),
+                expected_statistic["approximation"]["error_bound"] + 1e-4,
+            )
+
+    def test_histogram_bins(self):
+        df = create_random_df(1000, 4)
+        config = {"histogram_bins": 10}
+
+        accumulator = roc_auc.instance.accumulate(
+            roc_auc.instance.create_accumulator(config, MODEL_QUALITY_ATTRIBUTES),
+            df,
+            config,
+            MODEL_QUALITY_ATTRIBUTES,
+        )
+
+        self.assertEqual((2, 10), accumulator.shape)
+        self.assertEqual(1000, accumulator.sum())
+        for histogram_bins in [1, 2.5, "4096"]:
+            with self.assertRaises(ValueError):
+                get_histogram_bins({"histogram_bins": histogram_bins})
+
+    def test_binned_gini_does_not_support_streaming(self):
+        self.assertIsNone(gini.instance.create_accumulator({}, MODEL_QUALITY_ATTRIBUTES))
+        self.assertIsNone(
+            gini.instance.create_accumulator({"method": "binned"}, MODEL_QUALITY_ATTRIBUTES)
+        )
@@ -0,0 +1,194 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License").
+# You may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from functools import reduce
+
+import numpy as np
+import pandas as pd
+import pytest  # noqa
+import unittest
+from sklearn.metrics import confusion_matrix, f1_score, matthews_corrcoef
+
+from src.model.model_quality_attributes import ModelQualityAttributes
+from src.monitoring_custom_metrics.model_quality.binary_classification import (
+    accuracy,
+    f1,
+    false_positive_rate,
+    mcc,
+    precision,
+    recall,
+    specificity,
+)
+from src.monitoring_custom_metrics.model_quality.binary_classification._ranking_engine import (
+    RankingEngine,
+)
+from src.monitoring_custom_metrics.model_quality.binary_classification._threshold_metric import (
+    calculate_confusion_counts,
+    get_confusion_counts,
+    get_probability_threshold,
+    get_sweep_thresholds,
+)
+from src.monitoring_custom_metrics.model_quality.model_quality_context import ModelQualityContext
+
+METRICS = [accuracy, f1, false_positive_rate, mcc, precision, recall, specificity]
+MODEL_QUALITY_ATTRIBUTES = ModelQualityAttributes(
+    "ground_truth_attribute", "probability_attribute", "0.5", "inference_attribute"
+)
+
+
+def create_random_df(rows: int, seed: int, decimals: int) -> pd.DataFrame:
+    random_generator = np.random.default_rng(seed)
+    scores = random_generator.random(rows).round(decimals)
+    return pd.DataFrame(
+        {
+            "ground_truth_attribute": (random_generator.random(rows) < scores).astype(np.int64),
+            "probability_attribute": scores,
+        }
+    )
+
+
+class TestThresholdMetric(unittest.TestCase):
+    def test_confusion_counts_match_sklearn(self):
+        df = create_random_df(1000, 0, 2)
+        labels = df["ground_truth_attribute"].to_numpy()
+        scores = df["probability_attribute"].to_numpy()
+
+        for threshold in [0.0, 0.25, 0.5, 0.73, 1.0]:
+            true_negatives, false_positives, false_negatives, true_positives = confusion_matrix(
+                labels, (scores >= threshold).astype(np.int64), labels=[0, 1]
+            ).ravel()
+            self.assertEqual(
+                [true_positives, false_positives, false_negatives, true_negatives],
+                calculate_confusion_counts(labels, scores, threshold).tolist(),
+            )
+
+    def test_ranking_engine_counts_match_every_threshold(self):
+        # Scores rounded to two decimals tie, and the thresholds fall on, between and outside the scores.
+        df = create_random_df(5000, 1, 2)
+        labels = df["ground_truth_attribute"].to_numpy()
+        scores = df["probability_attribute"].to_numpy()
+        thresholds = np.array([-1.0, 0.0, 0.005, 0.3, 0.5, 0.555, 0.99, 1.0, 2.0])
+
+        counts = RankingEngine(labels, scores).confusion_counts_at(thresholds)
+
+        self.assertEqual((4, len(thresholds)), counts.shape)
+        for index, threshold in enumerate(thresholds):
+            self.assertEqual(
+                calculate_confusion_counts(labels, scores, threshold).tolist(),
+                counts[:, index].tolist(),
+            )
+
+    def test_threshold_sweep_matches_sklearn(self):
+        df = create_random_df(2000, 2, 3)
+        labels = df["ground_truth_attribute"].to_numpy()
+        scores = df["probability_attribute"].to_numpy()
+        config = {"threshold_sweep": {"count": 21}}
+
+        mcc_sweep = mcc.instance.calculate_statistics(df, config, MODEL_QUALITY_ATTRIBUTES)
+        f1_sweep = f1.instance.calculate_statistics(df, config, MODEL_QUALITY_ATTRIBUTES)
+
+        self.assertEqual(21, len(mcc_sweep["threshold_sweep"]))
+        for mcc_value, f1_value in zip(mcc_sweep["threshold_sweep"], f1_sweep["threshold_sweep"]):
+            predicted = (scores >= mcc_value["threshold"]).astype(np.int64)
+            self.assertEqual(round(matthews_corrcoef(labels, predicted), 4), mcc_value["value"])
+            self.assertEqual(
+                round(f1_score(labels, predicted, zero_division=0), 4), f1_value["value"]
+            )
+
+    def test_chunked_and_sharded_runs_match_the_whole_dataset(self):
+        df = create_random_df(10000, 3, 2)
+        config = {"threshold_sweep": {"thresholds": [0.1, 0.5, 0.9]}}
+
+        for metric in METRICS:
+            instance = metric.instance
+            expected = instance.calculate_statistics(df, config, MODEL_QUALITY_ATTRIBUTES)
+
+            # Chunks folded one after another, including an empty chunk.
+            accumulator = instance.create_accumulator(config, MODEL_QUALITY_ATTRIBUTES)
+            for start in list(range(0, 10000, 777)) + [10000]:
+                accumulator = instance.accumulate(
+                    accumulator, df.iloc[start : start + 777], config, MODEL_QUALITY_ATTRIBUTES
+                )
+            self.assertEqual(
+                expected, instance.finalize(accumulator, config, MODEL_QUALITY_ATTRIBUTES)
+            )
+
+            # Shards accumulated separately, merged in another order.
+            shards = [
+                instance.accumulate(
+                    instance.create_accumulator(config, MODEL_QUALITY_ATTRIBUTES),
+                    df.iloc[start : start + 2000],
+                    config,
+                    MODEL_QUALITY_ATTRIBUTES,
+                )
+                for start in range(0, 10000, 2000)
+            ]
+            merged = reduce(instance.merge_accumulators, shards[::-1])
+            self.assertEqual(expected, instance.finalize(merged, config, MODEL_QUALITY_ATTRIBUTES))
+
+    def test_without_data(self):
+        empty_df = pd.DataFrame(
+            {"ground_truth_attribute": pd.Series([], dtype=np.int64), "probability_attribute": []}
+        )
+        for metric in METRICS:
+            instance = metric.instance
+            accumulator = instance.create_accumulator({}, MODEL_QUALITY_ATTRIBUTES)
+
+            with self.assertRaises(ValueError) as context:
+                instance.finalize(accumulator, {}, MODEL_QUALITY_ATTRIBUTES)
+            self.assertEqual(
+                "Metric {} needs at least one sample".format(instance.metric_name),
+                str(context.exception),
+            )
+            with self.assertRaises(ValueError):
+                instance.calculate_statistics(empty_df, {}, MODEL_QUALITY_ATTRIBUTES)
+
+    def test_confusion_counts_are_shared_by_the_metrics(self):
+        df = pd.DataFrame(
+            {"ground_truth_attribute": [1, 0, 1], "probability_attribute": [0.9, 0.6, 0.2]}
+        )
+        context = ModelQualityContext(df, MODEL_QUALITY_ATTRIBUTES)
+
+        counts = get_confusion_counts(context, 0.5)
+        for metric in METRICS:
+            metric.instance.calculate_statistics(context, {}, MODEL_QUALITY_ATTRIBUTES)
+
+        self.assertIs(counts, get_confusion_counts(context, 0.5))
+        self.assertEqual([1, 1, 1, 0], counts.tolist())
+
+    def test_invalid_probability_threshold(self):
+        for probability_threshold in [None, "probability_threshold_attribute"]:
+            model_quality_attributes = ModelQualityAttributes(
+                "ground_truth_attribute",
+                "probability_attribute",
+                probability_threshold,
+                "inference_attribute",
+            )
+            with self.assertRaises(ValueError):
+                get_probability_threshold(model_quality_attributes)
+
+    def test_get_sweep_thresholds(self):
+        self.assertIsNone(get_sweep_thresholds({}))
+        self.assertEqual(
+            [0.0, 0.25, 0.5, 0.75, 1.0],
+            get_sweep_thresholds({"threshold_sweep": {"count": 5}}).tolist(),
+        )
+        self.assertEqual(101, len(get_sweep_thresholds({"threshold_sweep": {}})))
+        self.assertEqual(
+            [0.2, 0.8],
+            get_sweep_thresholds({"threshold_sweep": {"thresholds": [0.2, 0.8]}}).tolist(),
+        )
+        for threshold_sweep in [{"count": 1}, {"count": 2.5}, {"thresholds": []}]:
+            with self.assertRaises(ValueError):
+                get_sweep_thresholds({"threshold_sweep": threshold_sweep})
@@ -0,0 +1 @@
+# Implement your code here.
@@ -0,0 +1,142 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License").
+# You may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from functools import reduce
+
+import numpy as np
+import pandas as pd
+import pytest  # noqa
+import unittest
+from sklearn.metrics import confusion_matrix
+
+from src.model.model_quality_attributes import ModelQualityAttributes
+from src.monitoring_custom_metrics.model_quality.model_quality_context import ModelQualityContext
+from src.monitoring_custom_metrics.model_quality.multiclass_classification import (
+    accuracy,
+    class_recall,
+    cohen_kappa,
+    f1,
+    precision,
+    recall,
+)
+from src.monitoring_custom_metrics.model_quality.multiclass_classification._confusion_matrix import (
+    calculate_confusion_matrix,
+    create_confusion_matrix,
+    get_confusion_matrix,
+    merge_confusion_matrices,
+)
+
+METRICS = [accuracy, class_recall, cohen_kappa, f1, precision, recall]
+MODEL_QUALITY_ATTRIBUTES = ModelQualityAttributes(
+    "ground_truth_attribute", None, None, "inference_attribute"
+)
+
+
+def create_random_df(rows: int, seed: int) -> pd.DataFrame:
+    random_generator = np.random.default_rng(seed)
+    labels = random_generator.integers(0, 20, rows)
+    predictions = np.where(
+        random_generator.random(rows) < 0.7, labels, random_generator.integers(0, 22, rows)
+    )
+    return pd.DataFrame({"ground_truth_attribute": labels, "inference_attribute": predictions})
+
+
+class TestConfusionMatrix(unittest.TestCase):
+    def test_matches_sklearn(self):
+        df = create_random_df(5000, 0)
+        labels = df["ground_truth_attribute"].to_numpy()
+        predictions = df["inference_attribute"].to_numpy()
+
+        for encoded_labels, encoded_predictions in [
+            (labels, predictions),
+            # Integer classes too far apart to be used as codes directly.
+            (labels * 100000 - 7, predictions * 100000 - 7),
+            (labels.astype(str).astype(object), predictions.astype(str).astype(object)),
+        ]:
+            result = calculate_confusion_matrix(encoded_labels, encoded_predictions)
+            self.assertEqual(22, len(result["classes"]))
+            np.testing.assert_array_equal(
+                confusion_matrix(encoded_labels, encoded_predictions), result["matrix"]
+            )
+
+    def test_missing_integer_classes_are_dropped(self):
+        result = calculate_confusion_matrix(np.array([1, 5, 5, 9]), np.array([1, 5, 9, 9]))
+
+        np.testing.assert_array_equal([1, 5, 9], result["classes"])
+        np.testing.assert_array_equal([[1, 0, 0], [0, 1, 1], [0, 0, 1]], result["matrix"])
+
+    def test_merge_aligns_classes(self):
+        merged = merge_confusion_matrices(
+            calculate_confusion_matrix(np.array(["a", "b"]), np.array(["a", "a"])),
+            calculate_confusion_matrix(np.array(["c", "b"]), np.array(["b", "b"])),
+        )
+
+        np.testing.assert_array_equal(["a", "b", "c"], merged["classes"])
+        np.testing.assert_array_equal([[1, 0, 0], [1, 1, 0], [0, 1, 0]], merged["matrix"])
+
+    def test_merge_with_empty_confusion_matrix(self):
+        result = calculate_confusion_matrix(np.array([1, 2]), np.array([2, 2]))
+
+        self.assertIs(result, merge_confusion_matrices(create_confusion_matrix(), result))
+        self.assertIs(result, merge_confusion_matrices(result, create_confusion_matrix()))
+
+    def test_chunked_and_sharded_runs_match_the_whole_dataset(self):
+        df = create_random_df(10000, 1)
+
+        for metric in METRICS:
+            instance = metric.instance
+            expected = instance.calculate_statistics(df, {}, MODEL_QUALITY_ATTRIBUTES)
+
+            accumulator = instance.create_accumulator({}, MODEL_QUALITY_ATTRIBUTES)
+            for start in range(0, 10000, 777):
+                accumulator = instance.accumulate(
+                    accumulator, df.iloc[start : start + 777], {}, MODEL_QUALITY_ATTRIBUTES
+                )
+            self.assertEqual(expected, instance.finalize(accumulator, {}, MODEL_QUALITY_ATTRIBUTES))
+
+            shards = [
+                instance.accumulate(
+                    instance.create_accumulator({}, MODEL_QUALITY_ATTRIBUTES),
+                    shard,
+                    {},
+                    MODEL_QUALITY_ATTRIBUTES,
+                )
+                for shard in [df.iloc[start : start + 2000] for start in range(0, 10000, 2000)]
+            ]
+            merged = reduce(instance.merge_accumulators, shards[::-1])
+            self.assertEqual(expected, instance.finalize(merged, {}, MODEL_QUALITY_ATTRIBUTES))
+
+    def test_without_data(self):
+        empty_df = pd.DataFrame({"ground_truth_attribute": [], "inference_attribute": []})
+        for metric in METRICS:
+            instance = metric.instance
+            with self.assertRaises(ValueError) as context:
+                instance.finalize(create_confusion_matrix(), {}, MODEL_QUALITY_ATTRIBUTES)
+            self.assertEqual(
+                "Metric {} needs at least one sample".format(instance.metric_name),
+                str(context.exception),
+            )
+            with self.assertRaises(ValueError):
+                instance.calculate_statistics(empty_df, {}, MODEL_QUALITY_ATTRIBUTES)
+
+    def test_cohen_kappa_with_a_single_class(self):
+        df = pd.DataFrame({"ground_truth_attribute": [2, 2, 2], "inference_attribute": [2, 2, 2]})
+
+        with self.assertRaises(ValueError):
+            cohen_kappa.instance.calculate_statistics(df, {}, MODEL_QUALITY_ATTRIBUTES)
+
+    def test_confusion_matrix_is_shared_through_the_context(self):
+        context = ModelQualityContext(create_random_df(100, 2), MODEL_QUALITY_ATTRIBUTES)
+
+        self.assertIs(get_confusion_matrix(context), get_confusion_matrix(context))
@@ -0,0 +1,122 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License").
+# You may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pandas as pd
+import pytest  # noqa
+import unittest
+from sklearn.metrics import precision_score
+
+from src.model.model_quality_attributes import ModelQualityAttributes
+from src.monitoring_custom_metrics.model_quality.multiclass_classification.precision import (
+    instance,
+)
+
+GROUND_TRUTH = [
+    "cat",
+    "dog",
+    "bird",
+    "cat",
+    "dog",
+    "cat",
+    "bird",
+    "dog",
+    "cat",
+    "bird",
+    "dog",
+    "cat",
+]
+INFERENCE = ["cat", "dog", "cat", "cat", "bird", "cat", "bird", "dog", "dog", "bird", "dog", "bird"]
+DF = pd.DataFrame()
+DF["ground_truth_attribute"] = GROUND_TRUTH
+DF["inference_attribute"] = INFERENCE
+
+CONSTRAINT_NO_VIOLATION = {
+    "threshold": 0.6667,
+    "comparison_operator": "LessThanThreshold",
+    "additional_properties": None,
+}
+CONSTRAINT_WITH_VIOLATION = {
+    "threshold": 0.7167,
+    "comparison_operator": "LessThanThreshold",
+    "additional_properties": None,
+}
+
+CONFIG = {"metric_name": "precision"}
+
+CONFIG_OVERRIDE = {"metric_name": "precision", "threshold_override": 0.05}
+
+EXPECTED_STATISTIC = {"value": 0.6667, "standard_deviation": 0}
+EXPECTED_VIOLATION = {
+    "constraint_check_type": "LessThanThreshold",
+    "description": "Metric precision with 0.6667 was LessThanThreshold 0.7167",
+    "metric_name": "precision",
+}
+
+GROUND_TRUTH_ATTRIBUTE = "ground_truth_attribute"
+PROBABILITY_THRESHOLD_ATTRIBUTE = "probability_threshold_attribute"
+INFERENCE_ATTRIBUTE = "inference_attribute"
+MODEL_QUALITY_ATTRIBUTES = ModelQualityAttributes(
+    GROUND_TRUTH_ATTRIBUTE,
+    None,
+    PROBABILITY_THRESHOLD_ATTRIBUTE,
+    INFERENCE_ATTRIBUTE,
+)
+
+
+class TestCustomMetric(unittest.TestCase):
+    def test_calculate_statistics(self):
+        statistic = instance.calculate_statistics(DF, CONFIG, MODEL_QUALITY_ATTRIBUTES)
+        self.assertEqual(EXPECTED_STATISTIC, statistic)
+
+    def test_calculate_statistics_matches_sklearn(self):
+        statistic = instance.calculate_statistics(DF, CONFIG, MODEL_QUALITY_ATTRIBUTES)
+        self.assertEqual(
+            round(precision_score(GROUND_TRUTH, INFERENCE, average="macro"), 4), statistic["value"]
+        )
+
+    def test_calculate_statistics_with_average(self):
+        for average in ["micro", "weighted"]:
+            statistic = instance.calculate_statistics(
+                DF, {"metric_name": "precision", "average": average}, MODEL_QUALITY_ATTRIBUTES
+            )
+            self.assertEqual(
+                round(precision_score(GROUND_TRUTH, INFERENCE, average=average), 4),
+                statistic["value"],
+            )
+
+    def test_calculate_statistics_with_unknown_average(self):
+        with self.assertRaises(ValueError):
+            instance.calculate_statistics(
+                DF, {"metric_name": "precision", "average": "samples"}, MODEL_QUALITY_ATTRIBUTES
+            )
+
+    def test_evaluate_constraints(self):
+        no_violation = instance.evaluate_constraints(
+            EXPECTED_STATISTIC, DF, CONFIG, CONSTRAINT_NO_VIOLATION, MODEL_QUALITY_ATTRIBUTES
+        )
+        violation = instance.evaluate_constraints(
+            EXPECTED_STATISTIC, DF, CONFIG, CONSTRAINT_WITH_VIOLATION, MODEL_QUALITY_ATTRIBUTES
+        )
+        self.assertIsNone(no_violation)
+        self.assertEqual(EXPECTED_VIOLATION, violation)
+
+    def test_suggest_constraints(self):
+        suggested_baseline = instance.suggest_constraints(
+            EXPECTED_STATISTIC, DF, CONFIG, MODEL_QUALITY_ATTRIBUTES
+        )
+        suggested_baseline_w_override = instance.suggest_constraints(
+            EXPECTED_STATISTIC, DF, CONFIG_OVERRIDE, MODEL_QUALITY_ATTRIBUTES
+        )
+        self.assertEqual(CONSTRAINT_NO_VIOLATION, suggested_baseline)
+        self.assertEqual(CONSTRAINT_WITH_VIOLATION, suggested_baseline_w_override)
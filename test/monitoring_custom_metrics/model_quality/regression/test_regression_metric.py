@@ -0,0 +1,159 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License").
+# You may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from functools import reduce
+
+import numpy as np
+import pandas as pd
+import pytest  # noqa
+import unittest
+
+from src.model.model_quality_attributes import ModelQualityAttributes
+from src.monitoring_custom_metrics.model_quality.model_quality_context import ModelQualityContext
+from src.monitoring_custom_metrics.model_quality.regression import (
+    mae,
+    mape,
+    r2,
+    residual_mean,
+    residual_quantile,
+    residual_std,
+    rmse,
+)
+from src.monitoring_custom_metrics.model_quality.regression._regression_metric import (
+    calculate_regression_accumulator,
+    create_regression_accumulator,
+    get_regression_accumulator,
+    get_residual_quantile,
+    merge_regression_accumulators,
+)
+
+METRICS = [mae, mape, r2, residual_mean, residual_quantile, residual_std, rmse]
+MODEL_QUALITY_ATTRIBUTES = ModelQualityAttributes(
+    "ground_truth_attribute", None, None, "inference_attribute"
+)
+
+
+def create_random_df(rows: int, seed: int) -> pd.DataFrame:
+    random_generator = np.random.default_rng(seed)
+    actuals = random_generator.normal(100, 30, rows)
+    return pd.DataFrame(
+        {
+            "ground_truth_attribute": actuals,
+            "inference_attribute": actuals + random_generator.normal(2, 10, rows),
+        }
+    )
+
+
+class TestRegressionMetric(unittest.TestCase):
+    def test_chunked_and_sharded_runs_match_the_whole_dataset(self):
+        df = create_random_df(10000, 0)
+        config = {"quantile": 0.9}
+
+        for metric in METRICS:
+            instance = metric.instance
+            expected = instance.calculate_statistics(df, config, MODEL_QUALITY_ATTRIBUTES)
+
+            # Chunks folded one after another.
+            accumulator = instance.create_accumulator(config, MODEL_QUALITY_ATTRIBUTES)
+            for start in range(0, 10000, 777):
+                accumulator = instance.accumulate(
+                    accumulator, df.iloc[start : start + 777], config, MODEL_QUALITY_ATTRIBUTES
+                )
+            self.assertEqual(
+                expected, instance.finalize(accumulator, config, MODEL_QUALITY_ATTRIBUTES)
+            )
+
+            # Shards accumulated separately, merged in another order.
+            shards = [
+                instance.accumulate(
+                    instance.create_accumulator(config, MODEL_QUALITY_ATTRIBUTES),
+                    shard,
+                    config,
+                    MODEL_QUALITY_ATTRIBUTES,
+                )
+                for shard in np.array_split(df, 5)
+            ]
+            merged = reduce(instance.merge_accumulators, shards[::-1])
+            self.assertEqual(expected, instance.finalize(merged, config, MODEL_QUALITY_ATTRIBUTES))
+
+    def test_merged_moments(self):
+        df = create_random_df(1000, 1)
+        actuals = df["ground_truth_attribute"].to_numpy()
+        predictions = df["inference_attribute"].to_numpy()
+
+        merged = merge_regression_accumulators(
+            calculate_regression_accumulator(actuals[:300], predictions[:300]),
+            calculate_regression_accumulator(actuals[300:], predictions[300:]),
+        )
+        residuals = predictions - actuals
+
+        self.assertEqual(1000, merged["count"])
+        self.assertAlmostEqual(residuals.mean(), merged["residual_mean"], places=10)
+        self.assertAlmostEqual(residuals.var() * 1000, merged["residual_m2"], places=6)
+        self.assertAlmostEqual(actuals.mean(), merged["actual_mean"], places=10)
+        self.assertAlmostEqual(actuals.var() * 1000, merged["actual_m2"], places=6)
+
+    def test_merge_with_empty_accumulator(self):
+        accumulator = calculate_regression_accumulator(np.array([1.0, 2.0]), np.array([1.5, 1.0]))
+
+        self.assertEqual(
+            accumulator, merge_regression_accumulators(create_regression_accumulator(), accumulator)
+        )
+        self.assertEqual(
+            accumulator, merge_regression_accumulators(accumulator, create_regression_accumulator())
+        )
+
+    def test_without_data(self):
+        empty_df = pd.DataFrame({"ground_truth_attribute": [], "inference_attribute": []})
+        for metric in METRICS:
+            instance = metric.instance
+            with self.assertRaises(ValueError) as context:
+                instance.finalize(create_regression_accumulator(), {}, MODEL_QUALITY_ATTRIBUTES)
+            self.assertEqual(
+                "Metric {} needs at least one sample".format(instance.metric_name),
+                str(context.exception),
+            )
+            with self.assertRaises(ValueError):
+                instance.calculate_statistics(empty_df, {}, MODEL_QUALITY_ATTRIBUTES)
+        with self.assertRaises(ValueError):
+            get_residual_quantile(create_regression_accumulator(), 0.5)
+
+    def test_residual_quantiles_are_within_one_percent(self):
+        df = create_random_df(20000, 2)
+        residuals = (df["inference_attribute"] - df["ground_truth_attribute"]).to_numpy()
+        accumulator = calculate_regression_accumulator(
+            df["ground_truth_attribute"].to_numpy(), df["inference_attribute"].to_numpy()
+        )
+
+        for quantile in [0, 0.01, 0.25, 0.5, 0.75, 0.99, 1]:
+            expected = np.quantile(residuals, quantile, method="lower")
+            self.assertLessEqual(
+                abs(get_residual_quantile(accumulator, quantile) - expected),
+                0.01 * abs(expected),
+                quantile,
+            )
+
+    def test_zero_residuals(self):
+        accumulator = calculate_regression_accumulator(
+            np.array([1.0, 2.0, 3.0, 4.0]), np.array([1.0, 2.0, 3.0, 5.0])
+        )
+
+        self.assertEqual(3, accumulator["zero_residual_count"])
+        self.assertEqual(0.0, get_residual_quantile(accumulator, 0.5))
+        self.assertAlmostEqual(1.0, get_residual_quantile(accumulator, 1), delta=0.01)
+
+    def test_accumulator_is_shared_through_the_context(self):
+        context = ModelQualityContext(create_random_df(100, 3), MODEL_QUALITY_ATTRIBUTES)
+
+        self.assertIs(get_regression_accumulator(context), get_regression_accumulator(context))
@@ -0,0 +1,99 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License").
+# You may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pandas as pd
+import pytest  # noqa
+import unittest
+
+from src.model.model_quality_attributes import ModelQualityAttributes
+from src.monitoring_custom_metrics.model_quality.regression.residual_quantile import (
+    instance,
+)
+
+actuals = [3.0, -0.5, 2.0, 7.0, 4.2, 1.5, 10.0, 6.3, 0.8, 5.5]
+predictions = [2.5, 0.0, 2.1, 7.8, 3.9, 1.0, 11.2, 6.0, 1.1, 5.0]
+DF = pd.DataFrame()
+DF["ground_truth_attribute"] = actuals
+DF["inference_attribute"] = predictions
+
+CONSTRAINT_NO_VIOLATION = {
+    "threshold": -0.2982,
+    "comparison_operator": "GreaterThanThreshold",
+    "additional_properties": None,
+}
+CONSTRAINT_WITH_VIOLATION = {
+    "threshold": -0.3482,
+    "comparison_operator": "GreaterThanThreshold",
+    "additional_properties": None,
+}
+
+CONFIG = {"metric_name": "residual_quantile"}
+
+CONFIG_OVERRIDE = {"metric_name": "residual_quantile", "threshold_override": -0.05}
+
+EXPECTED_STATISTIC = {"value": -0.2982, "standard_deviation": 0}
+EXPECTED_VIOLATION = {
+    "constraint_check_type": "GreaterThanThreshold",
+    "description": "Metric residual_quantile with -0.2982 was GreaterThanThreshold -0.3482",
+    "metric_name": "residual_quantile",
+}
+
+GROUND_TRUTH_ATTRIBUTE = "ground_truth_attribute"
+PROBABILITY_THRESHOLD_ATTRIBUTE = "probability_threshold_attribute"
+INFERENCE_ATTRIBUTE = "inference_attribute"
+MODEL_QUALITY_ATTRIBUTES = ModelQualityAttributes(
+    GROUND_TRUTH_ATTRIBUTE,
+    None,
+    PROBABILITY_THRESHOLD_ATTRIBUTE,
+    INFERENCE_ATTRIBUTE,
+)
+
+
+class TestCustomMetric(unittest.TestCase):
+    def test_calculate_statistics(self):
+        statistic = instance.calculate_statistics(DF, CONFIG, MODEL_QUALITY_ATTRIBUTES)
+        self.assertEqual(EXPECTED_STATISTIC, statistic)
+
+    def test_calculate_statistics_with_quantile(self):
+        statistic = instance.calculate_statistics(
+            DF, {"metric_name": "residual_quantile", "quantile": 0.9}, MODEL_QUALITY_ATTRIBUTES
+        )
+        # The residual of rank 8 out of 0 to 9 is 0.8, estimated within 1%%.
+        self.assertAlmostEqual(0.8, statistic["value"], delta=0.008)
+
+    def test_calculate_statistics_with_invalid_quantile(self):
+        with self.assertRaisesRegex(ValueError, "Quantile must be between 0 and 1"):
+            instance.calculate_statistics(
+                DF, {"metric_name": "residual_quantile", "quantile": 90}, MODEL_QUALITY_ATTRIBUTES
+            )
+
+    def test_evaluate_constraints(self):
+        no_violation = instance.evaluate_constraints(
+            EXPECTED_STATISTIC, DF, CONFIG, CONSTRAINT_NO_VIOLATION, MODEL_QUALITY_ATTRIBUTES
+        )
+        violation = instance.evaluate_constraints(
+            EXPECTED_STATISTIC, DF, CONFIG, CONSTRAINT_WITH_VIOLATION, MODEL_QUALITY_ATTRIBUTES
+        )
+        self.assertIsNone(no_violation)
+        self.assertEqual(EXPECTED_VIOLATION, violation)
+
+    def test_suggest_constraints(self):
+        suggested_baseline = instance.suggest_constraints(
+            EXPECTED_STATISTIC, DF, CONFIG, MODEL_QUALITY_ATTRIBUTES
+        )
+        suggested_baseline_w_override = instance.suggest_constraints(
+            EXPECTED_STATISTIC, DF, CONFIG_OVERRIDE, MODEL_QUALITY_ATTRIBUTES
+        )
+        self.assertEqual(CONSTRAINT_NO_VIOLATION, suggested_baseline)
+        self.assertEqual(CONSTRAINT_WITH_VIOLATION, suggested_baseline_w_override)
@@ -0,0 +1,125 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License").
+# You may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+
+import numpy as np
+import pytest  # noqa
+import unittest
+from unittest import mock
+
+from src.model.bootstrap_config import BootstrapConfig
+from src.monitoring_custom_metrics.model_quality import bootstrap
+from src.monitoring_custom_metrics.model_quality.bootstrap import (
+    get_bootstrap_config,
+    get_chunk_bounds,
+    get_conditional_poisson_weights,
+    get_poisson_weights,
+    sum_weighted_chunks,
+    with_bootstrap,
+)
+
+BOOTSTRAP_CONFIG = BootstrapConfig(200, 0.9, 7)
+
+
+class TestBootstrap(unittest.TestCase):
+    def test_get_bootstrap_config(self):
+        self.assertIsNone(get_bootstrap_config({"metric_name": "gini"}))
+
+        bootstrap_config = get_bootstrap_config({"bootstrap": {"replicates": 1000}})
+        self.assertEqual(1000, bootstrap_config.replicates)
+        self.assertEqual(0.95, bootstrap_config.confidence_level)
+        self.assertEqual(0, bootstrap_config.seed)
+
+        bootstrap_config = get_bootstrap_config(
+            {"bootstrap": {"replicates": 50, "confidence_level": 0.8, "seed": 3}}
+        )
+        self.assertEqual(50, bootstrap_config.replicates)
+        self.assertEqual(0.8, bootstrap_config.confidence_level)
+        self.assertEqual(3, bootstrap_config.seed)
+
+    def test_get_bootstrap_config_invalid(self):
+        for invalid in [{}, {"replicates": 1}, {"replicates": 10.5}]:
+            with self.assertRaisesRegex(ValueError, "bootstrap replicates"):
+                get_bootstrap_config({"bootstrap": invalid})
+        with self.assertRaisesRegex(ValueError, "bootstrap confidence_level"):
+            get_bootstrap_config({"bootstrap": {"replicates": 10, "confidence_level": 95}})
+
+    def test_get_chunk_bounds(self):
+        with mock.patch.object(bootstrap, "BOOTSTRAP_CHUNK_CELLS", 1000):
+            self.assertEqual([(0, 10), (10, 20), (20, 25)], get_chunk_bounds(25, 100, None))
+            self.assertEqual([(0, 5)], get_chunk_bounds(5, 100, None))
+            # Chunks end on the next boundary.
+            self.assertEqual(
+                [(0, 12), (12, 25)], get_chunk_bounds(25, 100, np.array([3, 12, 13, 25]))
+            )
+
+    def test_get_poisson_weights(self):
+        weights = get_poisson_weights(BOOTSTRAP_CONFIG, 0, 5000)
+
+        self.assertEqual((200, 5000), weights.shape)
+        self.assertAlmostEqual(1, weights.mean(), places=2)
+        self.assertAlmostEqual(1, weights.var(), places=2)
+        np.testing.assert_array_equal(weights, get_poisson_weights(BOOTSTRAP_CONFIG, 0, 5000))
+        self.assertFalse(np.array_equal(weights, get_poisson_weights(BOOTSTRAP_CONFIG, 1, 5000)))
+
+    def test_get_conditional_poisson_weights(self):
+        totals = np.array([0, 3, 12])
+
+        weights = get_conditional_poisson_weights(np.random.default_rng(0), totals, 4)
+
+        self.assertEqual((3, 4), weights.shape)
+        np.testing.assert_array_equal(totals, weights.sum(axis=1))
+        self.assertEqual(
+            (3, 0), get_conditional_poisson_weights(np.random.default_rng(0), totals, 0).shape
+        )
+
+    def test_sum_weighted_chunks_does_not_depend_on_workers(self):
+        values = np.random.default_rng(0).random(1000)
+        results = []
+        with mock.patch.object(bootstrap, "BOOTSTRAP_CHUNK_CELLS", 200 * 64):
+            for workers in ["1", "3"]:
+                with mock.patch.dict(os.environ, {"bootstrap_workers": workers}):
+                    results.append(
+                        sum_weighted_chunks(
+                            lambda weights, start, stop: weights @ values[start:stop],
+                            len(values),
+                            BOOTSTRAP_CONFIG,
+                        )
+                    )
+            expected = sum(
+                get_poisson_weights(BOOTSTRAP_CONFIG, chunk_index, stop - start)
+                @ values[start:stop]
+                for chunk_index, (start, stop) in enumerate(get_chunk_bounds(1000, 200))
+            )
+
+        self.assertEqual((200,), results[0].shape)
+        np.testing.assert_array_equal(expected, results[0])
+        np.testing.assert_array_equal(expected, results[1])
+
+    def test_with_bootstrap(self):
+        replicate_values = np.r_[np.arange(101) / 100, np.nan]
+
+        statistics = with_bootstrap(
+            {"value": 0.5, "standard_deviation": 0}, replicate_values, BOOTSTRAP_CONFIG
+        )
+
+        self.assertEqual(
+            {
+                "value": 0.5,
+                "standard_deviation": round(float(np.std(np.arange(101) / 100, ddof=1)), 4),
+                "confidence_interval": {"confidence_level": 0.9, "lower": 0.05, "upper": 0.95},
+            },
+            statistics,
+        )
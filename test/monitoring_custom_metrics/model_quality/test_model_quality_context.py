@@ -0,0 +1,91 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License").
+# You may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import numpy as np
+import pandas as pd
+import pytest  # noqa
+import unittest
+
+from src.model.model_quality_attributes import ModelQualityAttributes
+from src.monitoring_custom_metrics.model_quality.model_quality_context import (
+    ModelQualityContext,
+    get_model_quality_context,
+)
+
+MODEL_QUALITY_ATTRIBUTES = ModelQualityAttributes(
+    "ground_truth_attribute",
+    "probability_attribute",
+    "probability_threshold_attribute",
+    "inference_attribute",
+)
+
+
+def create_df() -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "ground_truth_attribute": [1, 0, 1, 0],
+            "probability_attribute": [0.9, 0.2, 0.7, 0.4],
+            "inference_attribute": [True, False, True, False],
+        }
+    )
+
+
+class TestModelQualityContext(unittest.TestCase):
+    def test_arrays_are_read_only_and_contiguous(self):
+        context = ModelQualityContext(create_df(), MODEL_QUALITY_ATTRIBUTES)
+
+        self.assertEqual(4, context.item_count)
+        self.assertEqual(np.int64, context.labels.dtype)
+        self.assertEqual(np.float64, context.scores.dtype)
+        self.assertEqual(np.bool_, context.predictions.dtype)
+        for array in [context.labels, context.scores, context.predictions]:
+            self.assertTrue(array.flags.c_contiguous)
+            self.assertFalse(array.flags.writeable)
+        with self.assertRaises(ValueError):
+            context.scores[0] = 0.0
+
+    def test_arrays_are_extracted_once(self):
+        context = ModelQualityContext(create_df(), MODEL_QUALITY_ATTRIBUTES)
+
+        self.assertIs(context.labels, context.labels)
+        self.assertIs(context.scores, context.scores)
+
+    def test_missing_value_raises(self):
+        df = create_df()
+        df.loc[1, "probability_attribute"] = None
+        context = ModelQualityContext(df, MODEL_QUALITY_ATTRIBUTES)
+
+        np.testing.assert_array_equal([1, 0, 1, 0], context.labels)
+        with self.assertRaisesRegex(ValueError, "Missing value in probability_attribute column"):
+            context.scores
+
+    def test_df_does_not_leak_added_columns(self):
+        df = create_df()
+        context = ModelQualityContext(df, MODEL_QUALITY_ATTRIBUTES)
+
+        shim = context.df
+        shim["bins"] = 0
+
+        self.assertIn("bins", shim.columns)
+        self.assertNotIn("bins", context.df.columns)
+        self.assertNotIn("bins", df.columns)
+
+    def test_get_model_quality_context(self):
+        df = create_df()
+        context = ModelQualityContext(df, MODEL_QUALITY_ATTRIBUTES)
+
+        self.assertIs(context, get_model_quality_context(context, MODEL_QUALITY_ATTRIBUTES))
+        built = get_model_quality_context(df, MODEL_QUALITY_ATTRIBUTES)
+        self.assertIsInstance(built, ModelQualityContext)
+        self.assertIs(df, built.source)
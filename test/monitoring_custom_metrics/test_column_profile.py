@@ -0,0 +1,88 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License").
+# You may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from src.monitoring_custom_metrics.column_profile import (
+    calculate_profiles,
+    estimate_distinct_count,
+    get_column_profile,
+    get_common_statistics,
+    with_profile,
+)
+
+df = pd.DataFrame(
+    {
+        "Name": ["mike", "david", None, "sam@gmail.com"],
+        "Age": [20, 37, 23, 30],
+        "Score": [1.5, None, 2.5, 4.0],
+        "Count": pd.array([1, None, 3, 3], dtype="Int64"),
+    }
+)
+
+
+class TestColumnProfile(unittest.TestCase):
+    def test_calculate_profiles(self):
+        profiles = calculate_profiles(df)
+
+        self.assertEqual(["Name", "Age", "Score", "Count"], list(profiles))
+        self.assertEqual({"num_present": 3, "num_missing": 1}, profiles["Name"])
+        self.assertEqual(
+            {"num_present": 4, "num_missing": 0, "min": 20, "max": 37, "mean": 27.5},
+            profiles["Age"],
+        )
+        self.assertEqual(
+            {"num_present": 3, "num_missing": 1, "min": 1.5, "max": 4.0, "mean": 8 / 3},
+            profiles["Score"],
+        )
+        self.assertEqual(np.int64, type(profiles["Age"]["max"]))
+        self.assertEqual(7 / 3, profiles["Count"]["mean"])
+
+    def test_calculate_profiles_matches_column_statistics(self):
+        profiles = calculate_profiles(df)
+
+        for column_name in df.columns:
+            self.assertEqual(df[column_name].count(), profiles[column_name]["num_present"])
+            self.assertEqual(df[column_name].isnull().sum(), profiles[column_name]["num_missing"])
+
+    def test_with_profile(self):
+        profile = {"num_present": 1, "num_missing": 2}
+        column = with_profile(df["Age"], profile)
+
+        self.assertIs(profile, get_column_profile(column))
+        self.assertEqual(profile, get_common_statistics(column))
+        self.assertNotIn("profile", df["Age"].attrs)
+
+    def test_get_column_profile_without_profile(self):
+        column = df["Score"].copy()
+
+        self.assertEqual({"num_present": 3, "num_missing": 1}, get_common_statistics(column))
+        self.assertIs(get_column_profile(column), get_column_profile(column))
+
+    def test_estimate_distinct_count(self):
+        column = df["Count"].copy()
+
+        self.assertEqual(2, estimate_distinct_count(column))
+        self.assertEqual(2, get_column_profile(column)["distinct_count_estimate"])
+
+    def test_estimate_distinct_count_of_large_column(self):
+        values = np.random.default_rng(0).integers(0, 50000, size=200000)
+        column = pd.Series(values, name="Value")
+
+        estimate = estimate_distinct_count(column)
+
+        self.assertLess(abs(estimate / len(np.unique(values)) - 1), 0.1)
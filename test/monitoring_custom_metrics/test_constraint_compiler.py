@@ -0,0 +1,142 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License").
+# You may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+
+from src.model.data_type import DataType
+from src.model.problem_type import ProblemType
+from src.monitoring_custom_metrics.constraint_compiler import (
+    compile_data_quality_constraints,
+    compile_model_quality_constraints,
+)
+
+sum_constraint = {"lower_bound": 99.0, "upper_bound": 121.0, "additional_properties": None}
+email_constraint = {"additional_properties": {"allowed": False}}
+data_quality_constraints = {
+    "version": 0.0,
+    "features": [
+        {
+            "name": "Name",
+            "inferred_type": "String",
+            "string_constraints": {"email": email_constraint},
+        },
+        {"name": "Age", "inferred_type": "Integral", "num_constraints": {"sum": sum_constraint}},
+        {"name": "Score", "inferred_type": "Fractional", "num_constraints": {}},
+    ],
+}
+gini_constraint = {"threshold": 0.5}
+model_quality_constraints = {
+    "version": 0.0,
+    "binary_classification_constraints": {"gini": gini_constraint},
+    "regression_constraints": {"unknown": {}},
+}
+
+
+class TestConstraintCompiler(unittest.TestCase):
+    def test_compile_data_quality_constraints(self):
+        index = compile_data_quality_constraints(data_quality_constraints)
+
+        self.assertEqual(sum_constraint, index.get("Age", "sum"))
+        self.assertEqual(email_constraint, index.get("Name", "email"))
+        self.assertIsNone(index.get("Age", "email"))
+        self.assertIsNone(index.get("Missing", "sum"))
+        self.assertEqual(
+            {"Name": DataType.String, "Age": DataType.Integral, "Score": DataType.Fractional},
+            index.data_types,
+        )
+
+    def test_compile_data_quality_constraints_reports_every_error(self):
+        constraints = {
+            "features": [
+                {"inferred_type": "Integral"},
+                {"name": "Age", "inferred_type": "Integral", "num_constraints": {"email": {}}},
+                {"name": "Age", "inferred_type": "Integral", "num_constraints": {}},
+                {"name": "Date", "inferred_type": "Timestamp"},
+                {"name": "Name", "inferred_type": "String", "string_constraints": {"email": 1}},
+            ]
+        }
+
+        with self.assertRaises(ValueError) as context:
+            compile_data_quality_constraints(constraints)
+        self.assertEqual(
+            "Invalid baseline constraints: feature 0 has no name; "
+            "feature Age has constraints for unknown metric email; "
+            "feature Age is defined more than once; "
+            "feature Date has an unknown inferred_type Timestamp; "
+            "feature Name has invalid constraints for metric email",
+            str(context.exception),
+        )
+
+    def test_compile_data_quality_constraints_without_features(self):
+        with self.assertRaises(ValueError) as context:
+            compile_data_quality_constraints({"version": 0.0})
+        self.assertEqual(
+            "Invalid baseline constraints: 'features' must be a list", str(context.exception)
+        )
+
+    def test_compile_model_quality_constraints(self):
+        index = compile_model_quality_constraints(
+            model_quality_constraints, ProblemType.binary_classification
+        )
+
+        self.assertEqual(gini_constraint, index.get("gini"))
+        self.assertEqual({}, index.get("pr_auc"))
+
+    def test_compile_model_quality_constraints_with_unknown_metric(self):
+        with self.assertRaises(ValueError) as context:
+            compile_model_quality_constraints(model_quality_constraints, ProblemType.regression)
+        self.assertEqual(
+            "Invalid baseline constraints: regression_constraints has constraints for unknown "
+            "metric unknown",
+            str(context.exception),
+        )
+
+    def test_compile_model_quality_constraints_by_segment(self):
+        index = compile_model_quality_constraints(
+            {
+                "binary_classification_constraints": {"gini": gini_constraint},
+                "segments": [
+                    {
+                        "segment": {"marketplace": "US", "model_version": 2},
+                        "binary_classification_constraints": {"pr_auc": gini_constraint},
+                    }
+                ],
+            },
+            ProblemType.binary_classification,
+        )
+
+        segment_index = index.get_segment('[["marketplace", "US"], ["model_version", "2"]]')
+        self.assertEqual(gini_constraint, segment_index.get("pr_auc"))
+        self.assertEqual({}, segment_index.get("gini"))
+        self.assertIsNone(index.get_segment('[["marketplace", "UK"], ["model_version", "2"]]'))
+
+    def test_compile_model_quality_constraints_by_segment_reports_every_error(self):
+        with self.assertRaises(ValueError) as context:
+            compile_model_quality_constraints(
+                {
+                    "segments": [
+                        {"binary_classification_constraints": {}},
+                        {
+                            "segment": {"marketplace": "US"},
+                            "binary_classification_constraints": {"unknown": {}},
+                        },
+                    ],
+                },
+                ProblemType.binary_classification,
+            )
+        self.assertEqual(
+            "Invalid baseline constraints: segment 0 has no segment values; segment 1 "
+            "binary_classification_constraints has constraints for unknown metric unknown",
+            str(context.exception),
+        )
@@ -0,0 +1,130 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License").
+# You may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import pandas as pd
+
+from src.monitoring_custom_metrics.incremental import accumulate_incrementally, describe_file
+
+
+def create_state():
+    return {"item_count": 0, "total": 0}
+
+
+def accumulate_state(state, chunk):
+    return {
+        "item_count": state["item_count"] + len(chunk.index),
+        "total": state["total"] + chunk["a"].sum(),
+    }
+
+
+def merge_states(state, other):
+    return {key: state[key] + other[key] for key in state}
+
+
+class TestIncremental(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+        self.input_path = os.path.join(self.folder.name, "input")
+        self.output_path = os.path.join(self.folder.name, "output")
+        os.makedirs(self.input_path)
+        self.read_files = []
+
+    def tearDown(self):
+        self.folder.cleanup()
+
+    def write_file(self, name, values):
+        pd.DataFrame({"a": values}).to_csv(os.path.join(self.input_path, name), index=False)
+
+    def read_chunks(self, full_path):
+        self.read_files.append(os.path.basename(full_path))
+        yield pd.read_csv(full_path)
+
+    def run_incrementally(self, fingerprint=None):
+        self.read_files = []
+        files = (
+            (
+                os.path.join(self.input_path, name),
+                self.read_chunks(os.path.join(self.input_path, name)),
+            )
+            for name in sorted(os.listdir(self.input_path))
+        )
+        with mock.patch.dict(os.environ, {"output_path": self.output_path}, clear=True):
+            return accumulate_incrementally(
+                files,
+                fingerprint or {"metrics": ["sum"]},
+                create_state,
+                accumulate_state,
+                merge_states,
+            )
+
+    def test_accumulate_incrementally_only_reads_new_and_changed_files(self):
+        self.write_file("part-0.csv", [1, 2])
+        self.write_file("part-1.csv", [3])
+
+        self.assertEqual({"item_count": 3, "total": 6}, self.run_incrementally())
+        self.assertEqual(["part-0.csv", "part-1.csv"], self.read_files)
+
+        self.assertEqual({"item_count": 3, "total": 6}, self.run_incrementally())
+        self.assertEqual([], self.read_files)
+
+        self.write_file("part-2.csv", [10, 20])
+        self.assertEqual({"item_count": 5, "total": 36}, self.run_incrementally())
+        self.assertEqual(["part-2.csv"], self.read_files)
+
+        self.write_file("part-0.csv", [100])
+        os.remove(os.path.join(self.input_path, "part-1.csv"))
+        self.assertEqual({"item_count": 3, "total": 130}, self.run_incrementally())
+        self.assertEqual(["part-0.csv"], self.read_files)
+
+        with open(os.path.join(self.output_path, "incremental_manifest.json")) as file:
+            manifest = json.load(file)
+        self.assertEqual(
+            ["part-0.csv", "part-2.csv"],
+            [os.path.basename(entry["path"]) for entry in manifest["files"]],
+        )
+        self.assertEqual({"path", "size", "mtime", "sha256"}, set(manifest["files"][0].keys()))
+
+    def test_accumulate_incrementally_with_touched_file(self):
+        self.write_file("part-0.csv", [1, 2])
+        self.run_incrementally()
+
+        full_path = os.path.join(self.input_path, "part-0.csv")
+        os.utime(full_path, ns=(0, 0))
+        self.assertEqual({"item_count": 2, "total": 3}, self.run_incrementally())
+        self.assertEqual([], self.read_files)
+
+    def test_accumulate_incrementally_with_different_fingerprint(self):
+        self.write_file("part-0.csv", [1, 2])
+        self.run_incrementally()
+
+        self.assertEqual(
+            {"item_count": 2, "total": 3}, self.run_incrementally({"metrics": ["sum", "email"]})
+        )
+        self.assertEqual(["part-0.csv"], self.read_files)
+
+    def test_describe_file(self):
+        self.write_file("part-0.csv", [1, 2])
+        full_path = os.path.join(self.input_path, "part-0.csv")
+
+        entry = describe_file(full_path)
+        self.assertEqual(os.path.getsize(full_path), entry["size"])
+        self.assertEqual(64, len(entry["sha256"]))
+        # The content is not hashed again while the size and modification time do not change.
+        self.assertEqual("cached", describe_file(full_path, dict(entry, sha256="cached"))["sha256"])
@@ -17,12 +17,16 @@ import pandas as pd
 import os
 from unittest import mock
 
+from src.model.execution_mode import ExecutionMode
+from src.model.execution_plan import ExecutionPlan
 from src.model.monitor_type import MonitorType
 from src.model.operation_type import OperationType
+from src.model.sampling_mode import SamplingMode
 from src.monitoring_custom_metrics.main import (
     monitoring,
     determine_operation_to_run,
     determine_monitor_type,
+    get_chunk_size,
 )
 from unittest.mock import patch
 
@@ -72,14 +76,31 @@ class TestMonitoring(unittest.TestCase):
         clear=True,
     )
     @patch("src.monitoring_custom_metrics.main.get_dataframe_from_csv")
+    @patch("src.monitoring_custom_metrics.main.get_model_quality_columns")
+    @patch("src.monitoring_custom_metrics.main.determine_execution_plan")
     @patch("src.monitoring_custom_metrics.main.execute_for_model_quality")
     def test_monitoring_for_model_quality(
-        self, mock_execute_for_model_quality, mock_get_dataframe_from_csv
+        self,
+        mock_execute_for_model_quality,
+        mock_determine_execution_plan,
+        mock_get_model_quality_columns,
+        mock_get_dataframe_from_csv,
     ):
         mock_get_dataframe_from_csv.return_value = df
+        mock_get_model_quality_columns.return_value = ["Age"]
+        mock_determine_execution_plan.return_value = ExecutionPlan(
+            ExecutionMode.in_memory, None, "the input fits in memory"
+        )
 
         monitoring()
-        mock_execute_for_model_quality.assert_called_once_with(OperationType.suggest_baseline, df)
+        mock_get_model_quality_columns.assert_called_once_with(OperationType.suggest_baseline)
+        mock_determine_execution_plan.assert_called_once_with(
+            OperationType.suggest_baseline, MonitorType.MODEL_QUALITY, ["Age"], None
+        )
+        mock_get_dataframe_from_csv.assert_called_once_with(columns=["Age"], dtype=None)
+        mock_execute_for_model_quality.assert_called_once_with(
+            OperationType.suggest_baseline, df, incremental=False, constraint=None
+        )
 
     @mock.patch.dict(
         os.environ,
@@ -111,3 +132,88 @@ class TestMonitoring(unittest.TestCase):
     def test_determine_monitor_type_without_analysis_without_ground_truth_provided(self):
         monitor_type = determine_monitor_type()
         self.assertEqual(MonitorType.DATA_QUALITY.value, monitor_type.value)
+
+    @mock.patch.dict(
+        os.environ,
+        {"analysis_type": "DATA_QUALITY", "execution_mode": "streaming", "chunk_size": "2"},
+        clear=True,
+    )
+    @patch("src.monitoring_custom_metrics.main.get_dataframe_from_csv")
+    @patch("src.monitoring_custom_metrics.main.get_dataframe_chunks_from_csv")
+    @patch("src.monitoring_custom_metrics.main.execute_for_data_quality")
+    def test_monitoring_for_data_quality_streaming(
+        self,
+        mock_execute_for_data_quality,
+        mock_get_dataframe_chunks_from_csv,
+        mock_get_dataframe_from_csv,
+    ):
+        chunks = iter([df.iloc[:2], df.iloc[2:]])
+        mock_get_dataframe_chunks_from_csv.return_value = chunks
+
+        monitoring()
+
+        mock_get_dataframe_chunks_from_csv.assert_called_once_with(
+            chunk_size=2, columns=None, dtype=None
+        )
+        mock_get_dataframe_from_csv.assert_not_called()
+        mock_execute_for_data_quality.assert_called_once_with(
+            OperationType.suggest_baseline, chunks, incremental=False, constraints=None
+        )
+
+    @mock.patch.dict(
+        os.environ,
+        {"analysis_type": "DATA_QUALITY", "sampling_mode": "reservoir", "chunk_size": "2"},
+        clear=True,
+    )
+    @patch("src.monitoring_custom_metrics.main.get_dataframe_chunks_from_csv")
+    @patch("src.monitoring_custom_metrics.main.sample_dataset")
+    @patch("src.monitoring_custom_metrics.main.execute_for_data_quality")
+    def test_monitoring_for_data_quality_with_sampling(
+        self,
+        mock_execute_for_data_quality,
+        mock_sample_dataset,
+        mock_get_dataframe_chunks_from_csv,
+    ):
+        chunks = iter([df.iloc[:2], df.iloc[2:]])
+        mock_get_dataframe_chunks_from_csv.return_value = chunks
+        mock_sample_dataset.return_value = df
+
+        monitoring()
+        mock_get_dataframe_chunks_from_csv.assert_called_once_with(
+            chunk_size=2, columns=None, dtype=None
+        )
+        mock_sample_dataset.assert_called_once_with(
+            OperationType.suggest_baseline, SamplingMode.reservoir, chunks
+        )
+        mock_execute_for_data_quality.assert_called_once_with(
+            OperationType.suggest_baseline, df, incremental=False, constraints=None
+        )
+
+    @mock.patch.dict(
+        os.environ,
+        {"analysis_type": "DATA_QUALITY", "execution_mode": "incremental", "chunk_size": "2"},
+        clear=True,
+    )
+    @patch("src.monitoring_custom_metrics.main.get_file_chunks_from_csv")
+    @patch("src.monitoring_custom_metrics.main.execute_for_data_quality")
+    def test_monitoring_for_data_quality_incremental(
+        self, mock_execute_for_data_quality, mock_get_file_chunks_from_csv
+    ):
+        files = iter([("part-0.csv", iter([df]))])
+        mock_get_file_chunks_from_csv.return_value = files
+
+        monitoring()
+        mock_get_file_chunks_from_csv.assert_called_once_with(
+            chunk_size=2, columns=None, dtype=None
+        )
+        mock_execute_for_data_quality.assert_called_once_with(
+            OperationType.suggest_baseline, files, incremental=True, constraints=None
+        )
+
+    def test_get_chunk_size(self):
+        self.assertEqual(100000, get_chunk_size())
+        with mock.patch.dict(os.environ, {"chunk_size": "500"}, clear=True):
+            self.assertEqual(500, get_chunk_size())
+        with mock.patch.dict(os.environ, {"chunk_size": "0"}, clear=True):
+            with self.assertRaises(ValueError):
+                get_chunk_size()
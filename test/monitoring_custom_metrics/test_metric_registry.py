@@ -0,0 +1,144 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License").
+# You may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import sys
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+from unittest.mock import Mock, patch
+
+from src.model.data_type import DataType
+from src.model.problem_type import ProblemType
+from src.monitoring_custom_metrics.data_quality.numerical.sum import instance as sum_instance
+from src.monitoring_custom_metrics.metric_registry import (
+    clear_metric_registry,
+    discover_metrics,
+    get_data_quality_metrics,
+    get_model_quality_metrics,
+)
+
+
+class TestMetricRegistry(unittest.TestCase):
+    def setUp(self):
+        clear_metric_registry()
+
+    def tearDown(self):
+        clear_metric_registry()
+
+    def test_get_data_quality_metrics(self):
+        metrics = get_data_quality_metrics(DataType.Integral)
+
+        self.assertEqual(["sum"], [metric.__name__ for metric in metrics])
+        self.assertIs(sum_instance, metrics[0].instance)
+        self.assertIs(metrics, get_data_quality_metrics(DataType.Fractional))
+        self.assertEqual(
+            ["email"], [metric.__name__ for metric in get_data_quality_metrics(DataType.String)]
+        )
+
+    def test_get_model_quality_metrics(self):
+        metrics = get_model_quality_metrics(ProblemType.binary_classification)
+
+        self.assertEqual(
+            [
+                "accuracy",
+                "brier_score_loss",
+                "f1",
+                "false_positive_rate",
+                "gini",
+                "ks",
+                "lift",
+                "mcc",
+                "pr_auc",
+                "precision",
+                "recall",
+                "roc_auc",
+                "score_diff",
+                "specificity",
+            ],
+            [metric.__name__ for metric in metrics],
+        )
+        self.assertEqual(
+            ["mae", "mape", "r2", "residual_mean", "residual_quantile", "residual_std", "rmse"],
+            [metric.__name__ for metric in get_model_quality_metrics(ProblemType.regression)],
+        )
+        self.assertEqual(
+            ["accuracy", "class_recall", "cohen_kappa", "f1", "precision", "recall"],
+            [
+                metric.__name__
+                for metric in get_model_quality_metrics(ProblemType.multiclass_classification)
+            ],
+        )
+
+    def test_get_data_quality_metrics_for_unknown_data_type(self):
+        with self.assertRaises(NotImplementedError):
+            get_data_quality_metrics("Boolean")
+
+    @patch("src.monitoring_custom_metrics.metric_registry.discover_metrics", return_value=[])
+    def test_metrics_are_discovered_once(self, mock_discover_metrics):
+        get_model_quality_metrics(ProblemType.regression)
+        get_model_quality_metrics(ProblemType.regression)
+
+        mock_discover_metrics.assert_called_once_with("model_quality.regression", True)
+
+    @mock.patch.dict("os.environ", {"lazy_metric_import": "false"})
+    @patch("src.monitoring_custom_metrics.metric_registry.discover_metrics", return_value=[])
+    def test_metrics_are_imported_eagerly(self, mock_discover_metrics):
+        get_model_quality_metrics(ProblemType.regression)
+
+        mock_discover_metrics.assert_called_once_with("model_quality.regression", False)
+
+    def test_discover_metrics_imports_lazily(self):
+        module_name = "src.monitoring_custom_metrics.model_quality.binary_classification.gini"
+        imported_module = sys.modules.pop(module_name, None)
+        try:
+            metrics = discover_metrics("model_quality.binary_classification")
+            self.assertNotIn(module_name, sys.modules)
+
+            gini = next(metric for metric in metrics if metric.__name__ == "gini")
+            instance = gini.instance
+            self.assertIs(sys.modules[module_name].instance, instance)
+        finally:
+            if imported_module is not None:
+                sys.modules[module_name] = imported_module
+
+    @patch("src.monitoring_custom_metrics.metric_registry.entry_points")
+    def test_discover_metrics_from_entry_points(self, mock_entry_points):
+        instance = Mock()
+        entry_point = Mock(value="my_package.metrics:my_metric")
+        entry_point.name = "my_metric"
+        entry_point.load.return_value = SimpleNamespace(instance=instance)
+        mock_entry_points.return_value = [entry_point]
+
+        metrics = discover_metrics("data_quality.numerical")
+
+        mock_entry_points.assert_called_once_with(
+            group="monitoring_custom_metrics.data_quality.numerical"
+        )
+        self.assertEqual(["my_metric", "sum"], [metric.__name__ for metric in metrics])
+        entry_point.load.assert_not_called()
+        self.assertIs(instance, metrics[0].instance)
+
+    @patch("src.monitoring_custom_metrics.metric_registry.entry_points")
+    def test_discover_metrics_with_duplicated_entry_point(self, mock_entry_points):
+        entry_point = Mock(value="my_package.metrics:sum")
+        entry_point.name = "sum"
+        mock_entry_points.return_value = [entry_point]
+
+        with self.assertRaises(ValueError) as context:
+            discover_metrics("data_quality.numerical")
+        self.assertEqual(
+            "Metric sum from entry point my_package.metrics:sum is already defined for "
+            "data_quality.numerical",
+            str(context.exception),
+        )
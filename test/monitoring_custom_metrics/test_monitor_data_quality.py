@@ -12,21 +12,34 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import glob
 import json
 import os
-import sys
+import tempfile
 import unittest
+from types import SimpleNamespace
 from unittest import mock
 from unittest.mock import Mock, patch, mock_open
 
 import pandas as pd
 
+from src.monitoring_custom_metrics.data_quality.numerical.sum import instance as sum_instance
+from src.monitoring_custom_metrics.data_quality.string.email import instance as email_instance
 from src.monitoring_custom_metrics.monitor_data_quality import (
     translate_data_type,
     execute_operation_for_data_quality,
     execute_for_data_quality,
     validate_environment_variables,
+    create_data_quality_state,
+    accumulate_data_quality_state,
+    merge_data_quality_states,
+    get_baseline_dtypes,
+    get_column_executor,
+    calculate_batch_statistics,
+    load_data_quality_constraints,
 )
+from src.monitoring_custom_metrics.constraint_compiler import compile_data_quality_constraints
+from src.monitoring_custom_metrics.util import read_file_in_chunks
 from src.model.data_type import DataType
 from src.model.operation_type import OperationType
 
@@ -71,6 +84,28 @@ expected_statistics_file_content = {
 expected_constraint_violations = [constraint_violation]
 expected_constraints = [{"lower_bound": 21, "upper_bound": 40}]
 
+sum_module = SimpleNamespace(__name__="sum", instance=sum_instance)
+email_module = SimpleNamespace(__name__="email", instance=email_instance)
+
+
+def get_files(folder_path):
+    # Data files only: the incremental state is saved in the same folder.
+    return (
+        (full_path, read_file_in_chunks(full_path, chunk_size=1))
+        for full_path in sorted(glob.glob(os.path.join(folder_path, "*.csv")))
+    )
+
+
+def assert_called_with_columns(mock_execute_operation_for_data_quality, column_names):
+    for call, column_name in zip(
+        mock_execute_operation_for_data_quality.call_args_list, column_names
+    ):
+        pd.testing.assert_series_equal(df[column_name], call.args[2])
+
+
+def retrieve_real_modules(data_type):
+    return [email_module] if data_type is DataType.String else [sum_module]
+
 
 class TestMonitorDataQuality(unittest.TestCase):
     def test_translate_data_type(self):
@@ -78,21 +113,61 @@ class TestMonitorDataQuality(unittest.TestCase):
         self.assertEqual(DataType.Fractional, translate_data_type("float64"))
         self.assertEqual(DataType.String, translate_data_type("bool"))
         self.assertEqual(DataType.String, translate_data_type("object"))
+        self.assertEqual(DataType.Integral, translate_data_type(pd.Int64Dtype()))
+        self.assertEqual(DataType.String, translate_data_type(pd.StringDtype()))
+        self.assertEqual(DataType.String, translate_data_type(pd.CategoricalDtype(["a"])))
+
+    @mock.patch.dict(os.environ, {"baseline_constraints": "constraints.json"}, clear=True)
+    @patch("src.monitoring_custom_metrics.monitor_data_quality.retrieve_json_file_in_path")
+    def test_get_baseline_dtypes(self, mock_retrieve_json_file_in_path):
+        mock_retrieve_json_file_in_path.return_value = {
+            "features": [
+                {"name": "Name", "inferred_type": "String", "string_constraints": {}},
+                {"name": "Age", "inferred_type": "Integral", "num_constraints": {}},
+                {"name": "Score", "inferred_type": "Fractional", "num_constraints": {}},
+            ]
+        }
+
+        self.assertIsNone(load_data_quality_constraints(OperationType.suggest_baseline))
+        self.assertIsNone(get_baseline_dtypes(None))
+        self.assertEqual(
+            {"Name": "string", "Age": "Int64", "Score": "float64"},
+            get_baseline_dtypes(load_data_quality_constraints(OperationType.run_monitor)),
+        )
+        mock_retrieve_json_file_in_path.assert_called_once_with("constraints.json")
+
+    @mock.patch.dict(os.environ, {"baseline_constraints": "constraints.json"}, clear=True)
+    @patch(
+        "src.monitoring_custom_metrics.monitor_data_quality.retrieve_json_file_in_path",
+        return_value={"features": [{"name": "Age", "inferred_type": "Integral"}]},
+    )
+    def test_load_data_quality_constraints_with_invalid_constraints(
+        self, mock_retrieve_json_file_in_path
+    ):
+        with self.assertRaises(ValueError) as context:
+            load_data_quality_constraints(OperationType.run_monitor)
+        self.assertEqual(
+            "Invalid baseline constraints: feature Age has no num_constraints",
+            str(context.exception),
+        )
 
-    @patch("src.monitoring_custom_metrics.monitor_data_quality.get_data_quality_class_path")
-    @mock.patch("glob.glob", return_value=["sum.py"])
-    def test_run_monitor_for_data_quality(self, mock_glob, mock_get_data_quality_class_path):
-        sys.modules["sum"] = Mock()
-        sys.modules["sum"].__name__ = "sum"
+    @patch("src.monitoring_custom_metrics.monitor_data_quality.get_data_quality_metrics")
+    def test_run_monitor_for_data_quality(self, mock_get_data_quality_metrics):
+        module = Mock()
+        mock_get_data_quality_metrics.return_value = [module]
+        module.__name__ = "sum"
 
         instance = Mock()
-        sys.modules["sum"].instance = instance
+        module.instance = instance
         instance.calculate_statistics.return_value = statistic
         instance.evaluate_constraints.return_value = constraint_violation
         instance.suggest_constraints.return_value = constraint
 
         output = execute_operation_for_data_quality(
-            OperationType.run_monitor, DataType.Integral, column, constraint_output
+            OperationType.run_monitor,
+            DataType.Integral,
+            column,
+            compile_data_quality_constraints(constraint_output),
         )
 
         self.assertTrue(len(output) == 3)
@@ -106,14 +181,35 @@ class TestMonitorDataQuality(unittest.TestCase):
             statistic, column, expected_constraints[0]
         )
 
-    @patch("src.monitoring_custom_metrics.monitor_data_quality.get_data_quality_class_path")
-    @mock.patch("glob.glob", return_value=["sum.py"])
-    def test_suggest_baseline_for_data_quality(self, mock_glob, mock_get_data_quality_class_path):
-        sys.modules["sum"] = Mock()
-        sys.modules["sum"].__name__ = "sum"
+    @patch("src.monitoring_custom_metrics.monitor_data_quality.get_data_quality_metrics")
+    def test_run_monitor_for_data_quality_without_baseline_constraints(
+        self, mock_get_data_quality_metrics
+    ):
+        module = Mock()
+        mock_get_data_quality_metrics.return_value = [module]
+        module.__name__ = "sum"
+        module.instance.calculate_statistics.return_value = statistic
+        module.instance.suggest_constraints.return_value = constraint
+
+        output = execute_operation_for_data_quality(
+            OperationType.run_monitor,
+            DataType.Integral,
+            column,
+            compile_data_quality_constraints({"features": []}),
+        )
+
+        self.assertEqual([], output[2])
+        module.instance.evaluate_constraints.assert_not_called()
+        module.instance.suggest_constraints.assert_called_once_with(statistic, column, None)
+
+    @patch("src.monitoring_custom_metrics.monitor_data_quality.get_data_quality_metrics")
+    def test_suggest_baseline_for_data_quality(self, mock_get_data_quality_metrics):
+        module = Mock()
+        mock_get_data_quality_metrics.return_value = [module]
+        module.__name__ = "sum"
 
         instance = Mock()
-        sys.modules["sum"].instance = instance
+        module.instance = instance
         instance.calculate_statistics.return_value = statistic
         instance.suggest_constraints.return_value = constraint
 
@@ -142,16 +238,42 @@ class TestMonitorDataQuality(unittest.TestCase):
         with patch("builtins.open", mock_open(read_data="data")):
             output = execute_for_data_quality(operation_type, df)
 
-        mock_call_1 = mock.call(operation_type, DataType.String, df["Name"], None)
-        mock_call_2 = mock.call(operation_type, DataType.Integral, df["Age"], None)
+        mock_call_1 = mock.call(operation_type, DataType.String, mock.ANY, None, {}, True)
+        mock_call_2 = mock.call(
+            operation_type, DataType.Integral, mock.ANY, None, {"sum": 110}, True
+        )
 
         mock_execute_operation_for_data_quality.assert_has_calls(
             [mock_call_1, mock_call_2], any_order=True
         )
+        assert_called_with_columns(mock_execute_operation_for_data_quality, ["Name", "Age"])
         mock_write_results_to_output_folder.assert_called_once()
 
         self.assertTrue(len(output) == 3)
         self.assertEqual(4, output[0]["dataset"]["item_count"])
+        self.assertNotIn("sampling", output[0]["dataset"])
+
+    @mock.patch.dict(os.environ, {"output_path": "/output"}, clear=True)
+    @patch("src.monitoring_custom_metrics.monitor_data_quality.write_results_to_output_folder")
+    @patch(
+        "src.monitoring_custom_metrics.monitor_data_quality.execute_operation_for_data_quality",
+        return_value=[[], [], []],
+    )
+    def test_execute_for_data_quality_records_sampling(
+        self, mock_execute_operation_for_data_quality, mock_write_results_to_output_folder
+    ):
+        sample = df.copy()
+        sample.attrs["sampling"] = {"method": "reservoir", "sample_size": 4, "population_size": 4}
+
+        output = execute_for_data_quality(OperationType.suggest_baseline, sample)
+
+        self.assertEqual(
+            {
+                "item_count": 4,
+                "sampling": {"method": "reservoir", "sample_size": 4, "population_size": 4},
+            },
+            output[0]["dataset"],
+        )
 
     @mock.patch.dict(
         os.environ,
@@ -161,12 +283,17 @@ class TestMonitorDataQuality(unittest.TestCase):
     @patch("src.monitoring_custom_metrics.monitor_data_quality.write_results_to_output_folder")
     @patch("src.monitoring_custom_metrics.monitor_data_quality.execute_operation_for_data_quality")
     @patch(
-        "src.monitoring_custom_metrics.monitor_data_quality.retrieve_json_file_in_path",
+        "src.monitoring_custom_metrics.monitor_data_quality.compile_data_quality_constraints",
         return_value="data",
     )
+    @patch(
+        "src.monitoring_custom_metrics.monitor_data_quality.retrieve_json_file_in_path",
+        return_value="file",
+    )
     def test_execute_for_data_quality_evaluate_constraints(
         self,
         mock_retrieve_json_file,
+        mock_compile_data_quality_constraints,
         mock_execute_operation_for_data_quality,
         write_results_to_output_folder,
     ):
@@ -176,15 +303,19 @@ class TestMonitorDataQuality(unittest.TestCase):
             execute_for_data_quality(operation_type, df)
 
         mock_retrieve_json_file.assert_called_with(constraints_json_path)
+        mock_compile_data_quality_constraints.assert_called_once_with("file")
 
         write_results_to_output_folder.assert_called_once()
 
-        mock_call_1 = mock.call(operation_type, DataType.String, df["Name"], "data")
-        mock_call_2 = mock.call(operation_type, DataType.Integral, df["Age"], "data")
+        mock_call_1 = mock.call(operation_type, DataType.String, mock.ANY, "data", {}, True)
+        mock_call_2 = mock.call(
+            operation_type, DataType.Integral, mock.ANY, "data", {"sum": 110}, True
+        )
 
         mock_execute_operation_for_data_quality.assert_has_calls(
             [mock_call_1, mock_call_2], any_order=True
         )
+        assert_called_with_columns(mock_execute_operation_for_data_quality, ["Name", "Age"])
 
     def test_validate_environment_variables_with_baseline_constraints_missing(
         self,
@@ -195,3 +326,262 @@ class TestMonitorDataQuality(unittest.TestCase):
             "Environment variable baseline_constraints is not set.",
             str(context.exception),
         )
+
+    @mock.patch.dict(os.environ, {"output_path": "/output"}, clear=True)
+    @patch("src.monitoring_custom_metrics.monitor_data_quality.write_results_to_output_folder")
+    def test_execute_for_data_quality_column_executors_match_serial(
+        self, mock_write_results_to_output_folder
+    ):
+        wide_df = pd.concat(
+            [
+                df.add_suffix(f"_{index}").assign(**{f"Score_{index}": 1.5 * index})
+                for index in range(8)
+            ],
+            axis=1,
+        )
+        serial_output = json.dumps(
+            execute_for_data_quality(OperationType.suggest_baseline, wide_df), default=int
+        )
+
+        for column_executor in ["thread", "process"]:
+            with mock.patch.dict(
+                os.environ, {"column_executor": column_executor, "column_workers": "3"}
+            ):
+                output = execute_for_data_quality(OperationType.suggest_baseline, wide_df)
+            self.assertEqual(serial_output, json.dumps(output, default=int))
+
+    @patch("src.monitoring_custom_metrics.monitor_data_quality.get_data_quality_metrics")
+    def test_calculate_batch_statistics(self, mock_get_data_quality_metrics):
+        batch_instance = Mock()
+        batch_instance.calculate_statistics_batch.return_value = {"Age": 110}
+        column_instance = Mock()
+        column_instance.calculate_statistics_batch.return_value = None
+        mock_get_data_quality_metrics.return_value = [
+            SimpleNamespace(__name__="batch", instance=batch_instance),
+            SimpleNamespace(__name__="column", instance=column_instance),
+        ]
+
+        statistics = calculate_batch_statistics(df, {"Age": DataType.Integral})
+
+        self.assertEqual({"Age": {"batch": 110}}, statistics)
+        batch_instance.calculate_statistics_batch.assert_called_once()
+        self.assertEqual(["Age"], list(batch_instance.calculate_statistics_batch.call_args[0][0]))
+
+        execute_operation_for_data_quality(
+            OperationType.suggest_baseline, DataType.Integral, df["Age"], None, statistics["Age"]
+        )
+
+        batch_instance.calculate_statistics.assert_not_called()
+        column_instance.calculate_statistics.assert_called_once_with(df["Age"])
+
+    @mock.patch.dict(os.environ, {"column_executor": "threads"})
+    def test_get_column_executor_with_invalid_value(self):
+        with self.assertRaises(ValueError):
+            get_column_executor()
+
+    @mock.patch.dict(os.environ, {"output_path": "/output"}, clear=True)
+    @patch("src.monitoring_custom_metrics.monitor_data_quality.write_results_to_output_folder")
+    @patch(
+        "src.monitoring_custom_metrics.monitor_data_quality.get_data_quality_metrics",
+        side_effect=retrieve_real_modules,
+    )
+    def test_execute_for_data_quality_streaming_matches_in_memory(
+        self, mock_get_data_quality_metrics, mock_write_results_to_output_folder
+    ):
+        streaming_df = df.assign(Score=[1.5, None, 2.5, 4.0])
+        in_memory_output = execute_for_data_quality(OperationType.suggest_baseline, streaming_df)
+        streaming_output = execute_for_data_quality(
+            OperationType.suggest_baseline,
+            (streaming_df.iloc[start : start + 3] for start in range(0, 4, 3)),
+        )
+
+        self.assertEqual(in_memory_output, streaming_output)
+        self.assertEqual(2, mock_write_results_to_output_folder.call_count)
+
+    @mock.patch.dict(
+        os.environ,
+        {
+            "output_path": "/output",
+            "baseline_constraints": constraints_json_path,
+            "time_column": "event_time",
+            "time_bucket": "5min",
+        },
+        clear=True,
+    )
+    @patch("src.monitoring_custom_metrics.monitor_data_quality.write_results_to_output_folder")
+    @patch(
+        "src.monitoring_custom_metrics.monitor_data_quality.get_data_quality_metrics",
+        side_effect=retrieve_real_modules,
+    )
+    def test_execute_for_data_quality_by_time_bucket(
+        self, mock_get_data_quality_metrics, mock_write_results_to_output_folder
+    ):
+        timed_df = df.assign(
+            event_time=[
+                "2024-01-01T00:01:00Z",
+                "2024-01-01T00:06:00Z",
+                "2024-01-01T00:02:00Z",
+                "2024-01-01T00:09:00Z",
+            ]
+        )
+        constraints = compile_data_quality_constraints(
+            {
+                "features": [
+                    {
+                        "name": "Name",
+                        "inferred_type": "String",
+                        "string_constraints": {
+                            "email": {"additional_properties": {"allowed": False}}
+                        },
+                    },
+                    {
+                        "name": "Age",
+                        "inferred_type": "Integral",
+                        "num_constraints": {"sum": {"lower_bound": 100, "upper_bound": 120}},
+                    },
+                ]
+            }
+        )
+
+        output = execute_for_data_quality(
+            OperationType.run_monitor, timed_df, constraints=constraints
+        )
+
+        time_series = output[0]["time_series"]
+        self.assertEqual(
+            [("2024-01-01T00:00:00+00:00", 2), ("2024-01-01T00:05:00+00:00", 2)],
+            [(bucket["start"], bucket["item_count"]) for bucket in time_series],
+        )
+        self.assertEqual(
+            [43, 67],
+            [
+                next(feature for feature in bucket["features"] if feature["name"] == "Age")[
+                    "numerical_statistics"
+                ]["sum"]
+                for bucket in time_series
+            ],
+        )
+        # The email is in the whole dataset and in the second bucket. The sums of the buckets are below the bounds
+        # of the whole dataset, but sum grows with the number of rows and is only checked for the whole dataset.
+        self.assertEqual(
+            [("email", None), ("email", "2024-01-01T00:05:00+00:00")],
+            [
+                (violation["metric_name"], violation.get("time_bucket"))
+                for violation in output[2]["violations"]
+            ],
+        )
+
+    @mock.patch.dict(
+        os.environ,
+        {
+            "output_path": "/output",
+            "baseline_constraints": constraints_json_path,
+            "time_column": "event_time",
+            "time_bucket": "1min",
+        },
+        clear=True,
+    )
+    @patch("src.monitoring_custom_metrics.monitor_data_quality.write_results_to_output_folder")
+    @patch(
+        "src.monitoring_custom_metrics.monitor_data_quality.get_data_quality_metrics",
+        side_effect=retrieve_real_modules,
+    )
+    @patch("pandas.DataFrame.info")
+    def test_execute_for_data_quality_by_time_bucket_on_its_own_baseline(
+        self, mock_info, mock_get_data_quality_metrics, mock_write_results_to_output_folder
+    ):
+        timed_df = df.assign(
+            event_time=[
+                "2024-01-01T00:01:00Z",
+                "2024-01-01T00:06:00Z",
+                "2024-01-01T00:02:00Z",
+                "2024-01-01T00:09:00Z",
+            ]
+        )
+        baseline = execute_for_data_quality(OperationType.suggest_baseline, timed_df)
+        mock_info.reset_mock()
+
+        output = execute_for_data_quality(
+            OperationType.run_monitor,
+            timed_df,
+            constraints=compile_data_quality_constraints(baseline[1]),
+        )
+
+        self.assertEqual(4, len(output[0]["time_series"]))
+        self.assertEqual([], output[2]["violations"])
+        # The columns are described once, for the whole dataset.
+        mock_info.assert_called_once()
+
+    @patch("src.monitoring_custom_metrics.monitor_data_quality.write_results_to_output_folder")
+    @patch(
+        "src.monitoring_custom_metrics.monitor_data_quality.get_data_quality_metrics",
+        side_effect=retrieve_real_modules,
+    )
+    def test_execute_for_data_quality_incremental_matches_in_memory(
+        self, mock_get_data_quality_metrics, mock_write_results_to_output_folder
+    ):
+        incremental_df = df.assign(Score=[1.5, None, 2.5, 4.0])
+        in_memory_output = execute_for_data_quality(OperationType.suggest_baseline, incremental_df)
+
+        with tempfile.TemporaryDirectory() as folder_path:
+            for index in range(2):
+                incremental_df.iloc[index * 2 : index * 2 + 2].to_csv(
+                    os.path.join(folder_path, f"part-{index}.csv"), index=False
+                )
+            environment = {"dataset_source": folder_path, "output_path": folder_path}
+            with mock.patch.dict(os.environ, environment, clear=True):
+                first_output = execute_for_data_quality(
+                    OperationType.suggest_baseline, get_files(folder_path), incremental=True
+                )
+                second_output = execute_for_data_quality(
+                    OperationType.suggest_baseline, get_files(folder_path), incremental=True
+                )
+
+        self.assertEqual(in_memory_output, first_output)
+        self.assertEqual(in_memory_output, second_output)
+
+    @patch(
+        "src.monitoring_custom_metrics.monitor_data_quality.get_data_quality_metrics",
+        side_effect=retrieve_real_modules,
+    )
+    def test_merge_data_quality_states_with_missing_columns(self, mock_get_data_quality_metrics):
+        first = accumulate_data_quality_state(create_data_quality_state(), df.iloc[:2])
+        second = accumulate_data_quality_state(create_data_quality_state(), df[["Name"]].iloc[2:])
+
+        merged = merge_data_quality_states(first, second)
+
+        self.assertEqual(4, merged["item_count"])
+        self.assertEqual(["Name", "Age"], list(merged["columns"]))
+        self.assertEqual(2, merged["columns"]["Age"]["num_missing"])
+        self.assertEqual(DataType.Fractional, merged["columns"]["Age"]["data_type"])
+        self.assertTrue(merged["columns"]["Name"]["accumulators"]["email"])
+
+    @patch(
+        "src.monitoring_custom_metrics.monitor_data_quality.get_data_quality_metrics",
+        side_effect=retrieve_real_modules,
+    )
+    def test_accumulate_data_quality_state_with_incompatible_types(
+        self, mock_get_data_quality_metrics
+    ):
+        state = accumulate_data_quality_state(create_data_quality_state(), df.iloc[:2])
+
+        with self.assertRaises(ValueError) as context:
+            accumulate_data_quality_state(state, df.iloc[2:].assign(Age=["a", "b"]))
+        self.assertEqual(
+            "Column Age changed from Integral to String between chunks", str(context.exception)
+        )
+
+    @patch("src.monitoring_custom_metrics.monitor_data_quality.get_data_quality_metrics")
+    def test_accumulate_data_quality_state_without_accumulator(self, mock_get_data_quality_metrics):
+        module = Mock()
+        mock_get_data_quality_metrics.return_value = [module]
+        module.__name__ = "sum"
+        module.instance.create_accumulator.return_value = None
+
+        with self.assertRaises(ValueError) as context:
+            accumulate_data_quality_state(create_data_quality_state(), df[["Age"]])
+        self.assertEqual(
+            "Metric sum does not support streaming execution. "
+            "Use the 'in_memory' execution mode instead.",
+            str(context.exception),
+        )
@@ -14,21 +14,31 @@
 
 import json
 import os
-import sys
 import unittest
+from types import SimpleNamespace
 from unittest import mock
 from unittest.mock import Mock, patch
 
 import pandas as pd
 
+from src.model.constraint_index import ModelQualityConstraintIndex
 from src.model.model_quality_attributes import ModelQualityAttributes
 from src.model.problem_type import ProblemType
+from src.monitoring_custom_metrics.model_quality.binary_classification.brier_score_loss import (
+    instance as brier_score_loss_instance,
+)
+from src.monitoring_custom_metrics.model_quality.binary_classification.score_diff import (
+    instance as score_diff_instance,
+)
 from src.monitoring_custom_metrics.monitor_model_quality import (
     execute_operation_for_model_quality,
     execute_for_model_quality,
     translate_problem_type,
     validate_environment_variables,
     get_model_quality_attributes,
+    create_model_quality_state,
+    get_columns_referenced,
+    get_model_quality_columns,
 )
 from src.model.operation_type import OperationType
 
@@ -38,6 +48,11 @@ column = df["Age"]
 constraint_label = "binary_classification_constraints"
 constraint = {constraint_label: {"my_custom_metric": {"threshold": 50}}}
 no_constraint = {constraint_label: {}}
+constraint_index = ModelQualityConstraintIndex(
+    ProblemType.binary_classification,
+    {(ProblemType.binary_classification, "my_custom_metric"): {"threshold": 50}},
+)
+no_constraint_index = ModelQualityConstraintIndex(ProblemType.binary_classification, {})
 config_that_includes_my_custom_metric = {"my_custom_metric": {"threshold_overide": 10}}
 config_without_my_custom_metric = {}
 config_json_path = "/opt/config.json"
@@ -83,21 +98,43 @@ model_quality_attributes = ModelQualityAttributes(
     inference_attribute,
 )
 
+binary_df = pd.DataFrame(
+    {
+        "probability_attribute": [0.9, 0.3, 0.8, 0.75, 0.65, 0.6, 0.78, 0.7, 0.05, 0.4],
+        "ground_truth_attribute": [1, 1, 1, 1, 1, 0, 0, 0, 0, 0],
+    }
+)
+real_modules = [
+    SimpleNamespace(__name__="brier_score_loss", instance=brier_score_loss_instance),
+    SimpleNamespace(__name__="score_diff", instance=score_diff_instance),
+]
+streaming_config = {"brier_score_loss": {}, "score_diff": {"two_sided": True}}
+segmented_df = pd.DataFrame(
+    {
+        "probability_attribute": [0.9, 0.3, 0.8, 0.75, 0.65, 0.6, 0.78, 0.7, 0.05, 0.4, 0.2, 0.95],
+        "ground_truth_attribute": [1, 1, 1, 1, 1, 0, 0, 0, 0, 0, 0, 1],
+        "device": ["mobile", "desktop"] * 5 + ["tablet", "tablet"],
+    }
+)
+segmented_config = {
+    "segment_by": {"columns": ["device"], "min_segment_size": 3},
+    "brier_score_loss": {},
+    "score_diff": {"two_sided": True},
+}
+
 
 class TestMonitorModelQuality(unittest.TestCase):
-    @patch("src.monitoring_custom_metrics.monitor_model_quality.get_model_quality_class_path")
-    @mock.patch("glob.glob", return_value=["a.py"])
-    def test_evaluate_constraints_for_model_quality(
-        self, mock_glob, mock_get_model_quality_class_path
-    ):
-        sys.modules["a"] = Mock()
+    @patch("src.monitoring_custom_metrics.monitor_model_quality.get_model_quality_metrics")
+    def test_evaluate_constraints_for_model_quality(self, mock_get_model_quality_metrics):
+        module = Mock()
+        mock_get_model_quality_metrics.return_value = [module]
         instance = Mock()
-        sys.modules["a"].instance = instance
+        module.instance = instance
 
         instance.calculate_statistics.return_value = statistics_result
         instance.suggest_constraints.return_value = constraints_result
         instance.evaluate_constraints.return_value = expected_constraint_violations
-        sys.modules["a"].__name__ = "my_custom_metric"
+        module.__name__ = "my_custom_metric"
 
         output = execute_operation_for_model_quality(
             OperationType.run_monitor,
@@ -106,7 +143,7 @@ class TestMonitorModelQuality(unittest.TestCase):
             df,
             config_that_includes_my_custom_metric,
             constraint_label,
-            constraint,
+            constraint_index,
         )
         self.assertTrue(len(output) == 3)
 
@@ -122,20 +159,20 @@ class TestMonitorModelQuality(unittest.TestCase):
             model_quality_attributes,
         )
 
-    @patch("src.monitoring_custom_metrics.monitor_model_quality.get_model_quality_class_path")
-    @mock.patch("glob.glob", return_value=["a.py"])
+    @patch("src.monitoring_custom_metrics.monitor_model_quality.get_model_quality_metrics")
     def test_evaluate_constraints_for_model_quality_with_no_constraints_provided(
-        self, mock_glob, mock_get_model_quality_class_path
+        self, mock_get_model_quality_metrics
     ):
         empty_dict = {}
-        sys.modules["a"] = Mock()
+        module = Mock()
+        mock_get_model_quality_metrics.return_value = [module]
         instance = Mock()
-        sys.modules["a"].instance = instance
+        module.instance = instance
 
         instance.calculate_statistics.return_value = statistics_result
         instance.suggest_constraints.return_value = constraints_result
         instance.evaluate_constraints.return_value = expected_constraint_violations
-        sys.modules["a"].__name__ = "my_custom_metric"
+        module.__name__ = "my_custom_metric"
 
         output = execute_operation_for_model_quality(
             OperationType.run_monitor,
@@ -144,7 +181,7 @@ class TestMonitorModelQuality(unittest.TestCase):
             df,
             config_that_includes_my_custom_metric,
             constraint_label,
-            no_constraint,
+            no_constraint_index,
         )
         self.assertTrue(len(output) == 3)
 
@@ -160,19 +197,19 @@ class TestMonitorModelQuality(unittest.TestCase):
             model_quality_attributes,
         )
 
-    @patch("src.monitoring_custom_metrics.monitor_model_quality.get_model_quality_class_path")
-    @mock.patch("glob.glob", return_value=["a.py"])
+    @patch("src.monitoring_custom_metrics.monitor_model_quality.get_model_quality_metrics")
     def test_evaluate_constraints_for_model_quality_without_module_config(
-        self, mock_glob, mock_get_model_quality_class_path
+        self, mock_get_model_quality_metrics
     ):
-        sys.modules["a"] = Mock()
+        module = Mock()
+        mock_get_model_quality_metrics.return_value = [module]
         instance = Mock()
-        sys.modules["a"].instance = instance
+        module.instance = instance
 
         instance.calculate_statistics.return_value = statistics_result
         instance.suggest_constraints.return_value = constraints_result
         instance.evaluate_constraints.return_value = expected_constraint_violations
-        sys.modules["a"].__name__ = "my_custom_metric"
+        module.__name__ = "my_custom_metric"
 
         output = execute_operation_for_model_quality(
             OperationType.run_monitor,
@@ -181,7 +218,7 @@ class TestMonitorModelQuality(unittest.TestCase):
             df,
             config_without_my_custom_metric,
             constraint_label,
-            constraint,
+            constraint_index,
         )
 
         self.assertTrue(len(output) == 3)
@@ -192,15 +229,15 @@ class TestMonitorModelQuality(unittest.TestCase):
 
         instance.evaluate_constraints.assert_not_called()
 
-    @patch("src.monitoring_custom_metrics.monitor_model_quality.get_model_quality_class_path")
-    @mock.patch("glob.glob", return_value=["a.py"])
-    def test_suggest_baseline_for_model_quality(self, mock_glob, mock_get_model_quality_class_path):
-        sys.modules["a"] = Mock()
+    @patch("src.monitoring_custom_metrics.monitor_model_quality.get_model_quality_metrics")
+    def test_suggest_baseline_for_model_quality(self, mock_get_model_quality_metrics):
+        module = Mock()
+        mock_get_model_quality_metrics.return_value = [module]
         instance = Mock()
-        sys.modules["a"].instance = instance
+        module.instance = instance
         instance.calculate_statistics.return_value = statistics_result
         instance.suggest_constraints.return_value = constraints_result
-        sys.modules["a"].__name__ = "my_custom_metric"
+        module.__name__ = "my_custom_metric"
 
         output = execute_operation_for_model_quality(
             OperationType.suggest_baseline,
@@ -211,7 +248,7 @@ class TestMonitorModelQuality(unittest.TestCase):
             constraint_label,
         )
 
-        mock_get_model_quality_class_path.assert_called_once()
+        mock_get_model_quality_metrics.assert_called_once()
 
         self.assertTrue(len(output) == 3)
         self.assertEqual(expected_statistics, output[0])
@@ -294,6 +331,10 @@ class TestMonitorModelQuality(unittest.TestCase):
     @patch(
         "src.monitoring_custom_metrics.monitor_model_quality.execute_operation_for_model_quality"
     )
+    @patch(
+        "src.monitoring_custom_metrics.monitor_model_quality.compile_model_quality_constraints",
+        return_value="data",
+    )
     @patch(
         "src.monitoring_custom_metrics.monitor_model_quality.retrieve_json_file_in_path",
         return_value="data",
@@ -301,6 +342,7 @@ class TestMonitorModelQuality(unittest.TestCase):
     def test_execute_for_model_quality_evaluate_constraints(
         self,
         mock_retrieve_json_file_in_path,
+        mock_compile_model_quality_constraints,
         mock_execute_operation_for_model_quality,
         mock_write_results_to_output_folder,
         mock_get_model_quality_attributes,
@@ -323,6 +365,9 @@ class TestMonitorModelQuality(unittest.TestCase):
         mock_retrieve_json_file_in_path.assert_has_calls(
             [mock.call(config_json_path), mock.call(constraints_json_path)]
         )
+        mock_compile_model_quality_constraints.assert_called_once_with(
+            "data", ProblemType.binary_classification
+        )
         mock_execute_operation_for_model_quality.assert_called_with(
             operation_type,
             ProblemType.binary_classification,
@@ -465,3 +510,323 @@ class TestMonitorModelQuality(unittest.TestCase):
             "probability_threshold_attribute", attributes.probability_threshold_attribute
         )
         self.assertIsNone(attributes.inference_attribute)
+
+    @mock.patch.dict(
+        os.environ,
+        {
+            "config_path": config_json_path,
+            "problem_type": "BinaryClassification",
+            "ground_truth_attribute": ground_truth_attribute,
+            "probability_attribute": probability_attribute,
+            "probability_threshold_attribute": "0.5",
+        },
+        clear=True,
+    )
+    @patch("src.monitoring_custom_metrics.monitor_model_quality.write_results_to_output_folder")
+    @patch(
+        "src.monitoring_custom_metrics.monitor_model_quality.get_model_quality_metrics",
+        return_value=real_modules,
+    )
+    @patch(
+        "src.monitoring_custom_metrics.monitor_model_quality.retrieve_json_file_in_path",
+        return_value=streaming_config,
+    )
+    def test_execute_for_model_quality_streaming_matches_in_memory(
+        self,
+        mock_retrieve_json_file_in_path,
+        mock_get_model_quality_metrics,
+        mock_write_results_to_output_folder,
+    ):
+        in_memory_output = execute_for_model_quality(OperationType.suggest_baseline, binary_df)
+        streaming_output = execute_for_model_quality(
+            OperationType.suggest_baseline,
+            (binary_df.iloc[start : start + 3] for start in range(0, len(binary_df), 3)),
+        )
+
+        self.assertEqual(in_memory_output, streaming_output)
+        self.assertEqual(10, streaming_output[0]["dataset"]["item_count"])
+
+    @patch("src.monitoring_custom_metrics.monitor_model_quality.get_model_quality_metrics")
+    def test_create_model_quality_state_without_accumulator(self, mock_get_model_quality_metrics):
+        module = Mock()
+        mock_get_model_quality_metrics.return_value = [module]
+        module.__name__ = "my_custom_metric"
+        module.instance.create_accumulator.return_value = None
+
+        with self.assertRaises(ValueError) as context:
+            create_model_quality_state(
+                ProblemType.binary_classification,
+                config_that_includes_my_custom_metric,
+                model_quality_attributes,
+            )
+        self.assertEqual(
+            "Metric my_custom_metric does not support streaming execution. "
+            "Use the 'in_memory' execution mode instead.",
+            str(context.exception),
+        )
+
+    @patch(
+        "src.monitoring_custom_metrics.monitor_model_quality.get_model_quality_metrics",
+        return_value=real_modules,
+    )
+    def test_execute_operation_for_model_quality_by_segment(self, mock_get_model_quality_metrics):
+        output = execute_operation_for_model_quality(
+            OperationType.suggest_baseline,
+            ProblemType.binary_classification,
+            model_quality_attributes,
+            segmented_df,
+            segmented_config,
+            constraint_label,
+        )
+
+        self.assertEqual(4, len(output))
+        # The tablet segment has less than 3 rows.
+        self.assertEqual(
+            [({"device": "desktop"}, 5), ({"device": "mobile"}, 5)],
+            [(segment["segment"], segment["item_count"]) for segment in output[3]],
+        )
+        for segment in output[3]:
+            segment_df = segmented_df[segmented_df["device"] == segment["segment"]["device"]]
+            expected = execute_operation_for_model_quality(
+                OperationType.suggest_baseline,
+                ProblemType.binary_classification,
+                model_quality_attributes,
+                segment_df,
+                streaming_config,
+                constraint_label,
+            )
+            self.assertEqual(expected[0], segment["statistics"])
+            self.assertEqual(expected[1], segment["constraints"])
+
+    @patch(
+        "src.monitoring_custom_metrics.monitor_model_quality.get_model_quality_metrics",
+        return_value=real_modules,
+    )
+    def test_evaluate_constraints_for_model_quality_by_segment(
+        self, mock_get_model_quality_metrics
+    ):
+        brier_score_loss_constraint = {
+            "threshold": 0.1,
+            "comparison_operator": "GreaterThanThreshold",
+            "additional_properties": None,
+        }
+        segment_constraint_index = ModelQualityConstraintIndex(
+            ProblemType.binary_classification,
+            {
+                (ProblemType.binary_classification, "brier_score_loss"): dict(
+                    brier_score_loss_constraint, threshold=1.0
+                )
+            },
+            {
+                '[["device", "mobile"]]': ModelQualityConstraintIndex(
+                    ProblemType.binary_classification,
+                    {
+                        (
+                            ProblemType.binary_classification,
+                            "brier_score_loss",
+                        ): brier_score_loss_constraint
+                    },
+                )
+            },
+        )
+
+        output = execute_operation_for_model_quality(
+            OperationType.run_monitor,
+            ProblemType.binary_classification,
+            model_quality_attributes,
+            segmented_df,
+            {"segment_by": {"columns": ["device"], "min_segment_size": 3}, "brier_score_loss": {}},
+            constraint_label,
+            segment_constraint_index,
+        )
+
+        # Only the mobile segment has baseline constraints.
+        self.assertEqual(1, len(output[2]))
+        self.assertEqual("brier_score_loss", output[2][0]["metric_name"])
+        self.assertEqual({"device": "mobile"}, output[2][0]["segment"])
+
+    @mock.patch.dict(
+        os.environ,
+        {
+            "config_path": config_json_path,
+            "problem_type": "BinaryClassification",
+            "ground_truth_attribute": ground_truth_attribute,
+            "probability_attribute": probability_attribute,
+            "probability_threshold_attribute": "0.5",
+        },
+        clear=True,
+    )
+    @patch("src.monitoring_custom_metrics.monitor_model_quality.write_results_to_output_folder")
+    @patch(
+        "src.monitoring_custom_metrics.monitor_model_quality.get_model_quality_metrics",
+        return_value=real_modules,
+    )
+    @patch(
+        "src.monitoring_custom_metrics.monitor_model_quality.retrieve_json_file_in_path",
+        return_value=segmented_config,
+    )
+    def test_execute_for_model_quality_by_segment_streaming_matches_in_memory(
+        self,
+        mock_retrieve_json_file_in_path,
+        mock_get_model_quality_metrics,
+        mock_write_results_to_output_folder,
+    ):
+        in_memory_output = execute_for_model_quality(OperationType.suggest_baseline, segmented_df)
+        streaming_output = execute_for_model_quality(
+            OperationType.suggest_baseline,
+            (segmented_df.iloc[start : start + 5] for start in range(0, len(segmented_df), 5)),
+        )
+
+        self.assertEqual(in_memory_output, streaming_output)
+        self.assertEqual(
+            [{"device": "desktop"}, {"device": "mobile"}],
+            [segment["segment"] for segment in streaming_output[0]["segments"]],
+        )
+        self.assertEqual(
+            [{"device": "desktop"}, {"device": "mobile"}],
+            [segment["segment"] for segment in streaming_output[1]["segments"]],
+        )
+        self.assertIn(
+            "brier_score_loss", streaming_output[0]["segments"][0]["binary_classification_metrics"]
+        )
+
+    @mock.patch.dict(
+        os.environ,
+        {
+            "config_path": config_json_path,
+            "problem_type": "BinaryClassification",
+            "ground_truth_attribute": ground_truth_attribute,
+            "probability_attribute": probability_attribute,
+            "probability_threshold_attribute": "0.5",
+            "baseline_constraints": constraints_json_path,
+            "time_column": "event_time",
+            "time_bucket": "1h",
+        },
+        clear=True,
+    )
+    @patch("src.monitoring_custom_metrics.monitor_model_quality.write_results_to_output_folder")
+    @patch(
+        "src.monitoring_custom_metrics.monitor_model_quality.get_model_quality_metrics",
+        return_value=real_modules,
+    )
+    @patch(
+        "src.monitoring_custom_metrics.monitor_model_quality.retrieve_json_file_in_path",
+        return_value=streaming_config,
+    )
+    def test_execute_for_model_quality_by_time_bucket(
+        self,
+        mock_retrieve_json_file_in_path,
+        mock_get_model_quality_metrics,
+        mock_write_results_to_output_folder,
+    ):
+        timed_df = binary_df.assign(event_time=["2024-01-01T10:15:00Z", "2024-01-01T11:45:00Z"] * 5)
+        brier_score_loss_constraint = {
+            "threshold": 0.25,
+            "comparison_operator": "GreaterThanThreshold",
+            "additional_properties": None,
+        }
+
+        output = execute_for_model_quality(
+            OperationType.run_monitor,
+            timed_df,
+            constraint=ModelQualityConstraintIndex(
+                ProblemType.binary_classification,
+                {
+                    (
+                        ProblemType.binary_classification,
+                        "brier_score_loss",
+                    ): brier_score_loss_constraint,
+                    (ProblemType.binary_classification, "score_diff"): {
+                        "threshold": 1.0,
+                        "comparison_operator": "GreaterThanThreshold",
+                        "additional_properties": None,
+                    },
+                },
+            ),
+        )
+
+        time_series = output[0]["time_series"]
+        self.assertEqual(
+            [("2024-01-01T10:00:00+00:00", 5), ("2024-01-01T11:00:00+00:00", 5)],
+            [(bucket["start"], bucket["item_count"]) for bucket in time_series],
+        )
+        for bucket, parity in zip(time_series, [0, 1]):
+            expected = execute_operation_for_model_quality(
+                OperationType.suggest_baseline,
+                ProblemType.binary_classification,
+                model_quality_attributes,
+                timed_df.iloc[parity::2],
+                streaming_config,
+                constraint_label,
+            )
+            self.assertEqual(expected[0], bucket["binary_classification_metrics"])
+        # The whole dataset is within the constraint, the second bucket is not.
+        self.assertEqual(
+            ["2024-01-01T11:00:00+00:00"],
+            [violation["time_bucket"] for violation in output[2]["violations"]],
+        )
+
+    @mock.patch.dict(
+        os.environ,
+        {
+            "config_path": config_json_path,
+            "problem_type": "BinaryClassification",
+            "ground_truth_attribute": ground_truth_attribute,
+            "inference_attribute": inference_attribute,
+            "time_column": "event_time",
+        },
+        clear=True,
+    )
+    @patch(
+        "src.monitoring_custom_metrics.monitor_model_quality.retrieve_json_file_in_path",
+        return_value=config_that_includes_my_custom_metric,
+    )
+    def test_get_model_quality_columns_with_time_column(self, mock_retrieve_json_file_in_path):
+        columns = get_model_quality_columns(OperationType.suggest_baseline)
+
+        self.assertEqual([ground_truth_attribute, inference_attribute, "event_time"], columns)
+
+    def test_get_columns_referenced_with_segment_by(self):
+        columns = get_columns_referenced(segmented_config, model_quality_attributes)
+
+        self.assertEqual(
+            [ground_truth_attribute, probability_attribute, inference_attribute, "device"],
+            columns,
+        )
+
+    def test_get_columns_referenced(self):
+        config = {
+            "gini": {"threshold_override": 0.1},
+            "my_custom_metric": {
+                "weight_attribute": "weight",
+                "probability_threshold_attribute": "0.5",
+                "inference_attribute": "probability_attribute",
+            },
+        }
+
+        columns = get_columns_referenced(config, model_quality_attributes)
+
+        self.assertEqual(
+            [ground_truth_attribute, probability_attribute, inference_attribute, "weight"],
+            columns,
+        )
+
+    @mock.patch.dict(
+        os.environ,
+        {
+            "config_path": config_json_path,
+            "problem_type": "BinaryClassification",
+            "ground_truth_attribute": ground_truth_attribute,
+            "inference_attribute": inference_attribute,
+        },
+        clear=True,
+    )
+    @patch(
+        "src.monitoring_custom_metrics.monitor_model_quality.retrieve_json_file_in_path",
+        return_value=config_that_includes_my_custom_metric,
+    )
+    def test_get_model_quality_columns(self, mock_retrieve_json_file_in_path):
+        columns = get_model_quality_columns(OperationType.suggest_baseline)
+
+        mock_retrieve_json_file_in_path.assert_called_once_with(config_json_path)
+        self.assertEqual([ground_truth_attribute, inference_attribute], columns)
@@ -0,0 +1,133 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License").
+# You may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import tempfile
+import unittest
+from unittest import mock
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+
+from src.model.execution_mode import ExecutionMode
+from src.model.monitor_type import MonitorType
+from src.model.operation_type import OperationType
+from src.model.sampling_mode import SamplingMode
+from src.monitoring_custom_metrics.planner import (
+    determine_execution_mode,
+    determine_execution_plan,
+    estimate_in_memory_size,
+    estimate_row_count,
+    get_memory_limit,
+    plan_execution,
+    supports_streaming,
+)
+
+GIB = 2**30
+
+
+class TestPlanner(unittest.TestCase):
+    def test_determine_execution_mode_defaults_to_in_memory(self):
+        self.assertEqual(ExecutionMode.in_memory, determine_execution_mode())
+
+    @mock.patch.dict(os.environ, {"execution_mode": "streaming"}, clear=True)
+    def test_determine_execution_mode_with_execution_mode_provided(self):
+        self.assertEqual(ExecutionMode.streaming, determine_execution_mode())
+
+    @mock.patch.dict(os.environ, {"sampling_mode": "reservoir"}, clear=True)
+    @patch("src.monitoring_custom_metrics.planner.plan_execution")
+    def test_determine_execution_plan_set_by_the_environment(self, mock_plan_execution):
+        execution_plan = determine_execution_plan(
+            OperationType.suggest_baseline, MonitorType.DATA_QUALITY
+        )
+
+        self.assertEqual(ExecutionMode.in_memory, execution_plan.execution_mode)
+        self.assertEqual(SamplingMode.reservoir, execution_plan.sampling_mode)
+        self.assertEqual("set by the environment", execution_plan.reason)
+        mock_plan_execution.assert_not_called()
+
+    @mock.patch.dict(os.environ, {"dataset_source": "/data"}, clear=True)
+    @patch("src.monitoring_custom_metrics.planner.get_full_paths_in_directory")
+    @patch("src.monitoring_custom_metrics.planner.supports_streaming")
+    @patch("src.monitoring_custom_metrics.planner.estimate_in_memory_size")
+    @patch("src.monitoring_custom_metrics.planner.get_memory_limit", return_value=8 * GIB)
+    def test_plan_execution(
+        self,
+        mock_get_memory_limit,
+        mock_estimate_in_memory_size,
+        mock_supports_streaming,
+        mock_get_full_paths_in_directory,
+    ):
+        def plan(size, streaming, operation_type=OperationType.suggest_baseline):
+            mock_estimate_in_memory_size.return_value = size
+            mock_supports_streaming.return_value = streaming
+            execution_plan = plan_execution(operation_type, MonitorType.DATA_QUALITY)
+            return execution_plan.execution_mode, execution_plan.sampling_mode
+
+        self.assertEqual((ExecutionMode.in_memory, None), plan(2 * GIB, False))
+        self.assertEqual((ExecutionMode.streaming, None), plan(3 * GIB, True))
+        self.assertEqual((ExecutionMode.in_memory, SamplingMode.reservoir), plan(3 * GIB, False))
+        self.assertEqual(
+            (ExecutionMode.in_memory, None), plan(3 * GIB, False, OperationType.run_monitor)
+        )
+        mock_get_full_paths_in_directory.assert_called_with("/data")
+
+    @mock.patch.dict(os.environ, {"time_column": "event_time"}, clear=True)
+    @patch("src.monitoring_custom_metrics.planner.supports_streaming_for_data_quality")
+    def test_supports_streaming_with_time_column(self, mock_supports_streaming_for_data_quality):
+        self.assertFalse(
+            supports_streaming(OperationType.suggest_baseline, MonitorType.DATA_QUALITY)
+        )
+        mock_supports_streaming_for_data_quality.assert_not_called()
+
+    def test_estimate_row_count(self):
+        random_generator = np.random.default_rng(0)
+        df = pd.DataFrame({"id": range(200000), "score": random_generator.random(200000).round(6)})
+
+        with tempfile.TemporaryDirectory() as folder_path:
+            paths = {
+                name: os.path.join(folder_path, name)
+                for name in ["small.csv", "large.csv", "large.csv.gz", "large.csv.zst"]
+            }
+            df.iloc[:10].to_csv(paths["small.csv"], index=False)
+            df.to_csv(paths["large.csv"], index=False)
+            df.to_csv(paths["large.csv.gz"], index=False)
+            df.to_csv(paths["large.csv.zst"], index=False)
+            df.to_parquet(os.path.join(folder_path, "data.parquet"))
+            df.to_feather(os.path.join(folder_path, "data.feather"))
+
+            self.assertEqual(10, estimate_row_count(paths["small.csv"]))
+            for name in ["large.csv", "large.csv.gz", "large.csv.zst"]:
+                self.assertAlmostEqual(200000, estimate_row_count(paths[name]), delta=20000)
+            self.assertEqual(200000, estimate_row_count(os.path.join(folder_path, "data.parquet")))
+            self.assertEqual(200000, estimate_row_count(os.path.join(folder_path, "data.feather")))
+
+    def test_estimate_in_memory_size(self):
+        df = pd.DataFrame({"id": range(1000), "value": [index / 2 for index in range(1000)]})
+
+        with tempfile.TemporaryDirectory() as folder_path:
+            empty_path = os.path.join(folder_path, "empty.csv")
+            data_path = os.path.join(folder_path, "data.csv")
+            df.iloc[:0].to_csv(empty_path, index=False)
+            df.to_csv(data_path, index=False)
+
+            # Two 8 bytes columns per row, plus the index of the sample.
+            self.assertAlmostEqual(
+                2000 * 16, estimate_in_memory_size([empty_path, data_path, data_path]), delta=500
+            )
+            self.assertEqual(0, estimate_in_memory_size([empty_path]))
+
+    def test_get_memory_limit(self):
+        self.assertGreater(get_memory_limit(), 0)
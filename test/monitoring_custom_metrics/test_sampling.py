@@ -0,0 +1,149 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License").
+# You may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import unittest
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+
+from src.model.operation_type import OperationType
+from src.model.sampling_mode import SamplingMode
+from src.monitoring_custom_metrics.sampling import (
+    allocate_sample,
+    determine_sampling_mode,
+    estimate_sampling_error,
+    get_sample_size,
+    get_sampling_weight,
+    sample_chunks,
+    sample_dataset,
+)
+
+df = pd.DataFrame(
+    {"id": range(1000), "label": [1 if index % 100 == 0 else 0 for index in range(1000)]}
+)
+
+
+def split(data, chunk_size):
+    return [
+        data.iloc[start : start + chunk_size] for start in range(0, len(data.index), chunk_size)
+    ]
+
+
+class TestSampling(unittest.TestCase):
+    def test_sample_chunks(self):
+        sample = sample_chunks(split(df, 64), 100, 7)
+
+        self.assertEqual(100, len(sample.index))
+        self.assertTrue(sample["id"].is_monotonic_increasing)
+        self.assertTrue(sample["id"].is_unique)
+        self.assertEqual(list(range(100)), sample.index.tolist())
+        self.assertEqual(
+            {
+                "method": "reservoir",
+                "seed": 7,
+                "sample_size": 100,
+                "population_size": 1000,
+                "estimated_sampling_error": estimate_sampling_error(100, 1000),
+            },
+            sample.attrs["sampling"],
+        )
+        # The sample only depends on the seed, not on how the input is split in chunks.
+        pd.testing.assert_frame_equal(sample, sample_chunks(split(df, 1000), 100, 7))
+        self.assertFalse(sample.equals(sample_chunks(split(df, 64), 100, 8)))
+
+    def test_sample_chunks_smaller_than_sample_size(self):
+        sample = sample_chunks(split(df, 64), 5000, 0)
+
+        pd.testing.assert_frame_equal(df, sample)
+        self.assertEqual(0.0, sample.attrs["sampling"]["estimated_sampling_error"])
+        self.assertEqual(1, get_sampling_weight(sample["id"]))
+
+    def test_sample_chunks_stratified(self):
+        sample = sample_chunks(split(df, 64), 50, 0, strata_column="label")
+
+        self.assertEqual(50, len(sample.index))
+        self.assertEqual({0: 49, 1: 1}, sample["label"].value_counts().to_dict())
+        self.assertTrue(sample["id"].is_monotonic_increasing)
+        self.assertEqual("stratified", sample.attrs["sampling"]["method"])
+        self.assertEqual("label", sample.attrs["sampling"]["strata_column"])
+        self.assertEqual(20, get_sampling_weight(sample))
+
+    def test_allocate_sample(self):
+        self.assertEqual({0: 3, 1: 2}, allocate_sample({0: 3, 1: 2}, 10))
+        self.assertEqual({0: 6, 1: 4}, allocate_sample({0: 60, 1: 40}, 10))
+        self.assertEqual({0: 9, 1: 1}, allocate_sample({0: 999, 1: 1}, 10))
+        self.assertEqual({0: 4, 1: 3, 2: 3}, allocate_sample({0: 10, 1: 10, 2: 10}, 10))
+        # The nine rare strata get one row each, all taken from the large one.
+        self.assertEqual(
+            {0: 1, **{stratum: 1 for stratum in range(1, 10)}},
+            allocate_sample({0: 1000, **{stratum: 1 for stratum in range(1, 10)}}, 10),
+        )
+        with self.assertRaises(ValueError):
+            allocate_sample({stratum: 5 for stratum in range(11)}, 10)
+
+    def test_allocate_sample_never_exceeds_sample_size(self):
+        random_generator = np.random.default_rng(0)
+        for _ in range(500):
+            strata = int(random_generator.integers(1, 30))
+            sample_size = int(random_generator.integers(strata, 60))
+            counts = dict(enumerate(random_generator.zipf(1.5, strata).clip(1, 5000).tolist()))
+
+            quotas = allocate_sample(counts, sample_size)
+
+            self.assertEqual(min(sample_size, sum(counts.values())), sum(quotas.values()))
+            self.assertTrue(all(1 <= quotas[stratum] <= counts[stratum] for stratum in counts))
+
+    def test_sample_chunks_stratified_on_continuous_column(self):
+        with self.assertRaises(ValueError) as context:
+            sample_chunks(split(df, 64), 50, 0, strata_column="id")
+        self.assertEqual(
+            "Stratified sampling needs at most 50 distinct values in column 'id': stratify on a "
+            "categorical column or use reservoir sampling.",
+            str(context.exception),
+        )
+
+    def test_estimate_sampling_error(self):
+        self.assertAlmostEqual(0.098, estimate_sampling_error(100, 10**9), places=3)
+        self.assertEqual(0.0, estimate_sampling_error(1000, 1000))
+        self.assertEqual(0.0, estimate_sampling_error(0, 0))
+
+    @mock.patch.dict(os.environ, {"sampling_mode": "stratified"}, clear=True)
+    def test_sample_dataset(self):
+        with self.assertRaises(ValueError):
+            sample_dataset(OperationType.run_monitor, SamplingMode.reservoir, split(df, 64))
+        with self.assertRaises(ValueError) as context:
+            sample_dataset(OperationType.suggest_baseline, SamplingMode.stratified, split(df, 64))
+        self.assertEqual(
+            "Environment variable ground_truth_attribute is not set.", str(context.exception)
+        )
+
+        environment = {"ground_truth_attribute": "label", "sample_size": "10", "sampling_seed": "3"}
+        with mock.patch.dict(os.environ, environment):
+            sample = sample_dataset(
+                OperationType.suggest_baseline, SamplingMode.stratified, split(df, 64)
+            )
+        self.assertEqual(10, len(sample.index))
+        self.assertEqual(3, sample.attrs["sampling"]["seed"])
+
+    def test_determine_sampling_mode(self):
+        self.assertIsNone(determine_sampling_mode())
+        self.assertEqual(100000, get_sample_size())
+        with mock.patch.dict(os.environ, {"sampling_mode": "reservoir", "sample_size": "10"}):
+            self.assertEqual(SamplingMode.reservoir, determine_sampling_mode())
+            self.assertEqual(10, get_sample_size())
+        with mock.patch.dict(os.environ, {"sample_size": "0"}):
+            with self.assertRaises(ValueError):
+                get_sample_size()
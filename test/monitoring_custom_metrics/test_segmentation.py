@@ -0,0 +1,98 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License").
+# You may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from src.monitoring_custom_metrics.segmentation import (
+    get_segment_config,
+    get_segment_key,
+    split_segments,
+)
+
+df = pd.DataFrame(
+    {
+        "marketplace": ["US", "UK", "US", None, "UK", "US"],
+        "model_version": [2, 1, 1, 1, 1, 2],
+        "score": [0.1, 0.2, 0.3, 0.4, 0.5, 0.6],
+    }
+)
+
+
+class TestSegmentation(unittest.TestCase):
+    def test_get_segment_config(self):
+        segment_config = get_segment_config(
+            {"segment_by": {"columns": ["marketplace"], "min_segment_size": 10}, "gini": {}}
+        )
+
+        self.assertEqual(["marketplace"], segment_config.columns)
+        self.assertEqual(10, segment_config.min_segment_size)
+        self.assertEqual(
+            100, get_segment_config({"segment_by": {"columns": ["marketplace"]}}).min_segment_size
+        )
+        self.assertIsNone(get_segment_config({"gini": {}}))
+
+    def test_get_segment_config_with_invalid_parameters(self):
+        for segment_by in [
+            ["marketplace"],
+            {"columns": []},
+            {"columns": "marketplace"},
+            {"columns": ["marketplace"], "min_segment_size": 0},
+        ]:
+            with self.assertRaises(ValueError):
+                get_segment_config({"segment_by": segment_by})
+
+    def test_split_segments(self):
+        segments = split_segments(df, ["marketplace", "model_version"])
+
+        self.assertEqual(
+            [
+                {"marketplace": "UK", "model_version": 1},
+                {"marketplace": "US", "model_version": 1},
+                {"marketplace": "US", "model_version": 2},
+                {"marketplace": None, "model_version": 1},
+            ],
+            [segment for segment, segment_df in segments],
+        )
+        self.assertEqual(
+            [[0.2, 0.5], [0.3], [0.1, 0.6], [0.4]],
+            [segment_df["score"].tolist() for segment, segment_df in segments],
+        )
+        self.assertIsInstance(segments[0][0]["model_version"], int)
+
+    def test_split_segments_matches_filtering(self):
+        random_generator = np.random.default_rng(0)
+        random_df = pd.DataFrame(
+            {
+                "segment": random_generator.integers(0, 50, 10000),
+                "score": random_generator.random(10000),
+            }
+        )
+
+        for segment, segment_df in split_segments(random_df, ["segment"]):
+            pd.testing.assert_frame_equal(
+                random_df[random_df["segment"] == segment["segment"]], segment_df
+            )
+
+    def test_split_empty_dataset(self):
+        self.assertEqual([], split_segments(df.iloc[0:0], ["marketplace"]))
+
+    def test_get_segment_key(self):
+        self.assertEqual(
+            '[["marketplace", "US"], ["model_version", "2"]]',
+            get_segment_key({"marketplace": "US", "model_version": 2}),
+        )
+        self.assertEqual('[["marketplace", null]]', get_segment_key({"marketplace": None}))
@@ -0,0 +1,123 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License").
+# You may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import unittest
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+
+from src.model.time_series_config import TimeSeriesConfig
+from src.monitoring_custom_metrics.time_series import (
+    get_time_series_config,
+    split_time_buckets,
+    validate_time_series_execution,
+)
+
+df = pd.DataFrame(
+    {
+        "event_time": [
+            "2024-01-01T00:07:00Z",
+            "2024-01-01T00:01:00Z",
+            None,
+            "2024-01-01T00:22:30Z",
+            "2024-01-01T00:03:59Z",
+        ],
+        "value": [1, 2, 3, 4, 5],
+    }
+)
+five_minutes = TimeSeriesConfig("event_time", pd.Timedelta("5min"))
+
+
+class TestTimeSeries(unittest.TestCase):
+    @mock.patch.dict(os.environ, {"time_column": "event_time", "time_bucket": "5min"}, clear=True)
+    def test_get_time_series_config(self):
+        time_series_config = get_time_series_config()
+
+        self.assertEqual("event_time", time_series_config.time_column)
+        self.assertEqual(pd.Timedelta(minutes=5), time_series_config.bucket)
+
+    @mock.patch.dict(os.environ, {"time_column": "event_time"}, clear=True)
+    def test_get_time_series_config_defaults_to_hourly_buckets(self):
+        self.assertEqual(pd.Timedelta(hours=1), get_time_series_config().bucket)
+
+    @mock.patch.dict(os.environ, {}, clear=True)
+    def test_get_time_series_config_without_time_column(self):
+        self.assertIsNone(get_time_series_config())
+
+    def test_get_time_series_config_with_invalid_bucket(self):
+        for bucket in ["five minutes", "0min", "-1h"]:
+            with mock.patch.dict(
+                os.environ, {"time_column": "event_time", "time_bucket": bucket}, clear=True
+            ):
+                with self.assertRaises(ValueError):
+                    get_time_series_config()
+
+    @mock.patch.dict(os.environ, {"time_column": "event_time"}, clear=True)
+    def test_validate_time_series_execution_with_chunks(self):
+        with self.assertRaises(ValueError):
+            validate_time_series_execution(iter([df]))
+
+    def test_split_time_buckets(self):
+        buckets = split_time_buckets(df, five_minutes)
+
+        # The row without an event time is not in any bucket, and the empty buckets are skipped.
+        self.assertEqual(
+            [
+                ("2024-01-01T00:00:00+00:00", [2, 5]),
+                ("2024-01-01T00:05:00+00:00", [1]),
+                ("2024-01-01T00:20:00+00:00", [4]),
+            ],
+            [(start, bucket_df["value"].tolist()) for start, bucket_df in buckets],
+        )
+
+    def test_split_time_buckets_with_epoch_seconds(self):
+        epoch_df = pd.DataFrame({"event_time": [1704067620, 1704067260], "value": [1, 2]})
+
+        self.assertEqual(
+            ["2024-01-01T00:00:00+00:00", "2024-01-01T00:05:00+00:00"],
+            [start for start, bucket_df in split_time_buckets(epoch_df, five_minutes)],
+        )
+
+    def test_split_time_buckets_matches_filtering(self):
+        random_generator = np.random.default_rng(0)
+        times = pd.Timestamp("2024-01-01", tz="UTC") + pd.to_timedelta(
+            random_generator.integers(0, 3600, 10000), unit="s"
+        )
+        random_df = pd.DataFrame({"event_time": times, "value": random_generator.random(10000)})
+
+        buckets = split_time_buckets(random_df, five_minutes)
+
+        self.assertEqual(12, len(buckets))
+        for start, bucket_df in buckets:
+            expected = random_df[random_df["event_time"].dt.floor("5min") == pd.Timestamp(start)]
+            pd.testing.assert_frame_equal(expected, bucket_df)
+
+    def test_split_time_buckets_with_a_far_outlier_time(self):
+        outlier_df = pd.DataFrame(
+            {
+                "event_time": ["1970-01-01T00:00:00Z"] + ["2024-01-01T00:00:01Z"] * 1000,
+                "value": range(1001),
+            }
+        )
+        one_second = TimeSeriesConfig("event_time", pd.Timedelta("1s"))
+
+        # Only the two buckets with rows are allocated, not the 1.7 billion seconds in between.
+        buckets = split_time_buckets(outlier_df, one_second)
+
+        self.assertEqual(
+            [("1970-01-01T00:00:00+00:00", 1), ("2024-01-01T00:00:01+00:00", 1000)],
+            [(start, len(bucket_df.index)) for start, bucket_df in buckets],
+        )
@@ -13,15 +13,25 @@
 # limitations under the License.
 
 import os
+import tempfile
 import unittest
 from unittest import mock
-from unittest.mock import patch, mock_open, call
+from unittest.mock import MagicMock, patch, mock_open, call
 
 import pandas as pd
 
+from src.model.compression import Compression
+from src.model.csv_engine import CsvEngine
+from src.model.file_format import FileFormat
 from src.monitoring_custom_metrics.util import (
     retrieve_json_file,
     get_dataframe_from_csv,
+    get_dataframe_chunks_from_csv,
+    get_file_chunks_from_csv,
+    get_reader_workers,
+    get_csv_engine,
+    detect_file_format,
+    detect_compression,
     retrieve_first_json_file_in_path,
     retrieve_json_file_in_path,
     validate_environment_variable,
@@ -62,14 +72,263 @@ class TestUtil(unittest.TestCase):
         results = get_dataframe_from_csv()
         read_csv_mock.assert_has_calls(
             [
-                call("/opt/ml/processing/input/data/someRandomFileName.csv"),
                 call("/opt/ml/processing/input/data/anotherFileName.csv"),
+                call("/opt/ml/processing/input/data/someRandomFileName.csv"),
             ]
         )
 
         self.assertEqual(1, len(results.columns))
         self.assertTrue(3, len(results.columns[0]))
 
+    @mock.patch.dict(os.environ, {"dataset_source": "/opt/ml/processing/input/data"}, clear=True)
+    @patch("os.listdir")
+    @patch("pandas.read_csv")
+    def test_get_dataframe_chunks_from_csv(self, read_csv_mock, list_dir_mock):
+        chunks = [pd.DataFrame({"data": [11, 4]}), pd.DataFrame({"data": [2020]})]
+        first_reader = MagicMock()
+        first_reader.__enter__.return_value = iter(chunks)
+        second_reader = MagicMock()
+        second_reader.__enter__.return_value = iter([pd.DataFrame({"data": [7]})])
+        read_csv_mock.side_effect = [first_reader, second_reader]
+        list_dir_mock.return_value = ["someRandomFileName.csv", "anotherFileName.csv"]
+
+        results = list(get_dataframe_chunks_from_csv(chunk_size=2))
+
+        read_csv_mock.assert_has_calls(
+            [
+                call("/opt/ml/processing/input/data/anotherFileName.csv", chunksize=2),
+                call("/opt/ml/processing/input/data/someRandomFileName.csv", chunksize=2),
+            ]
+        )
+        self.assertEqual([[11, 4], [2020], [7]], [chunk["data"].tolist() for chunk in results])
+
+    def test_get_dataframe_from_csv_with_parallel_reader(self):
+        with tempfile.TemporaryDirectory() as folder_path:
+            for index in range(4):
+                pd.DataFrame({"data": [index * 10, index * 10 + 1]}).to_csv(
+                    os.path.join(folder_path, f"part-{index}.csv"), index=False
+                )
+
+            with mock.patch.dict(os.environ, {"dataset_source": folder_path}, clear=True):
+                serial_result = get_dataframe_from_csv()
+            with mock.patch.dict(
+                os.environ, {"dataset_source": folder_path, "reader_workers": "2"}, clear=True
+            ):
+                parallel_result = get_dataframe_from_csv()
+                parallel_chunks = list(get_dataframe_chunks_from_csv(chunk_size=1))
+
+        pd.testing.assert_frame_equal(serial_result, parallel_result)
+        self.assertEqual(8, len(parallel_chunks))
+        pd.testing.assert_frame_equal(serial_result, pd.concat(parallel_chunks))
+
+    def test_get_dataframe_from_csv_does_not_depend_on_the_directory_order(self):
+        with tempfile.TemporaryDirectory() as folder_path:
+            for index in range(5):
+                pd.DataFrame({"data": [index * 10, index * 10 + 1]}).to_csv(
+                    os.path.join(folder_path, f"part-{index}.csv"), index=False
+                )
+            names = os.listdir(folder_path)
+
+            results = []
+            for shuffled_names in [
+                sorted(names),
+                sorted(names, reverse=True),
+                names[2:] + names[:2],
+            ]:
+                for reader_workers in ["1", "2"]:
+                    with mock.patch.dict(
+                        os.environ,
+                        {"dataset_source": folder_path, "reader_workers": reader_workers},
+                        clear=True,
+                    ), patch("os.listdir", return_value=shuffled_names):
+                        results.append(get_dataframe_from_csv())
+
+        self.assertEqual(list(range(0, 50, 10)), results[0]["data"].tolist()[::2])
+        for result in results[1:]:
+            pd.testing.assert_frame_equal(results[0], result)
+
+    def test_get_dataframe_from_columnar_files_with_projection(self):
+        df = pd.DataFrame({"a": [1, 2, 3], "b": ["x", "y", "z"], "c": [0.5, 1.5, 2.5]})
+
+        with tempfile.TemporaryDirectory() as folder_path:
+            df.iloc[:2].to_parquet(os.path.join(folder_path, "part-0.parquet"))
+            # No extension: the format is detected from the magic bytes.
+            df.iloc[2:].to_feather(os.path.join(folder_path, "part-1"))
+
+            with mock.patch.dict(os.environ, {"dataset_source": folder_path}, clear=True):
+                result = get_dataframe_from_csv(columns=["c", "a"])
+                chunks = list(get_dataframe_chunks_from_csv(chunk_size=1, columns=["c", "a"]))
+
+        expected = df[["c", "a"]]
+        pd.testing.assert_frame_equal(
+            expected, result.sort_values("a").reset_index(drop=True), check_like=True
+        )
+        self.assertEqual(3, len(chunks))
+        pd.testing.assert_frame_equal(
+            expected,
+            pd.concat(chunks).sort_values("a").reset_index(drop=True),
+            check_like=True,
+        )
+
+    def test_get_dataframe_from_csv_with_dtype(self):
+        with tempfile.TemporaryDirectory() as folder_path:
+            with open(os.path.join(folder_path, "part-0.csv"), "w") as f:
+                f.write("a,b,c\n1,x,0.5\n,y,1.5\n3,,2.5\n")
+
+            with mock.patch.dict(os.environ, {"dataset_source": folder_path}, clear=True):
+                dtype = {"a": "Int64", "b": "string"}
+                result = get_dataframe_from_csv(dtype=dtype)
+                chunks = list(get_dataframe_chunks_from_csv(chunk_size=2, dtype=dtype))
+
+        self.assertEqual("Int64", str(result["a"].dtype))
+        self.assertEqual("string", str(result["b"].dtype))
+        self.assertEqual("float64", str(result["c"].dtype))
+        self.assertEqual([1, 3], result["a"].dropna().tolist())
+        self.assertTrue(result["b"].isna()[2])
+        pd.testing.assert_frame_equal(result, pd.concat(chunks))
+
+    def test_get_dataframe_from_csv_with_dtype_falls_back_to_inference(self):
+        with tempfile.TemporaryDirectory() as folder_path:
+            with open(os.path.join(folder_path, "part-0.csv"), "w") as f:
+                f.write("a\n1\n2\n3.5\n4\n")
+
+            with mock.patch.dict(os.environ, {"dataset_source": folder_path}, clear=True):
+                result = get_dataframe_from_csv(dtype={"a": "Int64"})
+                chunks = list(get_dataframe_chunks_from_csv(chunk_size=2, dtype={"a": "Int64"}))
+
+        self.assertEqual([1.0, 2.0, 3.5, 4.0], result["a"].tolist())
+        self.assertEqual([1, 2, 3.5, 4], pd.concat(chunks)["a"].tolist())
+
+    def test_get_dataframe_from_csv_with_pyarrow_engine(self):
+        with tempfile.TemporaryDirectory() as folder_path:
+            with open(os.path.join(folder_path, "part-0.csv"), "w") as f:
+                f.write("a,b,c,d,e\n1,x,0.5,2024-01-01,\n2,,1.5,2024-01-02,\n3,z,2.5,2024-01-03,\n")
+
+            with mock.patch.dict(os.environ, {"dataset_source": folder_path}, clear=True):
+                expected = get_dataframe_from_csv()
+            with mock.patch.dict(
+                os.environ, {"dataset_source": folder_path, "csv_engine": "pyarrow"}, clear=True
+            ):
+                result = get_dataframe_from_csv()
+                chunks = list(get_dataframe_chunks_from_csv(chunk_size=2))
+                projected = get_dataframe_from_csv(columns=["c", "a"], dtype={"a": "Int64"})
+
+        self.assertEqual(pd.StringDtype("pyarrow"), result["b"].dtype)
+        self.assertEqual(pd.StringDtype("pyarrow"), result["d"].dtype)
+        arrow_strings = {"b": pd.StringDtype("pyarrow"), "d": pd.StringDtype("pyarrow")}
+        pd.testing.assert_frame_equal(expected.astype(arrow_strings), result)
+        self.assertEqual([2, 1], [len(chunk.index) for chunk in chunks])
+        pd.testing.assert_frame_equal(result, pd.concat(chunks))
+        self.assertEqual(["c", "a"], list(projected.columns))
+        self.assertEqual("Int64", str(projected["a"].dtype))
+
+    def test_get_dataframe_chunks_from_csv_with_pyarrow_engine_reinfers_types(self):
+        with tempfile.TemporaryDirectory() as folder_path:
+            with open(os.path.join(folder_path, "part-0.csv"), "w") as f:
+                f.write("a\n" + "".join(f"{index}\n" for index in range(300000)) + "0.5\n")
+
+            with mock.patch.dict(
+                os.environ, {"dataset_source": folder_path, "csv_engine": "pyarrow"}, clear=True
+            ):
+                chunks = list(get_dataframe_chunks_from_csv(chunk_size=100000))
+
+        result = pd.concat(chunks)
+        self.assertEqual(300001, len(result.index))
+        self.assertEqual(list(range(300001)), result.index.tolist())
+        self.assertEqual(0.5, result["a"].iloc[-1])
+        self.assertEqual(sum(range(300000)) + 0.5, result["a"].sum())
+        self.assertEqual("int64", str(chunks[0]["a"].dtype))
+
+    def test_get_dataframe_from_compressed_csv(self):
+        df = pd.DataFrame({"a": range(10), "b": [f"x{index}" for index in range(10)]})
+
+        with tempfile.TemporaryDirectory() as folder_path:
+            df.iloc[:4].to_csv(os.path.join(folder_path, "part-0.csv.gz"), index=False)
+            df.iloc[4:7].to_csv(os.path.join(folder_path, "part-1.csv.zst"), index=False)
+            # No extension: the compression is detected from the magic bytes.
+            df.iloc[7:].to_csv(os.path.join(folder_path, "part-2"), index=False, compression="gzip")
+
+            for engine in ["c", "pyarrow"]:
+                environment = {"dataset_source": folder_path, "csv_engine": engine}
+                with mock.patch.dict(os.environ, environment, clear=True):
+                    result = get_dataframe_from_csv()
+                    chunks = list(get_dataframe_chunks_from_csv(chunk_size=2))
+
+                pd.testing.assert_frame_equal(
+                    df,
+                    result.astype({"b": object}).sort_values("a").reset_index(drop=True),
+                )
+                self.assertEqual(6, len(chunks))
+                self.assertEqual(sorted(df["a"]), sorted(pd.concat(chunks)["a"]))
+
+    def test_detect_compression(self):
+        with tempfile.TemporaryDirectory() as folder_path:
+            pd.DataFrame({"a": [1]}).to_csv(
+                os.path.join(folder_path, "zstd"), index=False, compression="zstd"
+            )
+            pd.DataFrame({"a": [1]}).to_csv(os.path.join(folder_path, "plain"), index=False)
+            pd.DataFrame({"a": [1]}).to_parquet(os.path.join(folder_path, "part.parquet.gz"))
+
+            self.assertEqual(Compression.gzip, detect_compression("/data/part.csv.gz"))
+            self.assertEqual(Compression.zstd, detect_compression("/data/part.CSV.ZST"))
+            self.assertIsNone(detect_compression("/data/part.csv"))
+            self.assertEqual(
+                Compression.zstd, detect_compression(os.path.join(folder_path, "zstd"))
+            )
+            self.assertIsNone(detect_compression(os.path.join(folder_path, "plain")))
+            self.assertEqual(FileFormat.csv, detect_file_format("/data/part.csv.gz"))
+            self.assertEqual(FileFormat.csv, detect_file_format(os.path.join(folder_path, "zstd")))
+            with self.assertRaises(ValueError):
+                detect_file_format(os.path.join(folder_path, "part.parquet.gz"))
+
+    def test_get_file_chunks_from_csv(self):
+        with tempfile.TemporaryDirectory() as folder_path:
+            for index in range(2):
+                pd.DataFrame({"data": [index, index + 1, index + 2]}).to_csv(
+                    os.path.join(folder_path, f"part-{index}.csv"), index=False
+                )
+
+            with mock.patch.dict(os.environ, {"dataset_source": folder_path}, clear=True):
+                files = dict(get_file_chunks_from_csv(chunk_size=2))
+                chunks = list(files[os.path.join(folder_path, "part-1.csv")])
+
+        self.assertEqual(2, len(files))
+        self.assertEqual([[1, 2], [3]], [chunk["data"].tolist() for chunk in chunks])
+
+    def test_detect_file_format(self):
+        with tempfile.TemporaryDirectory() as folder_path:
+            pd.DataFrame({"a": [1]}).to_parquet(os.path.join(folder_path, "parquet_data"))
+            pd.DataFrame({"a": [1]}).to_feather(os.path.join(folder_path, "arrow_data"))
+            pd.DataFrame({"a": [1]}).to_csv(os.path.join(folder_path, "csv_data"))
+
+            self.assertEqual(
+                FileFormat.parquet, detect_file_format(os.path.join(folder_path, "parquet_data"))
+            )
+            self.assertEqual(
+                FileFormat.feather, detect_file_format(os.path.join(folder_path, "arrow_data"))
+            )
+            self.assertEqual(
+                FileFormat.csv, detect_file_format(os.path.join(folder_path, "csv_data"))
+            )
+        self.assertEqual(FileFormat.parquet, detect_file_format("/not/read/data.PQ"))
+        self.assertEqual(FileFormat.feather, detect_file_format("/not/read/data.arrow"))
+        self.assertEqual(FileFormat.csv, detect_file_format("/not/read/data.csv"))
+
+    def test_get_csv_engine(self):
+        self.assertEqual(CsvEngine.c, get_csv_engine())
+        with mock.patch.dict(os.environ, {"csv_engine": "pyarrow"}, clear=True):
+            self.assertEqual(CsvEngine.pyarrow, get_csv_engine())
+
+    def test_get_reader_workers(self):
+        self.assertEqual(1, get_reader_workers())
+        with mock.patch.dict(os.environ, {"reader_workers": "4"}, clear=True):
+            self.assertEqual(4, get_reader_workers())
+        with mock.patch.dict(os.environ, {"reader_workers": "auto"}, clear=True):
+            self.assertEqual(os.cpu_count(), get_reader_workers())
+        with mock.patch.dict(os.environ, {"reader_workers": "0"}, clear=True):
+            with self.assertRaises(ValueError):
+                get_reader_workers()
+
     @patch("json.load")
     @patch("src.monitoring_custom_metrics.util.retrieve_json_file")
     def test_retrieve_json_file_in_path_for_file_path(